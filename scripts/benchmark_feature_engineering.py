@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Feature Engineering Benchmark Script
+Times NaN cleaning and intraday features against the previous multi-pass versions
+on synthetic hourly bars (default: 2 years x 500 symbols)
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+# Add the project root directory to the path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data.processors.feature_engineering import TradingFeatureEngine
+from src.data.processors.rolling_kernels import NUMBA_AVAILABLE, rolling_std
+
+
+def legacy_clean(df):
+    """Previous clean_sequence_data: four full-frame null counts and a per-column mean loop"""
+    clean = df.copy()
+    clean.isnull().sum().sum()
+    clean = clean.ffill().bfill()
+    if clean.isnull().sum().sum() > 0:
+        numeric_columns = clean.select_dtypes(include=[np.number]).columns
+        means = clean[numeric_columns].mean()
+        for col in numeric_columns:
+            if clean[col].isnull().any() and not pd.isna(means[col]):
+                clean[col] = clean[col].fillna(means[col])
+    if clean.isnull().sum().sum() > 0:
+        clean = clean.fillna(0)
+    return clean, clean.isnull().sum().sum() == 0
+
+
+def legacy_intraday(df):
+    """Previous calculate_intraday_features: five groupby('date') passes"""
+    df['date'] = df['timestamp'].dt.date
+    daily_opens = df.groupby('date')['open'].transform('first')
+    df['returns_from_daily_open'] = ((df['close'] - daily_opens) / daily_opens).fillna(0)
+    df['intraday_high'] = df.groupby('date')['high'].transform('max')
+    df['intraday_low'] = df.groupby('date')['low'].transform('min')
+    intraday_range = df['intraday_high'] - df['intraday_low']
+    df['intraday_range_pct'] = (intraday_range / daily_opens).fillna(0)
+    df['position_in_range'] = ((df['close'] - df['intraday_low']) /
+                               intraday_range.replace(0, np.nan)).fillna(0.5)
+    prev_day_close = (df.groupby('date')['close'].transform('last')
+                      .shift(df.groupby('date').cumcount().max() + 1))
+    df['overnight_gap'] = ((daily_opens - prev_day_close) / prev_day_close).fillna(0)
+    df['dist_from_intraday_high'] = ((df['close'] - df['intraday_high']) / df['intraday_high']).fillna(0)
+    df['dist_from_intraday_low'] = ((df['close'] - df['intraday_low']) / df['intraday_low']).fillna(0)
+    return df
+
+
+def legacy_rolling_statistics(df):
+    """Previous calculate_rolling_statistics and vol-of-vol: one pandas rolling pass per statistic"""
+    for window in [6, 12, 24]:
+        df[f'returns_mean_{window}h'] = df['returns'].rolling(window).mean()
+        df[f'returns_std_{window}h'] = df['returns'].rolling(window).std()
+        df[f'returns_skew_{window}h'] = df['returns'].rolling(window).skew()
+        df[f'returns_kurt_{window}h'] = df['returns'].rolling(window).kurt()
+        df[f'price_momentum_{window}h'] = (df['close'] / df['close'].shift(window) - 1)
+    df['realized_vol_med'] = df['returns'].rolling(24).std() * np.sqrt(24)
+    df['vol_of_vol'] = df['realized_vol_med'].rolling(24).std()
+    return df
+
+
+def rolling_statistics(engine):
+    def run(df):
+        df = engine.calculate_rolling_statistics(df)
+        df['realized_vol_med'] = rolling_std(df['returns'], 24) * np.sqrt(24)
+        df['vol_of_vol'] = rolling_std(df['realized_vol_med'], 24)
+        return df
+    return run
+
+
+def make_symbol_frame(rng, days, features):
+    """Hourly bars (7 per trading day) with NaN warm-up periods like the rolling features"""
+    sessions = pd.bdate_range('2022-01-03', periods=days)
+    stamps = (sessions.values[:, None] + np.timedelta64(9 * 60 + 30, 'm')
+              + np.arange(7) * np.timedelta64(1, 'h')).ravel()
+    n = len(stamps)
+    close = 100 + rng.normal(size=n).cumsum()
+    df = pd.DataFrame({'timestamp': pd.DatetimeIndex(stamps), 'open': close, 'high': close + 1,
+                       'low': close - 1, 'close': close, 'volume': rng.integers(1000, 5000, size=n),
+                       'symbol': 'SYM'})
+    df['returns'] = df['close'].pct_change()
+    for i in range(features):
+        values = rng.normal(size=n)
+        values[:rng.integers(1, 480)] = np.nan
+        df[f'feature_{i}'] = values
+    return df
+
+
+def timed(func, frames):
+    """Total seconds spent in ``func`` over fresh copies of ``frames``"""
+    elapsed = 0.0
+    for frame in frames:
+        frame = frame.copy()
+        start = time.perf_counter()
+        func(frame)
+        elapsed += time.perf_counter() - start
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark feature engineering kernels")
+    parser.add_argument('--symbols', type=int, default=500, help="Symbols to process (default: 500)")
+    parser.add_argument('--days', type=int, default=504, help="Trading days per symbol (default: 504, ~2 years)")
+    parser.add_argument('--features', type=int, default=80, help="Feature columns to clean (default: 80)")
+    args = parser.parse_args()
+
+    with patch('src.data.processors.feature_engineering.get_db_manager'):
+        engine = TradingFeatureEngine()
+
+    rng = np.random.default_rng(42)
+    print(f"Generating {args.symbols} symbols x {args.days} days ({args.symbols * args.days * 7:,} rows)...")
+    frames = [make_symbol_frame(rng, args.days, args.features) for _ in range(args.symbols)]
+
+    results = [
+        ('clean_sequence_data', timed(legacy_clean, frames), timed(engine.clean_sequence_data, frames)),
+        ('calculate_intraday_features', timed(legacy_intraday, frames),
+         timed(engine.calculate_intraday_features, frames)),
+        ('rolling moments + vol_of_vol', timed(legacy_rolling_statistics, frames),
+         timed(rolling_statistics(engine), frames)),
+    ]
+    print(f"Rolling kernels: {'numba' if NUMBA_AVAILABLE else 'numpy'}")
+    print(f"{'kernel':<30}{'previous (s)':>14}{'current (s)':>14}{'speedup':>10}")
+    for name, before, after in results:
+        print(f"{name:<30}{before:>14.2f}{after:>14.2f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
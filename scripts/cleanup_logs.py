@@ -21,8 +21,10 @@ from src.utils.logging_config import (
 from src.utils.resilient_database_logging import (
     get_all_logger_stats, cleanup_resilient_loggers
 )
+from src.utils.log_shipping import get_log_shipper
 from src.utils.db_pool_monitor import ConnectionPoolMonitor, create_optimized_db_manager
 from src.data.storage.database import get_db_manager
+from src.utils.database_log_manager import get_database_log_manager
 
 logger = get_combined_logger("mltrading.log_cleanup_script")
 
@@ -93,16 +95,22 @@ def stats_command(args):
         print(f"\n{logger_name.upper()} Logger:")
         print(f"  Queued: {stats['logs_queued']}")
         print(f"  Written to DB: {stats['logs_written_to_db']}")
+        print(f"  Spilled to disk: {stats['logs_spilled']}")
         print(f"  Dropped: {stats['logs_dropped']}")
         print(f"  DB Errors: {stats['database_errors']}")
         print(f"  Queue Size: {stats['queue_size']}")
         print(f"  Thread Alive: {stats['thread_alive']}")
-        
-        if 'circuit_breaker' in stats:
-            cb_stats = stats['circuit_breaker']
-            print(f"  Circuit Breaker: {cb_stats['state']}")
-            print(f"  Failures: {cb_stats['failure_count']}")
-            print(f"  Successes: {cb_stats['success_count']}")
+
+    shipper = get_log_shipper()
+    shipping = shipper.get_stats()
+    print("\n=== Log Shipping ===")
+    for name in ['enqueued', 'written', 'spilled', 'replayed', 'dropped', 'rejected', 'dead_lettered',
+                 'write_errors']:
+        print(f"  {name}: {shipping[name]}")
+    print(f"  Queue Size: {shipping['queue_size']} (next batch: {shipping['target_batch_size']})")
+    print(f"  Spill backlog: {shipping['spill_backlog_bytes']} bytes ({shipper.spill_path})")
+    print(f"  Dead letters: {shipper.dead_letter_path}")
+    print(f"  Reconnect backoff: {shipping['backoff_seconds']:.1f}s")
 
 
 def monitor_command(args):
@@ -185,6 +193,19 @@ def optimize_command(args):
         print(f"❌ Error during optimization: {e}")
 
 
+def migrate_command(args):
+    """Partition the log tables and backfill log rollups over their history"""
+    print("=== Log Table Migration ===")
+
+    results = get_database_log_manager().migrate_log_tables()
+    if results['status'] == 'success':
+        print(f"Rows scanned: {results['rows_scanned']}")
+        print(f"Rollups written: {results['rollups_written']}")
+        print("✅ Log tables partitioned and rollups backfilled")
+    else:
+        print(f"❌ Migration failed: {results['message']}")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Log cleanup and database connection management")
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
@@ -208,6 +229,9 @@ def main():
     
     # Optimize command
     optimize_parser = subparsers.add_parser('optimize', help='Optimize database connections')
+
+    # Migrate command
+    subparsers.add_parser('migrate', help='Partition log tables and backfill log rollups')
     
     args = parser.parse_args()
     
@@ -219,6 +243,8 @@ def main():
         monitor_command(args)
     elif args.command == 'optimize':
         optimize_command(args)
+    elif args.command == 'migrate':
+        migrate_command(args)
     else:
         parser.print_help()
 
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Feature Parquet Export Script
+Exports feature_engineered_data to a symbol/year/month partitioned Parquet dataset
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# Add the project root directory to the path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data.storage.database import get_db_manager
+from src.data.storage.feature_parquet import FeatureParquetExporter
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export feature data to Parquet for ML training")
+    parser.add_argument('--root', default='data/features', help="Dataset directory (default: data/features)")
+    parser.add_argument('--feature-version', default='3.0', help="Feature version to export")
+    parser.add_argument('--full', action='store_true', help="Ignore the watermark and re-export everything")
+    args = parser.parse_args()
+
+    exporter = FeatureParquetExporter(get_db_manager(), args.root, feature_version=args.feature_version)
+    result = exporter.export(full=args.full)
+    print(f"Exported {result['rows']} rows into {result['partitions']} partitions "
+          f"for {result['symbols']} symbols (watermark: {result['watermark']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,8 +8,11 @@ sys.path.insert(0, str(project_root))
 
 from fastapi import FastAPI, Request  # noqa: E402
 from fastapi.middleware.cors import CORSMiddleware  # noqa: E402
+from fastapi.responses import Response  # noqa: E402
 
 from src.utils.logging_config import get_ui_logger, log_request  # noqa: E402
+from src.utils.metrics import PROMETHEUS_CONTENT_TYPE, get_metrics_registry  # noqa: E402
+from src.data.storage.database import get_db_manager  # noqa: E402
 from src.api.routes import data  # noqa: E402
 
 # Initialize logger
@@ -65,6 +68,14 @@ async def health_check():
     logger.info("Health check endpoint accessed")
     return {"status": "healthy", "service": "ml-trading-api"}
 
+
+@app.get("/metrics")
+async def metrics():
+    """In-process metrics in the Prometheus text exposition format"""
+    # Creating the shared database manager registers its connection pool metrics
+    get_db_manager()
+    return Response(content=get_metrics_registry().render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
 # Include data routes
 app.include_router(data.router)
 
@@ -23,6 +23,11 @@ class DatabaseConfig(BaseModel):
     min_connections: int = Field(default=1, ge=1, le=50, description="Minimum pool connections")
     max_connections: int = Field(default=20, ge=1, le=50, description="Maximum pool connections")
     timeout: int = Field(default=30, ge=5, le=300, description="Connection timeout in seconds")
+    replica_host: Optional[str] = Field(default=None, description="Read replica host (reads use primary when unset)")
+    replica_port: Optional[int] = Field(default=None, description="Read replica port (defaults to primary port)")
+    replica_name: Optional[str] = Field(default=None, description="Read replica database name (defaults to primary)")
+    replica_max_connections: int = Field(default=4, ge=1, le=50, description="Maximum read pool connections")
+    replica_max_lag_seconds: float = Field(default=30.0, ge=0, description="Replica lag before reads fall back to primary")
 
 
 class AlpacaConfig(BaseModel):
@@ -160,6 +165,14 @@ class LoggingConfig(BaseModel):
     max_log_file_size_mb: int = Field(default=50, ge=1, description="Maximum log file size in MB")
     backup_count: int = Field(default=5, ge=1, description="Number of backup log files")
     cleanup_interval_hours: int = Field(default=24, ge=1, description="Log cleanup interval in hours")
+    operation_sample_rates: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Fraction of log_operation calls logged in full, by operation name or glob pattern"
+    )
+    default_operation_sample_rate: float = Field(default=1.0, ge=0.0, le=1.0,
+                                                 description="Sample rate for operations without an entry")
+    operation_summary_interval_seconds: float = Field(default=60.0, ge=0.0,
+                                                      description="Seconds between operation timing summaries")
 
 
 class Settings(BaseSettings):
@@ -391,6 +404,12 @@ class Settings(BaseSettings):
             self.database.user = os.getenv('DB_USER')
         if os.getenv('DB_PASSWORD'):
             self.database.password = os.getenv('DB_PASSWORD')
+        if os.getenv('DB_REPLICA_HOST'):
+            self.database.replica_host = os.getenv('DB_REPLICA_HOST')
+        if os.getenv('DB_REPLICA_PORT'):
+            self.database.replica_port = int(os.getenv('DB_REPLICA_PORT'))
+        if os.getenv('DB_REPLICA_NAME'):
+            self.database.replica_name = os.getenv('DB_REPLICA_NAME')
 
         # Alpaca environment variables
         if os.getenv('ALPACA_PAPER_API_KEY'):
@@ -6,6 +6,7 @@ Main entry point for the Dash web application.
 import dash
 import dash_bootstrap_components as dbc
 from dash import dcc, html, callback_context, Input, Output
+from flask import Response
 import sys
 from pathlib import Path
 
@@ -15,6 +16,8 @@ sys.path.insert(0, str(project_root))
 
 # Import configuration and components
 from src.utils.logging_config import get_ui_logger  # noqa: E402
+from src.utils.metrics import PROMETHEUS_CONTENT_TYPE, get_metrics_registry  # noqa: E402
+from src.data.storage.database import get_db_manager  # noqa: E402
 from src.dashboard.config import (  # noqa: E402
     DASHBOARD_CONFIG,
     EXTERNAL_STYLESHEETS,
@@ -57,6 +60,14 @@ app = dash.Dash(
 )
 
 
+@app.server.route("/metrics")
+def metrics():
+    """In-process metrics in the Prometheus text exposition format"""
+    # Creating the shared database manager registers its connection pool metrics
+    get_db_manager()
+    return Response(get_metrics_registry().render(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+
 def create_navigation():
     """Create the navigation bar"""
     nav_links = []
@@ -9,6 +9,8 @@ import numpy as np
 from dash import Input, Output, callback, html
 import dash_bootstrap_components as dbc
 
+from src.data.processors.feature_registry import FEATURE_REGISTRY, LAG_PERIODS, LAGGED_SERIES, ROLLING_WINDOWS
+
 from ..services.unified_data_service import MarketDataService
 from ..services.feature_data_service import FeatureDataService
 
@@ -16,6 +18,22 @@ from ..services.feature_data_service import FeatureDataService
 market_service = MarketDataService()
 feature_service = FeatureDataService()
 
+# Columns each chart reads; all charts for a symbol share one coalesced feature query
+MACD_CHART_COLUMNS = ['timestamp', 'close'] + FEATURE_REGISTRY.columns('macd')
+MA_RATIOS_CHART_COLUMNS = ['timestamp', 'close'] + FEATURE_REGISTRY.columns('moving_averages')
+VOL_RATIOS_CHART_COLUMNS = ['timestamp'] + FEATURE_REGISTRY.columns('volatility')
+ADVANCED_VOL_CHART_COLUMNS = ['timestamp', 'realized_vol_short', 'realized_vol_med', 'realized_vol_long',
+                              'gk_volatility', 'vol_of_vol', 'atr', 'atr_normalized']
+MONEY_FLOW_CHART_COLUMNS = ['timestamp', 'close', 'volume', 'mfi', 'volume_ratio', 'log_volume']
+VPT_CHART_COLUMNS = ['timestamp', 'close', 'vpt', 'vpt_ma', 'vpt_normalized']
+INTRADAY_CHART_COLUMNS = ['timestamp', 'close'] + FEATURE_REGISTRY.columns('intraday')
+LAGGED_HEATMAP_COLUMNS = (list(LAGGED_SERIES.values()) +
+                          [f'{feat}_lag_{lag}' for lag in LAG_PERIODS for feat in LAGGED_SERIES])
+ROLLING_STATS_CHART_COLUMNS = ['timestamp'] + [f'returns_{stat}_{window}h' for window in ROLLING_WINDOWS
+                                               for stat in ['mean', 'std', 'skew', 'kurt']]
+RSI_CHART_COLUMNS = FEATURE_REGISTRY.columns('rsi_family')
+BOLLINGER_CHART_COLUMNS = ['close', 'price_ma_short'] + FEATURE_REGISTRY.columns('bollinger_bands')
+
 
 @callback(
     Output("detailed-analysis-symbol", "options"),
@@ -45,7 +63,8 @@ def update_macd_detailed_chart(symbol, days):
 
     try:
         # Get comprehensive feature data
-        df = feature_service.get_feature_data(symbol=symbol, days=days or 30)
+        df = feature_service.get_feature_data(symbol=symbol, days=days or 30,
+                                              columns=MACD_CHART_COLUMNS)
 
         if df is None or df.empty:
             return create_empty_chart("No MACD data available")
@@ -136,7 +155,8 @@ def update_ma_ratios_chart(symbol, days):
 
     try:
         # Get comprehensive feature data
-        df = feature_service.get_feature_data(symbol=symbol, days=days or 30)
+        df = feature_service.get_feature_data(symbol=symbol, days=days or 30,
+                                              columns=MA_RATIOS_CHART_COLUMNS)
 
         if df is None or df.empty:
             return create_empty_chart("No moving averages data available")
@@ -222,7 +242,8 @@ def update_vol_ratios_chart(symbol, days):
 
     try:
         # Get comprehensive feature data
-        df = feature_service.get_feature_data(symbol=symbol, days=days or 30)
+        df = feature_service.get_feature_data(symbol=symbol, days=days or 30,
+                                              columns=VOL_RATIOS_CHART_COLUMNS)
 
         if df is None or df.empty:
             return create_empty_chart("No volatility data available")
@@ -299,7 +320,8 @@ def update_advanced_vol_chart(symbol, days):
 
     try:
         # Get comprehensive feature data
-        df = feature_service.get_feature_data(symbol=symbol, days=days or 30)
+        df = feature_service.get_feature_data(symbol=symbol, days=days or 30,
+                                              columns=ADVANCED_VOL_CHART_COLUMNS)
 
         if df is None or df.empty:
             return create_empty_chart("No advanced volatility data available")
@@ -395,7 +417,8 @@ def update_money_flow_chart(symbol, days):
 
     try:
         # Get comprehensive feature data
-        df = feature_service.get_feature_data(symbol=symbol, days=days or 30)
+        df = feature_service.get_feature_data(symbol=symbol, days=days or 30,
+                                              columns=MONEY_FLOW_CHART_COLUMNS)
 
         if df is None or df.empty:
             return create_empty_chart("No money flow data available")
@@ -489,7 +512,8 @@ def update_vpt_chart(symbol, days):
 
     try:
         # Get comprehensive feature data
-        df = feature_service.get_feature_data(symbol=symbol, days=days or 30)
+        df = feature_service.get_feature_data(symbol=symbol, days=days or 30,
+                                              columns=VPT_CHART_COLUMNS)
 
         if df is None or df.empty:
             return create_empty_chart("No VPT data available")
@@ -573,7 +597,8 @@ def update_intraday_features_chart(symbol, days):
 
     try:
         # Get comprehensive feature data
-        df = feature_service.get_feature_data(symbol=symbol, days=days or 30)
+        df = feature_service.get_feature_data(symbol=symbol, days=days or 30,
+                                              columns=INTRADAY_CHART_COLUMNS)
 
         if df is None or df.empty:
             return create_empty_chart("No intraday data available")
@@ -665,7 +690,8 @@ def update_lagged_features_heatmap(symbol, days):
 
     try:
         # Get comprehensive feature data
-        df = feature_service.get_feature_data(symbol=symbol, days=days or 30)
+        df = feature_service.get_feature_data(symbol=symbol, days=days or 30,
+                                              columns=LAGGED_HEATMAP_COLUMNS)
 
         if df is None or df.empty:
             return create_empty_chart("No lagged features data available")
@@ -730,7 +756,8 @@ def update_rolling_stats_chart(symbol, days):
 
     try:
         # Get comprehensive feature data
-        df = feature_service.get_feature_data(symbol=symbol, days=days or 30)
+        df = feature_service.get_feature_data(symbol=symbol, days=days or 30,
+                                              columns=ROLLING_STATS_CHART_COLUMNS)
 
         if df is None or df.empty:
             return create_empty_chart("No rolling statistics data available")
@@ -827,7 +854,7 @@ def update_rsi_multi_chart(symbol, days):
         symbol = "AAPL"
 
     try:
-        feature_data = market_service.feature_service.get_feature_data(symbol, days)
+        feature_data = feature_service.get_feature_data(symbol, days, columns=RSI_CHART_COLUMNS)
 
         if feature_data.empty:
             return create_empty_figure("No RSI data available")
@@ -900,7 +927,7 @@ def update_bollinger_detailed_chart(symbol, days):
         symbol = "AAPL"
 
     try:
-        feature_data = market_service.feature_service.get_feature_data(symbol, days)
+        feature_data = feature_service.get_feature_data(symbol, days, columns=BOLLINGER_CHART_COLUMNS)
 
         if feature_data.empty:
             return create_empty_figure("No Bollinger Bands data available")
@@ -1084,7 +1111,7 @@ def update_volume_indicators_chart(symbol, days):
         # Volume and Volume MA
         if 'volume' in volume_data and 'volume_ma' in volume_data:
             # Get volume from feature data (since volume_data might not have raw volume)
-            feature_data = market_service.feature_service.get_feature_data(symbol, days)
+            feature_data = feature_service.get_feature_data(symbol, days, columns=['volume'])
             if 'volume' in feature_data.columns:
                 fig.add_trace(
                     go.Bar(
@@ -17,8 +17,8 @@ sys.path.insert(0, str(project_root))
 
 from src.utils.logging_config import get_ui_logger
 from src.dashboard.utils.log_viewer import (
-    create_log_viewer, load_and_filter_logs, format_log_display,
-    get_log_stats, generate_log_analytics
+    create_log_viewer, load_and_filter_logs, load_log_rollups, format_log_display,
+    get_log_stats, generate_log_analytics, generate_rollup_analytics
 )
 
 # Initialize logger
@@ -116,16 +116,18 @@ def register_logs_callbacks(app):
             event_type_filter = event_type_filter or "all"
             symbol_filter = symbol_filter or "all"
 
-            # Load logs for analytics
+            # Aggregate the database rollups; parse the log files only when they are unavailable
+            # or the filters need fields the rollups do not keep
+            if event_type_filter == "all" and symbol_filter == "all":
+                rollups = load_log_rollups(component_filter, level_filter, time_filter)
+                if rollups:
+                    return generate_rollup_analytics(rollups)
+
             logs = load_and_filter_logs(
                 component_filter, level_filter, time_filter,
                 event_type_filter, symbol_filter
             )
-
-            # Generate analytics
-            analytics = generate_log_analytics(logs)
-
-            return analytics
+            return generate_log_analytics(logs)
         except Exception as e:
             return html.Div(f"Error generating analytics: {str(e)}", className="text-danger")
 
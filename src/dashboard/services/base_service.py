@@ -82,15 +82,12 @@ class BaseDashboardService:
         }
 
     def execute_query(self, query: str, params: tuple = None) -> List[tuple]:
-        """Execute a SELECT query and return results."""
+        """Execute a SELECT query (prepared server-side when repeated) and return results."""
         try:
-            conn = self.db_manager.get_connection()
+            conn = self.db_manager.get_read_connection()
             try:
                 with conn.cursor() as cur:
-                    if params:
-                        cur.execute(query, params)
-                    else:
-                        cur.execute(query)
+                    self.db_manager.execute_cached(cur, query, params or None)
                     return cur.fetchall()
             finally:
                 self.db_manager.return_connection(conn)
@@ -7,30 +7,50 @@ import time
 from typing import Dict, Any, Optional, Callable
 from functools import wraps
 from .base_service import BaseDashboardService
+from ...utils.metrics import get_metrics_registry
 
 
 class CacheService(BaseDashboardService):
     """Service to handle caching of frequently accessed dashboard data."""
 
-    def __init__(self, default_ttl: int = 300):  # 5 minutes default TTL
+    def __init__(self, default_ttl: int = 300, name: str = 'dashboard'):  # 5 minutes default TTL
         super().__init__()
         self.cache: Dict[str, Dict[str, Any]] = {}
         self.default_ttl = default_ttl
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+
+        metrics = get_metrics_registry()
+        self._hit_counter = metrics.counter('mltrading_cache_requests_total', 'Cache lookups by result',
+                                            cache=name, result='hit')
+        self._miss_counter = metrics.counter('mltrading_cache_requests_total', 'Cache lookups by result',
+                                             cache=name, result='miss')
+        self._entries_gauge = metrics.gauge('mltrading_cache_entries', 'Entries held in the cache', cache=name)
 
     def get(self, key: str) -> Optional[Any]:
         """Get value from cache if not expired."""
         if key not in self.cache:
+            self._record_miss()
             return None
 
         entry = self.cache[key]
         if time.time() - entry['timestamp'] > entry['ttl']:
             # Cache expired, remove entry
             del self.cache[key]
+            self._entries_gauge.set(len(self.cache))
+            self._record_miss()
             return None
 
+        self.hits += 1
+        self._hit_counter.inc()
         self.logger.debug(f"Cache hit for key: {key}")
         return entry['data']
 
+    def _record_miss(self):
+        self.misses += 1
+        self._miss_counter.inc()
+
     def set(self, key: str, data: Any, ttl: int = None) -> None:
         """Set value in cache with TTL."""
         if ttl is None:
@@ -41,6 +61,7 @@ class CacheService(BaseDashboardService):
             'timestamp': time.time(),
             'ttl': ttl
         }
+        self._entries_gauge.set(len(self.cache))
         self.logger.debug(f"Cache set for key: {key} with TTL: {ttl}s")
 
     def invalidate(self, pattern: str = None) -> None:
@@ -48,12 +69,14 @@ class CacheService(BaseDashboardService):
         if pattern is None:
             # Clear all cache
             self.cache.clear()
+            self._entries_gauge.set(0)
             self.logger.info("All cache entries cleared")
         else:
             # Clear entries matching pattern
             keys_to_remove = [key for key in self.cache.keys() if pattern in key]
             for key in keys_to_remove:
                 del self.cache[key]
+            self._entries_gauge.set(len(self.cache))
             self.logger.info(f"Cleared {len(keys_to_remove)} cache entries matching pattern: {pattern}")
 
     def get_cache_stats(self) -> Dict[str, Any]:
@@ -69,7 +92,10 @@ class CacheService(BaseDashboardService):
         return {
             'total_entries': total_entries,
             'active_entries': total_entries - expired_count,
-            'expired_entries': expired_count
+            'expired_entries': expired_count,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / (self.hits + self.misses) if self.hits + self.misses else 0.0
         }
 
 
@@ -87,7 +113,7 @@ def cached(ttl: int = 300, key_func: Callable = None):
         def wrapper(self, *args, **kwargs):
             # Initialize cache service if not present
             if not hasattr(self, '_cache_service'):
-                self._cache_service = CacheService()
+                self._cache_service = CacheService(name=type(self).__name__)
 
             # Generate cache key
             if key_func:
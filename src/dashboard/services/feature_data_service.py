@@ -4,9 +4,20 @@ Replaces real-time calculations with efficient database queries for comprehensiv
 """
 
 import pandas as pd
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Union
+from src.data.processors.feature_registry import FEATURE_REGISTRY
+from src.data.storage.feature_reader import FeatureReader
 from .base_service import BaseDashboardService
-from .cache_service import cached
+from .feature_frame_loader import get_feature_frame_loader
+
+# Column sets used by the indicator helpers below, taken from the feature registry
+MOVING_AVERAGE_COLUMNS = FEATURE_REGISTRY.columns('moving_averages')
+BOLLINGER_COLUMNS = ['price_ma_short'] + FEATURE_REGISTRY.columns('bollinger_bands')
+RSI_COLUMNS = FEATURE_REGISTRY.columns('rsi_family')
+MACD_COLUMNS = FEATURE_REGISTRY.columns('macd')
+VOLATILITY_COLUMNS = FEATURE_REGISTRY.columns(['average_true_range', 'volatility'])
+VOLUME_COLUMNS = FEATURE_REGISTRY.columns('volume_indicators')
+ADVANCED_COLUMNS = FEATURE_REGISTRY.columns(['intraday', 'sequence_modeling'])
 
 
 class FeatureDataService(BaseDashboardService):
@@ -25,84 +36,66 @@ class FeatureDataService(BaseDashboardService):
 
     def __init__(self):
         super().__init__()
+        self.frame_loader = get_feature_frame_loader()
+        self.feature_reader = FeatureReader(self.db_manager)
         self.logger.info("FeatureDataService initialized - using pre-calculated features from database")
 
-    @cached(ttl=120, key_func=lambda self, symbol, days: f"features_{symbol}_{days}")
-    def get_feature_data(self, symbol: str, days: int = 30, feature_version: str = '3.0') -> pd.DataFrame:
+    def get_feature_data(self, symbol: str, days: int = 30, feature_version: str = '3.0',
+                         columns: Optional[List[str]] = None) -> pd.DataFrame:
         """
         Get comprehensive feature data for a symbol from the database.
 
+        Concurrent calls for the same (symbol, days, feature_version) share one
+        query and one frame; each caller gets its own column projection.
+
         Args:
             symbol: Stock symbol
             days: Number of days of data to retrieve
             feature_version: Feature version ('3.0' for comprehensive features)
+            columns: Columns the caller uses (None for all)
 
         Returns:
-            DataFrame with all pre-calculated features
+            DataFrame with the requested pre-calculated features (empty on error)
         """
         try:
-            query = """
-                SELECT *
-                FROM feature_engineered_data
-                WHERE symbol = %s
-                AND feature_version = %s
-                AND timestamp >= NOW() - INTERVAL '%s days'
-                ORDER BY timestamp ASC
-            """
+            return self.frame_loader.load(
+                (symbol, days, feature_version),
+                lambda: self._fetch_feature_frame(symbol, days, feature_version),
+                columns=columns
+            )
+        except Exception as e:
+            self.logger.error(f"Error retrieving feature data for {symbol}: {e}")
+            return pd.DataFrame()
 
-            result = self.execute_query(query, (symbol, feature_version, days))
+    def _fetch_feature_frame(self, symbol: str, days: int, feature_version: str) -> pd.DataFrame:
+        """Read every feature column once as a compact, typed frame; errors propagate to the loader."""
+        df = self.feature_reader.read(symbol, feature_version=feature_version, days=days)
 
-            if not result:
-                self.logger.warning(f"No feature data found for {symbol} (version {feature_version})")
-                return pd.DataFrame()
-
-            # Convert to DataFrame
-            # Get column names from query result
-            columns = ['id', 'symbol', 'timestamp', 'open', 'high', 'low', 'close', 'volume',
-                       'returns', 'log_returns', 'high_low_pct', 'open_close_pct', 'price_acceleration', 'returns_sign',
-                       'returns_squared', 'realized_vol_short', 'realized_vol_med', 'realized_vol_long', 'gk_volatility', 'vol_of_vol',
-                       'price_ma_short', 'price_ma_med', 'price_ma_long', 'price_to_ma_short', 'price_to_ma_med',
-                       'price_to_ma_long',
-                       'ma_short_to_med', 'ma_med_to_long', 'volume_ma', 'volume_ratio', 'log_volume', 'vpt', 'vpt_ma',
-                       'vpt_normalized', 'mfi',
-                       'rsi_1d', 'rsi_3d', 'rsi_1w', 'rsi_2w', 'rsi_ema', 'hour', 'day_of_week', 'date', 'hour_sin',
-                       'hour_cos', 'dow_sin', 'dow_cos',
-                       'is_market_open', 'is_morning', 'is_afternoon', 'hours_since_open', 'hours_to_close',
-                       'returns_from_daily_open',
-                       'intraday_high', 'intraday_low', 'intraday_range_pct', 'position_in_range', 'overnight_gap',
-                       'dist_from_intraday_high', 'dist_from_intraday_low',
-                       'returns_lag_1', 'vol_lag_1', 'volume_ratio_lag_1', 'returns_lag_2', 'vol_lag_2',
-                       'volume_ratio_lag_2',
-                       'returns_lag_4', 'vol_lag_4', 'volume_ratio_lag_4', 'returns_lag_8', 'vol_lag_8',
-                       'volume_ratio_lag_8',
-                       'returns_lag_24', 'vol_lag_24', 'volume_ratio_lag_24', 'returns_mean_6h', 'returns_std_6h',
-                       'returns_skew_6h', 'returns_kurt_6h', 'price_momentum_6h',
-                       'returns_mean_12h', 'returns_std_12h', 'returns_skew_12h', 'returns_kurt_12h',
-                       'price_momentum_12h',
-                       'returns_mean_24h', 'returns_std_24h', 'returns_skew_24h', 'returns_kurt_24h',
-                       'price_momentum_24h',
-                       'bb_upper', 'bb_lower', 'bb_position', 'bb_squeeze',
-                       'macd',
-                       'macd_signal',
-                       'macd_histogram',
-                       'macd_normalized',
-                       'atr', 'atr_normalized', 'williams_r', 'source', 'feature_version', 'created_at', 'updated_at',
-                       'vol_ratio_short_med', 'vol_ratio_med_long']
-
-            # Use only the number of columns returned by the query
-            if result and len(result[0]) < len(columns):
-                columns = columns[:len(result[0])]
-
-            df = pd.DataFrame(result, columns=columns)
-
-            # Convert timestamp to datetime and reset index to make it a column
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-
-            self.logger.info(f"Retrieved {len(df)} feature records for {symbol}")
-            return df
+        if df.empty:
+            self.logger.warning(f"No feature data found for {symbol} (version {feature_version})")
+            return pd.DataFrame()
+
+        self.logger.info(f"Retrieved {len(df)} feature records for {symbol}")
+        return df
+
+    def get_feature_set(self, symbol: Union[str, List[str]], columns: Union[str, List[str]], days: int = 30,
+                        feature_version: str = '3.0') -> pd.DataFrame:
+        """
+        Read only the named columns or feature sets, bypassing the shared frame.
 
+        Args:
+            symbol: Stock symbol or list of symbols
+            columns: Column names and/or feature set names (see FEATURE_SETS)
+            days: Number of days of data to retrieve
+            feature_version: Feature version
+
+        Returns:
+            DataFrame with symbol, timestamp and the requested columns in compact dtypes
+        """
+        try:
+            return self.feature_reader.read(symbol, columns=columns, feature_version=feature_version, days=days)
         except Exception as e:
-            self.logger.error(f"Error retrieving feature data for {symbol}: {e}")
+            self.logger.error(f"Error retrieving feature set {columns} for {symbol}: {e}")
             return pd.DataFrame()
 
     def get_moving_averages(self, symbol: str, days: int = 30) -> Dict[str, pd.Series]:
@@ -113,7 +106,7 @@ class FeatureDataService(BaseDashboardService):
             Dict with 'sma_short' (24h), 'sma_med' (120h), 'sma_long' (480h) and ratios
         """
         try:
-            df = self.get_feature_data(symbol, days)
+            df = self.get_feature_data(symbol, days, columns=MOVING_AVERAGE_COLUMNS)
 
             if df.empty:
                 return {}
@@ -141,7 +134,7 @@ class FeatureDataService(BaseDashboardService):
             Dict with 'middle', 'upper', 'lower', 'position', 'squeeze'
         """
         try:
-            df = self.get_feature_data(symbol, days)
+            df = self.get_feature_data(symbol, days, columns=BOLLINGER_COLUMNS)
 
             if df.empty:
                 return {}
@@ -166,7 +159,7 @@ class FeatureDataService(BaseDashboardService):
             Dict with multiple RSI timeframes: '1d', '3d', '1w', '2w', 'ema'
         """
         try:
-            df = self.get_feature_data(symbol, days)
+            df = self.get_feature_data(symbol, days, columns=RSI_COLUMNS)
 
             if df.empty:
                 return {}
@@ -193,7 +186,7 @@ class FeatureDataService(BaseDashboardService):
             Dict with 'macd', 'signal', 'histogram', 'normalized'
         """
         try:
-            df = self.get_feature_data(symbol, days)
+            df = self.get_feature_data(symbol, days, columns=MACD_COLUMNS)
 
             if df.empty:
                 return {}
@@ -217,7 +210,7 @@ class FeatureDataService(BaseDashboardService):
             Dict with various volatility measures and ATR
         """
         try:
-            df = self.get_feature_data(symbol, days)
+            df = self.get_feature_data(symbol, days, columns=VOLATILITY_COLUMNS)
 
             if df.empty:
                 return {}
@@ -247,7 +240,7 @@ class FeatureDataService(BaseDashboardService):
             Dict with volume indicators including VPT and MFI
         """
         try:
-            df = self.get_feature_data(symbol, days)
+            df = self.get_feature_data(symbol, days, columns=VOLUME_COLUMNS)
 
             if df.empty:
                 return {}
@@ -274,7 +267,7 @@ class FeatureDataService(BaseDashboardService):
             Dict with advanced features not available in traditional UI calculations
         """
         try:
-            df = self.get_feature_data(symbol, days)
+            df = self.get_feature_data(symbol, days, columns=ADVANCED_COLUMNS)
 
             if df.empty:
                 return {}
@@ -0,0 +1,146 @@
+"""
+Request-coalescing loader for shared feature frames.
+
+A symbol change on the detailed analysis tab fires a dozen chart callbacks at
+once, all asking for the same feature data. The loader lets the first caller
+for a key run the query while concurrent callers for that key wait for its
+result, and keeps the loaded frame for a short TTL. Failed and empty loads are
+shared with the callers waiting on them but never cached. Callers only ever
+receive a column projection, never the shared frame itself.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence
+
+import pandas as pd
+
+
+class _InFlightLoad:
+    """A load that concurrent callers for the same key wait on"""
+
+    __slots__ = ('done', 'frame', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.frame: Optional[pd.DataFrame] = None
+        self.error: Optional[BaseException] = None
+
+
+class CoalescingFrameLoader:
+    """
+    Single-flight, short-TTL cache of DataFrames keyed by request parameters.
+
+    Example:
+        >>> loader = CoalescingFrameLoader(ttl=120)
+        >>> key = ('AAPL', 30, '3.0')
+        >>> macd = loader.load(key, lambda: fetch_features('AAPL', 30), columns=['timestamp', 'macd'])
+        >>> loader.get_stats()['loads']
+        1
+    """
+
+    def __init__(self, ttl: float = 120, max_entries: int = 32):
+        """
+        Initialize loader.
+
+        Args:
+            ttl: Seconds a loaded frame is reused for
+            max_entries: Frames kept before the least recently used is dropped
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._frames: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._in_flight: Dict[Hashable, _InFlightLoad] = {}
+        self._lock = threading.Lock()
+        self._stats = {'loads': 0, 'coalesced': 0, 'hits': 0, 'errors': 0}
+
+    def load(self, key: Hashable, fetch: Callable[[], pd.DataFrame],
+             columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Get the frame for ``key``, running ``fetch`` only if no fresh or in-flight copy exists.
+
+        Args:
+            key: Hashable request key, e.g. (symbol, days, feature_version)
+            fetch: Callable that loads the full frame
+            columns: Columns to return; missing ones are skipped, None returns all
+
+        Returns:
+            Projection of the shared frame (the shared frame is never handed out)
+        """
+        return self.project(self._shared_frame(key, fetch), columns)
+
+    @staticmethod
+    def project(frame: pd.DataFrame, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Select ``columns`` in the frame's own column order"""
+        if columns is None:
+            return frame[list(frame.columns)]
+        wanted = set(columns)
+        return frame[[col for col in frame.columns if col in wanted]]
+
+    def _shared_frame(self, key: Hashable, fetch: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        with self._lock:
+            entry = self._frames.get(key)
+            if entry is not None and time.monotonic() - entry[1] <= self.ttl:
+                self._frames.move_to_end(key)
+                self._stats['hits'] += 1
+                return entry[0]
+
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._in_flight[key] = _InFlightLoad()
+                self._stats['loads'] += 1
+            else:
+                self._stats['coalesced'] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.frame
+
+        try:
+            frame = fetch()
+            flight.frame = frame
+            if not frame.empty:
+                with self._lock:
+                    self._frames[key] = (frame, time.monotonic())
+                    self._frames.move_to_end(key)
+                    while len(self._frames) > self.max_entries:
+                        self._frames.popitem(last=False)
+            return frame
+        except BaseException as e:
+            flight.error = e
+            with self._lock:
+                self._stats['errors'] += 1
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            flight.done.set()
+
+    def invalidate(self, key: Hashable = None) -> None:
+        """Drop one cached frame, or all of them when ``key`` is None"""
+        with self._lock:
+            if key is None:
+                self._frames.clear()
+            else:
+                self._frames.pop(key, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get load, coalesce and hit counters."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['cached_frames'] = len(self._frames)
+            stats['in_flight'] = len(self._in_flight)
+        return stats
+
+
+# Shared by every FeatureDataService instance so all dashboard callbacks coalesce together
+_feature_frame_loader = CoalescingFrameLoader(ttl=120)
+
+
+def get_feature_frame_loader() -> CoalescingFrameLoader:
+    """Get the global feature frame loader instance."""
+    return _feature_frame_loader
@@ -93,7 +93,7 @@ class MarketDataService(BaseDashboardService):
                 ORDER BY timestamp ASC
             """
 
-            conn = self.db_manager.get_connection()
+            conn = self.db_manager.get_read_connection()
             try:
                 df = pd.read_sql_query(query, conn, params=[symbol.upper(), source])
             finally:
@@ -144,7 +144,7 @@ class MarketDataService(BaseDashboardService):
                 LIMIT 200
             """
 
-            conn = self.db_manager.get_connection()
+            conn = self.db_manager.get_read_connection()
             try:
                 df = pd.read_sql_query(query, conn, params=[symbol.upper(), source])
             finally:
@@ -0,0 +1,369 @@
+"""
+Indexed, tail-reading backend for the dashboard log viewer.
+
+Each log file keeps the byte range it has parsed, a cache of recent entries
+and a sparse timestamp -> byte offset index. A refresh only parses bytes
+appended since the previous one; a time-filtered query reads backward from
+the tail until it passes the cutoff instead of parsing the whole file, and
+component/level/symbol filters run on the cached entries before any dicts
+are built for the UI.
+"""
+
+import bisect
+import os
+import re
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Files shown on the Logs tab
+DEFAULT_LOG_FILES = [
+    "logs/ui_dashboard.log",
+    "logs/ui_api.log",
+    "logs/ui_launcher.log",
+    "logs/ui_utils.log",
+    "logs/yahoo_extraction.log",
+    "logs/mltrading_combined.log"
+]
+
+# 2025-08-01 18:41:14,948 - mltrading.ui.dashboard - INFO - message
+_HEADER = re.compile(rb'(\d{4})-(\d{2})-(\d{2}) (\d{2}):(\d{2}):(\d{2}),(\d{3}) - ([^-]+) - (\w+) - ')
+# 2025-01-15 10:30:45 - INFO - message (yahoo extraction, no component)
+_ALT_HEADER = re.compile(rb'(\d{4})-(\d{2})-(\d{2}) (\d{2}):(\d{2}):(\d{2}) - (\w+) - ')
+
+# Entries written by several processes are not strictly ordered; backward
+# reads continue this far past the cutoff so late-flushed lines are not missed
+CLOCK_SKEW_TOLERANCE = timedelta(minutes=1)
+
+
+class LogEntry:
+    """One parsed log record (header line plus any continuation lines)"""
+
+    __slots__ = ('timestamp', 'level', 'component', 'message', 'raw', 'offset')
+
+    def __init__(self, timestamp: datetime, level: str, component: str, message: str, raw: str, offset: int):
+        self.timestamp = timestamp
+        self.level = level
+        self.component = component
+        self.message = message
+        self.raw = raw
+        self.offset = offset
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'timestamp': self.timestamp,
+            'level': self.level,
+            'component': self.component,
+            'message': self.message,
+            'raw': self.raw
+        }
+
+
+def _parse_header(line: bytes) -> Optional[Tuple[datetime, str, str, int]]:
+    """Timestamp, level, component and message start of an entry's first line, or None for continuations"""
+    match = _HEADER.match(line)
+    if match:
+        year, month, day, hour, minute, second, millis, component, level = match.groups()
+        timestamp = datetime(int(year), int(month), int(day), int(hour), int(minute), int(second),
+                             int(millis) * 1000)
+        return timestamp, level.decode('ascii'), component.decode('utf-8', 'replace').strip(), match.end()
+    match = _ALT_HEADER.match(line)
+    if match:
+        year, month, day, hour, minute, second, level = match.groups()
+        timestamp = datetime(int(year), int(month), int(day), int(hour), int(minute), int(second))
+        return timestamp, level.decode('ascii'), 'yahoo_extraction', match.end()
+    return None
+
+
+def make_filter(component_filter: str = "all", level_filter: str = "all", event_type_filter: str = "all",
+                symbol_filter: str = "all") -> Optional[Callable[[LogEntry], bool]]:
+    """Build one predicate for the viewer's dropdown filters (None when nothing is filtered)"""
+    checks = []
+    if level_filter != "all":
+        checks.append(lambda entry: entry.level == level_filter)
+    if component_filter != "all":
+        component = component_filter.lower()
+        checks.append(lambda entry: component in entry.component.lower())
+    if symbol_filter != "all":
+        checks.append(lambda entry: symbol_filter in entry.message)
+    if event_type_filter != "all":
+        event_type = event_type_filter.lower()
+        checks.append(lambda entry: event_type in entry.message.lower())
+    if not checks:
+        return None
+    return lambda entry: all(check(entry) for check in checks)
+
+
+class LogFileIndex:
+    """
+    Incrementally parsed view of one log file.
+
+    ``entries`` cache the byte range [start_offset, end_offset) in file order;
+    the sparse index keeps one (timestamp, offset) point roughly every
+    ``index_stride`` bytes of everything ever parsed, so wider time windows
+    seek straight to the right place even after old entries left the cache.
+    """
+
+    def __init__(self, path: str, block_size: int = 256 * 1024, index_stride: int = 256 * 1024,
+                 max_entries: int = 50000):
+        self.path = Path(path)
+        self.block_size = block_size
+        self.index_stride = index_stride
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self, identity: Optional[Tuple[int, int]] = None):
+        self.identity = identity
+        self.start_offset = 0
+        self.end_offset = 0
+        self.entries: List[LogEntry] = []
+        self.index_offsets: List[int] = []
+        self.index_times: List[datetime] = []
+        self.bytes_parsed = 0
+        self.initialized = False
+
+    def query(self, since: Optional[datetime] = None,
+              match: Optional[Callable[[LogEntry], bool]] = None) -> List[LogEntry]:
+        """
+        Entries at or after ``since`` (all entries when None) that pass ``match``, in file order.
+        """
+        with self._lock:
+            if not self._refresh():
+                return []
+
+            cutoff = since - CLOCK_SKEW_TOLERANCE if since is not None else None
+            while self._needs_older(cutoff) and len(self.entries) < self.max_entries:
+                self._extend_backward(cutoff)
+            if len(self.entries) > self.max_entries:
+                # The last extension can overshoot; keep the newest entries and stream the rest
+                del self.entries[:len(self.entries) - self.max_entries]
+                self.start_offset = self.entries[0].offset
+
+            older: List[LogEntry] = []
+            if self._needs_older(cutoff):
+                # Cache is full: stream the older range without keeping it
+                scan_from = self._index_before(cutoff) if cutoff is not None else 0
+                older = [entry for entry in self._parse(scan_from, self.start_offset)
+                         if (since is None or entry.timestamp >= since) and (match is None or match(entry))]
+
+            recent = [entry for entry in self.entries
+                      if (since is None or entry.timestamp >= since) and (match is None or match(entry))]
+            return older + recent
+
+    def _needs_older(self, cutoff: Optional[datetime]) -> bool:
+        if self.start_offset == 0:
+            return False
+        return cutoff is None or not self.entries or self.entries[0].timestamp >= cutoff
+
+    def _refresh(self) -> bool:
+        """Parse bytes appended since the last call; start over if the file was rotated or truncated"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            self._reset()
+            return False
+
+        identity = (stat.st_dev, stat.st_ino)
+        if identity != self.identity or stat.st_size < self.end_offset:
+            self._reset(identity)
+        if not self.initialized:
+            # Nothing read yet: start at the tail and let queries read backward
+            self.start_offset = self.end_offset = self._complete_size(stat.st_size)
+            self.initialized = True
+            return True
+
+        end = self._complete_size(stat.st_size)
+        if end <= self.end_offset:
+            return True
+
+        # The last cached entry may have gained continuation lines (e.g. a traceback)
+        resume = self.end_offset
+        if self.entries:
+            resume = self.entries.pop().offset
+        self.entries.extend(self._parse(resume, end))
+        self.end_offset = end
+        if len(self.entries) > self.max_entries:
+            del self.entries[:len(self.entries) - self.max_entries]
+            self.start_offset = self.entries[0].offset
+        return True
+
+    def _complete_size(self, size: int) -> int:
+        """File size up to the last newline, so a line being written is read next time"""
+        if size == 0:
+            return 0
+        with open(self.path, 'rb') as f:
+            position = size
+            while position > 0:
+                step = min(self.block_size, position)
+                f.seek(position - step)
+                block = f.read(step)
+                newline = block.rfind(b'\n')
+                if newline >= 0:
+                    return position - step + newline + 1
+                position -= step
+        return 0
+
+    def _extend_backward(self, cutoff: Optional[datetime]):
+        """Prepend entries before start_offset, reading back a growing distance until the cutoff is passed"""
+        step = self.block_size
+        while True:
+            indexed = self._index_before(cutoff) if cutoff is not None else 0
+            if indexed > 0:
+                # Index points sit on entry boundaries
+                begin = aligned = indexed
+            else:
+                begin = max(0, self.start_offset - step)
+                aligned = self._align(begin, self.start_offset)
+            if aligned is None and begin > 0:
+                step *= 2
+                continue
+
+            older = list(self._parse(aligned, self.start_offset)) if aligned is not None else []
+            self.entries[:0] = older
+            self.start_offset = aligned if aligned is not None and begin > 0 else 0
+            if older or self.start_offset == 0:
+                return
+            step *= 2
+
+    def _align(self, begin: int, end: int) -> Optional[int]:
+        """Offset of the first entry header in [begin, end), or None"""
+        with open(self.path, 'rb') as f:
+            f.seek(begin)
+            if begin > 0:
+                # Skip the partial line we landed in
+                partial = f.readline()
+                begin += len(partial)
+            position = begin
+            while position < end:
+                line = f.readline()
+                if not line:
+                    break
+                if _parse_header(line) is not None:
+                    return position
+                position += len(line)
+        return None
+
+    def _index_before(self, cutoff: datetime) -> int:
+        """Largest indexed offset whose timestamp is before the cutoff (0 if none)"""
+        best = 0
+        for position in range(bisect.bisect_left(self.index_offsets, self.start_offset) - 1, -1, -1):
+            if self.index_times[position] < cutoff:
+                best = self.index_offsets[position]
+                break
+        return best
+
+    def _add_index_point(self, timestamp: datetime, offset: int):
+        position = bisect.bisect_left(self.index_offsets, offset)
+        if position < len(self.index_offsets) and self.index_offsets[position] == offset:
+            return
+        previous = self.index_offsets[position - 1] if position else None
+        if previous is not None and offset - previous < self.index_stride:
+            return
+        self.index_offsets.insert(position, offset)
+        self.index_times.insert(position, timestamp)
+
+    def _parse(self, begin: int, end: int) -> Iterator[LogEntry]:
+        """Parse entries in [begin, end); ``begin`` must be an entry boundary"""
+        if begin >= end:
+            return
+        with open(self.path, 'rb') as f:
+            f.seek(begin)
+            position = begin
+            header = None
+            lines: List[bytes] = []
+            entry_offset = begin
+            while position < end:
+                line = f.readline()
+                if not line:
+                    break
+                parsed = _parse_header(line)
+                if parsed is not None:
+                    if header is not None:
+                        yield self._make_entry(header, lines, entry_offset)
+                    header, lines, entry_offset = parsed, [line], position
+                    self._add_index_point(parsed[0], position)
+                elif header is not None:
+                    stripped = line.strip()
+                    if stripped:
+                        lines.append(stripped)
+                position += len(line)
+            if header is not None:
+                yield self._make_entry(header, lines, entry_offset)
+            self.bytes_parsed += position - begin
+
+    @staticmethod
+    def _make_entry(header: Tuple[datetime, str, str, int], lines: List[bytes], offset: int) -> LogEntry:
+        timestamp, level, component, message_start = header
+        first = lines[0].strip()
+        raw = b'\n'.join([first] + lines[1:]).decode('utf-8', 'replace')
+        message = lines[0][message_start:].strip().decode('utf-8', 'replace')
+        return LogEntry(timestamp, level, component, message, raw, offset)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'path': str(self.path),
+            'start_offset': self.start_offset,
+            'end_offset': self.end_offset,
+            'cached_entries': len(self.entries),
+            'index_points': len(self.index_offsets),
+            'bytes_parsed': self.bytes_parsed
+        }
+
+
+class LogIndex:
+    """
+    Log index over all files shown on the Logs tab.
+
+    Example:
+        >>> index = LogIndex()
+        >>> recent_errors = index.query(since=datetime.now() - timedelta(hours=1), level_filter="ERROR")
+    """
+
+    def __init__(self, log_files: Optional[List[str]] = None, **file_options: Any):
+        self.files = [LogFileIndex(path, **file_options) for path in (log_files or DEFAULT_LOG_FILES)]
+
+    def query(self, since: Optional[datetime] = None, component_filter: str = "all", level_filter: str = "all",
+              event_type_filter: str = "all", symbol_filter: str = "all",
+              limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Matching entries from every file, newest first.
+
+        Args:
+            since: Oldest timestamp to include (None for all time)
+            component_filter, level_filter, event_type_filter, symbol_filter: Viewer filters ("all" disables)
+            limit: Maximum entries returned
+
+        Returns:
+            List of entry dicts with timestamp, level, component, message and raw
+        """
+        match = make_filter(component_filter, level_filter, event_type_filter, symbol_filter)
+        entries: List[LogEntry] = []
+        for log_file in self.files:
+            try:
+                entries.extend(log_file.query(since, match))
+            except Exception as e:
+                print(f"Error reading log file {log_file.path}: {e}")
+
+        entries.sort(key=lambda entry: entry.timestamp, reverse=True)
+        if limit is not None:
+            entries = entries[:limit]
+        return [entry.to_dict() for entry in entries]
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        return [log_file.get_stats() for log_file in self.files]
+
+
+_log_index: Optional[LogIndex] = None
+_log_index_lock = threading.Lock()
+
+
+def get_log_index() -> LogIndex:
+    """Get the process-wide log index used by the Logs tab"""
+    global _log_index
+    if _log_index is None:
+        with _log_index_lock:
+            if _log_index is None:
+                _log_index = LogIndex()
+    return _log_index
@@ -2,7 +2,7 @@ from dash import html, dcc, Input, Output, State
 import dash_bootstrap_components as dbc
 from pathlib import Path
 import re
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import sys
 
 # Add the project root to Python path if not already added
@@ -11,6 +11,8 @@ if 'src' not in sys.modules:
     sys.path.insert(0, str(project_root))
 
 from src.utils.helpers.date_utils import format_datetime_display
+from src.dashboard.utils.log_index import get_log_index
+from src.utils.log_rollups import summarize_rollups
 
 
 def create_log_viewer():
@@ -214,11 +216,24 @@ def parse_log_line(line):
         }
 
 
+# Time filter values of the viewer's dropdown
+TIME_FILTER_WINDOWS = {
+    "1h": timedelta(hours=1),
+    "6h": timedelta(hours=6),
+    "24h": timedelta(hours=24),
+    "7d": timedelta(days=7)
+}
+
+
 def load_and_filter_logs(component_filter="all", level_filter="all", time_filter="24h",
                         event_type_filter="all", symbol_filter="all"):
     """
     Load and filter logs based on various criteria
 
+    Reads through the shared log index: only bytes appended since the last
+    refresh are parsed, files are read backward from the tail until the time
+    cutoff, and the remaining filters run before entries are materialized.
+
     Args:
         component_filter (str): Component to filter by
         level_filter (str): Log level to filter by
@@ -227,103 +242,59 @@ def load_and_filter_logs(component_filter="all", level_filter="all", time_filter
         symbol_filter (str): Symbol to filter by
 
     Returns:
-        list: Filtered log entries
+        list: Filtered log entries, newest first
     """
     try:
-        # Define log file paths
-        log_files = [
-            "logs/ui_dashboard.log",
-            "logs/ui_api.log",
-            "logs/ui_launcher.log",
-            "logs/ui_utils.log",
-            "logs/yahoo_extraction.log",
-            "logs/mltrading_combined.log"
-        ]
-
-        all_logs = []
-
-        # Load logs from all files
-        for log_file in log_files:
-            try:
-                log_path = Path(log_file)
-                if log_path.exists():
-                    # Try different encodings
-                    encodings = ['utf-8', 'latin-1', 'cp1252']
-                    for encoding in encodings:
-                        try:
-                            with open(log_path, 'r', encoding=encoding) as f:
-                                current_message = ""
-                                for line in f:
-                                    line = line.strip()
-                                    if not line:
-                                        continue
-
-                                    # Check if this line starts with a timestamp (new log entry)
-                                    # Look for the pattern: YYYY-MM-DD HH:MM:SS,mmm - COMPONENT - LEVEL - MESSAGE
-                                    if re.match(r'^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3} - [^-]+ - \w+ -', line):
-                                        # If we have a previous message, save it
-                                        if current_message:
-                                            log_entry = parse_log_line(current_message)
-                                            all_logs.append(log_entry)
-                                        current_message = line
-                                    else:
-                                        # This is a continuation of the previous message
-                                        current_message += "\n" + line
-
-                                # Don't forget the last message
-                                if current_message:
-                                    log_entry = parse_log_line(current_message)
-                                    all_logs.append(log_entry)
-                            break  # If successful, break out of encoding loop
-                        except UnicodeDecodeError:
-                            continue  # Try next encoding
-                    else:
-                        print(f"Could not read {log_file} with any encoding")
-            except Exception as e:
-                print(f"Error reading log file {log_file}: {e}")
-
-        # Sort by timestamp
-        all_logs.sort(key=lambda x: x['timestamp'], reverse=True)
-
-        # Apply time filter
+        since = None
         if time_filter != "all":
-            now = datetime.now()
-            if time_filter == "1h":
-                cutoff = now - timedelta(hours=1)
-            elif time_filter == "6h":
-                cutoff = now - timedelta(hours=6)
-            elif time_filter == "24h":
-                cutoff = now - timedelta(hours=24)
-            elif time_filter == "7d":
-                cutoff = now - timedelta(days=7)
-            else:
-                cutoff = now - timedelta(hours=24)
-
-            all_logs = [log for log in all_logs if log['timestamp'] >= cutoff]
-
-        # Apply component filter
-        if component_filter != "all":
-            all_logs = [log for log in all_logs if component_filter.lower() in log['component'].lower()]
-
-        # Apply level filter
-        if level_filter != "all":
-            all_logs = [log for log in all_logs if log['level'] == level_filter]
-
-        # Apply event type filter
-        if event_type_filter != "all":
-            all_logs = [log for log in all_logs if event_type_filter.lower() in log['message'].lower()]
-
-        # Apply symbol filter
-        if symbol_filter != "all":
-            all_logs = [log for log in all_logs if symbol_filter in log['message']]
-
-        return all_logs
+            since = datetime.now() - TIME_FILTER_WINDOWS.get(time_filter, TIME_FILTER_WINDOWS["24h"])
+
+        return get_log_index().query(
+            since=since,
+            component_filter=component_filter,
+            level_filter=level_filter,
+            event_type_filter=event_type_filter,
+            symbol_filter=symbol_filter
+        )
 
     except Exception as e:
         print(f"Error loading logs: {e}")
         return []
 
 
+def load_log_rollups(component_filter="all", level_filter="all", time_filter="24h"):
+    """
+    Load per-minute log rollups from the database for the analytics panel
+
+    Args:
+        component_filter (str): Component to filter by
+        level_filter (str): Log level to filter by
+        time_filter (str): Time range to filter by
+
+    Returns:
+        list: Rollup rows; empty when the database or the rollup table is unavailable
+    """
+    try:
+        from src.utils.database_log_manager import get_database_log_manager
+
+        start_time = None
+        if time_filter != "all":
+            start_time = datetime.now(timezone.utc) - TIME_FILTER_WINDOWS.get(time_filter, TIME_FILTER_WINDOWS["24h"])
+        rollups = get_database_log_manager().get_log_rollups(
+            start_time=start_time,
+            level=None if level_filter == "all" else level_filter
+        )
+    except Exception as e:
+        print(f"Error loading log rollups: {e}")
+        return []
+
+    if component_filter != "all":
+        # Same matching as the log file filter
+        component = component_filter.lower()
+        rollups = [row for row in rollups if component in (row['component'] or '').lower()]
+    return rollups
+
+
 def format_log_display(logs):
     """
     Format logs for display in the UI
@@ -402,9 +373,45 @@ def get_log_stats(logs):
     return html.Div(stats_html, className="log-stats p-2 bg-light rounded")
 
 
+def generate_rollup_analytics(rollups):
+    """
+    Generate analytics and insights from per-minute log rollups
+
+    Args:
+        rollups (list): Rollup rows from load_log_rollups
+
+    Returns:
+        html.Div: Analytics display
+    """
+    summary = summarize_rollups(rollups)
+    analytics_html = [html.P(f"Total Events: {summary['events']}", className="text-muted")]
+
+    if summary['errors']:
+        analytics_html.append(html.H5("Error Analysis", className="text-danger"))
+        analytics_html.append(html.P(f"Total Errors: {summary['errors']}"))
+        (source, component, operation), count = max(summary['error_sources'].items(), key=lambda x: x[1])
+        label = " / ".join(part for part in (component, operation) if part) or source
+        analytics_html.append(html.P(f"Most Common Error Source: {label} ({count} times)"))
+
+    warnings = summary['levels'].get('WARNING', 0)
+    if warnings:
+        analytics_html.append(html.H5("Warning Analysis", className="text-warning"))
+        analytics_html.append(html.P(f"Total Warnings: {warnings}"))
+
+    if summary['operations']:
+        analytics_html.append(html.H5("Performance Insights", className="text-info"))
+        for op in summary['operations'][:5]:
+            p95 = f"{op['p95_ms']:.0f}ms" if op['p95_ms'] is not None else "n/a"
+            analytics_html.append(html.P(
+                f"{op['operation']}: {op['calls']} calls, avg {op['avg_ms']:.1f}ms, p95 {p95}"))
+
+    return html.Div(analytics_html, className="log-analytics p-2 bg-light rounded mt-2")
+
+
 def generate_log_analytics(logs):
     """
-    Generate analytics and insights from logs
+    Generate analytics and insights from parsed log file entries
+    (fallback when the database rollups are unavailable)
 
     Args:
         logs (list): List of log entries
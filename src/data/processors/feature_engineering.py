@@ -19,13 +19,30 @@ import logging
 # Add project root to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
 
+from src.data.processors.feature_registry import (
+    FEATURE_REGISTRY, LAG_PERIODS, LAGGED_SERIES, LONG_WINDOW, MED_WINDOW, ROLLING_WINDOWS, RSI_WINDOWS,
+    SHORT_WINDOW, VOL_WINDOWS
+)
 from src.data.storage.database import get_db_manager
 from src.utils.logging_config import setup_logger, log_operation
 
+# Feature groups calculated by each phase
+PHASE1_FEATURES = ['foundation', 'time']
+PHASE2_FEATURES = ['moving_averages', 'volatility', 'technical_indicators']
+
 # Configure logging
 logger = setup_logger('mltrading.feature_engineering', 'feature_engineering.log', enable_database_logging=False)
 
 
+def _attach_columns(df: pd.DataFrame, columns: Dict[str, Any]) -> pd.DataFrame:
+    """Add or replace columns in one concat rather than one block insert per column"""
+    features = pd.DataFrame(columns, index=df.index)
+    existing = df.columns.intersection(features.columns)
+    if len(existing) > 0:
+        df = df.drop(columns=existing)
+    return pd.concat([df, features], axis=1)
+
+
 class TradingFeatureEngine:
     """
     ML Trading Feature Engineering System
@@ -68,65 +85,50 @@ class TradingFeatureEngine:
     def __init__(self):
         self.db_manager = get_db_manager()
 
-        # Feature constants from Analysis-v4.ipynb - EXACT MATCH
-        self.SHORT_WINDOW = 24  # 1 day
-        self.MED_WINDOW = 120  # 5 days
-        self.LONG_WINDOW = 480  # 20 days
-        self.VOL_WINDOWS = [12, 24, 120]  # 12h, 1d, 5d
-
-        self.RSI_WINDOWS = {
-            'rsi_1d': 7,  # 1 day (~7 intraday records)
-            'rsi_3d': 21,  # 3 days (~21 intraday records)
-            'rsi_1w': 35,  # 1 week (~35 intraday records, 5 trading days)
-            'rsi_2w': 70  # 2 weeks (~70 intraday records, 10 trading days)
-        }
-
-        self.LAG_PERIODS = [1, 2, 4, 8, 24]  # 1h, 2h, 4h, 8h, 1day
-        self.ROLLING_WINDOWS = [6, 12, 24]  # 6h, 12h, 24h windows
+        # Feature constants from Analysis-v4.ipynb - EXACT MATCH (declared with the features in feature_registry)
+        self.SHORT_WINDOW = SHORT_WINDOW
+        self.MED_WINDOW = MED_WINDOW
+        self.LONG_WINDOW = LONG_WINDOW
+        self.VOL_WINDOWS = list(VOL_WINDOWS)
+        self.RSI_WINDOWS = dict(RSI_WINDOWS)
+        self.LAG_PERIODS = list(LAG_PERIODS)
+        self.ROLLING_WINDOWS = list(ROLLING_WINDOWS)
 
         # Lookback requirement for calculations
         self.MIN_LOOKBACK_HOURS = 600  # 25 days buffer for stable calculations
 
     def clean_sequence_data(self, sequence_data: pd.DataFrame) -> tuple[pd.DataFrame, bool]:
-        """Clean sequence data by handling NaN values with multiple strategies"""
+        """
+        Clean sequence data by forward filling, then backward filling, NaN values
+
+        Only columns with no values at all are left after the fills; they are
+        filled with 0 as a last resort. Null counts are taken once, on the input.
+        """
 
         # Handle empty data
         if sequence_data.empty:
             return sequence_data.copy(), True
 
-        sequence_clean = sequence_data.copy()
-        initial_nans = sequence_clean.isnull().sum().sum()
-
-        if initial_nans > 0:
-            logger.info(f"Cleaning {initial_nans} NaN values from feature data")
-
-        # Strategy 1: Forward fill then backward fill
-        sequence_clean = sequence_clean.ffill().bfill()
-        nans_after_fill = sequence_clean.isnull().sum().sum()
-
-        # Strategy 2: If still NaNs, fill with column means (only for numeric columns)
-        if nans_after_fill > 0:
-            # Only calculate means for numeric columns to avoid date arithmetic issues
-            numeric_columns = sequence_clean.select_dtypes(include=[np.number]).columns
-            column_means = sequence_clean[numeric_columns].mean()
-
-            # Only fill numeric columns that have valid means (avoid NaN means)
-            for col in numeric_columns:
-                if sequence_clean[col].isnull().any() and not pd.isna(column_means[col]):
-                    sequence_clean[col].fillna(column_means[col], inplace=True)
+        null_counts = sequence_data.isna().to_numpy().sum(axis=0)
+        initial_nans = int(null_counts.sum())
+        if initial_nans == 0:
+            return sequence_data.copy(), True
 
-        nans_after_mean = sequence_clean.isnull().sum().sum()
+        logger.info(f"Cleaning {initial_nans} NaN values from feature data")
 
-        # Strategy 3: If still NaNs (shouldn't happen), fill with 0
-        if nans_after_mean > 0:
-            sequence_clean = sequence_clean.fillna(0)
-            logger.warning(f"Applied fallback: {nans_after_mean} NaNs filled with 0 as last resort")
+        # Forward fill then backward fill
+        sequence_clean = sequence_data.ffill().bfill()
 
-        # Final check
-        remaining_nans = sequence_clean.isnull().sum().sum()
+        # Fallback: a column is still NaN after both fills only if it was entirely NaN
+        empty_columns = sequence_data.columns[null_counts == len(sequence_data)]
+        remaining_nans = 0
+        if len(empty_columns) > 0:
+            sequence_clean[empty_columns] = sequence_clean[empty_columns].fillna(0)
+            logger.warning(f"Applied fallback: {len(empty_columns) * len(sequence_data)} NaNs filled with 0 "
+                           f"as last resort")
+            remaining_nans = int(sequence_clean[empty_columns].isna().sum().sum())
 
-        if initial_nans > 0:
-            logger.info(f"NaN cleaning complete: {initial_nans} -> {remaining_nans} remaining")
+        logger.info(f"NaN cleaning complete: {initial_nans} -> {remaining_nans} remaining")
 
         return sequence_clean, remaining_nans == 0
 
@@ -143,7 +145,7 @@ class TradingFeatureEngine:
         """
         with log_operation(f"get_market_data_{symbol}", logger, symbol=symbol):
             try:
-                conn = self.db_manager.get_connection()
+                conn = self.db_manager.get_read_connection()
                 try:
                     if initial_run:
                         # Initial run: Get ALL historical data for complete feature backfill
@@ -185,6 +187,26 @@ class TradingFeatureEngine:
                 logger.error(f"Failed to retrieve market data for {symbol}: {e}")
                 return pd.DataFrame()
 
+    def compute_features(self, df: pd.DataFrame, features=None) -> pd.DataFrame:
+        """
+        Compute registered features and attach them to ``df``.
+
+        Only the nodes needed for ``features`` are run; dependencies already
+        present as columns of ``df`` are reused, and shared intermediates are
+        computed once per call.
+
+        Args:
+            df: DataFrame with OHLCV data and timestamp
+            features: Feature group, node or column names (None for all stored features)
+
+        Returns:
+            DataFrame with the computed feature columns added or replaced
+        """
+        columns = FEATURE_REGISTRY.compute(df, features, logger=logger)
+        if not columns:
+            return df
+        return _attach_columns(df, columns)
+
     def calculate_basic_price_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Calculate fundamental price-based features for ML models.
@@ -224,17 +246,7 @@ class TradingFeatureEngine:
             return df
 
         logger.info("Calculating basic price features (6 features)")
-
-        # Basic price features - EXACT match to notebook add_basic_price_features()
-        df['returns'] = df['close'].pct_change()
-        df['log_returns'] = np.log(df['close'] / df['close'].shift(1))
-        df['high_low_pct'] = (df['high'] - df['low']) / df['close']
-        df['open_close_pct'] = (df['close'] - df['open']) / df['open']
-
-        # Price momentum features - EXACT match to notebook
-        df['price_acceleration'] = df['returns'].diff()  # Second derivative of price
-        df['returns_sign'] = np.sign(df['returns'])  # Direction indicator
-
+        df = self.compute_features(df, 'foundation')
         logger.info("Completed basic price features calculation")
         return df
 
@@ -253,26 +265,7 @@ class TradingFeatureEngine:
             return df
 
         logger.info("Calculating time features (7 features)")
-
-        # Time features - EXACT match to notebook add_time_features()
-        # Basic time features
-        df['hour'] = df['timestamp'].dt.hour
-        df['day_of_week'] = df['timestamp'].dt.dayofweek
-        df['date'] = df['timestamp'].dt.date
-
-        # Cyclical encoding for time features (better for neural networks)
-        df['hour_sin'] = np.sin(2 * np.pi * df['hour'] / 24)
-        df['hour_cos'] = np.cos(2 * np.pi * df['hour'] / 24)
-        df['dow_sin'] = np.sin(2 * np.pi * df['day_of_week'] / 7)
-        df['dow_cos'] = np.cos(2 * np.pi * df['day_of_week'] / 7)
-
-        # Market session features - EXACT match to notebook
-        df['is_market_open'] = ((df['hour'] >= 9) & (df['hour'] <= 16)).astype(int)
-        df['is_morning'] = ((df['hour'] >= 9) & (df['hour'] <= 12)).astype(int)
-        df['is_afternoon'] = ((df['hour'] >= 13) & (df['hour'] <= 16)).astype(int)
-        df['hours_since_open'] = np.clip(df['hour'] - 9, 0, 7)
-        df['hours_to_close'] = np.clip(16 - df['hour'], 0, 7)
-
+        df = self.compute_features(df, 'time')
         logger.info("Completed time features calculation")
         return df
 
@@ -294,22 +287,7 @@ class TradingFeatureEngine:
             logger.warning(f"Limited data for moving averages: {len(df)} records, optimal: {self.LONG_WINDOW}")
 
         logger.info("Calculating moving average features (8 features)")
-
-        # Moving averages - EXACT match to notebook add_moving_average_features()
-        # Use min_periods=1 to allow calculation even with limited data
-        df['price_ma_short'] = df['close'].rolling(self.SHORT_WINDOW, min_periods=1).mean()
-        df['price_ma_med'] = df['close'].rolling(self.MED_WINDOW, min_periods=1).mean()
-        df['price_ma_long'] = df['close'].rolling(self.LONG_WINDOW, min_periods=1).mean()
-
-        # Price to moving average ratios - EXACT match to notebook
-        df['price_to_ma_short'] = df['close'] / df['price_ma_short']
-        df['price_to_ma_med'] = df['close'] / df['price_ma_med']
-        df['price_to_ma_long'] = df['close'] / df['price_ma_long']
-
-        # Moving average convergence/divergence ratios - EXACT match to notebook
-        df['ma_short_to_med'] = df['price_ma_short'] / df['price_ma_med']
-        df['ma_med_to_long'] = df['price_ma_med'] / df['price_ma_long']
-
+        df = self.compute_features(df, 'moving_averages')
         logger.info("Completed moving average features calculation")
         return df
 
@@ -328,28 +306,7 @@ class TradingFeatureEngine:
             return df
 
         logger.info("Calculating volatility features (8 features)")
-
-        # Basic volatility features - EXACT match to notebook
-        df['returns_squared'] = df['returns'] ** 2
-
-        # Realized volatility for different windows - EXACT match to notebook
-        df['realized_vol_short'] = df['returns'].rolling(12).std() * np.sqrt(24)  # 12h window
-        df['realized_vol_med'] = df['returns'].rolling(24).std() * np.sqrt(24)    # 24h window
-        df['realized_vol_long'] = df['returns'].rolling(120).std() * np.sqrt(24)  # 120h window
-
-        # Volatility ratios
-        df['vol_ratio_short_med'] = df['realized_vol_short'] / (df['realized_vol_med'] + 1e-10)
-        df['vol_ratio_med_long'] = df['realized_vol_med'] / (df['realized_vol_long'] + 1e-10)
-
-        # Garman-Klass volatility - EXACT match to notebook
-        ln_hl = np.log(df['high'] / df['low'])
-        ln_co = np.log(df['close'] / df['open'])
-        gk_vol = 0.5 * ln_hl**2 - (2*np.log(2) - 1) * ln_co**2
-        df['gk_volatility'] = np.sqrt(gk_vol.rolling(24).mean() * 24)
-
-        # Volatility of volatility - EXACT match to notebook
-        df['vol_of_vol'] = df['realized_vol_med'].rolling(24).std()
-
+        df = self.compute_features(df, 'volatility')
         logger.info("Completed volatility features calculation")
         return df
 
@@ -368,43 +325,7 @@ class TradingFeatureEngine:
             return df
 
         logger.info("Calculating technical indicators (10 features)")
-
-        # Bollinger Bands - exact match to notebook (20-period, 2 std dev)
-        bb_window = 20
-        bb_std_multiplier = 2
-
-        bb_mean = df['close'].rolling(window=bb_window, min_periods=1).mean()
-        bb_std = df['close'].rolling(window=bb_window, min_periods=1).std()
-
-        df['bb_upper'] = bb_mean + (bb_std_multiplier * bb_std)
-        df['bb_lower'] = bb_mean - (bb_std_multiplier * bb_std)
-        df['bb_position'] = (df['close'] - df['bb_lower']) / (df['bb_upper'] - df['bb_lower'])
-        df['bb_squeeze'] = (df['bb_upper'] - df['bb_lower']) / bb_mean
-
-        # MACD - exact match to notebook (12, 26, 9)
-        ema_fast = df['close'].ewm(span=12, min_periods=1).mean()
-        ema_slow = df['close'].ewm(span=26, min_periods=1).mean()
-
-        df['macd'] = ema_fast - ema_slow
-        df['macd_signal'] = df['macd'].ewm(span=9, min_periods=1).mean()
-        df['macd_histogram'] = df['macd'] - df['macd_signal']
-        df['macd_normalized'] = df['macd'] / df['close']
-
-        # ATR - Average True Range (14-period) - exact match to notebook
-        high_low = df['high'] - df['low']
-        high_close_prev = abs(df['high'] - df['close'].shift(1))
-        low_close_prev = abs(df['low'] - df['close'].shift(1))
-
-        true_range = pd.concat([high_low, high_close_prev, low_close_prev], axis=1).max(axis=1)
-        df['atr'] = true_range.rolling(window=14, min_periods=1).mean()
-        df['atr_normalized'] = df['atr'] / df['close']
-
-        # Williams %R - exact match to notebook (14-period)
-        williams_window = 14
-        highest_high = df['high'].rolling(window=williams_window, min_periods=1).max()
-        lowest_low = df['low'].rolling(window=williams_window, min_periods=1).min()
-        df['williams_r'] = -100 * (highest_high - df['close']) / (highest_high - lowest_low)
-
+        df = self.compute_features(df, 'technical_indicators')
         logger.info("Completed technical indicators calculation")
         return df
 
@@ -423,27 +344,7 @@ class TradingFeatureEngine:
             return df
 
         logger.info("Calculating volume features")
-
-        # Basic volume features
-        df['volume_ma'] = df['volume'].rolling(self.MED_WINDOW).mean()
-        df['volume_ratio'] = df['volume'] / df['volume_ma']
-        df['log_volume'] = np.log(df['volume'] + 1)
-
-        # Volume-Price Trend (VPT) indicator
-        df['vpt'] = (df['volume'] * df['returns']).cumsum()
-        df['vpt_ma'] = df['vpt'].rolling(self.SHORT_WINDOW).mean()
-        df['vpt_normalized'] = df['vpt'] / df['vpt_ma']
-
-        # Money Flow Index components
-        typical_price = (df['high'] + df['low'] + df['close']) / 3
-        money_flow = typical_price * df['volume']
-        positive_flow = money_flow.where(typical_price > typical_price.shift(1), 0)
-        negative_flow = money_flow.where(typical_price < typical_price.shift(1), 0)
-
-        money_ratio = (positive_flow.rolling(14).sum() /
-                      (negative_flow.rolling(14).sum() + 1e-10))
-        df['mfi'] = 100 - (100 / (1 + money_ratio))
-
+        df = self.compute_features(df, 'volume_indicators')
         logger.info("Completed volume features calculation")
         return df
 
@@ -462,26 +363,8 @@ class TradingFeatureEngine:
             return df
 
         logger.info("Calculating RSI features")
-
-        # Multiple RSI timeframes
-        for rsi_name, window in self.RSI_WINDOWS.items():
-            delta = df['close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window).mean()
-            rs = gain / (loss + 1e-10)
-            df[rsi_name] = 100 - (100 / (1 + rs))
-
-        # Exponential Moving Average RSI
-        delta = df['close'].diff()
-        gain = delta.where(delta > 0, 0)
-        loss = -delta.where(delta < 0, 0)
-
-        alpha = 2 / (14 + 1)
-        avg_gain = gain.ewm(alpha=alpha, adjust=False).mean()
-        avg_loss = loss.ewm(alpha=alpha, adjust=False).mean()
-        rs_ema = avg_gain / (avg_loss + 1e-10)
-        df['rsi_ema'] = 100 - (100 / (1 + rs_ema))
-
+        # Every RSI window shares one close-to-close delta and gain/loss split
+        df = self.compute_features(df, 'rsi_family')
         logger.info("Completed RSI features calculation")
         return df
 
@@ -501,43 +384,12 @@ class TradingFeatureEngine:
 
         logger.info("Calculating intraday features")
 
-        try:
-            # Ensure date column exists
-            if 'date' not in df.columns:
-                df['date'] = df['timestamp'].dt.date
-
-            daily_opens = df.groupby('date')['open'].transform('first')
-            df['returns_from_daily_open'] = ((df['close'] - daily_opens) /
-                                           daily_opens).fillna(0)
-
-            df['intraday_high'] = df.groupby('date')['high'].transform('max')
-            df['intraday_low'] = df.groupby('date')['low'].transform('min')
-
-            intraday_range = df['intraday_high'] - df['intraday_low']
-            df['intraday_range_pct'] = (intraday_range / daily_opens).fillna(0)
-
-            range_denominator = intraday_range.replace(0, np.nan)
-            df['position_in_range'] = ((df['close'] - df['intraday_low']) /
-                                     range_denominator).fillna(0.5)
-
-            prev_day_close = (df.groupby('date')['close']
-                             .transform('last')
-                             .shift(df.groupby('date').cumcount().max() + 1))
-            df['overnight_gap'] = ((daily_opens - prev_day_close) /
-                                prev_day_close).fillna(0)
-
-            df['dist_from_intraday_high'] = ((df['close'] - df['intraday_high']) /
-                                           df['intraday_high']).fillna(0)
-            df['dist_from_intraday_low'] = ((df['close'] - df['intraday_low']) /
-                                          df['intraday_low']).fillna(0)
-
-        except Exception as e:
-            symbol = df['symbol'].iloc[0] if 'symbol' in df.columns and not df.empty else 'unknown'
-            logger.warning(f"Error in intraday features for {symbol}: {e}")
-            # Create dummy features if calculation fails
-            for col in ['returns_from_daily_open', 'intraday_range_pct', 'position_in_range',
-                       'overnight_gap', 'dist_from_intraday_high', 'dist_from_intraday_low']:
-                df[col] = 0 if 'gap' in col or 'range' in col or 'dist' in col else 0.5
+        # Falls back to constant features if the calculation fails
+        features = FEATURE_REGISTRY.compute(df, 'intraday', logger=logger)
+        # Ensure date column exists
+        if 'date' not in df.columns:
+            features = {'date': df['timestamp'].dt.date, **features}
+        df = _attach_columns(df, features)
 
         logger.info("Completed intraday features calculation")
         return df
@@ -558,14 +410,10 @@ class TradingFeatureEngine:
 
         logger.info("Calculating lagged features")
 
-        # Enhanced lagged features
-        for lag in self.LAG_PERIODS:
-            if 'returns' in df.columns:
-                df[f'returns_lag_{lag}'] = df['returns'].shift(lag)
-            if 'realized_vol_short' in df.columns:
-                df[f'vol_lag_{lag}'] = df['realized_vol_short'].shift(lag)
-            if 'volume_ratio' in df.columns:
-                df[f'volume_ratio_lag_{lag}'] = df['volume_ratio'].shift(lag)
+        # Lag only the series that have already been calculated
+        lag_nodes = [f'{prefix}_lags' for prefix, source in LAGGED_SERIES.items() if source in df.columns]
+        if lag_nodes:
+            df = self.compute_features(df, lag_nodes)
 
         logger.info("Completed lagged features calculation")
         return df
@@ -585,17 +433,7 @@ class TradingFeatureEngine:
             return df
 
         logger.info("Calculating rolling statistics")
-
-        # Rolling statistics for different windows
-        for window in self.ROLLING_WINDOWS:
-            df[f'returns_mean_{window}h'] = df['returns'].rolling(window).mean()
-            df[f'returns_std_{window}h'] = df['returns'].rolling(window).std()
-            df[f'returns_skew_{window}h'] = df['returns'].rolling(window).skew()
-            df[f'returns_kurt_{window}h'] = df['returns'].rolling(window).kurt()
-
-            # Price momentum over different windows
-            df[f'price_momentum_{window}h'] = (df['close'] / df['close'].shift(window) - 1)
-
+        df = self.compute_features(df, 'rolling_statistics')
         logger.info("Completed rolling statistics calculation")
         return df
 
@@ -663,8 +501,7 @@ class TradingFeatureEngine:
             df_features = df.copy()
 
             # Calculate Phase 1 features
-            df_features = self.calculate_basic_price_features(df_features)
-            df_features = self.calculate_time_features(df_features)
+            df_features = self.compute_features(df_features, PHASE1_FEATURES)
 
             # Add metadata
             df_features['source'] = 'yahoo'
@@ -712,14 +549,8 @@ class TradingFeatureEngine:
             # Make a copy to avoid modifying original
             df_features = df.copy()
 
-            # Calculate Phase 1 features (foundation)
-            df_features = self.calculate_basic_price_features(df_features)
-            df_features = self.calculate_time_features(df_features)
-
-            # Calculate Phase 2 features (core technical)
-            df_features = self.calculate_moving_average_features(df_features)
-            df_features = self.calculate_volatility_features(df_features)
-            df_features = self.calculate_technical_indicators(df_features)
+            # Calculate Phase 1 (foundation) and Phase 2 (core technical) features in one plan
+            df_features = self.compute_features(df_features, PHASE1_FEATURES + PHASE2_FEATURES)
 
             # Clean NaN values using multi-strategy approach
             logger.info("Applying comprehensive NaN cleaning to calculated features")
@@ -775,21 +606,8 @@ class TradingFeatureEngine:
             # Make a copy to avoid modifying original
             df_features = df.copy()
 
-            # Phase 1 features (foundation)
-            df_features = self.calculate_basic_price_features(df_features)
-            df_features = self.calculate_time_features(df_features)
-
-            # Phase 2 features (core technical)
-            df_features = self.calculate_moving_average_features(df_features)
-            df_features = self.calculate_volatility_features(df_features)
-            df_features = self.calculate_technical_indicators(df_features)
-
-            # Phase 3 features (advanced)
-            df_features = self.calculate_volume_features(df_features)
-            df_features = self.calculate_rsi_features(df_features)
-            df_features = self.calculate_intraday_features(df_features)
-            df_features = self.calculate_lagged_features(df_features)
-            df_features = self.calculate_rolling_statistics(df_features)
+            # Phase 1+2+3 features: every registered feature in one dependency-ordered plan
+            df_features = self.compute_features(df_features)
 
             # Clean NaN values using multi-strategy approach
             logger.info("Applying comprehensive NaN cleaning to calculated features")
@@ -825,65 +643,8 @@ class TradingFeatureEngine:
         if df.empty:
             return []
 
-        # Comprehensive Phase 1+2+3 feature columns for database storage (~90+ features total)
-        feature_columns = [
-            # Base data
-            'symbol', 'timestamp', 'open', 'high', 'low', 'close', 'volume',
-
-            # Phase 1 features (13) - Foundation
-            'returns', 'log_returns', 'high_low_pct', 'open_close_pct',
-            'price_acceleration', 'returns_sign',
-            'hour', 'day_of_week', 'date', 'hour_sin', 'hour_cos', 'dow_sin', 'dow_cos',
-            'is_market_open',
-
-            # Phase 2 features (24) - Core Technical
-            # Moving averages (8)
-            'price_ma_short', 'price_ma_med', 'price_ma_long',
-            'price_to_ma_short', 'price_to_ma_med', 'price_to_ma_long',
-            'ma_short_to_med', 'ma_med_to_long',
-
-            # Volatility features (5)
-            'realized_vol_short', 'realized_vol_med', 'realized_vol_long',
-            'gk_volatility', 'vol_of_vol',
-
-            # Technical indicators (10)
-            'bb_upper', 'bb_lower', 'bb_position', 'bb_squeeze',
-            'macd', 'macd_signal', 'macd_histogram', 'macd_normalized',
-            'atr', 'atr_normalized', 'williams_r',
-
-            # Phase 3 features - Advanced Features
-            # Volume features (7)
-            'volume_ma', 'volume_ratio', 'log_volume', 'vpt', 'vpt_ma', 'vpt_normalized', 'mfi',
-
-            # RSI features (5)
-            'rsi_1d', 'rsi_3d', 'rsi_1w', 'rsi_2w', 'rsi_ema',
-
-            # Extended time features from Phase 1
-            'is_morning', 'is_afternoon', 'hours_since_open', 'hours_to_close',
-
-            # Intraday features (6)
-            'returns_from_daily_open', 'intraday_high', 'intraday_low',
-            'intraday_range_pct', 'position_in_range', 'overnight_gap',
-            'dist_from_intraday_high', 'dist_from_intraday_low',
-
-            # Lagged features (15)
-            'returns_lag_1', 'vol_lag_1', 'volume_ratio_lag_1',
-            'returns_lag_2', 'vol_lag_2', 'volume_ratio_lag_2',
-            'returns_lag_4', 'vol_lag_4', 'volume_ratio_lag_4',
-            'returns_lag_8', 'vol_lag_8', 'volume_ratio_lag_8',
-            'returns_lag_24', 'vol_lag_24', 'volume_ratio_lag_24',
-
-            # Rolling statistics (15)
-            'returns_mean_6h', 'returns_std_6h', 'returns_skew_6h', 'returns_kurt_6h', 'price_momentum_6h',
-            'returns_mean_12h', 'returns_std_12h', 'returns_skew_12h', 'returns_kurt_12h', 'price_momentum_12h',
-            'returns_mean_24h', 'returns_std_24h', 'returns_skew_24h', 'returns_kurt_24h', 'price_momentum_24h',
-
-            # Missing columns that exist in database schema
-            'returns_squared', 'vol_ratio_short_med', 'vol_ratio_med_long',
-
-            # Metadata
-            'source', 'feature_version', 'created_at', 'updated_at'
-        ]
+        # Base data, every persisted registry feature and metadata
+        feature_columns = FEATURE_REGISTRY.storage_columns()
 
         records = []
         for _, row in df.iterrows():
@@ -927,7 +688,7 @@ class TradingFeatureEngine:
                     logger.warning(f"No valid records to store for {symbol}")
                     return False
 
-                with self.db_manager.get_connection() as conn:
+                with self.db_manager.get_connection_context() as conn:
                     with conn.cursor() as cursor:
                         # Dynamic INSERT statement based on available columns
                         sample_record = records[0]
@@ -0,0 +1,581 @@
+"""
+Declarative feature registry for the feature engine.
+
+Every feature group declares the columns it reads, the columns it writes,
+how many bars of history it needs and whether its outputs are persisted.
+The registry resolves requested columns or groups into a dependency-ordered
+plan, so only what is needed is computed and shared intermediates (such as
+the close-to-close delta behind every RSI window) are computed once. The
+same declarations drive the feature_engineered_data column list and the
+dashboard column sets.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .rolling_kernels import rolling_moments, rolling_std
+
+# Feature constants from Analysis-v4.ipynb
+SHORT_WINDOW = 24  # 1 day
+MED_WINDOW = 120  # 5 days
+LONG_WINDOW = 480  # 20 days
+VOL_WINDOWS = [12, 24, 120]  # 12h, 1d, 5d
+RSI_WINDOWS = {
+    'rsi_1d': 7,  # 1 day (~7 intraday records)
+    'rsi_3d': 21,  # 3 days (~21 intraday records)
+    'rsi_1w': 35,  # 1 week (~35 intraday records, 5 trading days)
+    'rsi_2w': 70  # 2 weeks (~70 intraday records, 10 trading days)
+}
+LAG_PERIODS = [1, 2, 4, 8, 24]  # 1h, 2h, 4h, 8h, 1day
+ROLLING_WINDOWS = [6, 12, 24]  # 6h, 12h, 24h windows
+
+# Columns read from market_data rather than computed
+BASE_COLUMNS = ['symbol', 'timestamp', 'open', 'high', 'low', 'close', 'volume']
+STORAGE_METADATA_COLUMNS = ['source', 'feature_version', 'created_at', 'updated_at']
+
+FeatureSpec = Union[None, str, Iterable[str]]
+
+
+@dataclass(frozen=True)
+class FeatureDefinition:
+    """
+    One node of the feature graph.
+
+    Attributes:
+        name: Unique node name
+        outputs: Columns written by ``compute``
+        inputs: Base columns or outputs of other nodes that ``compute`` reads
+        compute: Function of a FeatureContext returning {column: values}
+        group: Feature set the outputs belong to (None for intermediates)
+        lookback: Bars of history needed on top of the inputs' own lookback
+        min_rows: Skip the node (with a warning) on frames shorter than this
+        persist: Whether outputs are stored in feature_engineered_data
+        fallback: Constant values used instead of raising when ``compute`` fails
+    """
+    name: str
+    outputs: Tuple[str, ...]
+    inputs: Tuple[str, ...]
+    compute: Callable[['FeatureContext'], Dict[str, Any]]
+    group: Optional[str] = None
+    lookback: int = 0
+    min_rows: int = 0
+    persist: bool = True
+    fallback: Optional[Dict[str, float]] = None
+    description: str = ''
+
+
+@dataclass
+class FeatureContext:
+    """Column lookup over the input frame plus everything computed so far in the plan"""
+    frame: pd.DataFrame
+    computed: Dict[str, pd.Series] = field(default_factory=dict)
+
+    def __getitem__(self, column: str) -> pd.Series:
+        if column in self.computed:
+            return self.computed[column]
+        return self.frame[column]
+
+    def __contains__(self, column: str) -> bool:
+        return column in self.computed or column in self.frame.columns
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    @property
+    def index(self) -> pd.Index:
+        return self.frame.index
+
+
+class FeatureRegistry:
+    """
+    Feature definitions and the dependency resolution between them.
+
+    Example:
+        >>> plan = FEATURE_REGISTRY.resolve(['rsi_1d', 'rsi_ema'])
+        >>> [node.name for node in plan]
+        ['price_delta', 'delta_gain_loss', 'rsi_windows', 'rsi_ema']
+        >>> features = FEATURE_REGISTRY.compute(df, 'rsi_family')
+    """
+
+    def __init__(self):
+        self._nodes: Dict[str, FeatureDefinition] = {}
+        self._producers: Dict[str, FeatureDefinition] = {}
+
+    def register(self, definition: FeatureDefinition) -> FeatureDefinition:
+        if definition.name in self._nodes:
+            raise ValueError(f"Feature {definition.name} is already registered")
+        for column in definition.outputs:
+            if column in self._producers:
+                raise ValueError(f"Column {column} is already produced by {self._producers[column].name}")
+        self._nodes[definition.name] = definition
+        for column in definition.outputs:
+            self._producers[column] = definition
+        return definition
+
+    def feature(self, outputs: Iterable[str], inputs: Iterable[str], name: Optional[str] = None, **options):
+        """Decorator registering ``compute`` functions as feature definitions."""
+        def decorator(compute):
+            self.register(FeatureDefinition(name=name or compute.__name__, outputs=tuple(outputs),
+                                            inputs=tuple(inputs), compute=compute, **options))
+            return compute
+        return decorator
+
+    @property
+    def nodes(self) -> List[FeatureDefinition]:
+        return list(self._nodes.values())
+
+    def producer(self, column: str) -> Optional[FeatureDefinition]:
+        return self._producers.get(column)
+
+    def _targets(self, spec: FeatureSpec) -> List[FeatureDefinition]:
+        if spec is None:
+            return [node for node in self._nodes.values() if node.persist]
+        if isinstance(spec, str):
+            spec = [spec]
+        targets = []
+        for name in spec:
+            if name in self._nodes:
+                targets.append(self._nodes[name])
+            elif name in self._producers:
+                targets.append(self._producers[name])
+            else:
+                group = [node for node in self._nodes.values() if node.group == name]
+                if not group and name not in BASE_COLUMNS:
+                    raise KeyError(f"Unknown feature, column or group: {name}")
+                targets.extend(group)
+        return targets
+
+    def resolve(self, spec: FeatureSpec = None, available: Iterable[str] = ()) -> List[FeatureDefinition]:
+        """
+        Nodes needed for ``spec`` in dependency order.
+
+        Args:
+            spec: None (every persisted feature), or node, column and group names
+            available: Columns already computed; dependencies producing only these are not rerun
+
+        Returns:
+            Each required node once, after every node it reads from
+        """
+        available = set(available)
+        plan: List[FeatureDefinition] = []
+        done = set()
+        visiting = set()
+
+        def visit(node: FeatureDefinition):
+            if node.name in done:
+                return
+            if node.name in visiting:
+                raise ValueError(f"Feature dependency cycle through {node.name}")
+            visiting.add(node.name)
+            for column in node.inputs:
+                dependency = self._producers.get(column)
+                if dependency is not None and column not in available:
+                    visit(dependency)
+            visiting.discard(node.name)
+            done.add(node.name)
+            plan.append(node)
+
+        for target in self._targets(spec):
+            visit(target)
+        return plan
+
+    def lookback(self, spec: FeatureSpec = None) -> int:
+        """Bars of history needed before the first stable value of every feature in ``spec``."""
+        needed: Dict[str, int] = {}
+        for node in self.resolve(spec):
+            upstream = [needed[self._producers[col].name] for col in node.inputs if col in self._producers]
+            needed[node.name] = node.lookback + max(upstream, default=0)
+        return max(needed.values(), default=0)
+
+    def columns(self, spec: FeatureSpec = None, persisted_only: bool = True) -> List[str]:
+        """Output columns of the nodes named by ``spec`` (not their dependencies), in registry order."""
+        wanted = {node.name for node in self._targets(spec)}
+        return [column for node in self._nodes.values() if node.name in wanted
+                and (node.persist or not persisted_only) for column in node.outputs]
+
+    def feature_sets(self) -> Dict[str, List[str]]:
+        """Persisted output columns per group."""
+        sets: Dict[str, List[str]] = {}
+        for node in self._nodes.values():
+            if node.group and node.persist:
+                sets.setdefault(node.group, []).extend(node.outputs)
+        return sets
+
+    def storage_columns(self) -> List[str]:
+        """Columns written to feature_engineered_data: base data, persisted features, metadata."""
+        return BASE_COLUMNS + self.columns(None) + STORAGE_METADATA_COLUMNS
+
+    def compute(self, df: pd.DataFrame, spec: FeatureSpec = None, logger=None) -> Dict[str, pd.Series]:
+        """
+        Compute the persisted outputs of ``spec`` and everything they depend on.
+
+        Dependencies already present as columns of ``df`` are reused. Nodes
+        whose ``min_rows`` is not met, or whose inputs are missing, are
+        skipped together with the nodes that read from them.
+
+        Returns:
+            {column: Series} for every persisted output of the plan, in plan order
+        """
+        context = FeatureContext(df)
+        skipped = set()
+        outputs: Dict[str, pd.Series] = {}
+        for node in self.resolve(spec, available=df.columns):
+            missing = [col for col in node.inputs if col in skipped or col not in context]
+            if missing or len(df) < node.min_rows:
+                if logger is not None:
+                    reason = f"missing inputs {missing}" if missing else f"{len(df)} records < {node.min_rows}"
+                    logger.warning(f"Skipping {node.name} features: {reason}")
+                skipped.update(node.outputs)
+                continue
+            try:
+                values_by_column = node.compute(context)
+            except Exception as e:
+                if node.fallback is None:
+                    raise
+                if logger is not None:
+                    logger.warning(f"Error in {node.name} features, using fallback values: {e}")
+                values_by_column = dict(node.fallback)
+                skipped.update(set(node.outputs) - set(node.fallback))
+            for column, values in values_by_column.items():
+                series = values if isinstance(values, pd.Series) else pd.Series(values, index=df.index)
+                context.computed[column] = series
+                if node.persist:
+                    outputs[column] = series
+        return outputs
+
+
+FEATURE_REGISTRY = FeatureRegistry()
+feature = FEATURE_REGISTRY.feature
+
+
+# Phase 1: foundation features
+
+@feature(['returns', 'log_returns', 'high_low_pct', 'open_close_pct', 'price_acceleration', 'returns_sign'],
+         inputs=['open', 'high', 'low', 'close'], group='foundation', lookback=2, min_rows=2)
+def foundation(ctx):
+    close = ctx['close']
+    returns = close.pct_change()
+    return {
+        'returns': returns,
+        'log_returns': np.log(close / close.shift(1)),
+        'high_low_pct': (ctx['high'] - ctx['low']) / close,
+        'open_close_pct': (close - ctx['open']) / ctx['open'],
+        'price_acceleration': returns.diff(),  # Second derivative of price
+        'returns_sign': np.sign(returns),  # Direction indicator
+    }
+
+
+@feature(['hour', 'day_of_week', 'date', 'hour_sin', 'hour_cos', 'dow_sin', 'dow_cos', 'is_market_open',
+          'is_morning', 'is_afternoon', 'hours_since_open', 'hours_to_close'],
+         inputs=['timestamp'], group='time')
+def time_features(ctx):
+    timestamps = ctx['timestamp'].dt
+    hour = timestamps.hour
+    day_of_week = timestamps.dayofweek
+    return {
+        'hour': hour,
+        'day_of_week': day_of_week,
+        'date': timestamps.date,
+        # Cyclical encoding for time features (better for neural networks)
+        'hour_sin': np.sin(2 * np.pi * hour / 24),
+        'hour_cos': np.cos(2 * np.pi * hour / 24),
+        'dow_sin': np.sin(2 * np.pi * day_of_week / 7),
+        'dow_cos': np.cos(2 * np.pi * day_of_week / 7),
+        # Market session features
+        'is_market_open': ((hour >= 9) & (hour <= 16)).astype(int),
+        'is_morning': ((hour >= 9) & (hour <= 12)).astype(int),
+        'is_afternoon': ((hour >= 13) & (hour <= 16)).astype(int),
+        'hours_since_open': np.clip(hour - 9, 0, 7),
+        'hours_to_close': np.clip(16 - hour, 0, 7),
+    }
+
+
+# Phase 2: core technical features
+
+@feature(['price_ma_short', 'price_ma_med', 'price_ma_long', 'price_to_ma_short', 'price_to_ma_med',
+          'price_to_ma_long', 'ma_short_to_med', 'ma_med_to_long'],
+         inputs=['close'], group='moving_averages', lookback=LONG_WINDOW)
+def moving_averages(ctx):
+    close = ctx['close']
+    # min_periods=1 allows calculation even with limited data
+    ma_short = close.rolling(SHORT_WINDOW, min_periods=1).mean()
+    ma_med = close.rolling(MED_WINDOW, min_periods=1).mean()
+    ma_long = close.rolling(LONG_WINDOW, min_periods=1).mean()
+    return {
+        'price_ma_short': ma_short,
+        'price_ma_med': ma_med,
+        'price_ma_long': ma_long,
+        'price_to_ma_short': close / ma_short,
+        'price_to_ma_med': close / ma_med,
+        'price_to_ma_long': close / ma_long,
+        'ma_short_to_med': ma_short / ma_med,
+        'ma_med_to_long': ma_med / ma_long,
+    }
+
+
+@feature(['returns_squared', 'realized_vol_short', 'realized_vol_med', 'realized_vol_long',
+          'vol_ratio_short_med', 'vol_ratio_med_long'],
+         inputs=['returns'], group='volatility', lookback=max(VOL_WINDOWS))
+def realized_volatility(ctx):
+    returns = ctx['returns']
+    values = returns.to_numpy(dtype=np.float64)
+    vol_short = rolling_std(values, 12) * np.sqrt(24)  # 12h window
+    vol_med = rolling_std(values, 24) * np.sqrt(24)  # 24h window
+    vol_long = rolling_std(values, 120) * np.sqrt(24)  # 120h window
+    return {
+        'returns_squared': returns ** 2,
+        'realized_vol_short': vol_short,
+        'realized_vol_med': vol_med,
+        'realized_vol_long': vol_long,
+        'vol_ratio_short_med': vol_short / (vol_med + 1e-10),
+        'vol_ratio_med_long': vol_med / (vol_long + 1e-10),
+    }
+
+
+@feature(['gk_volatility'], inputs=['open', 'high', 'low', 'close'], group='volatility', lookback=24)
+def garman_klass_volatility(ctx):
+    ln_hl = np.log(ctx['high'] / ctx['low'])
+    ln_co = np.log(ctx['close'] / ctx['open'])
+    gk_vol = 0.5 * ln_hl**2 - (2*np.log(2) - 1) * ln_co**2
+    return {'gk_volatility': np.sqrt(gk_vol.rolling(24).mean() * 24)}
+
+
+@feature(['vol_of_vol'], inputs=['realized_vol_med'], group='volatility', lookback=24)
+def vol_of_vol(ctx):
+    return {'vol_of_vol': rolling_std(ctx['realized_vol_med'], 24)}
+
+
+@feature(['bb_upper', 'bb_lower', 'bb_position', 'bb_squeeze'], inputs=['close'],
+         group='technical_indicators', lookback=20, min_rows=50)
+def bollinger_bands(ctx):
+    # 20-period, 2 std dev
+    close = ctx['close']
+    bb_mean = close.rolling(window=20, min_periods=1).mean()
+    bb_std = close.rolling(window=20, min_periods=1).std()
+    upper = bb_mean + (2 * bb_std)
+    lower = bb_mean - (2 * bb_std)
+    return {
+        'bb_upper': upper,
+        'bb_lower': lower,
+        'bb_position': (close - lower) / (upper - lower),
+        'bb_squeeze': (upper - lower) / bb_mean,
+    }
+
+
+@feature(['macd', 'macd_signal', 'macd_histogram', 'macd_normalized'], inputs=['close'],
+         group='technical_indicators', lookback=35, min_rows=50)
+def macd(ctx):
+    # 12, 26, 9
+    close = ctx['close']
+    macd_line = close.ewm(span=12, min_periods=1).mean() - close.ewm(span=26, min_periods=1).mean()
+    signal = macd_line.ewm(span=9, min_periods=1).mean()
+    return {
+        'macd': macd_line,
+        'macd_signal': signal,
+        'macd_histogram': macd_line - signal,
+        'macd_normalized': macd_line / close,
+    }
+
+
+@feature(['atr', 'atr_normalized'], inputs=['high', 'low', 'close'], group='technical_indicators',
+         lookback=15, min_rows=50)
+def average_true_range(ctx):
+    # 14-period
+    high, low, close = ctx['high'], ctx['low'], ctx['close']
+    high_low = high - low
+    high_close_prev = abs(high - close.shift(1))
+    low_close_prev = abs(low - close.shift(1))
+    true_range = pd.concat([high_low, high_close_prev, low_close_prev], axis=1).max(axis=1)
+    atr = true_range.rolling(window=14, min_periods=1).mean()
+    return {'atr': atr, 'atr_normalized': atr / close}
+
+
+@feature(['williams_r'], inputs=['high', 'low', 'close'], group='technical_indicators', lookback=14, min_rows=50)
+def williams_r(ctx):
+    # 14-period
+    highest_high = ctx['high'].rolling(window=14, min_periods=1).max()
+    lowest_low = ctx['low'].rolling(window=14, min_periods=1).min()
+    return {'williams_r': -100 * (highest_high - ctx['close']) / (highest_high - lowest_low)}
+
+
+# Phase 3: advanced features
+
+@feature(['volume_ma', 'volume_ratio', 'log_volume'], inputs=['volume'], group='volume_indicators',
+         lookback=MED_WINDOW)
+def volume_levels(ctx):
+    volume = ctx['volume']
+    volume_ma = volume.rolling(MED_WINDOW).mean()
+    return {
+        'volume_ma': volume_ma,
+        'volume_ratio': volume / volume_ma,
+        'log_volume': np.log(volume + 1),
+    }
+
+
+@feature(['vpt', 'vpt_ma', 'vpt_normalized'], inputs=['volume', 'returns'], group='volume_indicators',
+         lookback=SHORT_WINDOW)
+def volume_price_trend(ctx):
+    vpt = (ctx['volume'] * ctx['returns']).cumsum()
+    vpt_ma = vpt.rolling(SHORT_WINDOW).mean()
+    return {'vpt': vpt, 'vpt_ma': vpt_ma, 'vpt_normalized': vpt / vpt_ma}
+
+
+@feature(['mfi'], inputs=['high', 'low', 'close', 'volume'], group='volume_indicators', lookback=15)
+def money_flow_index(ctx):
+    typical_price = (ctx['high'] + ctx['low'] + ctx['close']) / 3
+    money_flow = typical_price * ctx['volume']
+    positive_flow = money_flow.where(typical_price > typical_price.shift(1), 0)
+    negative_flow = money_flow.where(typical_price < typical_price.shift(1), 0)
+    money_ratio = (positive_flow.rolling(14).sum() /
+                   (negative_flow.rolling(14).sum() + 1e-10))
+    return {'mfi': 100 - (100 / (1 + money_ratio))}
+
+
+@feature(['price_delta'], inputs=['close'], persist=False, lookback=1)
+def price_delta(ctx):
+    return {'price_delta': ctx['close'].diff()}
+
+
+@feature(['delta_gain', 'delta_loss'], inputs=['price_delta'], persist=False)
+def delta_gain_loss(ctx):
+    delta = ctx['price_delta']
+    return {'delta_gain': delta.where(delta > 0, 0), 'delta_loss': -delta.where(delta < 0, 0)}
+
+
+@feature(list(RSI_WINDOWS), inputs=['delta_gain', 'delta_loss'], group='rsi_family',
+         lookback=max(RSI_WINDOWS.values()))
+def rsi_windows(ctx):
+    gain, loss = ctx['delta_gain'], ctx['delta_loss']
+    result = {}
+    for rsi_name, window in RSI_WINDOWS.items():
+        rs = gain.rolling(window).mean() / (loss.rolling(window).mean() + 1e-10)
+        result[rsi_name] = 100 - (100 / (1 + rs))
+    return result
+
+
+@feature(['rsi_ema'], inputs=['delta_gain', 'delta_loss'], group='rsi_family', lookback=14)
+def rsi_ema(ctx):
+    alpha = 2 / (14 + 1)
+    avg_gain = ctx['delta_gain'].ewm(alpha=alpha, adjust=False).mean()
+    avg_loss = ctx['delta_loss'].ewm(alpha=alpha, adjust=False).mean()
+    return {'rsi_ema': 100 - (100 / (1 + avg_gain / (avg_loss + 1e-10)))}
+
+
+INTRADAY_COLUMNS = ['returns_from_daily_open', 'intraday_high', 'intraday_low', 'intraday_range_pct',
+                    'position_in_range', 'overnight_gap', 'dist_from_intraday_high', 'dist_from_intraday_low']
+
+
+def _fill_nan(values: np.ndarray, fill: float) -> np.ndarray:
+    """Replace NaN (not inf) like Series.fillna"""
+    return np.where(np.isnan(values), fill, values)
+
+
+def _daily_ohlc(day_codes: np.ndarray, n_days: int, open_: np.ndarray, high: np.ndarray, low: np.ndarray,
+                close: np.ndarray) -> np.ndarray:
+    """
+    Per-day first open, max high, min low and last close, skipping NaN like groupby first/max/min/last
+
+    Args:
+        day_codes: Day index of every row (-1 for rows without a timestamp)
+        n_days: Number of days
+
+    Returns:
+        (n_days, 4) array
+    """
+    rows = np.arange(len(day_codes))
+    valid = day_codes >= 0
+    daily = np.full((n_days, 4), np.nan)
+
+    has_open = valid & ~np.isnan(open_)
+    first = np.full(n_days, len(rows))
+    np.minimum.at(first, day_codes[has_open], rows[has_open])
+    found = first < len(rows)
+    daily[found, 0] = open_[first[found]]
+
+    np.fmax.at(daily[:, 1], day_codes[valid], high[valid])
+    np.fmin.at(daily[:, 2], day_codes[valid], low[valid])
+
+    has_close = valid & ~np.isnan(close)
+    last = np.full(n_days, -1)
+    np.maximum.at(last, day_codes[has_close], rows[has_close])
+    found = last >= 0
+    daily[found, 3] = close[last[found]]
+    return daily
+
+
+@feature(INTRADAY_COLUMNS, inputs=['timestamp', 'open', 'high', 'low', 'close'], group='intraday',
+         fallback={'returns_from_daily_open': 0.5, 'intraday_range_pct': 0, 'position_in_range': 0,
+                   'overnight_gap': 0, 'dist_from_intraday_high': 0, 'dist_from_intraday_low': 0})
+def intraday(ctx):
+    # One grouped pass over integer day codes for all daily reference points
+    day_codes, days = pd.factorize(ctx['timestamp'].dt.normalize(), sort=True)
+    daily = _daily_ohlc(day_codes, len(days), *(ctx[col].to_numpy(dtype=np.float64)
+                                                for col in ['open', 'high', 'low', 'close']))
+    valid = day_codes >= 0
+
+    # Previous trading day's last close, per day
+    prev_close = np.concatenate([[np.nan], daily[:-1, 3]])
+    daily = np.column_stack([daily, prev_close])
+
+    per_day = np.full((len(ctx), daily.shape[1]), np.nan)
+    per_day[valid] = daily[day_codes[valid]]
+    daily_opens, intraday_high, intraday_low, _, prev_day_close = per_day.T
+    close = ctx['close'].to_numpy(dtype=np.float64)
+
+    result = {}
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result['returns_from_daily_open'] = _fill_nan((close - daily_opens) / daily_opens, 0)
+
+        result['intraday_high'] = intraday_high
+        result['intraday_low'] = intraday_low
+
+        intraday_range = intraday_high - intraday_low
+        result['intraday_range_pct'] = _fill_nan(intraday_range / daily_opens, 0)
+
+        range_denominator = np.where(intraday_range == 0, np.nan, intraday_range)
+        result['position_in_range'] = _fill_nan((close - intraday_low) / range_denominator, 0.5)
+
+        result['overnight_gap'] = _fill_nan((daily_opens - prev_day_close) / prev_day_close, 0)
+
+        result['dist_from_intraday_high'] = _fill_nan((close - intraday_high) / intraday_high, 0)
+        result['dist_from_intraday_low'] = _fill_nan((close - intraday_low) / intraday_low, 0)
+    return result
+
+
+# Lagged copies of these series: {column prefix: source column}
+LAGGED_SERIES = {'returns': 'returns', 'vol': 'realized_vol_short', 'volume_ratio': 'volume_ratio'}
+
+
+def _register_lags(prefix: str, source: str):
+    def lags(ctx):
+        values = ctx[source]
+        return {f'{prefix}_lag_{lag}': values.shift(lag) for lag in LAG_PERIODS}
+
+    FEATURE_REGISTRY.register(FeatureDefinition(
+        name=f'{prefix}_lags', outputs=tuple(f'{prefix}_lag_{lag}' for lag in LAG_PERIODS), inputs=(source,),
+        compute=lags, group='sequence_modeling', lookback=max(LAG_PERIODS)))
+
+
+for _prefix, _source in LAGGED_SERIES.items():
+    _register_lags(_prefix, _source)
+
+
+@feature([f'{stat}_{window}h' for window in ROLLING_WINDOWS
+          for stat in ['returns_mean', 'returns_std', 'returns_skew', 'returns_kurt', 'price_momentum']],
+         inputs=['returns', 'close'], group='sequence_modeling', lookback=max(ROLLING_WINDOWS))
+def rolling_statistics(ctx):
+    # All four moments from one kernel pass per window
+    returns = ctx['returns'].to_numpy(dtype=np.float64)
+    close = ctx['close']
+    result = {}
+    for window in ROLLING_WINDOWS:
+        moments = rolling_moments(returns, window)
+        result[f'returns_mean_{window}h'] = moments.mean
+        result[f'returns_std_{window}h'] = moments.std
+        result[f'returns_skew_{window}h'] = moments.skew
+        result[f'returns_kurt_{window}h'] = moments.kurt
+        result[f'price_momentum_{window}h'] = close / close.shift(window) - 1
+    return result
@@ -0,0 +1,239 @@
+"""
+Rolling moment kernels for the feature engine.
+
+``rolling_moments`` returns the rolling mean, sample standard deviation,
+skewness and excess kurtosis of a series in one call, matching pandas
+``rolling(window).mean()/.std()/.skew()/.kurt()``. With Numba installed a
+compiled single-pass kernel keeps compensated running power sums that are
+updated as values enter and leave the window; without it a vectorized
+NumPy kernel takes windowed differences of blockwise prefix power sums.
+"""
+
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+try:
+    import numba
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# pandas treats a population variance below this as zero for skew/kurt
+VARIANCE_EPSILON = 1e-14
+
+# Rows per prefix-sum block of the NumPy kernel
+NUMPY_BLOCK_ROWS = 4096
+
+
+class RollingMoments(NamedTuple):
+    """Rolling statistics aligned with the input series"""
+    mean: np.ndarray
+    std: np.ndarray
+    skew: np.ndarray
+    kurt: np.ndarray
+
+
+def _kahan_add(total: float, comp: float, value: float):
+    y = value - comp
+    t = total + y
+    return t, (t - total) - y
+
+
+def _rolling_sums_loop(values, window, out_nobs, out_moments, out_uniform):
+    """
+    Single-pass rolling moments.
+
+    Running sums of x, x^2, x^3 and x^4 (Kahan-compensated, over values
+    recentered by the caller) are updated as each value enters and leaves the
+    window; population central moments are derived from them per position.
+    """
+    n = len(values)
+    s1 = s2 = s3 = s4 = 0.0
+    c1 = c2 = c3 = c4 = 0.0
+    nobs = 0
+    same_run = 0
+    prev = np.nan
+    for i in range(n):
+        x = values[i]
+        if x == x:
+            nobs += 1
+            s1, c1 = _kahan_add(s1, c1, x)
+            s2, c2 = _kahan_add(s2, c2, x * x)
+            s3, c3 = _kahan_add(s3, c3, x * x * x)
+            s4, c4 = _kahan_add(s4, c4, x * x * x * x)
+            same_run = same_run + 1 if x == prev else 1
+            prev = x
+        if i >= window:
+            x = values[i - window]
+            if x == x:
+                nobs -= 1
+                s1, c1 = _kahan_add(s1, c1, -x)
+                s2, c2 = _kahan_add(s2, c2, -x * x)
+                s3, c3 = _kahan_add(s3, c3, -x * x * x)
+                s4, c4 = _kahan_add(s4, c4, -x * x * x * x)
+        out_nobs[i] = nobs
+        out_uniform[i] = nobs > 0 and same_run >= nobs
+        if nobs > 0:
+            a = s1 / nobs
+            b = s2 / nobs - a * a
+            c = s3 / nobs - a * a * a - 3 * a * b
+            d = s4 / nobs - a * a * a * a - 6 * b * a * a - 4 * c * a
+            out_moments[0, i] = a
+            out_moments[1, i] = b
+            out_moments[2, i] = c
+            out_moments[3, i] = d
+        else:
+            out_moments[:, i] = np.nan
+
+
+if NUMBA_AVAILABLE:
+    _kahan_add = numba.njit(cache=True)(_kahan_add)
+    _rolling_sums_numba = numba.njit(cache=True)(_rolling_sums_loop)
+
+
+def _moments_loop(values: np.ndarray, window: int, kernel=_rolling_sums_loop):
+    # Recenter like pandas so the power sums stay small relative to their differences
+    finite = values[np.isfinite(values)]
+    shift = float(np.round(finite.mean())) if finite.size else 0.0
+    nobs = np.zeros(len(values), dtype=np.int64)
+    moments = np.empty((4, len(values)))
+    uniform = np.zeros(len(values), dtype=np.bool_)
+    kernel(values - shift, window, nobs, moments, uniform)
+    moments[0] += shift
+    return nobs, moments, uniform
+
+
+def _run_lengths(values: np.ndarray) -> np.ndarray:
+    """Length of the run of equal non-NaN values ending at each row (NaN rows are skipped, as pandas does)."""
+    valid = np.flatnonzero(~np.isnan(values))
+    runs = np.zeros(len(values), dtype=np.int64)
+    if valid.size == 0:
+        return runs
+    kept = values[valid]
+    starts = np.ones(len(kept), dtype=bool)
+    starts[1:] = kept[1:] != kept[:-1]
+    positions = np.arange(len(kept))
+    runs_kept = positions - np.maximum.accumulate(np.where(starts, positions, 0)) + 1
+    # Carry the run at the last valid row forward over NaN rows
+    last_valid = np.full(len(values), -1)
+    last_valid[valid] = positions
+    last_valid = np.maximum.accumulate(last_valid)
+    has_valid = last_valid >= 0
+    runs[has_valid] = runs_kept[last_valid[has_valid]]
+    return runs
+
+
+def _moments_numpy(values: np.ndarray, window: int):
+    """
+    Rolling moments from windowed differences of prefix power sums.
+
+    Prefix sums restart every block and each block is recentered on its own
+    mean, which keeps the cancellation error of the differences small.
+    """
+    n = len(values)
+    nobs = np.empty(n, dtype=np.int64)
+    moments = np.empty((4, n))
+    block = max(NUMPY_BLOCK_ROWS, window)
+
+    for start in range(0, n, block):
+        stop = min(start + block, n)
+        lead = max(start - window + 1, 0)
+        segment = values[lead:stop]
+        valid = ~np.isnan(segment)
+        if valid.all():
+            shift = segment.mean()
+            x = segment - shift
+        else:
+            shift = segment[valid].mean() if valid.any() else 0.0
+            x = np.where(valid, segment - shift, 0.0)
+        x2 = x * x
+
+        # prefix[:, window + k] holds the sums of the first k rows; the leading zeros
+        # make every window a difference of two contiguous slices
+        prefix = np.zeros((5, window + len(segment) + 1))
+        np.cumsum(valid, out=prefix[0, window + 1:])
+        np.cumsum(x, out=prefix[1, window + 1:])
+        np.cumsum(x2, out=prefix[2, window + 1:])
+        np.cumsum(x2 * x, out=prefix[3, window + 1:])
+        np.cumsum(x2 * x2, out=prefix[4, window + 1:])
+
+        first, last = start - lead + 1, stop - lead + 1
+        sums = prefix[:, window + first:window + last] - prefix[:, first:last]
+        count = np.rint(sums[0])
+        out = moments[:, start:stop]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            np.divide(sums[1:], count, out=out)
+        a, b, c, d = out
+        a2 = a * a
+        # Raw moments about the block shift -> central moments (same expansion as pandas)
+        d -= a2 * a2 + 6 * (b - a2) * a2 + 4 * (c - a2 * a - 3 * a * (b - a2)) * a
+        c -= a2 * a + 3 * a * (b - a2)
+        b -= a2
+        a += shift
+        nobs[start:stop] = count
+
+    uniform = (nobs > 0) & (_run_lengths(values) >= nobs)
+    return nobs, moments, uniform
+
+
+def rolling_moments(values, window: int, min_periods: Optional[int] = None,
+                    engine: str = 'auto') -> RollingMoments:
+    """
+    Rolling mean, std (ddof=1), skew and excess kurtosis in one call.
+
+    Args:
+        values: 1-D array or Series
+        window: Window length in rows
+        min_periods: Minimum non-NaN values per window (default: ``window``, as pandas)
+        engine: 'numba', 'numpy' or 'auto' (Numba when installed)
+
+    Returns:
+        RollingMoments of float64 arrays the length of ``values``
+    """
+    if engine == 'auto':
+        engine = 'numba' if NUMBA_AVAILABLE else 'numpy'
+    if engine == 'numba' and not NUMBA_AVAILABLE:
+        raise ImportError("numba is required for engine='numba': pip install numba")
+    if engine not in ('numba', 'numpy'):
+        raise ValueError(f"Unknown engine: {engine}")
+
+    values = np.asarray(values, dtype=np.float64)
+    min_periods = window if min_periods is None else min_periods
+    if engine == 'numba':
+        nobs, moments, uniform = _moments_loop(values, window, _rolling_sums_numba)
+    else:
+        nobs, moments, uniform = _moments_numpy(values, window)
+    return _finalize(nobs, moments, uniform, max(min_periods, 1))
+
+
+def _finalize(nobs: np.ndarray, moments: np.ndarray, uniform: np.ndarray, min_periods: int) -> RollingMoments:
+    """Turn population central moments into pandas' bias-corrected statistics (overwrites ``moments``)."""
+    mean, b, c, d = moments
+    n = nobs.astype(np.float64)
+    # Rounding can leave a tiny negative variance; a uniform window has none
+    np.maximum(b, 0.0, out=b)
+    b[uniform] = 0.0
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        std = np.sqrt(b * n / (n - 1))
+        skew = np.sqrt(n * (n - 1)) * c / ((n - 2) * b * np.sqrt(b))
+        kurt = ((n * n - 1) * d / (b * b) - 3 * (n - 1) ** 2) / ((n - 2) * (n - 3))
+
+    flat = b <= VARIANCE_EPSILON
+    skew[flat] = np.nan
+    kurt[flat] = np.nan
+    skew[uniform] = 0.0
+    kurt[uniform] = -3.0
+
+    mean[nobs < min_periods] = np.nan
+    std[nobs < max(min_periods, 2)] = np.nan
+    skew[nobs < max(min_periods, 3)] = np.nan
+    kurt[nobs < max(min_periods, 4)] = np.nan
+    return RollingMoments(mean, std, skew, kurt)
+
+
+def rolling_std(values, window: int, min_periods: Optional[int] = None, engine: str = 'auto') -> np.ndarray:
+    """Rolling sample standard deviation (see ``rolling_moments``)."""
+    return rolling_moments(values, window, min_periods, engine).std
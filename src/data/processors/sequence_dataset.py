@@ -0,0 +1,283 @@
+"""
+Rolling-window sequence datasets for sequence models.
+
+Per-symbol feature arrays are turned into (window x features) samples with
+``numpy.lib.stride_tricks.sliding_window_view``, so no window is copied until
+a batch is gathered. Labels are forward returns aligned to each window's
+last bar, splits are made by time with no input or label overlap between
+them, and datasets can be written to and reopened from memory-mapped
+``.npy`` files to iterate data larger than RAM.
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+META_FILE = 'meta.json'
+
+
+def forward_returns(prices: np.ndarray, horizon: int, log: bool = False) -> np.ndarray:
+    """
+    Return over the next ``horizon`` bars for every bar (NaN where the future is unknown).
+
+    Args:
+        prices: 1-D price array
+        horizon: Bars ahead
+        log: Log returns instead of simple returns
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    labels = np.full(prices.shape, np.nan, dtype=np.float32)
+    if horizon < len(prices):
+        ahead, now = prices[horizon:], prices[:-horizon]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            labels[:-horizon] = np.log(ahead / now) if log else ahead / now - 1.0
+    return labels
+
+
+class _SymbolSeries:
+    """Feature matrix, labels and timestamps of one symbol plus its window view"""
+
+    __slots__ = ('symbol', 'values', 'labels', 'timestamps', 'windows')
+
+    def __init__(self, symbol: str, values: np.ndarray, labels: np.ndarray, timestamps: np.ndarray, window: int):
+        self.symbol = symbol
+        self.values = values
+        self.labels = labels
+        self.timestamps = timestamps
+        # (n_windows, n_features, window) view over ``values``; nothing is copied
+        self.windows = sliding_window_view(values, window, axis=0) if len(values) >= window else None
+
+
+class SequenceSplit(NamedTuple):
+    """Time-ordered train/validation/test datasets"""
+    train: 'SequenceDataset'
+    val: 'SequenceDataset'
+    test: 'SequenceDataset'
+
+
+class SequenceDataset:
+    """
+    Sliding-window samples over per-symbol feature arrays.
+
+    Sample ``i`` is the ``window`` bars ending at bar ``t`` of one symbol and
+    its label is the forward return from ``t`` to ``t + horizon``.
+
+    Example:
+        >>> dataset = SequenceDataset.from_frame(features_df, FEATURES, window=48, horizon=4)
+        >>> split = dataset.split_by_time(datetime(2024, 6, 1), datetime(2024, 9, 1))
+        >>> for x, y in split.train.batches(256, shuffle=True, seed=7):
+        ...     model.train_on_batch(x, y)   # x: (256, 48, n_features), y: (256,)
+    """
+
+    def __init__(self, series: Sequence[_SymbolSeries], feature_names: List[str], window: int, horizon: int,
+                 index: Optional[np.ndarray] = None):
+        self.series = list(series)
+        self.feature_names = list(feature_names)
+        self.window = window
+        self.horizon = horizon
+        # Rows of (series position, window start) for every usable sample
+        self.index = self._build_index() if index is None else index
+
+    @classmethod
+    def from_arrays(cls, features: Mapping[str, np.ndarray], prices: Mapping[str, np.ndarray],
+                    timestamps: Mapping[str, np.ndarray], window: int, horizon: int = 1,
+                    feature_names: Optional[List[str]] = None, log_returns: bool = False) -> 'SequenceDataset':
+        """
+        Build from per-symbol (time x features) arrays.
+
+        Args:
+            features: Symbol -> 2-D feature array ordered by time
+            prices: Symbol -> 1-D prices used for the labels
+            timestamps: Symbol -> 1-D timestamps of each row
+            window: Bars per sample
+            horizon: Bars ahead for the label
+            feature_names: Column names of the feature arrays
+            log_returns: Label with log returns instead of simple returns
+        """
+        series = []
+        for symbol, values in features.items():
+            values = np.ascontiguousarray(values, dtype=np.float32)
+            series.append(_SymbolSeries(symbol, values, forward_returns(prices[symbol], horizon, log_returns),
+                                        np.asarray(timestamps[symbol], dtype='datetime64[ns]'), window))
+        names = feature_names or [f'f{i}' for i in range(series[0].values.shape[1] if series else 0)]
+        return cls(series, names, window, horizon)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, feature_columns: List[str], window: int, horizon: int = 1,
+                   price_column: str = 'close', log_returns: bool = False) -> 'SequenceDataset':
+        """
+        Build from a long frame with ``symbol`` and ``timestamp`` columns (e.g. FeatureParquetReader.read).
+        """
+        features, prices, timestamps = {}, {}, {}
+        df = df.sort_values(['symbol', 'timestamp'])
+        for symbol, group in df.groupby('symbol', sort=False, observed=True):
+            features[str(symbol)] = group[feature_columns].to_numpy(dtype=np.float32)
+            prices[str(symbol)] = group[price_column].to_numpy(dtype=np.float64)
+            timestamps[str(symbol)] = group['timestamp'].to_numpy(dtype='datetime64[ns]')
+        return cls.from_arrays(features, prices, timestamps, window, horizon, list(feature_columns), log_returns)
+
+    def _build_index(self) -> np.ndarray:
+        parts = []
+        for pos, series in enumerate(self.series):
+            if series.windows is None:
+                continue
+            starts = np.arange(len(series.windows))
+            usable = np.isfinite(series.labels[starts + self.window - 1])
+            starts = starts[usable]
+            parts.append(np.column_stack([np.full(len(starts), pos), starts]))
+        if not parts:
+            return np.empty((0, 2), dtype=np.int64)
+        return np.concatenate(parts).astype(np.int64)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __getitem__(self, i: int) -> Tuple[np.ndarray, np.float32]:
+        pos, start = self.index[i]
+        series = self.series[pos]
+        return series.windows[start].T, series.labels[start + self.window - 1]
+
+    @property
+    def symbols(self) -> List[str]:
+        return [series.symbol for series in self.series]
+
+    def sample_times(self) -> np.ndarray:
+        """Timestamp of the last bar of every sample."""
+        return self._times_at(self.window - 1)
+
+    def _times_at(self, offset: int) -> np.ndarray:
+        """Timestamp ``offset`` bars after each window start (clipped to the series end)."""
+        times = np.empty(len(self.index), dtype='datetime64[ns]')
+        for pos, series in enumerate(self.series):
+            rows = self.index[:, 0] == pos
+            at = np.minimum(self.index[rows, 1] + offset, len(series.timestamps) - 1)
+            times[rows] = series.timestamps[at]
+        return times
+
+    def subset(self, rows: np.ndarray) -> 'SequenceDataset':
+        """Dataset over a selection of samples, sharing the underlying arrays."""
+        return SequenceDataset(self.series, self.feature_names, self.window, self.horizon, self.index[rows])
+
+    def split_by_time(self, train_end: Union[datetime, str], val_end: Union[datetime, str]) -> SequenceSplit:
+        """
+        Split samples by time without leakage.
+
+        A training sample's label must be known by ``train_end``; a validation
+        sample's first input bar must come after ``train_end`` and its label
+        by ``val_end``; a test sample's first input bar must come after
+        ``val_end``. Samples straddling a boundary are dropped.
+        """
+        train_end, val_end = np.datetime64(pd.Timestamp(train_end)), np.datetime64(pd.Timestamp(val_end))
+        start_times = self._times_at(0)
+        label_times = self._times_at(self.window - 1 + self.horizon)
+
+        train = label_times <= train_end
+        val = (start_times > train_end) & (label_times <= val_end)
+        test = start_times > val_end
+        return SequenceSplit(self.subset(np.flatnonzero(train)), self.subset(np.flatnonzero(val)),
+                             self.subset(np.flatnonzero(test)))
+
+    def gather(self, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Materialize samples ``rows`` as a (batch, window, features) array and labels.
+
+        Only the requested windows are copied, grouped per symbol.
+        """
+        selected = self.index[rows]
+        x = np.empty((len(rows), self.window, len(self.feature_names)), dtype=np.float32)
+        y = np.empty(len(rows), dtype=np.float32)
+        for pos in np.unique(selected[:, 0]):
+            mask = selected[:, 0] == pos
+            series = self.series[pos]
+            starts = selected[mask, 1]
+            x[mask] = series.windows[starts].transpose(0, 2, 1)
+            y[mask] = series.labels[starts + self.window - 1]
+        return x, y
+
+    def batches(self, batch_size: int, shuffle: bool = False,
+                seed: Optional[int] = None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Iterate (x, y) batches; with a memmap backing only each batch is paged in."""
+        order = np.arange(len(self.index))
+        if shuffle:
+            np.random.default_rng(seed).shuffle(order)
+        for offset in range(0, len(order), batch_size):
+            yield self.gather(order[offset:offset + batch_size])
+
+    def to_memmap(self, path: Union[str, Path]) -> Path:
+        """
+        Write the per-symbol arrays as ``.npy`` files that ``open_memmap`` maps back lazily.
+
+        Returns:
+            Dataset directory
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        for pos, series in enumerate(self.series):
+            _write_series(path, pos, series.values, series.labels, series.timestamps)
+        _write_meta(path, self.symbols, self.feature_names, self.window, self.horizon)
+        return path
+
+    @classmethod
+    def open_memmap(cls, path: Union[str, Path]) -> 'SequenceDataset':
+        """Open a dataset written by ``to_memmap`` without loading it into memory."""
+        path = Path(path)
+        meta = json.loads((path / META_FILE).read_text())
+        series = []
+        for pos, symbol in enumerate(meta['symbols']):
+            values = np.load(path / f'{pos:05d}_features.npy', mmap_mode='r')
+            labels = np.load(path / f'{pos:05d}_labels.npy', mmap_mode='r')
+            timestamps = np.load(path / f'{pos:05d}_timestamps.npy', mmap_mode='r').view('datetime64[ns]')
+            series.append(_SymbolSeries(symbol, values, labels, timestamps, meta['window']))
+        return cls(series, meta['feature_names'], meta['window'], meta['horizon'])
+
+
+def _write_series(path: Path, pos: int, values: np.ndarray, labels: np.ndarray, timestamps: np.ndarray):
+    for name, array in (('features', values), ('labels', labels),
+                        ('timestamps', np.asarray(timestamps, dtype='datetime64[ns]').view('int64'))):
+        out = np.lib.format.open_memmap(path / f'{pos:05d}_{name}.npy', mode='w+',
+                                        dtype=array.dtype, shape=array.shape)
+        out[:] = array
+        out.flush()
+        del out
+
+
+def _write_meta(path: Path, symbols: List[str], feature_names: List[str], window: int, horizon: int):
+    meta = {'symbols': symbols, 'feature_names': feature_names, 'window': window, 'horizon': horizon}
+    (path / META_FILE).write_text(json.dumps(meta, indent=2))
+
+
+def build_memmap_dataset(path: Union[str, Path], frames: Iterable[Tuple[str, pd.DataFrame]],
+                         feature_columns: List[str], window: int, horizon: int = 1, price_column: str = 'close',
+                         log_returns: bool = False) -> SequenceDataset:
+    """
+    Write a memmap-backed dataset one symbol at a time, for data that does not fit in memory.
+
+    Args:
+        path: Dataset directory
+        frames: (symbol, frame) pairs with ``timestamp`` and the feature columns, e.g. a generator
+            over ``FeatureParquetReader.read(symbol)``
+        feature_columns: Feature columns in sample order
+        window: Bars per sample
+        horizon: Bars ahead for the label
+        price_column: Column the label returns are computed from
+        log_returns: Label with log returns instead of simple returns
+
+    Returns:
+        The dataset reopened from disk
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    symbols = []
+    for symbol, frame in frames:
+        frame = frame.sort_values('timestamp')
+        _write_series(path, len(symbols), frame[feature_columns].to_numpy(dtype=np.float32),
+                      forward_returns(frame[price_column].to_numpy(dtype=np.float64), horizon, log_returns),
+                      frame['timestamp'].to_numpy(dtype='datetime64[ns]'))
+        symbols.append(str(symbol))
+    _write_meta(path, symbols, list(feature_columns), window, horizon)
+    return SequenceDataset.open_memmap(path)
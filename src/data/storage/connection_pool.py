@@ -0,0 +1,430 @@
+"""
+Thread-safe blocking connection pool for PostgreSQL.
+
+Replaces psycopg2's SimpleConnectionPool (not thread-safe, fails fast when
+exhausted) with a pool that queues callers in FIFO order, validates
+connections on checkout, recycles old connections and records wait metrics.
+"""
+
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+import psycopg2
+from psycopg2.pool import PoolError
+
+from ...utils.logging_config import get_combined_logger
+from ...utils.metrics import Histogram
+
+logger = get_combined_logger("mltrading.data.connection_pool", enable_database_logging=False)
+
+
+class PoolTimeoutError(PoolError):
+    """Raised when no connection becomes available within the acquire timeout"""
+    pass
+
+
+class _Waiter:
+    """A queued caller waiting for a connection handoff"""
+
+    __slots__ = ('event', 'conn', 'may_create')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.conn = None
+        self.may_create = False
+
+
+class _Checkout:
+    """Bookkeeping for a connection currently held by a caller"""
+
+    __slots__ = ('conn', 'started', 'thread_name', 'leak_reported', 'stack')
+
+    def __init__(self, conn, capture_stack: bool = False):
+        # Strong reference: keeps id(conn) unique while the connection is out
+        self.conn = conn
+        self.started = time.monotonic()
+        self.thread_name = threading.current_thread().name
+        self.leak_reported = False
+        # Drop the pool's own frames so the stack ends at the caller
+        self.stack = traceback.format_stack()[:-2] if capture_stack else None
+
+
+class BlockingConnectionPool:
+    """
+    Fair, blocking PostgreSQL connection pool.
+
+    Callers that find the pool exhausted wait in a FIFO queue and receive
+    returned connections directly (handoff), so a late arrival can never jump
+    ahead of a thread that has been waiting longer. Exposes the same
+    ``getconn`` / ``putconn`` / ``closeall`` / ``minconn`` / ``maxconn``
+    surface as psycopg2's pools.
+
+    Example:
+        >>> pool = BlockingConnectionPool(1, 5, acquire_timeout=10, host='localhost',
+        ...                               database='mltrading', user='postgres')
+        >>> conn = pool.getconn()
+        >>> try:
+        ...     with conn.cursor() as cur:
+        ...         cur.execute("SELECT 1")
+        ... finally:
+        ...     pool.putconn(conn)
+        >>> pool.get_stats()['waiters']
+        0
+    """
+
+    def __init__(self, minconn: int, maxconn: int, acquire_timeout: float = 30.0,
+                 max_lifetime: Optional[float] = 1800.0, health_check_after: float = 30.0,
+                 leak_threshold: float = 300.0, track_stacks: bool = False,
+                 connection_factory: Optional[Callable[[], Any]] = None, **connect_kwargs):
+        """
+        Initialize pool and open ``minconn`` connections.
+
+        Args:
+            minconn: Connections opened up front and kept idle
+            maxconn: Hard cap on open connections
+            acquire_timeout: Default seconds to wait for a connection
+            max_lifetime: Seconds after which a connection is closed and replaced (None disables)
+            health_check_after: Idle seconds after which a checkout pings the connection
+            leak_threshold: Seconds a checkout may be held before it is counted as a leak
+            track_stacks: Record the caller's stack for every checkout (debugging aid)
+            connection_factory: Callable creating a new connection (defaults to psycopg2.connect)
+            **connect_kwargs: Arguments passed to psycopg2.connect
+        """
+        if maxconn < 1 or minconn < 0 or minconn > maxconn:
+            raise ValueError(f"Invalid pool bounds: min={minconn}, max={maxconn}")
+
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.acquire_timeout = acquire_timeout
+        self.max_lifetime = max_lifetime
+        self.health_check_after = health_check_after
+        self.leak_threshold = leak_threshold
+        self.track_stacks = track_stacks
+        self._connect_kwargs = connect_kwargs
+        self._factory = connection_factory or (lambda: psycopg2.connect(**self._connect_kwargs))
+
+        self._lock = threading.Lock()
+        self._idle: Deque[Any] = deque()
+        self._waiters: Deque[_Waiter] = deque()
+        self._created_at: Dict[int, float] = {}
+        self._last_used: Dict[int, float] = {}
+        self._checked_out: Dict[int, _Checkout] = {}
+        self._size = 0
+        self.closed = False
+
+        self.wait_histogram = Histogram()
+        self.checkout_histogram = Histogram()
+        self._counters = {
+            'acquired': 0,
+            'waited': 0,
+            'timeouts': 0,
+            'created': 0,
+            'closed': 0,
+            'recycled': 0,
+            'health_check_failures': 0,
+            'leaks_detected': 0,
+        }
+        self._total_wait = 0.0
+
+        for _ in range(minconn):
+            with self._lock:
+                self._size += 1
+            self._idle.append(self._open())
+
+    # -- connection lifecycle -------------------------------------------------
+
+    def _open(self):
+        """Create a new connection (called without the lock held)"""
+        try:
+            conn = self._factory()
+        except Exception:
+            with self._lock:
+                self._size -= 1
+                self._grant_capacity_locked()
+            raise
+        now = time.monotonic()
+        with self._lock:
+            self._created_at[id(conn)] = now
+            self._last_used[id(conn)] = now
+            self._counters['created'] += 1
+        return conn
+
+    def _close_quietly(self, conn):
+        """Close a connection and drop its bookkeeping, keeping its slot reserved"""
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._lock:
+            self._created_at.pop(id(conn), None)
+            self._last_used.pop(id(conn), None)
+            self._counters['closed'] += 1
+
+    def _discard(self, conn):
+        """Close a connection and free its slot for the next waiter"""
+        self._close_quietly(conn)
+        with self._lock:
+            self._size -= 1
+            self._grant_capacity_locked()
+
+    def _grant_capacity_locked(self):
+        """Let the oldest waiter open a new connection in a freed slot"""
+        if self._waiters and self._size < self.maxconn:
+            waiter = self._waiters.popleft()
+            waiter.may_create = True
+            self._size += 1
+            waiter.event.set()
+
+    def _is_expired(self, conn) -> bool:
+        if self.max_lifetime is None:
+            return False
+        created = self._created_at.get(id(conn))
+        return created is not None and (time.monotonic() - created) > self.max_lifetime
+
+    def _is_healthy(self, conn) -> bool:
+        """Check a connection before handing it out"""
+        if getattr(conn, 'closed', 0):
+            return False
+        last_used = self._last_used.get(id(conn), 0.0)
+        if time.monotonic() - last_used < self.health_check_after:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+                cur.fetchone()
+            conn.rollback()
+            return True
+        except Exception as e:
+            logger.warning(f"Pooled connection failed health check: {e}")
+            return False
+
+    def _validate(self, conn):
+        """Return a usable connection, replacing expired or broken ones"""
+        if self._is_expired(conn):
+            counter = 'recycled'
+        elif not self._is_healthy(conn):
+            counter = 'health_check_failures'
+        else:
+            return conn
+        with self._lock:
+            self._counters[counter] += 1
+        # Reuse the slot for the replacement so waiters cannot overshoot maxconn
+        self._close_quietly(conn)
+        return self._open()
+
+    # -- public pool API ------------------------------------------------------
+
+    def getconn(self, timeout: Optional[float] = None):
+        """
+        Check out a connection, waiting in FIFO order if the pool is exhausted.
+
+        Args:
+            timeout: Seconds to wait (defaults to ``acquire_timeout``)
+
+        Returns:
+            A validated connection
+
+        Raises:
+            PoolTimeoutError: When no connection became available in time
+            PoolError: When the pool is closed
+        """
+        timeout = self.acquire_timeout if timeout is None else timeout
+        start = time.monotonic()
+        conn = None
+        create = False
+        waiter = None
+
+        with self._lock:
+            if self.closed:
+                raise PoolError("connection pool is closed")
+            if not self._waiters and self._idle:
+                conn = self._idle.pop()
+            elif not self._waiters and self._size < self.maxconn:
+                self._size += 1
+                create = True
+            else:
+                waiter = _Waiter()
+                self._waiters.append(waiter)
+
+        if waiter is not None:
+            signalled = waiter.event.wait(timeout)
+            with self._lock:
+                if not signalled and waiter.conn is None and not waiter.may_create:
+                    try:
+                        self._waiters.remove(waiter)
+                    except ValueError:
+                        pass
+                    self._counters['timeouts'] += 1
+                    raise PoolTimeoutError(
+                        f"timed out waiting for connection after {timeout:.1f}s "
+                        f"(size={self._size}/{self.maxconn}, waiters={len(self._waiters)})")
+                conn = waiter.conn
+                create = waiter.may_create
+                self._counters['waited'] += 1
+
+        if create:
+            conn = self._open()
+        else:
+            conn = self._validate(conn)
+
+        waited = time.monotonic() - start
+        self.wait_histogram.observe(waited)
+        with self._lock:
+            self._total_wait += waited
+            self._counters['acquired'] += 1
+            self._checked_out[id(conn)] = _Checkout(conn, self.track_stacks)
+        return conn
+
+    def putconn(self, conn, close: bool = False):
+        """
+        Return a connection to the pool.
+
+        Args:
+            conn: Connection obtained from ``getconn``
+            close: Close the connection instead of reusing it
+        """
+        with self._lock:
+            checkout = self._checked_out.pop(id(conn), None)
+        if checkout is None:
+            raise PoolError("trying to put unkeyed connection")
+
+        self.checkout_histogram.observe(time.monotonic() - checkout.started)
+
+        expired = self._is_expired(conn)
+        if self.closed or close or getattr(conn, 'closed', 0) or expired:
+            if expired and not close:
+                with self._lock:
+                    self._counters['recycled'] += 1
+            self._discard(conn)
+            return
+
+        # Leave no transaction open for the next borrower
+        try:
+            if conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+        except Exception:
+            self._discard(conn)
+            return
+
+        with self._lock:
+            self._last_used[id(conn)] = time.monotonic()
+            if self._waiters:
+                waiter = self._waiters.popleft()
+                waiter.conn = conn
+                waiter.event.set()
+            else:
+                self._idle.append(conn)
+
+    def owns(self, conn) -> bool:
+        """Whether ``conn`` is currently checked out of this pool"""
+        with self._lock:
+            return id(conn) in self._checked_out
+
+    def closeall(self):
+        """Close every idle connection and refuse new checkouts"""
+        with self._lock:
+            self.closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+        for conn in idle:
+            self._discard(conn)
+
+    def close_idle(self, keep: Optional[int] = None) -> int:
+        """
+        Close idle connections above ``keep`` (defaults to ``minconn``).
+
+        Returns:
+            Number of connections closed
+        """
+        keep = self.minconn if keep is None else keep
+        to_close = []
+        with self._lock:
+            while len(self._idle) > keep:
+                to_close.append(self._idle.popleft())
+        for conn in to_close:
+            self._discard(conn)
+        return len(to_close)
+
+    # -- metrics --------------------------------------------------------------
+
+    def detect_leaks(self) -> int:
+        """
+        Count checkouts held longer than ``leak_threshold``.
+
+        Each long-held checkout is reported once.
+
+        Returns:
+            Number of newly detected leaks
+        """
+        now = time.monotonic()
+        new_leaks = []
+        with self._lock:
+            for checkout in self._checked_out.values():
+                if not checkout.leak_reported and now - checkout.started > self.leak_threshold:
+                    checkout.leak_reported = True
+                    new_leaks.append((checkout.thread_name, now - checkout.started, checkout.stack))
+            self._counters['leaks_detected'] += len(new_leaks)
+        for thread_name, held, stack in new_leaks:
+            message = f"Possible connection leak: checkout by thread {thread_name} held for {held:.1f}s"
+            if stack:
+                message += "\nChecked out at:\n" + "".join(stack)
+            logger.warning(message)
+        return len(new_leaks)
+
+    def outstanding_checkouts(self, min_held: float = 0.0) -> List[Dict[str, Any]]:
+        """
+        List connections currently checked out.
+
+        Args:
+            min_held: Only include checkouts held at least this many seconds
+
+        Returns:
+            List of dicts with held seconds, thread name and stack (if tracked), longest first
+        """
+        now = time.monotonic()
+        with self._lock:
+            checkouts = [
+                {
+                    'connection_id': conn_id,
+                    'held_seconds': now - checkout.started,
+                    'thread_name': checkout.thread_name,
+                    'stack': ''.join(checkout.stack) if checkout.stack else None,
+                }
+                for conn_id, checkout in self._checked_out.items()
+                if now - checkout.started >= min_held
+            ]
+        return sorted(checkouts, key=lambda c: c['held_seconds'], reverse=True)
+
+    @property
+    def total_wait_seconds(self) -> float:
+        """Cumulative seconds callers spent waiting for a connection"""
+        return self._total_wait
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get pool status and wait metrics.
+
+        Returns:
+            Dictionary with sizes, waiters, counters and histograms
+        """
+        self.detect_leaks()
+        with self._lock:
+            stats = {
+                'min_connections': self.minconn,
+                'max_connections': self.maxconn,
+                'pool_size': self._size,
+                'available_connections': len(self._idle),
+                'used_connections': len(self._checked_out),
+                'waiters': len(self._waiters),
+                'total_wait_seconds': self._total_wait,
+                'closed': self.closed,
+                **self._counters,
+            }
+        stats['wait_time'] = self.wait_histogram.snapshot()
+        stats['wait_time']['p95'] = self.wait_histogram.quantile(0.95)
+        stats['checkout_duration'] = self.checkout_histogram.snapshot()
+        stats['checkout_duration']['p95'] = self.checkout_histogram.quantile(0.95)
+        return stats
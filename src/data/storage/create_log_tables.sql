@@ -84,27 +84,32 @@ CREATE TABLE IF NOT EXISTS user_action_logs (
 
 -- Create indexes for better query performance
 CREATE INDEX IF NOT EXISTS idx_system_logs_timestamp ON system_logs(timestamp);
+CREATE INDEX IF NOT EXISTS idx_system_logs_timestamp_id ON system_logs(timestamp, id); -- keyset pagination
 CREATE INDEX IF NOT EXISTS idx_system_logs_level ON system_logs(level);
 CREATE INDEX IF NOT EXISTS idx_system_logs_logger ON system_logs(logger_name);
 CREATE INDEX IF NOT EXISTS idx_system_logs_correlation ON system_logs(correlation_id);
 CREATE INDEX IF NOT EXISTS idx_system_logs_created_at ON system_logs(created_at);
 
 CREATE INDEX IF NOT EXISTS idx_trading_events_timestamp ON trading_events(timestamp);
+CREATE INDEX IF NOT EXISTS idx_trading_events_timestamp_id ON trading_events(timestamp, id); -- keyset pagination
 CREATE INDEX IF NOT EXISTS idx_trading_events_symbol ON trading_events(symbol);
 CREATE INDEX IF NOT EXISTS idx_trading_events_type ON trading_events(event_type);
 CREATE INDEX IF NOT EXISTS idx_trading_events_correlation ON trading_events(correlation_id);
 
 CREATE INDEX IF NOT EXISTS idx_performance_logs_timestamp ON performance_logs(timestamp);
+CREATE INDEX IF NOT EXISTS idx_performance_logs_timestamp_id ON performance_logs(timestamp, id); -- keyset pagination
 CREATE INDEX IF NOT EXISTS idx_performance_logs_operation ON performance_logs(operation_name);
 CREATE INDEX IF NOT EXISTS idx_performance_logs_component ON performance_logs(component);
 CREATE INDEX IF NOT EXISTS idx_performance_logs_correlation ON performance_logs(correlation_id);
 
 CREATE INDEX IF NOT EXISTS idx_error_logs_timestamp ON error_logs(timestamp);
+CREATE INDEX IF NOT EXISTS idx_error_logs_timestamp_id ON error_logs(timestamp, id); -- keyset pagination
 CREATE INDEX IF NOT EXISTS idx_error_logs_type ON error_logs(error_type);
 CREATE INDEX IF NOT EXISTS idx_error_logs_component ON error_logs(component);
 CREATE INDEX IF NOT EXISTS idx_error_logs_correlation ON error_logs(correlation_id);
 
 CREATE INDEX IF NOT EXISTS idx_user_action_logs_timestamp ON user_action_logs(timestamp);
+CREATE INDEX IF NOT EXISTS idx_user_action_logs_timestamp_id ON user_action_logs(timestamp, id); -- keyset pagination
 CREATE INDEX IF NOT EXISTS idx_user_action_logs_action_type ON user_action_logs(action_type);
 CREATE INDEX IF NOT EXISTS idx_user_action_logs_user_id ON user_action_logs(user_id);
 CREATE INDEX IF NOT EXISTS idx_user_action_logs_correlation ON user_action_logs(correlation_id);
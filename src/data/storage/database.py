@@ -4,13 +4,14 @@ Handles connections, table creation, and basic CRUD operations.
 """
 
 import os
+import threading
+import time
 import warnings
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 from contextlib import contextmanager
 import psycopg2
 from psycopg2.extras import RealDictCursor, execute_batch
-from psycopg2.pool import SimpleConnectionPool
 import pandas as pd
 
 # Suppress pandas SQLAlchemy warning
@@ -18,10 +19,43 @@ warnings.filterwarnings('ignore', message='pandas only supports SQLAlchemy')
 
 from ...utils.logging_config import get_combined_logger, log_operation
 from ...utils.connection_config import ConnectionConfig, get_safe_db_config
-from ...utils.retry_decorators import retry_on_database_error
+from .connection_pool import BlockingConnectionPool
+from .statement_cache import PreparedStatementRegistry
 
 logger = get_combined_logger("mltrading.data.database", enable_database_logging=True)
 
+# Replay lag of a hot standby; 0 for a primary/stand-in or a fully caught-up replica
+REPLICA_LAG_QUERY = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+# Hot read queries prepared server-side once per pooled connection
+HOT_READ_STATEMENTS = {
+    'market_data_range': """
+        SELECT symbol, timestamp, open, high, low, close, volume, source
+        FROM market_data
+        WHERE symbol = %s AND timestamp BETWEEN %s AND %s AND source = %s
+        ORDER BY timestamp
+    """,
+    'latest_market_data': """
+        SELECT * FROM market_data
+        WHERE symbol = %s AND source = %s
+        ORDER BY timestamp DESC LIMIT 1
+    """,
+    'data_date_range': """
+        SELECT MIN(timestamp), MAX(timestamp)
+        FROM market_data
+        WHERE symbol = %s AND source = %s
+    """,
+    'stock_info': """
+        SELECT * FROM stock_info WHERE symbol = %s
+    """,
+}
+
 
 class DatabaseManager:
     """
@@ -32,8 +66,10 @@ class DatabaseManager:
     reliability.
 
     Features:
-        - Connection pooling (configurable 1-20 connections)
-        - Automatic retry logic with exponential backoff
+        - Fair blocking connection pool (FIFO waiters, acquire timeout)
+        - Connection health checks and max-lifetime recycling
+        - Server-side prepared statements for hot reads
+        - Optional read replica pool with lag-aware routing of read-only methods
         - Safe configuration management
         - Structured logging integration
         - Batch operations for performance
@@ -61,8 +97,23 @@ class DatabaseManager:
     def __init__(self, host: str = None, port: int = None,
                  database: str = None, user: str = None,
                  password: str = None, min_conn: int = None,
-                 max_conn: int = None):
-        """Initialize database manager with connection pool using safe defaults."""
+                 max_conn: int = None, track_checkouts: bool = None,
+                 replica_host: str = None, replica_port: int = None,
+                 replica_database: str = None, replica_max_conn: int = None,
+                 max_replica_lag: float = None):
+        """
+        Initialize database manager with connection pool using safe defaults.
+
+        Args:
+            track_checkouts: Record the call stack of every checkout so leaked or
+                long-held connections can be traced (defaults to DB_TRACK_CHECKOUTS)
+            replica_host: Read replica (or second local Postgres) host; reads use the
+                primary when neither this nor DB_REPLICA_HOST is set
+            replica_port: Read replica port (defaults to the primary port)
+            replica_database: Read replica database name (defaults to the primary name)
+            replica_max_conn: Read pool size
+            max_replica_lag: Replica lag in seconds above which reads fall back to the primary
+        """
         # Use safe configuration defaults
         safe_config = get_safe_db_config()
 
@@ -74,14 +125,68 @@ class DatabaseManager:
         self.min_conn = min_conn or safe_config['min_conn']
         self.max_conn = max_conn or safe_config['max_conn']
         self.timeout = safe_config['timeout']
+        if track_checkouts is None:
+            track_checkouts = ConnectionConfig.TRACK_CHECKOUTS
+        self.track_checkouts = track_checkouts
+        self.statements = PreparedStatementRegistry()
+        for name, sql in HOT_READ_STATEMENTS.items():
+            self.statements.register(name, sql)
         self.pool = None
         self._init_pool()
 
+        self.replica_host = replica_host or safe_config.get('replica_host')
+        self.replica_port = replica_port or safe_config.get('replica_port') or self.port
+        self.replica_database = replica_database or safe_config.get('replica_database') or self.database
+        self.replica_max_conn = (replica_max_conn or safe_config.get('replica_max_conn')
+                                 or ConnectionConfig.REPLICA_POOL_SIZE)
+        self.max_replica_lag = (max_replica_lag if max_replica_lag is not None
+                                else safe_config.get('replica_max_lag', ConnectionConfig.REPLICA_MAX_LAG))
+        self.read_pool = None
+        self._replica_lag = None
+        self._replica_lag_checked = 0.0
+        self._routing_lock = threading.Lock()
+        self.routing_stats = {
+            'replica_reads': 0,
+            'primary_reads': 0,
+            'stale_fallbacks': 0,
+            'error_fallbacks': 0,
+        }
+        if self.replica_host:
+            self._init_read_pool()
+
+    def _init_read_pool(self):
+        """Initialize the read replica pool; reads stay on the primary if it fails."""
+        try:
+            self.read_pool = BlockingConnectionPool(
+                0, self.replica_max_conn,
+                acquire_timeout=ConnectionConfig.POOL_ACQUIRE_TIMEOUT,
+                max_lifetime=ConnectionConfig.POOL_MAX_LIFETIME,
+                health_check_after=ConnectionConfig.POOL_HEALTH_CHECK_AFTER,
+                leak_threshold=ConnectionConfig.POOL_LEAK_THRESHOLD,
+                track_stacks=self.track_checkouts,
+                host=self.replica_host,
+                port=self.replica_port,
+                database=self.replica_database,
+                user=self.user,
+                password=self.password,
+                connect_timeout=self.timeout
+            )
+            logger.info(f"Read replica pool initialized for {self.replica_host}:{self.replica_port}/"
+                        f"{self.replica_database} (max {self.replica_max_conn}, max lag {self.max_replica_lag}s)")
+        except Exception as e:
+            logger.error(f"Failed to initialize read replica pool, reads will use the primary: {e}")
+            self.read_pool = None
+
     def _init_pool(self):
         """Initialize connection pool with safe limits."""
         try:
-            self.pool = SimpleConnectionPool(
+            self.pool = BlockingConnectionPool(
                 self.min_conn, self.max_conn,
+                acquire_timeout=ConnectionConfig.POOL_ACQUIRE_TIMEOUT,
+                max_lifetime=ConnectionConfig.POOL_MAX_LIFETIME,
+                health_check_after=ConnectionConfig.POOL_HEALTH_CHECK_AFTER,
+                leak_threshold=ConnectionConfig.POOL_LEAK_THRESHOLD,
+                track_stacks=self.track_checkouts,
                 host=self.host,
                 port=self.port,
                 database=self.database,
@@ -99,12 +204,16 @@ class DatabaseManager:
             self.pool = None
             logger.warning("Database pool initialization failed, using fallback mode")
 
-    @retry_on_database_error(max_attempts=3, delay=0.5)
-    def get_connection(self, timeout=60):
-        """Get a connection from the pool with timeout and retry logic."""
-        import time
-        from psycopg2.pool import PoolError
+    def get_connection(self, timeout: float = None):
+        """
+        Get a connection from the pool.
 
+        Callers queue in FIFO order when the pool is exhausted instead of
+        retrying; a PoolTimeoutError is raised if none frees up in time.
+
+        Args:
+            timeout: Seconds to wait for a connection (defaults to POOL_ACQUIRE_TIMEOUT)
+        """
         if self.pool is None:
             # Fallback: create a direct connection
             try:
@@ -119,29 +228,134 @@ class DatabaseManager:
                 logger.error(f"Failed to create fallback connection: {e}")
                 raise
 
-        # Try to get connection with retry and exponential backoff
-        max_retries = 5
-        base_delay = 0.1
+        try:
+            return self.pool.getconn(timeout=timeout)
+        except Exception as e:
+            error_msg = str(e)
+            if "too many clients already" in error_msg:
+                logger.error("Connection limit exceeded - consider reducing concurrency or max_workers")
+                logger.error(f"Current pool: {self.min_conn}-{self.max_conn} connections")
+            logger.error(f"Failed to get connection: {e}")
+            raise
 
-        for attempt in range(max_retries):
-            try:
-                return self.pool.getconn()
-            except PoolError as e:
-                if "pool exhausted" in str(e).lower() and attempt < max_retries - 1:
-                    delay = base_delay * (2 ** attempt)  # Exponential backoff
-                    logger.warning(f"Connection pool exhausted, retry {attempt + 1}/{max_retries} in {delay:.2f}s")
-                    time.sleep(delay)
-                    continue
-                else:
-                    logger.error(f"Failed to get connection after {attempt + 1} attempts: {e}")
-                    raise
-            except Exception as e:
-                error_msg = str(e)
-                if "too many clients already" in error_msg:
-                    logger.error("Connection limit exceeded - consider reducing concurrency or max_workers")
-                    logger.error(f"Current pool: {self.min_conn}-{self.max_conn} connections")
-                logger.error(f"Unexpected error getting connection: {e}")
-                raise
+    def get_replica_lag(self, force: bool = False) -> Optional[float]:
+        """
+        Get the replica's replay lag in seconds (cached for REPLICA_LAG_CHECK_INTERVAL).
+
+        Returns:
+            Lag in seconds, or None when no replica is configured or it is unreachable
+        """
+        if self.read_pool is None:
+            return None
+        now = time.monotonic()
+        with self._routing_lock:
+            fresh = now - self._replica_lag_checked < ConnectionConfig.REPLICA_LAG_CHECK_INTERVAL
+            if fresh and not force:
+                return self._replica_lag
+            # Claim the probe so concurrent readers use the cached value meanwhile
+            self._replica_lag_checked = now
+
+        lag = None
+        conn = None
+        try:
+            conn = self.read_pool.getconn(timeout=1.0)
+            with conn.cursor() as cur:
+                cur.execute(REPLICA_LAG_QUERY)
+                lag = float(cur.fetchone()[0])
+        except Exception as e:
+            logger.warning(f"Replica lag check failed: {e}")
+        finally:
+            if conn is not None:
+                self.read_pool.putconn(conn)
+
+        with self._routing_lock:
+            self._replica_lag = lag
+        return lag
+
+    def _record_route(self, counter: str):
+        with self._routing_lock:
+            self.routing_stats[counter] += 1
+
+    def get_read_connection(self, timeout: float = None):
+        """
+        Get a connection for read-only work.
+
+        Uses the replica pool when one is configured and its lag is within
+        ``max_replica_lag``; otherwise falls back to the primary. Return the
+        connection with ``return_connection`` as usual.
+        """
+        if self.read_pool is not None:
+            lag = self.get_replica_lag()
+            if lag is not None and lag <= self.max_replica_lag:
+                try:
+                    conn = self.read_pool.getconn(timeout=timeout)
+                    self._record_route('replica_reads')
+                    return conn
+                except Exception as e:
+                    logger.warning(f"Replica connection unavailable, reading from primary: {e}")
+                    self._record_route('error_fallbacks')
+            elif lag is None:
+                self._record_route('error_fallbacks')
+            else:
+                logger.warning(f"Replica lag {lag:.1f}s exceeds {self.max_replica_lag}s, reading from primary")
+                self._record_route('stale_fallbacks')
+        self._record_route('primary_reads')
+        return self.get_connection(timeout=timeout)
+
+    @contextmanager
+    def get_read_connection_context(self, timeout: float = None):
+        """Context manager for read-only work routed like ``get_read_connection``."""
+        conn = None
+        try:
+            conn = self.get_read_connection(timeout=timeout)
+            yield conn
+        except Exception as e:
+            logger.error(f"Error in read connection context: {e}")
+            raise
+        finally:
+            if conn is not None:
+                self.return_connection(conn)
+
+    def get_statement_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-statement call counts, prepare counts and latency."""
+        return self.statements.get_stats()
+
+    def _execute_hot(self, cur, name: str, params: tuple):
+        """Run a registered hot statement, prepared when the pool is in use."""
+        if self.pool is None:
+            # Fallback connections are closed after each use, so preparing would not pay off
+            cur.execute(HOT_READ_STATEMENTS[name], params)
+        else:
+            self.statements.execute(cur, name, params)
+
+    def execute_cached(self, cur, sql: str, params: tuple = None):
+        """
+        Execute ad-hoc SELECT text on ``cur`` through the prepared statement cache.
+
+        Repeated query text is prepared once per pooled connection; anything
+        that cannot be prepared runs as a plain execute.
+        """
+        if self.pool is None:
+            cur.execute(sql, params)
+        else:
+            self.statements.execute_sql(cur, sql, params)
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get connection pool wait and usage metrics."""
+        if self.pool is None:
+            return {'pool_status': 'fallback_mode'}
+        return self.pool.get_stats()
+
+    def get_all_pool_stats(self) -> Dict[str, Any]:
+        """Get metrics for the primary and replica pools plus read routing counters."""
+        with self._routing_lock:
+            routing = dict(self.routing_stats)
+            routing['replica_lag_seconds'] = self._replica_lag
+        return {
+            'primary': self.get_pool_stats(),
+            'replica': self.read_pool.get_stats() if self.read_pool is not None else None,
+            'routing': routing,
+        }
 
     def return_connection(self, conn):
         """Return a connection to the pool."""
@@ -149,7 +363,9 @@ class DatabaseManager:
             return
 
         try:
-            if self.pool is None:
+            if self.read_pool is not None and self.read_pool.owns(conn):
+                self.read_pool.putconn(conn)
+            elif self.pool is None:
                 # Close the fallback connection
                 conn.close()
             else:
@@ -163,19 +379,75 @@ class DatabaseManager:
                 pass
 
     @contextmanager
-    def get_connection_context(self):
-        """Context manager for safe connection handling."""
+    def get_connection_context(self, timeout: float = None):
+        """
+        Context manager for safe connection handling.
+
+        Commits on success and rolls back on error (the same transaction
+        semantics as ``with conn:`` on a psycopg2 connection), and always
+        returns the connection to the pool. Use this instead of pairing
+        ``get_connection()`` with ``return_connection()`` by hand (or
+        ``with db_manager.get_connection() as conn:``), where any path that
+        skips ``return_connection()`` leaks the connection and eventually
+        exhausts the pool.
+        """
         conn = None
         try:
-            conn = self.get_connection()
+            conn = self.get_connection(timeout=timeout)
             yield conn
+            conn.commit()
         except Exception as e:
             logger.error(f"Error in connection context: {e}")
+            if conn is not None:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
             raise
         finally:
             if conn is not None:
                 self.return_connection(conn)
 
+    def enable_checkout_tracking(self, enabled: bool = True):
+        """Turn call-stack recording for new checkouts on or off."""
+        self.track_checkouts = enabled
+        if self.pool is not None:
+            self.pool.track_stacks = enabled
+
+    def get_outstanding_checkouts(self, min_held: float = 0.0) -> List[Dict[str, Any]]:
+        """
+        List connections currently checked out of the pool.
+
+        Args:
+            min_held: Only include checkouts held at least this many seconds
+
+        Returns:
+            List of dicts with held_seconds, thread_name and stack (when tracking)
+        """
+        if self.pool is None:
+            return []
+        return self.pool.outstanding_checkouts(min_held=min_held)
+
+    def find_long_held_checkouts(self, threshold: float = None) -> List[Dict[str, Any]]:
+        """
+        Flag checkouts held longer than ``threshold`` seconds and log where they came from.
+
+        Args:
+            threshold: Seconds (defaults to POOL_LEAK_THRESHOLD)
+
+        Returns:
+            The long-held checkouts, longest first
+        """
+        threshold = ConnectionConfig.POOL_LEAK_THRESHOLD if threshold is None else threshold
+        long_held = self.get_outstanding_checkouts(min_held=threshold)
+        for checkout in long_held:
+            message = (f"Connection held for {checkout['held_seconds']:.1f}s "
+                       f"by thread {checkout['thread_name']}")
+            if checkout['stack']:
+                message += f"\nChecked out at:\n{checkout['stack']}"
+            logger.warning(message)
+        return long_held
+
     def check_tables_exist(self) -> bool:
         """Check if all required tables exist in the database."""
         conn = self.get_connection()
@@ -286,37 +558,41 @@ class DatabaseManager:
             self.return_connection(conn)
 
     def get_market_data(self, symbol: str, start_date: datetime,
-                       end_date: datetime, source: str = 'yahoo') -> pd.DataFrame:
-        """Get market data for a symbol within date range."""
-        conn = self.get_connection()
+                       end_date: datetime, source: str = 'yahoo',
+                       include_range_debug: bool = False) -> pd.DataFrame:
+        """
+        Get market data for a symbol within date range.
+
+        Args:
+            include_range_debug: Also log the symbol's full stored range
+                (a MIN/MAX/COUNT scan over its entire history; off on the hot path)
+        """
+        conn = self.get_read_connection()
         try:
-            # Debug: Log what we're searching for
-            logger.info(f"Database query - Symbol: {symbol}, Start: {start_date}, End: {end_date}, Source: {source}")
+            logger.debug(f"Database query - Symbol: {symbol}, Start: {start_date}, End: {end_date}, Source: {source}")
+
+            if include_range_debug:
+                debug_query = ("SELECT MIN(timestamp), MAX(timestamp), COUNT(*) FROM market_data "
+                               "WHERE symbol = %s AND source = %s")
+                with conn.cursor() as cur:
+                    cur.execute(debug_query, (symbol, source))
+                    debug_result = cur.fetchone()
+                    if debug_result:
+                        min_ts, max_ts, count = debug_result
+                        logger.info(f"Database contains for {symbol}: {count} records from {min_ts} to {max_ts}")
 
-            # First, check what data actually exists for this symbol
-            debug_query = "SELECT MIN(timestamp), MAX(timestamp), COUNT(*) FROM market_data WHERE symbol = %s AND source = %s"
             with conn.cursor() as cur:
-                cur.execute(debug_query, (symbol, source))
-                debug_result = cur.fetchone()
-                if debug_result:
-                    min_ts, max_ts, count = debug_result
-                    logger.info(f"Database contains for {symbol}: {count} records from {min_ts} to {max_ts}")
-
-            query = """
-                SELECT symbol, timestamp, open, high, low, close, volume, source
-                FROM market_data
-                WHERE symbol = %s AND timestamp BETWEEN %s AND %s AND source = %s
-                ORDER BY timestamp
-            """
-            # Use pandas with psycopg2 connection directly to avoid SQLAlchemy warning
-            import pandas as pd
-            df = pd.read_sql_query(query, conn, params=(symbol, start_date, end_date, source))
-
-            # Debug: Log what we actually retrieved
+                self._execute_hot(cur, 'market_data_range', (symbol, start_date, end_date, source))
+                columns = [desc[0] for desc in cur.description]
+                # coerce_float matches read_sql_query's handling of NUMERIC columns
+                df = pd.DataFrame.from_records(cur.fetchall(), columns=columns, coerce_float=True)
+            # read_sql_query normalised tz-aware timestamps to UTC; keep that contract
+            if not df.empty and isinstance(df['timestamp'].dtype, pd.DatetimeTZDtype):
+                df['timestamp'] = pd.to_datetime(df['timestamp'], utc=True)
+
             if not df.empty:
-                retrieved_min = df['timestamp'].min()
-                retrieved_max = df['timestamp'].max()
-                logger.info(f"Retrieved from database: {len(df)} records from {retrieved_min} to {retrieved_max}")
+                logger.debug(f"Retrieved from database: {len(df)} records from "
+                             f"{df['timestamp'].min()} to {df['timestamp'].max()}")
 
             return df
 
@@ -329,14 +605,10 @@ class DatabaseManager:
 
     def get_latest_market_data(self, symbol: str, source: str = 'yahoo') -> Optional[Dict]:
         """Get latest market data for a symbol."""
-        conn = self.get_connection()
+        conn = self.get_read_connection()
         try:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("""
-                    SELECT * FROM market_data
-                    WHERE symbol = %s AND source = %s
-                    ORDER BY timestamp DESC LIMIT 1
-                """, (symbol, source))
+                self._execute_hot(cur, 'latest_market_data', (symbol, source))
                 result = cur.fetchone()
                 return dict(result) if result else None
 
@@ -414,7 +686,7 @@ class DatabaseManager:
 
     def get_symbols_with_data(self, source: str = 'yahoo') -> List[str]:
         """Get list of symbols that have market data."""
-        conn = self.get_connection()
+        conn = self.get_read_connection()
         try:
             with conn.cursor() as cur:
                 cur.execute("""
@@ -430,14 +702,10 @@ class DatabaseManager:
 
     def get_data_date_range(self, symbol: str, source: str = 'yahoo') -> tuple:
         """Get the date range of available data for a symbol."""
-        conn = self.get_connection()
+        conn = self.get_read_connection()
         try:
             with conn.cursor() as cur:
-                cur.execute("""
-                    SELECT MIN(timestamp), MAX(timestamp)
-                    FROM market_data
-                    WHERE symbol = %s AND source = %s
-                """, (symbol, source))
+                self._execute_hot(cur, 'data_date_range', (symbol, source))
                 result = cur.fetchone()
                 return result if result else (None, None)
 
@@ -479,12 +747,10 @@ class DatabaseManager:
 
     def get_stock_info(self, symbol: str) -> Optional[Dict]:
         """Get stock information for a symbol."""
-        conn = self.get_connection()
+        conn = self.get_read_connection()
         try:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("""
-                    SELECT * FROM stock_info WHERE symbol = %s
-                """, (symbol,))
+                self._execute_hot(cur, 'stock_info', (symbol,))
                 result = cur.fetchone()
                 return dict(result) if result else None
 
@@ -494,9 +760,26 @@ class DatabaseManager:
         finally:
             self.return_connection(conn)
 
+    def get_sectors(self, symbols: List[str]) -> Dict[str, str]:
+        """Get the sector of each symbol in one query (symbols without one are omitted)."""
+        conn = self.get_read_connection()
+        try:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT symbol, sector FROM stock_info
+                    WHERE symbol = ANY(%s) AND sector IS NOT NULL
+                """, (list(symbols),))
+                return {row[0]: row[1] for row in cur.fetchall()}
+
+        except Exception as e:
+            logger.error(f"Failed to get sectors: {e}")
+            raise
+        finally:
+            self.return_connection(conn)
+
     def get_stocks_by_sector(self, sector: str) -> List[str]:
         """Get all symbols in a specific sector."""
-        conn = self.get_connection()
+        conn = self.get_read_connection()
         try:
             with conn.cursor() as cur:
                 cur.execute("""
@@ -512,7 +795,7 @@ class DatabaseManager:
 
     def get_stocks_by_industry(self, industry: str) -> List[str]:
         """Get all symbols in a specific industry."""
-        conn = self.get_connection()
+        conn = self.get_read_connection()
         try:
             with conn.cursor() as cur:
                 cur.execute("""
@@ -528,7 +811,7 @@ class DatabaseManager:
 
     def get_all_sectors(self) -> List[str]:
         """Get all unique sectors."""
-        conn = self.get_connection()
+        conn = self.get_read_connection()
         try:
             with conn.cursor() as cur:
                 cur.execute("""
@@ -544,7 +827,7 @@ class DatabaseManager:
 
     def get_all_industries(self) -> List[str]:
         """Get all unique industries."""
-        conn = self.get_connection()
+        conn = self.get_read_connection()
         try:
             with conn.cursor() as cur:
                 cur.execute("""
@@ -560,7 +843,7 @@ class DatabaseManager:
 
     def get_industries_by_sector(self, sector: str) -> List[str]:
         """Get all unique industries within a specific sector."""
-        conn = self.get_connection()
+        conn = self.get_read_connection()
         try:
             with conn.cursor() as cur:
                 cur.execute("""
@@ -578,7 +861,7 @@ class DatabaseManager:
 
     def get_stocks_by_industry(self, industry: str, sector: str = None) -> List[str]:
         """Get all symbols in a specific industry, optionally filtered by sector."""
-        conn = self.get_connection()
+        conn = self.get_read_connection()
         try:
             with conn.cursor() as cur:
                 if sector:
@@ -603,7 +886,7 @@ class DatabaseManager:
 
     def get_earliest_data_date(self, source: str = 'yahoo') -> Optional[datetime]:
         """Get the earliest date in the market_data table."""
-        conn = self.get_connection()
+        conn = self.get_read_connection()
         try:
             with conn.cursor() as cur:
                 cur.execute("""
@@ -620,7 +903,7 @@ class DatabaseManager:
 
     def get_latest_data_date(self, source: str = 'yahoo') -> Optional[datetime]:
         """Get the latest date in the market_data table."""
-        conn = self.get_connection()
+        conn = self.get_read_connection()
         try:
             with conn.cursor() as cur:
                 cur.execute("""
@@ -636,10 +919,13 @@ class DatabaseManager:
             self.return_connection(conn)
 
     def close(self):
-        """Close the connection pool."""
+        """Close the connection pools."""
         if self.pool:
             self.pool.closeall()
             logger.info("Database connection pool closed")
+        if self.read_pool:
+            self.read_pool.closeall()
+            logger.info("Read replica connection pool closed")
 
 
 # Global database manager instance
@@ -664,4 +950,7 @@ def get_db_manager() -> DatabaseManager:
             user=user,
             password=password
         )
+        # Imported here: the monitor module imports this one
+        from ...utils.db_pool_monitor import register_pool_metrics
+        register_pool_metrics(db_manager)
     return db_manager
@@ -0,0 +1,285 @@
+"""
+Parquet export of feature_engineered_data for ML training.
+
+The exporter writes a hive-partitioned dataset (``symbol=/year=/month=``)
+and keeps a ``_manifest.json`` with the ``updated_at`` watermark plus
+per-partition row counts, time ranges and column statistics. Each run only
+pulls rows updated since the watermark and rewrites the partitions they
+touch. The reader prunes partitions and columns before touching any data
+and can stack the result into a (symbols x time x features) tensor.
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+from .feature_reader import FeatureReader, KEY_COLUMNS, resolve_columns, ColumnSpec
+from ...utils.logging_config import get_combined_logger
+
+logger = get_combined_logger("mltrading.data.feature_parquet")
+
+MANIFEST_FILE = '_manifest.json'
+PARTITION_COLUMNS = ['symbol', 'year', 'month']
+
+
+def _require_pyarrow():
+    if not PYARROW_AVAILABLE:
+        raise ImportError("pyarrow is required for Parquet feature export: pip install pyarrow")
+
+
+def _partition_dir(root: Path, symbol: str, year: int, month: int) -> Path:
+    return root / f'symbol={symbol}' / f'year={year}' / f'month={month}'
+
+
+def _column_stats(df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+    """Min, max and null count per numeric column."""
+    numeric = df.select_dtypes(include=['number', 'bool'])
+    mins, maxs, nulls = numeric.min(), numeric.max(), numeric.isna().sum()
+    return {
+        col: {
+            'min': None if pd.isna(mins[col]) else float(mins[col]),
+            'max': None if pd.isna(maxs[col]) else float(maxs[col]),
+            'null_count': int(nulls[col]),
+        }
+        for col in numeric.columns
+    }
+
+
+class FeatureTensor(NamedTuple):
+    """Stacked feature array with its axis labels"""
+    values: np.ndarray
+    symbols: List[str]
+    timestamps: pd.DatetimeIndex
+    features: List[str]
+
+
+class FeatureParquetExporter:
+    """
+    Incrementally export feature_engineered_data to a partitioned Parquet dataset.
+
+    Example:
+        >>> exporter = FeatureParquetExporter(get_db_manager(), 'data/features')
+        >>> exporter.export()
+        {'rows': 1250, 'partitions': 14, 'symbols': 7, 'watermark': '2024-05-01T16:00:12'}
+    """
+
+    def __init__(self, db_manager, root: Union[str, Path], feature_version: str = '3.0',
+                 columns: ColumnSpec = None, symbols_per_batch: int = 25):
+        """
+        Initialize exporter.
+
+        Args:
+            db_manager: DatabaseManager used for reads
+            root: Dataset directory
+            feature_version: Feature version to export
+            columns: Column names / feature sets to export (None for all features)
+            symbols_per_batch: Symbols pulled per COPY, bounding memory use
+        """
+        _require_pyarrow()
+        self.db_manager = db_manager
+        self.root = Path(root)
+        self.feature_version = feature_version
+        self.columns = resolve_columns(columns)
+        self.symbols_per_batch = symbols_per_batch
+        self.reader = FeatureReader(db_manager)
+
+    def load_manifest(self) -> Dict[str, Any]:
+        path = self.root / MANIFEST_FILE
+        if not path.exists():
+            return {'watermark': None, 'feature_version': self.feature_version, 'partitions': {}}
+        with open(path) as f:
+            return json.load(f)
+
+    def _save_manifest(self, manifest: Dict[str, Any]):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.root / (MANIFEST_FILE + '.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.root / MANIFEST_FILE)
+
+    def _updated_symbols(self, watermark: Optional[datetime]) -> List[str]:
+        query = "SELECT DISTINCT symbol FROM feature_engineered_data WHERE feature_version = %s"
+        params: list = [self.feature_version]
+        if watermark is not None:
+            query += " AND updated_at >= %s"
+            params.append(watermark)
+        with self.db_manager.get_read_connection_context() as conn:
+            with conn.cursor() as cur:
+                cur.execute(query + " ORDER BY symbol", params)
+                return [row[0] for row in cur.fetchall()]
+
+    def export(self, full: bool = False) -> Dict[str, Any]:
+        """
+        Export rows updated since the last run (or everything when ``full``).
+
+        Returns:
+            Dictionary with exported row, partition and symbol counts and the new watermark
+        """
+        manifest = self.load_manifest()
+        if full or manifest.get('feature_version') != self.feature_version:
+            manifest = {'watermark': None, 'feature_version': self.feature_version, 'partitions': {}}
+        watermark = pd.Timestamp(manifest['watermark']).to_pydatetime() if manifest['watermark'] else None
+
+        symbols = self._updated_symbols(watermark)
+        rows = 0
+        partitions = 0
+        new_watermark = watermark
+        for i in range(0, len(symbols), self.symbols_per_batch):
+            batch = symbols[i:i + self.symbols_per_batch]
+            df = self.reader.read(batch, columns=self.columns + ['updated_at'],
+                                  feature_version=self.feature_version, updated_after=watermark)
+            if df.empty:
+                continue
+            rows += len(df)
+            batch_max = df['updated_at'].max().to_pydatetime()
+            new_watermark = batch_max if new_watermark is None else max(new_watermark, batch_max)
+            partitions += self._write_batch(df.drop(columns=['updated_at']), manifest)
+
+        if new_watermark is not None:
+            manifest['watermark'] = new_watermark.isoformat()
+        self._save_manifest(manifest)
+        logger.info(f"Exported {rows} feature rows into {partitions} partitions "
+                    f"({len(symbols)} symbols, watermark {manifest['watermark']})")
+        return {'rows': rows, 'partitions': partitions, 'symbols': len(symbols),
+                'watermark': manifest['watermark']}
+
+    def _write_batch(self, df: pd.DataFrame, manifest: Dict[str, Any]) -> int:
+        timestamps = df['timestamp'].dt
+        keys = pd.DataFrame({'symbol': df['symbol'].astype(str), 'year': timestamps.year,
+                             'month': timestamps.month})
+        written = 0
+        for (symbol, year, month), index in keys.groupby(PARTITION_COLUMNS, sort=False).groups.items():
+            part = df.loc[index].drop(columns=['symbol'])
+            self._write_partition(symbol, int(year), int(month), part, manifest)
+            written += 1
+        return written
+
+    def _write_partition(self, symbol: str, year: int, month: int, part: pd.DataFrame,
+                         manifest: Dict[str, Any]):
+        """Merge ``part`` into the partition file, replacing rows with the same timestamp."""
+        directory = _partition_dir(self.root, symbol, year, month)
+        path = directory / 'part-0.parquet'
+        if path.exists():
+            existing = pq.read_table(path).to_pandas()
+            part = pd.concat([existing, part], ignore_index=True)
+            part = part.drop_duplicates(subset=['timestamp'], keep='last')
+        part = part.sort_values('timestamp').reset_index(drop=True)
+
+        directory.mkdir(parents=True, exist_ok=True)
+        tmp = directory / 'part-0.parquet.tmp'
+        pq.write_table(pa.Table.from_pandas(part, preserve_index=False), tmp,
+                       compression='zstd', write_statistics=True)
+        os.replace(tmp, path)
+
+        manifest['partitions'][str(path.relative_to(self.root))] = {
+            'symbol': symbol,
+            'year': year,
+            'month': month,
+            'rows': len(part),
+            'min_timestamp': part['timestamp'].min().isoformat(),
+            'max_timestamp': part['timestamp'].max().isoformat(),
+            'columns': _column_stats(part.drop(columns=['timestamp'])),
+        }
+
+
+class FeatureParquetReader:
+    """
+    Partition- and column-pruned reads of an exported feature dataset.
+
+    Example:
+        >>> reader = FeatureParquetReader('data/features')
+        >>> df = reader.read(['AAPL', 'MSFT'], columns=['rsi_family'], start=datetime(2024, 1, 1))
+        >>> tensor = reader.to_tensor(['AAPL', 'MSFT'], columns=['returns', 'rsi_1d'])
+        >>> tensor.values.shape
+        (2, 3120, 2)
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        _require_pyarrow()
+        self.root = Path(root)
+
+    def partition_files(self, symbols: Optional[Sequence[str]] = None, start: datetime = None,
+                        end: datetime = None) -> List[Path]:
+        """List partition files that can hold rows for ``symbols`` between ``start`` and ``end``."""
+        first = (start.year, start.month) if start is not None else None
+        last = (end.year, end.month) if end is not None else None
+        wanted = set(symbols) if symbols is not None else None
+
+        files = []
+        for symbol_dir in sorted(self.root.glob('symbol=*')):
+            if wanted is not None and symbol_dir.name.split('=', 1)[1] not in wanted:
+                continue
+            for month_dir in sorted(symbol_dir.glob('year=*/month=*')):
+                key = (int(month_dir.parent.name.split('=')[1]), int(month_dir.name.split('=')[1]))
+                if (first is not None and key < first) or (last is not None and key > last):
+                    continue
+                files.extend(sorted(month_dir.glob('*.parquet')))
+        return files
+
+    def read(self, symbols: Optional[Sequence[str]] = None, columns: ColumnSpec = None,
+             start: datetime = None, end: datetime = None) -> pd.DataFrame:
+        """
+        Read the requested columns for ``symbols`` between ``start`` and ``end``.
+
+        Returns:
+            DataFrame ordered by symbol and timestamp with a categorical symbol
+        """
+        if isinstance(symbols, str):
+            symbols = [symbols]
+        files = self.partition_files(symbols, start, end)
+        wanted = [col for col in resolve_columns(columns) if col != 'symbol']
+        if not files:
+            return pd.DataFrame(columns=['symbol'] + wanted)
+
+        dataset = ds.dataset([str(f) for f in files], format='parquet',
+                             partitioning=ds.partitioning(pa.schema([('symbol', pa.string())]), flavor='hive'),
+                             partition_base_dir=str(self.root))
+        available = set(dataset.schema.names)
+        projection = ['symbol'] + [col for col in wanted if col in available]
+
+        row_filter = None
+        if start is not None:
+            row_filter = ds.field('timestamp') >= pa.scalar(pd.Timestamp(start))
+        if end is not None:
+            upper = ds.field('timestamp') <= pa.scalar(pd.Timestamp(end))
+            row_filter = upper if row_filter is None else row_filter & upper
+
+        df = dataset.to_table(columns=projection, filter=row_filter).to_pandas()
+        df['symbol'] = df['symbol'].astype('category')
+        return df.sort_values(KEY_COLUMNS).reset_index(drop=True)
+
+    def to_tensor(self, symbols: Union[str, Sequence[str]], columns: ColumnSpec = None, start: datetime = None,
+                  end: datetime = None, dtype=np.float32) -> FeatureTensor:
+        """
+        Stack features into a (symbols x time x features) array.
+
+        Timestamps are the union across symbols; a symbol without a row at a
+        timestamp gets NaN there.
+        """
+        if isinstance(symbols, str):
+            symbols = [symbols]
+        df = self.read(symbols, columns, start, end)
+        features = [col for col in df.columns if col not in KEY_COLUMNS
+                    and (pd.api.types.is_numeric_dtype(df[col]) or pd.api.types.is_bool_dtype(df[col]))]
+        timestamps = pd.DatetimeIndex(df['timestamp'].unique()).sort_values()
+        symbols = list(symbols)
+
+        values = np.full((len(symbols), len(timestamps), len(features)), np.nan, dtype=dtype)
+        symbol_idx = pd.Index(symbols).get_indexer(df['symbol'].astype(str))
+        time_idx = timestamps.get_indexer(df['timestamp'])
+        values[symbol_idx, time_idx, :] = df[features].to_numpy(dtype=dtype, na_value=np.nan)
+        return FeatureTensor(values, symbols, timestamps, features)
@@ -0,0 +1,275 @@
+"""
+Typed, column-projected reads of the feature_engineered_data table.
+
+Callers name the columns (or a feature set) they need; only those columns are
+selected, streamed out of PostgreSQL with ``COPY ... TO STDOUT`` and parsed
+straight into compact dtypes: float32 features, float64 OHLCV, int8 calendar
+fields, bool flags and a categorical ``symbol``. Column names come from the
+live table, so schema drift surfaces as a warning instead of misaligned data.
+"""
+
+import io
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+import pandas as pd
+
+from ..processors.feature_registry import FEATURE_REGISTRY
+from ...utils.logging_config import get_combined_logger
+
+logger = get_combined_logger("mltrading.data.feature_reader")
+
+FEATURE_TABLE = 'feature_engineered_data'
+
+# Column order of feature_engineered_data
+FEATURE_TABLE_COLUMNS = [
+    'id', 'symbol', 'timestamp', 'open', 'high', 'low', 'close', 'volume',
+    'returns', 'log_returns', 'high_low_pct', 'open_close_pct', 'price_acceleration', 'returns_sign',
+    'returns_squared', 'realized_vol_short', 'realized_vol_med', 'realized_vol_long', 'gk_volatility',
+    'vol_of_vol',
+    'price_ma_short', 'price_ma_med', 'price_ma_long', 'price_to_ma_short', 'price_to_ma_med',
+    'price_to_ma_long', 'ma_short_to_med', 'ma_med_to_long',
+    'volume_ma', 'volume_ratio', 'log_volume', 'vpt', 'vpt_ma', 'vpt_normalized', 'mfi',
+    'rsi_1d', 'rsi_3d', 'rsi_1w', 'rsi_2w', 'rsi_ema',
+    'hour', 'day_of_week', 'date', 'hour_sin', 'hour_cos', 'dow_sin', 'dow_cos',
+    'is_market_open', 'is_morning', 'is_afternoon', 'hours_since_open', 'hours_to_close',
+    'returns_from_daily_open',
+    'intraday_high', 'intraday_low', 'intraday_range_pct', 'position_in_range', 'overnight_gap',
+    'dist_from_intraday_high', 'dist_from_intraday_low',
+    'returns_lag_1', 'vol_lag_1', 'volume_ratio_lag_1', 'returns_lag_2', 'vol_lag_2',
+    'volume_ratio_lag_2', 'returns_lag_4', 'vol_lag_4', 'volume_ratio_lag_4', 'returns_lag_8',
+    'vol_lag_8', 'volume_ratio_lag_8', 'returns_lag_24', 'vol_lag_24', 'volume_ratio_lag_24',
+    'returns_mean_6h', 'returns_std_6h', 'returns_skew_6h', 'returns_kurt_6h', 'price_momentum_6h',
+    'returns_mean_12h', 'returns_std_12h', 'returns_skew_12h', 'returns_kurt_12h',
+    'price_momentum_12h', 'returns_mean_24h', 'returns_std_24h', 'returns_skew_24h',
+    'returns_kurt_24h', 'price_momentum_24h',
+    'bb_upper', 'bb_lower', 'bb_position', 'bb_squeeze',
+    'macd', 'macd_signal', 'macd_histogram', 'macd_normalized',
+    'atr', 'atr_normalized', 'williams_r',
+    'source', 'feature_version', 'created_at', 'updated_at',
+    'vol_ratio_short_med', 'vol_ratio_med_long'
+]
+
+KEY_COLUMNS = ['symbol', 'timestamp']
+# Prices and volume stay float64 so P&L and volume arithmetic on them is exact
+FLOAT64_COLUMNS = {'open', 'high', 'low', 'close', 'volume'}
+INT_COLUMNS = {'id': 'int32', 'hour': 'int8', 'day_of_week': 'int8'}
+BOOL_COLUMNS = {'is_market_open', 'is_morning', 'is_afternoon'}
+CATEGORY_COLUMNS = {'symbol', 'source', 'feature_version', 'date'}
+TIMESTAMP_COLUMNS = {'timestamp', 'created_at', 'updated_at'}
+METADATA_COLUMNS = ['id', 'date', 'source', 'feature_version', 'created_at', 'updated_at']
+
+# Named column groups callers can request instead of listing columns (the feature registry's groups)
+FEATURE_SETS: Dict[str, List[str]] = {
+    'ohlcv': ['open', 'high', 'low', 'close', 'volume'],
+    **{group: [col for col in columns if col not in METADATA_COLUMNS]
+       for group, columns in FEATURE_REGISTRY.feature_sets().items()},
+}
+
+ColumnSpec = Union[None, str, Iterable[str]]
+
+
+def feature_dtype(column: str) -> str:
+    """Compact dtype used when materializing ``column``."""
+    if column in FLOAT64_COLUMNS:
+        return 'float64'
+    if column in INT_COLUMNS:
+        return INT_COLUMNS[column]
+    if column in BOOL_COLUMNS:
+        return 'bool'
+    if column in CATEGORY_COLUMNS:
+        return 'category'
+    if column in TIMESTAMP_COLUMNS:
+        return 'datetime64[ns]'
+    return 'float32'
+
+
+def resolve_columns(columns: ColumnSpec) -> List[str]:
+    """
+    Expand a column spec into an ordered, de-duplicated column list.
+
+    Args:
+        columns: None (all feature columns), a feature set name, or an iterable
+            mixing column names and feature set names
+
+    Returns:
+        Column names in table order, always starting with symbol and timestamp
+    """
+    if columns is None:
+        wanted = [col for col in FEATURE_TABLE_COLUMNS if col not in METADATA_COLUMNS]
+    else:
+        if isinstance(columns, str):
+            columns = [columns]
+        wanted = []
+        for name in columns:
+            wanted.extend(FEATURE_SETS.get(name, [name]))
+
+    wanted = set(wanted) | set(KEY_COLUMNS)
+    ordered = [col for col in FEATURE_TABLE_COLUMNS if col in wanted]
+    # Columns added to the table after FEATURE_TABLE_COLUMNS was written
+    ordered.extend(sorted(wanted - set(FEATURE_TABLE_COLUMNS)))
+    return ordered
+
+
+def compact_feature_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert an already-materialized feature frame to the compact dtypes."""
+    converted = {}
+    for col in df.columns:
+        dtype = feature_dtype(col)
+        if dtype == 'bool':
+            converted[col] = df[col].fillna(0).astype(bool)
+        elif dtype == 'datetime64[ns]':
+            converted[col] = pd.to_datetime(df[col])
+        elif dtype.startswith('int') and df[col].isna().any():
+            converted[col] = df[col].astype('float32')
+        else:
+            converted[col] = df[col].astype(dtype)
+    return pd.DataFrame(converted, index=df.index)
+
+
+class FeatureReader:
+    """
+    Column-projected, dtype-compact reader for feature_engineered_data.
+
+    Example:
+        >>> reader = FeatureReader(get_db_manager())
+        >>> df = reader.read(['AAPL', 'MSFT'], columns=['rsi_family', 'close'], days=365)
+        >>> df.dtypes['rsi_1d'], df.dtypes['symbol']
+        (dtype('float32'), CategoricalDtype(...))
+    """
+
+    def __init__(self, db_manager, table: str = FEATURE_TABLE, schema_ttl: float = 300):
+        """
+        Initialize reader.
+
+        Args:
+            db_manager: DatabaseManager used for read connections
+            table: Table to read from
+            schema_ttl: Seconds the live column list is cached for
+        """
+        self.db_manager = db_manager
+        self.table = table
+        self.schema_ttl = schema_ttl
+        self._columns: Optional[List[str]] = None
+        self._columns_loaded = 0.0
+        self._lock = threading.Lock()
+
+    def _table_columns(self, cur) -> List[str]:
+        with self._lock:
+            if self._columns is not None and time.monotonic() - self._columns_loaded <= self.schema_ttl:
+                return self._columns
+        cur.execute("""
+            SELECT column_name FROM information_schema.columns
+            WHERE table_name = %s
+            ORDER BY ordinal_position
+        """, (self.table,))
+        columns = [row[0] for row in cur.fetchall()]
+        with self._lock:
+            self._columns = columns
+            self._columns_loaded = time.monotonic()
+        return columns
+
+    @staticmethod
+    def _select_expression(column: str) -> str:
+        if column in BOOL_COLUMNS:
+            # Stored as INTEGER 0/1; NULL counts as False so the column can be a plain bool
+            return f'(COALESCE("{column}", 0) <> 0) AS "{column}"'
+        return f'"{column}"'
+
+    def build_query(self, cur, symbols: Optional[Sequence[str]], columns: List[str],
+                    feature_version: Optional[str], start: Optional[datetime], end: Optional[datetime],
+                    days: Optional[int], updated_after: Optional[datetime] = None) -> str:
+        """Build the bound SELECT for the projection (COPY cannot take parameters)."""
+        conditions = []
+        params: list = []
+        if symbols is not None:
+            conditions.append('symbol = ANY(%s)')
+            params.append(list(symbols))
+        if feature_version is not None:
+            conditions.append('feature_version = %s')
+            params.append(feature_version)
+        if days is not None:
+            conditions.append("timestamp >= NOW() - make_interval(days => %s)")
+            params.append(int(days))
+        if start is not None:
+            conditions.append('timestamp >= %s')
+            params.append(start)
+        if end is not None:
+            conditions.append('timestamp <= %s')
+            params.append(end)
+        if updated_after is not None:
+            # Inclusive so rows sharing the watermark timestamp are never skipped
+            conditions.append('updated_at >= %s')
+            params.append(updated_after)
+
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ''
+        query = (f"SELECT {', '.join(self._select_expression(col) for col in columns)} "
+                 f"FROM {self.table}{where} ORDER BY symbol, timestamp")
+        sql = cur.mogrify(query, params)
+        return sql.decode() if isinstance(sql, bytes) else sql
+
+    def read(self, symbols: Union[None, str, Sequence[str]], columns: ColumnSpec = None,
+             feature_version: Optional[str] = '3.0', start: datetime = None, end: datetime = None,
+             days: int = None, updated_after: datetime = None) -> pd.DataFrame:
+        """
+        Read the named columns for ``symbols`` as a compact, typed frame.
+
+        Args:
+            symbols: Symbol or list of symbols (None for all)
+            columns: Column names and/or FEATURE_SETS names (None for all feature columns)
+            feature_version: Feature version to read (None for any)
+            start: Inclusive lower timestamp bound
+            end: Inclusive upper timestamp bound
+            days: Only rows from the last ``days`` days
+            updated_after: Only rows with ``updated_at`` at or after this time
+
+        Returns:
+            DataFrame ordered by symbol and timestamp
+        """
+        if isinstance(symbols, str):
+            symbols = [symbols]
+        requested = resolve_columns(columns)
+        buffer = io.StringIO()
+
+        with self.db_manager.get_read_connection_context() as conn:
+            with conn.cursor() as cur:
+                available = set(self._table_columns(cur))
+                missing = [col for col in requested if col not in available]
+                if missing:
+                    logger.warning(f"Columns not in {self.table}, skipped: {missing}")
+                selected = [col for col in requested if col in available]
+                sql = self.build_query(cur, symbols, selected, feature_version, start, end, days,
+                                       updated_after)
+                cur.copy_expert(f"COPY ({sql}) TO STDOUT WITH (FORMAT csv, HEADER true)", buffer)
+
+        buffer.seek(0)
+        return self.parse_csv(buffer, selected)
+
+    @staticmethod
+    def parse_csv(buffer, columns: List[str]) -> pd.DataFrame:
+        """Parse COPY CSV output straight into compact dtypes."""
+        dtypes = {}
+        parse_dates = []
+        for col in columns:
+            dtype = feature_dtype(col)
+            if dtype == 'datetime64[ns]':
+                parse_dates.append(col)
+            else:
+                dtypes[col] = dtype
+
+        try:
+            df = pd.read_csv(buffer, dtype=dtypes, parse_dates=parse_dates,
+                             true_values=['t'], false_values=['f'])
+        except ValueError:
+            # NULLs in an integer column: read it as float32 instead
+            buffer.seek(0)
+            relaxed = {col: ('float32' if dtype.startswith('int') else dtype) for col, dtype in dtypes.items()}
+            df = pd.read_csv(buffer, dtype=relaxed, parse_dates=parse_dates,
+                             true_values=['t'], false_values=['f'])
+
+        for col in parse_dates:
+            if not pd.api.types.is_datetime64_any_dtype(df[col]):
+                df[col] = pd.to_datetime(df[col])
+        return df
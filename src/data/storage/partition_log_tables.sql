@@ -0,0 +1,82 @@
+-- Partition log tables by day and create the per-minute log rollups table
+-- Run after create_log_tables.sql through DatabaseLogManager.migrate_log_tables
+-- (python scripts/cleanup_logs.py migrate), which then runs create_log_tables.sql
+-- again to recreate its indexes (on the partitioned parents) and the
+-- recent_system_activity view, and backfills log_rollups from the existing rows.
+-- Log statistics read only the rollups once they have rows, so running this file
+-- by hand must be followed by DatabaseLogManager.backfill_rollups(since=<oldest log>).
+--
+-- Retention then drops whole daily partitions (DatabaseLogManager.cleanup_old_logs)
+-- instead of DELETE + VACUUM. Future partitions are pre-created by
+-- DatabaseLogManager.ensure_log_partitions; rows outside them land in <table>_default.
+-- Safe to re-run: tables that are missing or already partitioned are skipped.
+
+DROP VIEW IF EXISTS recent_system_activity;
+
+DO $$
+DECLARE
+    log_table TEXT;
+    first_day DATE;
+    day DATE;
+BEGIN
+    FOREACH log_table IN ARRAY ARRAY['system_logs', 'trading_events', 'performance_logs',
+                                     'error_logs', 'user_action_logs', 'data_collection_logs']
+    LOOP
+        IF NOT EXISTS (SELECT 1 FROM pg_class WHERE relname = log_table AND relkind = 'r') THEN
+            CONTINUE;
+        END IF;
+
+        EXECUTE format('ALTER TABLE %I RENAME TO %I', log_table, log_table || '_unpartitioned');
+        -- The primary key of a partitioned table must include the partition column
+        EXECUTE format('CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS, PRIMARY KEY (id, timestamp)) '
+                       'PARTITION BY RANGE (timestamp)', log_table, log_table || '_unpartitioned');
+        EXECUTE format('CREATE TABLE %I PARTITION OF %I DEFAULT', log_table || '_default', log_table);
+
+        EXECUTE format('SELECT COALESCE(MIN(timestamp AT TIME ZONE ''UTC'')::date, CURRENT_DATE) FROM %I',
+                       log_table || '_unpartitioned') INTO first_day;
+        day := first_day;
+        WHILE day <= CURRENT_DATE + 7 LOOP
+            EXECUTE format('CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                           log_table || '_p' || to_char(day, 'YYYYMMDD'), log_table,
+                           day::text || ' 00:00:00+00', (day + 1)::text || ' 00:00:00+00');
+            day := day + 1;
+        END LOOP;
+
+        EXECUTE format('INSERT INTO %I SELECT * FROM %I', log_table, log_table || '_unpartitioned');
+        -- Keep the id sequence when the old table goes
+        EXECUTE format('ALTER SEQUENCE %I OWNED BY %I.id', log_table || '_id_seq', log_table);
+        EXECUTE format('DROP TABLE %I', log_table || '_unpartitioned');
+    END LOOP;
+END $$;
+
+-- Per-minute aggregates maintained by the log shipper (src/utils/log_rollups.py)
+CREATE TABLE IF NOT EXISTS log_rollups (
+    bucket TIMESTAMP WITH TIME ZONE NOT NULL, -- start of the UTC minute
+    source VARCHAR(50) NOT NULL, -- source log table
+    component VARCHAR(100) NOT NULL DEFAULT '',
+    level VARCHAR(20) NOT NULL DEFAULT '',
+    operation VARCHAR(100) NOT NULL DEFAULT '',
+    event_count BIGINT NOT NULL DEFAULT 0,
+    error_count BIGINT NOT NULL DEFAULT 0,
+    duration_count BIGINT NOT NULL DEFAULT 0,
+    duration_sum_ms DOUBLE PRECISION NOT NULL DEFAULT 0,
+    duration_min_ms DOUBLE PRECISION,
+    duration_max_ms DOUBLE PRECISION,
+    duration_buckets BIGINT[] NOT NULL, -- counts per ROLLUP_DURATION_BUCKETS_MS bound, then +Inf
+    PRIMARY KEY (bucket, source, component, level, operation)
+) PARTITION BY RANGE (bucket);
+
+CREATE TABLE IF NOT EXISTS log_rollups_default PARTITION OF log_rollups DEFAULT;
+
+DO $$
+DECLARE
+    day DATE;
+BEGIN
+    FOR day IN SELECT generate_series(CURRENT_DATE, CURRENT_DATE + 7, INTERVAL '1 day')::date LOOP
+        EXECUTE format('CREATE TABLE IF NOT EXISTS %I PARTITION OF log_rollups FOR VALUES FROM (%L) TO (%L)',
+                       'log_rollups_p' || to_char(day, 'YYYYMMDD'),
+                       day::text || ' 00:00:00+00', (day + 1)::text || ' 00:00:00+00');
+    END LOOP;
+END $$;
+
+CREATE INDEX IF NOT EXISTS idx_log_rollups_source_bucket ON log_rollups(source, bucket);
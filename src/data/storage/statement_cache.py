@@ -0,0 +1,300 @@
+"""
+Server-side prepared statement registry for hot read paths.
+
+Statements are registered once by name and PREPAREd lazily on each pooled
+connection the first time they run there, so PostgreSQL parses and plans
+them once per connection instead of once per call. Per-statement call
+counts and latencies are kept for monitoring.
+"""
+
+import hashlib
+import re
+import threading
+import time
+import weakref
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import psycopg2
+
+from ...utils.logging_config import get_combined_logger
+from ...utils.metrics import Histogram
+
+logger = get_combined_logger("mltrading.data.statement_cache", enable_database_logging=False)
+
+# SQLSTATE for "prepared statement does not exist" (e.g. after DISCARD ALL or a server-side reset)
+INVALID_SQL_STATEMENT_NAME = '26000'
+
+_TOKEN = re.compile(r"'(?:[^']|'')*'|%%|%s")
+
+
+def to_server_placeholders(sql: str) -> Tuple[str, int]:
+    """
+    Convert psycopg2 ``%s`` placeholders to PostgreSQL ``$n`` parameters.
+
+    Raises:
+        ValueError: When a placeholder sits inside a string literal (e.g.
+            ``INTERVAL '%s days'``), which only works with client-side binding
+
+    Returns:
+        Tuple of (converted SQL, number of parameters)
+    """
+    count = 0
+
+    def replace(match):
+        nonlocal count
+        token = match.group(0)
+        if token.startswith("'"):
+            if '%s' in token:
+                raise ValueError("placeholder inside string literal cannot be prepared")
+            return token.replace('%%', '%')
+        if token == '%%':
+            return '%'
+        count += 1
+        return f'${count}'
+
+    return _TOKEN.sub(replace, sql), count
+
+
+class _StatementStats:
+    """Call counters for one registered statement"""
+
+    __slots__ = ('calls', 'prepares', 'unprepared_calls', 'errors', 'latency')
+
+    def __init__(self):
+        self.calls = 0
+        self.prepares = 0
+        self.unprepared_calls = 0
+        self.errors = 0
+        self.latency = Histogram()
+
+
+class PreparedStatementRegistry:
+    """
+    Registry of named statements prepared per connection.
+
+    Example:
+        >>> registry = PreparedStatementRegistry()
+        >>> registry.register('stock_info', "SELECT * FROM stock_info WHERE symbol = %s")
+        >>> with conn.cursor() as cur:
+        ...     registry.execute(cur, 'stock_info', ('AAPL',))
+        ...     row = cur.fetchone()
+        >>> registry.get_stats()['stock_info']['calls']
+        1
+    """
+
+    def __init__(self, max_auto_statements: int = 128):
+        """
+        Initialize registry.
+
+        Args:
+            max_auto_statements: Cap on statements registered implicitly via ``execute_sql``
+        """
+        self.max_auto_statements = max_auto_statements
+        self._statements: Dict[str, Dict[str, Any]] = {}
+        self._stats: Dict[str, _StatementStats] = {}
+        self._auto_names: Dict[str, str] = {}
+        self._unpreparable = set()
+        # Connection -> names prepared on it / names its server rejected; entries vanish with the connection
+        self._prepared = weakref.WeakKeyDictionary()
+        self._rejected = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def register(self, name: str, sql: str):
+        """
+        Register a statement under ``name``.
+
+        Args:
+            name: Server-side statement name (must be a valid identifier)
+            sql: Query text using psycopg2 ``%s`` placeholders
+        """
+        server_sql, param_count = to_server_placeholders(sql)
+        with self._lock:
+            self._statements[name] = {'sql': sql, 'server_sql': server_sql, 'param_count': param_count}
+            self._stats.setdefault(name, _StatementStats())
+
+    def is_registered(self, name: str) -> bool:
+        return name in self._statements
+
+    def _prepared_on(self, conn) -> set:
+        return self._names_on(self._prepared, conn)
+
+    def _rejected_on(self, conn) -> set:
+        return self._names_on(self._rejected, conn)
+
+    def _names_on(self, names: weakref.WeakKeyDictionary, conn) -> set:
+        with self._lock:
+            try:
+                return names.setdefault(conn, set())
+            except TypeError:
+                # Connection type without weakref support: never cache plans on it
+                return set()
+
+    def _forget(self, conn):
+        with self._lock:
+            try:
+                self._prepared.pop(conn, None)
+            except TypeError:
+                pass
+
+    @staticmethod
+    def _is_idle(conn) -> bool:
+        try:
+            return conn.get_transaction_status() == psycopg2.extensions.TRANSACTION_STATUS_IDLE
+        except Exception:
+            return False
+
+    def _prepare(self, cursor, name: str, statement: Dict[str, Any]) -> bool:
+        """
+        PREPARE on the cursor's connection and commit so a later rollback keeps it.
+
+        A PREPARE the server rejects is rolled back to a savepoint, leaving the
+        connection usable, and not attempted on that connection again.
+
+        Returns:
+            True if the statement is now prepared on the connection
+        """
+        conn = cursor.connection
+        savepoint = not getattr(conn, 'autocommit', False)
+        try:
+            if savepoint:
+                cursor.execute("SAVEPOINT prepare_statement")
+            cursor.execute(f"PREPARE {name} AS {statement['server_sql']}")
+        except psycopg2.Error as e:
+            if savepoint:
+                cursor.execute("ROLLBACK TO SAVEPOINT prepare_statement")
+            self._rejected_on(conn).add(name)
+            logger.warning(f"Could not prepare statement {name}, running it unprepared on this connection: {e}")
+            return False
+        conn.commit()
+        self._prepared_on(conn).add(name)
+        self._stats[name].prepares += 1
+        return True
+
+    def execute(self, cursor, name: str, params: Optional[Sequence[Any]] = None):
+        """
+        Execute a registered statement on ``cursor``.
+
+        The statement is prepared on the connection first if needed. Preparing
+        happens only when the connection has no open transaction; otherwise, or
+        when the server rejected the PREPARE, the plain SQL is executed so the
+        caller's transaction is left untouched. A statement the server lost is
+        prepared again only if the connection was idle before the EXECUTE;
+        inside an open transaction the error is raised to the caller.
+
+        Args:
+            cursor: psycopg2 cursor (any cursor_factory)
+            name: Registered statement name
+            params: Positional parameters
+        """
+        statement = self._statements[name]
+        stats = self._stats[name]
+        params = tuple(params or ())
+        conn = cursor.connection
+        was_idle = self._is_idle(conn)
+        start = time.perf_counter()
+
+        try:
+            if name not in self._prepared_on(conn):
+                if (name in self._rejected_on(conn) or not self._is_idle(conn)
+                        or not self._prepare(cursor, name, statement)):
+                    stats.unprepared_calls += 1
+                    cursor.execute(statement['sql'], params)
+                    return
+            self._execute_prepared(cursor, name, statement, params)
+        except psycopg2.Error as e:
+            if getattr(e, 'pgcode', None) != INVALID_SQL_STATEMENT_NAME:
+                stats.errors += 1
+                raise
+            self._forget(conn)
+            if not was_idle:
+                # The failed EXECUTE aborted the caller's transaction; rolling back here would
+                # discard their earlier work and let the rest of the unit commit on its own
+                stats.errors += 1
+                logger.warning(f"Prepared statement {name} missing inside an open transaction")
+                raise
+            # Server lost the statement (reset/DISCARD): prepare again once
+            logger.warning(f"Prepared statement {name} missing on connection, re-preparing")
+            conn.rollback()
+            if self._prepare(cursor, name, statement):
+                self._execute_prepared(cursor, name, statement, params)
+            else:
+                stats.unprepared_calls += 1
+                cursor.execute(statement['sql'], params)
+        finally:
+            stats.calls += 1
+            stats.latency.observe(time.perf_counter() - start)
+
+    @staticmethod
+    def _execute_prepared(cursor, name: str, statement: Dict[str, Any], params: tuple):
+        if statement['param_count']:
+            placeholders = ', '.join(['%s'] * statement['param_count'])
+            cursor.execute(f"EXECUTE {name} ({placeholders})", params)
+        else:
+            cursor.execute(f"EXECUTE {name}")
+
+    def execute_sql(self, cursor, sql: str, params: Optional[Sequence[Any]] = None):
+        """
+        Execute ad-hoc SELECT text through an implicitly registered statement.
+
+        Statements are named by a hash of their text. Non-SELECT text, named
+        parameters and anything past ``max_auto_statements`` run unprepared.
+
+        Args:
+            cursor: psycopg2 cursor
+            sql: Query text using ``%s`` placeholders
+            params: Positional parameters
+        """
+        normalized = ' '.join(sql.split())
+        name = self._auto_names.get(normalized)
+        if name is None:
+            if normalized in self._unpreparable or not self._can_auto_prepare(normalized, params):
+                cursor.execute(sql, params)
+                return
+            name = 'auto_' + hashlib.sha1(normalized.encode()).hexdigest()[:16]
+            try:
+                self.register(name, sql)
+            except ValueError:
+                with self._lock:
+                    if len(self._unpreparable) < self.max_auto_statements:
+                        self._unpreparable.add(normalized)
+                cursor.execute(sql, params)
+                return
+            with self._lock:
+                self._auto_names[normalized] = name
+        self.execute(cursor, name, params)
+
+    def _can_auto_prepare(self, normalized: str, params: Optional[Sequence[Any]]) -> bool:
+        """Only plain positional SELECTs whose parameters bind as scalars or arrays"""
+        if not normalized.upper().startswith(('SELECT', 'WITH')) or '%(' in normalized:
+            return False
+        if params is None and '%' in normalized:
+            # Without parameters psycopg2 sends the text verbatim, so '%' is not an escape
+            return False
+        if params is not None and (isinstance(params, dict) or any(isinstance(p, tuple) for p in params)):
+            # Tuples expand to IN-lists client-side; they have no server-side equivalent
+            return False
+        return len(self._auto_names) < self.max_auto_statements
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get per-statement call counts and latency.
+
+        Returns:
+            Dictionary keyed by statement name
+        """
+        with self._lock:
+            items = list(self._stats.items())
+        result = {}
+        for name, stats in items:
+            latency = stats.latency.snapshot()
+            result[name] = {
+                'calls': stats.calls,
+                'prepares': stats.prepares,
+                'unprepared_calls': stats.unprepared_calls,
+                'errors': stats.errors,
+                'avg_ms': latency['avg'] * 1000,
+                'max_ms': latency['max'] * 1000,
+                'p95_ms': stats.latency.quantile(0.95) * 1000,
+                'total_ms': latency['sum'] * 1000,
+            }
+        return result
@@ -4,6 +4,8 @@ Contains backtesting engine and utilities for testing trading strategies
 """
 
 from .backtest_engine import BacktestEngine, BacktestResult
+from .performance_analytics import PerformanceReport, analyze, equity_metrics
+from .trade_log import Trade, TradeLog
 
-__all__ = ['BacktestEngine', 'BacktestResult']
-
+__all__ = ['BacktestEngine', 'BacktestResult', 'PerformanceReport', 'analyze', 'equity_metrics',
+           'Trade', 'TradeLog']
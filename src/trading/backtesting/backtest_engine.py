@@ -3,13 +3,15 @@ Backtesting Engine
 Simulates strategy performance on historical data
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any
 import pandas as pd
 import numpy as np
 from pathlib import Path
 
+from .performance_analytics import analyze
+from .trade_log import Trade, TradeLog
 from ..strategies.base_strategy import BaseStrategy, StrategySignal, SignalType
 from ...utils.logging_config import get_combined_logger, log_operation
 from ...data.storage.database import DatabaseManager
@@ -17,19 +19,13 @@ from ...data.storage.database import DatabaseManager
 logger = get_combined_logger("mltrading.backtesting")
 
 
-@dataclass
-class Trade:
-    """Represents a completed trade"""
-    symbol: str
-    entry_time: datetime
-    exit_time: datetime
-    entry_price: float
-    exit_price: float
+@dataclass(slots=True)
+class BacktestPosition:
+    """An open position in a backtest"""
     quantity: int
-    pnl: float
-    return_pct: float
-    duration_hours: float
-    strategy: str
+    entry_price: float
+    entry_time: datetime
+    cost: float
 
 
 @dataclass
@@ -63,10 +59,21 @@ class BacktestResult:
     avg_position_size: float
 
     # Trade details
-    trades: List[Trade]
+    trades: TradeLog
     equity_curve: pd.Series
     drawdown_curve: pd.Series
 
+    # Extended analytics (see performance_analytics)
+    periods_per_year: float = 252.0
+    annual_return_pct: float = 0.0
+    sortino_ratio: float = 0.0
+    calmar_ratio: float = 0.0
+    max_drawdown_duration: int = 0
+    exposure_pct: float = 0.0
+    turnover: float = 0.0
+    annual_turnover: float = 0.0
+    rolling_sharpe: pd.Series = field(default_factory=lambda: pd.Series(dtype=float))
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization"""
         return {
@@ -89,7 +96,15 @@ class BacktestResult:
             'sharpe_ratio': self.sharpe_ratio,
             'volatility': self.volatility,
             'max_positions': self.max_positions,
-            'avg_position_size': self.avg_position_size
+            'avg_position_size': self.avg_position_size,
+            'periods_per_year': self.periods_per_year,
+            'annual_return_pct': self.annual_return_pct,
+            'sortino_ratio': self.sortino_ratio,
+            'calmar_ratio': self.calmar_ratio,
+            'max_drawdown_duration': self.max_drawdown_duration,
+            'exposure_pct': self.exposure_pct,
+            'turnover': self.turnover,
+            'annual_turnover': self.annual_turnover
         }
 
 
@@ -141,7 +156,7 @@ class BacktestEngine:
             with log_operation("load_historical_data", logger):
                 historical_data = {}
 
-                with self.db_manager.get_connection() as conn:
+                with self.db_manager.get_read_connection_context() as conn:
                     for symbol in symbols:
                         query = """
                         SELECT timestamp, open, high, low, close, volume
@@ -199,10 +214,11 @@ class BacktestEngine:
 
                 # Initialize backtest state
                 capital = self.initial_capital
-                positions = {}
-                trades = []
-                equity_curve = []
+                positions: Dict[str, BacktestPosition] = {}
+                trades = TradeLog()
+                equity_times = []
                 portfolio_values = []
+                position_counts = []
 
                 # Get all timestamps across all symbols
                 all_timestamps = set()
@@ -242,28 +258,28 @@ class BacktestEngine:
                         )
 
                         if trade_result:
-                            if 'trade' in trade_result:
-                                trades.append(trade_result['trade'])
+                            if trade_result['trade'] is not None:
+                                trades.append_trade(trade_result['trade'])
                             capital = trade_result['new_capital']
-                            positions = trade_result['positions']
 
                     # Calculate portfolio value
                     portfolio_value = self._calculate_portfolio_value(
                         capital, positions, current_data, timestamp
                     )
                     portfolio_values.append(portfolio_value)
-                    equity_curve.append((timestamp, portfolio_value))
+                    equity_times.append(timestamp)
+                    position_counts.append(len(positions))
 
                     # Update strategy positions
-                    for symbol, pos in positions.items():
-                        if symbol in current_data and not current_data[symbol].empty:
+                    for symbol in positions:
+                        if symbol in strategy.positions and symbol in current_data and not current_data[symbol].empty:
                             current_price = current_data[symbol]['close'].iloc[-1]
                             strategy.positions[symbol].current_price = current_price
 
                 # Calculate final results
                 result = self._calculate_results(
                     strategy, start_date, end_date, trades,
-                    equity_curve, portfolio_values
+                    equity_times, portfolio_values, position_counts
                 )
 
                 logger.info(f"Backtest completed: {result.total_trades} trades, "
@@ -278,7 +294,7 @@ class BacktestEngine:
     def _execute_signal(self,
                         signal: StrategySignal,
                         capital: float,
-                        positions: Dict[str, Any],
+                        positions: Dict[str, BacktestPosition],
                         market_data: Dict[str, pd.DataFrame],
                         timestamp: datetime) -> Optional[Dict[str, Any]]:
         """
@@ -287,7 +303,7 @@ class BacktestEngine:
         Args:
             signal: Trading signal
             capital: Available capital
-            positions: Current positions
+            positions: Current positions (updated in place)
             market_data: Current market data
             timestamp: Current timestamp
 
@@ -309,7 +325,6 @@ class BacktestEngine:
                 execution_price = current_price * (1 - self.slippage)
 
             new_capital = capital
-            new_positions = positions.copy()
             trade = None
 
             if signal.signal_type == SignalType.BUY:
@@ -326,27 +341,22 @@ class BacktestEngine:
 
                     if cost <= capital:
                         new_capital -= cost
-                        new_positions[symbol] = {
-                            'quantity': quantity,
-                            'entry_price': execution_price,
-                            'entry_time': timestamp,
-                            'cost': cost
-                        }
+                        positions[symbol] = BacktestPosition(quantity, execution_price, timestamp, cost)
                         logger.debug(f"Bought {quantity} {symbol} at ${execution_price:.2f}")
 
             elif signal.signal_type in [SignalType.SELL, SignalType.CLOSE_LONG]:
                 if symbol in positions:
                     pos = positions[symbol]
-                    quantity = pos['quantity']
-                    entry_price = pos['entry_price']
-                    entry_time = pos['entry_time']
+                    quantity = pos.quantity
+                    entry_price = pos.entry_price
+                    entry_time = pos.entry_time
 
                     proceeds = quantity * execution_price - self.commission
                     new_capital += proceeds
 
                     # Calculate PnL
-                    pnl = proceeds - pos['cost']
-                    return_pct = pnl / pos['cost'] * 100
+                    pnl = proceeds - pos.cost
+                    return_pct = pnl / pos.cost * 100
                     duration = (timestamp - entry_time).total_seconds() / 3600  # hours
 
                     trade = Trade(
@@ -362,12 +372,12 @@ class BacktestEngine:
                         strategy=signal.metadata.get('strategy', 'unknown') if signal.metadata else 'unknown'
                     )
 
-                    del new_positions[symbol]
+                    del positions[symbol]
                     logger.debug(f"Sold {quantity} {symbol} at ${execution_price:.2f}, PnL: ${pnl:.2f}")
 
             return {
                 'new_capital': new_capital,
-                'positions': new_positions,
+                'positions': positions,
                 'trade': trade
             }
 
@@ -377,7 +387,7 @@ class BacktestEngine:
 
     def _calculate_portfolio_value(self,
                                   capital: float,
-                                  positions: Dict[str, Any],
+                                  positions: Dict[str, BacktestPosition],
                                   market_data: Dict[str, pd.DataFrame],
                                   timestamp: datetime) -> float:
         """Calculate total portfolio value"""
@@ -386,7 +396,7 @@ class BacktestEngine:
         for symbol, pos in positions.items():
             if symbol in market_data and not market_data[symbol].empty:
                 current_price = market_data[symbol]['close'].iloc[-1]
-                position_value = pos['quantity'] * current_price
+                position_value = pos.quantity * current_price
                 total_value += position_value
 
         return total_value
@@ -395,55 +405,32 @@ class BacktestEngine:
                            strategy: BaseStrategy,
                            start_date: datetime,
                            end_date: datetime,
-                           trades: List[Trade],
-                           equity_curve: List[Tuple[datetime, float]],
-                           portfolio_values: List[float]) -> BacktestResult:
-        """Calculate comprehensive backtest results"""
-
-        # Convert equity curve to pandas Series
-        if equity_curve:
-            equity_series = pd.Series(
-                [val for _, val in equity_curve],
-                index=[ts for ts, _ in equity_curve]
-            )
+                           trades: TradeLog,
+                           equity_times: List[datetime],
+                           portfolio_values: List[float],
+                           position_counts: List[int] = None) -> BacktestResult:
+        """Calculate comprehensive backtest results from the trade and equity arrays"""
+
+        # Equity curve
+        if portfolio_values:
+            equity = np.asarray(portfolio_values, dtype=float)
+            equity_index = pd.Index(equity_times)
         else:
-            equity_series = pd.Series([self.initial_capital])
+            equity = np.array([self.initial_capital], dtype=float)
+            equity_index = pd.RangeIndex(1)
+            equity_times = None
+            position_counts = [0]
+        equity_series = pd.Series(equity, index=equity_index)
+
+        report = analyze(equity, equity_times, trades, position_counts)
 
         # Basic metrics
-        final_capital = equity_series.iloc[-1] if not equity_series.empty else self.initial_capital
+        final_capital = float(equity[-1])
         total_return = final_capital - self.initial_capital
         total_return_pct = (total_return / self.initial_capital) * 100
 
-        # Trade statistics
-        total_trades = len(trades)
-        winning_trades = len([t for t in trades if t.pnl > 0])
-        losing_trades = len([t for t in trades if t.pnl < 0])
-        win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
-
-        wins = [t.pnl for t in trades if t.pnl > 0]
-        losses = [t.pnl for t in trades if t.pnl < 0]
-
-        avg_win = np.mean(wins) if wins else 0
-        avg_loss = np.mean(losses) if losses else 0
-
-        profit_factor = abs(sum(wins) / sum(losses)) if losses and sum(losses) != 0 else float('inf')
-
-        # Risk metrics
-        returns = equity_series.pct_change().dropna()
-        volatility = returns.std() * np.sqrt(252) * 100  # Annualized volatility
-
-        # Sharpe ratio (assuming 0% risk-free rate)
-        sharpe_ratio = (returns.mean() * 252) / (returns.std() * np.sqrt(252)) if returns.std() != 0 else 0
-
-        # Drawdown calculation
-        rolling_max = equity_series.expanding().max()
-        drawdown = equity_series - rolling_max
-        max_drawdown = drawdown.min()
-        max_drawdown_pct = (max_drawdown / rolling_max[drawdown.idxmin()]) * 100 if not rolling_max.empty else 0
-
-        # Position statistics
-        max_positions = 1  # Simplified for now
-        avg_position_size = np.mean([abs(t.quantity * t.entry_price) for t in trades]) if trades else 0
+        drawdown = pd.Series(equity - np.maximum.accumulate(equity), index=equity_index)
+        rolling_sharpe = pd.Series(report.rolling_sharpe, index=equity_index[1:])
 
         return BacktestResult(
             strategy_name=strategy.name,
@@ -453,20 +440,29 @@ class BacktestEngine:
             final_capital=final_capital,
             total_return=total_return,
             total_return_pct=total_return_pct,
-            total_trades=total_trades,
-            winning_trades=winning_trades,
-            losing_trades=losing_trades,
-            win_rate=win_rate,
-            avg_win=avg_win,
-            avg_loss=avg_loss,
-            profit_factor=profit_factor,
-            max_drawdown=max_drawdown,
-            max_drawdown_pct=max_drawdown_pct,
-            sharpe_ratio=sharpe_ratio,
-            volatility=volatility,
-            max_positions=max_positions,
-            avg_position_size=avg_position_size,
+            total_trades=report.total_trades,
+            winning_trades=report.winning_trades,
+            losing_trades=report.losing_trades,
+            win_rate=report.win_rate,
+            avg_win=report.avg_win,
+            avg_loss=report.avg_loss,
+            profit_factor=report.profit_factor,
+            max_drawdown=report.max_drawdown,
+            max_drawdown_pct=report.max_drawdown_pct,
+            sharpe_ratio=report.sharpe_ratio,
+            volatility=report.volatility,
+            max_positions=report.max_positions,
+            avg_position_size=report.avg_position_size,
             trades=trades,
             equity_curve=equity_series,
-            drawdown_curve=drawdown
+            drawdown_curve=drawdown,
+            periods_per_year=report.periods_per_year,
+            annual_return_pct=report.annual_return_pct,
+            sortino_ratio=report.sortino_ratio,
+            calmar_ratio=report.calmar_ratio,
+            max_drawdown_duration=report.max_drawdown_duration,
+            exposure_pct=report.exposure_pct,
+            turnover=report.turnover,
+            annual_turnover=report.annual_turnover,
+            rolling_sharpe=rolling_sharpe
         )
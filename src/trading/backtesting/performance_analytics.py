@@ -0,0 +1,239 @@
+"""
+Performance Analytics
+Vectorized backtest metrics computed from equity and trade arrays
+
+All metrics are NumPy reductions over the equity curve, the trade columns
+and the per-bar open position counts, so scoring a result costs a few dozen
+array operations and no per-trade Python objects. ``equity_metrics`` also
+takes a 2-D array (one curve per row) to score a whole parameter sweep at once.
+
+Annualization follows the bar spacing: daily bars use 252 periods a year and
+intraday bars use 252 times the observed bars per trading day (about 7 for
+hourly US equity bars), not 252.
+"""
+
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+DAY_NS = 86_400_000_000_000
+
+
+def _as_ns(timestamps: Any) -> np.ndarray:
+    """Epoch nanoseconds (UTC for tz-aware input) of a sequence of timestamps"""
+    if isinstance(timestamps, np.ndarray) and timestamps.dtype == np.int64:
+        return timestamps
+    return pd.DatetimeIndex(timestamps).as_unit('ns').asi8
+
+
+def periods_per_year(timestamps: Any) -> float:
+    """
+    Bars per year implied by the spacing of ``timestamps``
+
+    Intraday bars count the bars per trading day actually present, so market
+    hours and gaps (nights, weekends) are accounted for.
+    """
+    stamps = _as_ns(timestamps)
+    if len(stamps) < 2:
+        return float(TRADING_DAYS)
+    spacing_days = np.median(np.diff(stamps)) / DAY_NS
+    if spacing_days < 0.8:
+        bars_per_day = len(stamps) / len(np.unique(stamps // DAY_NS))
+        return TRADING_DAYS * bars_per_day
+    if spacing_days < 4:
+        return float(TRADING_DAYS)
+    if spacing_days < 20:
+        return 52.0
+    return 12.0
+
+
+def equity_metrics(equity: np.ndarray, periods: float) -> Dict[str, np.ndarray]:
+    """
+    Return, risk and drawdown metrics of one equity curve or a (curves x bars) array
+
+    Percentages are in percent; drawdown durations are in bars.
+
+    Returns:
+        Dictionary of metric -> scalar (1-D input) or one value per row (2-D input)
+    """
+    values = np.asarray(equity, dtype=float)
+    curves = np.atleast_2d(values)
+    n_bars = curves.shape[1]
+    returns = curves[:, 1:] / curves[:, :-1] - 1.0
+    n_returns = returns.shape[1]
+    sqrt_periods = np.sqrt(periods)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = returns.mean(axis=1) if n_returns else np.full(len(curves), np.nan)
+        std = returns.std(axis=1, ddof=1) if n_returns > 1 else np.full(len(curves), np.nan)
+        downside = (np.sqrt((np.minimum(returns, 0.0) ** 2).mean(axis=1)) if n_returns
+                    else np.full(len(curves), np.nan))
+
+        total_return = curves[:, -1] / curves[:, 0] - 1.0
+        years = n_returns / periods
+        annual_return = (np.power(np.maximum(1.0 + total_return, 0.0), 1.0 / years) - 1.0 if years
+                         else np.zeros(len(curves)))
+
+        peaks = np.maximum.accumulate(curves, axis=1)
+        drawdown = curves / peaks - 1.0
+        max_drawdown = drawdown.min(axis=1)
+        calmar = np.where(max_drawdown < 0, annual_return / -max_drawdown,
+                          np.where(annual_return > 0, np.inf, 0.0))
+
+        # Bars since the last equity high
+        bars = np.arange(n_bars)
+        last_peak = np.maximum.accumulate(np.where(curves >= peaks, bars, 0), axis=1)
+        underwater = bars - last_peak
+
+        metrics = {
+            'total_return_pct': total_return * 100,
+            'annual_return_pct': annual_return * 100,
+            'volatility': std * sqrt_periods * 100,
+            'sharpe_ratio': np.where(std > 0, mean / std * sqrt_periods, 0.0),
+            'sortino_ratio': np.where(downside > 0, mean / downside * sqrt_periods, 0.0),
+            'calmar_ratio': calmar,
+            'max_drawdown_pct': max_drawdown * 100,
+            'max_drawdown_duration': underwater.max(axis=1),
+            'current_drawdown_duration': underwater[:, -1],
+        }
+    if values.ndim == 1:
+        return {name: value[0].item() for name, value in metrics.items()}
+    return metrics
+
+
+def rolling_sharpe(equity: np.ndarray, window: int, periods: float) -> np.ndarray:
+    """Annualized Sharpe ratio of each trailing ``window`` of returns (NaN until the window fills)"""
+    equity = np.asarray(equity, dtype=float)
+    returns = equity[1:] / equity[:-1] - 1.0
+    result = np.full(len(returns), np.nan)
+    if window < 2 or len(returns) < window:
+        return result
+
+    sums = np.concatenate(([0.0], np.cumsum(returns)))
+    squares = np.concatenate(([0.0], np.cumsum(returns ** 2)))
+    window_sum = sums[window:] - sums[:-window]
+    window_squares = squares[window:] - squares[:-window]
+    mean = window_sum / window
+    variance = np.maximum((window_squares - window_sum * mean) / (window - 1), 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result[window - 1:] = np.where(variance > 0, mean / np.sqrt(variance) * np.sqrt(periods), np.nan)
+    return result
+
+
+def trade_metrics(pnl: np.ndarray, quantity: np.ndarray, entry_price: np.ndarray,
+                  exit_price: np.ndarray) -> Dict[str, float]:
+    """Win/loss statistics, average position size and traded notional of the closed trades"""
+    total_trades = len(pnl)
+    wins = pnl[pnl > 0]
+    losses = pnl[pnl < 0]
+    loss_total = losses.sum()
+    entry_notional = np.abs(quantity * entry_price)
+    return {
+        'total_trades': total_trades,
+        'winning_trades': len(wins),
+        'losing_trades': len(losses),
+        'win_rate': len(wins) / total_trades * 100 if total_trades else 0,
+        'avg_win': float(wins.mean()) if len(wins) else 0,
+        'avg_loss': float(losses.mean()) if len(losses) else 0,
+        'profit_factor': abs(wins.sum() / loss_total) if len(losses) and loss_total != 0 else float('inf'),
+        'avg_position_size': float(entry_notional.mean()) if total_trades else 0,
+        'traded_notional': float(entry_notional.sum() + np.abs(quantity * exit_price).sum()),
+    }
+
+
+def concurrent_positions(bar_times: Any, entry_times: Any, exit_times: Any) -> np.ndarray:
+    """Open trades at each bar (entered at or before it, exited after it), from trade timestamps"""
+    bars = _as_ns(bar_times)
+    opened = np.searchsorted(np.sort(_as_ns(entry_times)), bars, side='right')
+    closed = np.searchsorted(np.sort(_as_ns(exit_times)), bars, side='right')
+    return opened - closed
+
+
+@dataclass(slots=True)
+class PerformanceReport:
+    """Backtest performance metrics; percentages are in percent, durations in bars"""
+    periods_per_year: float
+    total_return_pct: float
+    annual_return_pct: float
+    volatility: float
+    sharpe_ratio: float
+    sortino_ratio: float
+    calmar_ratio: float
+    max_drawdown: float
+    max_drawdown_pct: float
+    max_drawdown_duration: int
+    current_drawdown_duration: int
+    total_trades: int
+    winning_trades: int
+    losing_trades: int
+    win_rate: float
+    avg_win: float
+    avg_loss: float
+    profit_factor: float
+    avg_position_size: float
+    exposure_pct: float
+    max_positions: int
+    turnover: float
+    annual_turnover: float
+    rolling_sharpe: np.ndarray
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Scalar metrics (the rolling Sharpe series is left out)"""
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.name != 'rolling_sharpe'}
+
+
+def analyze(equity: Sequence[float], timestamps: Any = None, trades=None,
+            position_counts: Optional[Sequence[int]] = None, periods: float = None,
+            rolling_window: int = None) -> PerformanceReport:
+    """
+    Score one backtest
+
+    Args:
+        equity: Portfolio value at each bar
+        timestamps: Bar timestamps (used to infer ``periods`` and, without
+            ``position_counts``, to place trades on bars)
+        trades: TradeLog (or anything with pnl/quantity/entry_price/exit_price
+            columns via ``column()``) of closed trades
+        position_counts: Open positions at each bar, as recorded by the engine
+        periods: Bars per year (inferred from ``timestamps`` when omitted)
+        rolling_window: Bars per rolling Sharpe window (default: about a month)
+    """
+    equity = np.asarray(equity, dtype=float)
+    if periods is None:
+        periods = periods_per_year(timestamps) if timestamps is not None else float(TRADING_DAYS)
+    if rolling_window is None:
+        rolling_window = max(2, int(round(periods / 12)))
+
+    curve = equity_metrics(equity, periods)
+    peaks = np.maximum.accumulate(equity)
+
+    if trades is not None and len(trades):
+        columns = {name: trades.column(name) for name in ('pnl', 'quantity', 'entry_price', 'exit_price')}
+    else:
+        columns = {name: np.zeros(0) for name in ('pnl', 'quantity', 'entry_price', 'exit_price')}
+    closed = trade_metrics(**columns)
+
+    if position_counts is not None:
+        counts = np.asarray(position_counts)
+    elif trades is not None and len(trades) and timestamps is not None:
+        counts = concurrent_positions(timestamps, trades.column('entry_time'), trades.column('exit_time'))
+    else:
+        counts = np.zeros(len(equity), dtype=int)
+
+    turnover = closed['traded_notional'] / equity.mean() if len(equity) else 0.0
+    bars = max(len(equity) - 1, 1)
+
+    return PerformanceReport(
+        periods_per_year=periods,
+        max_drawdown=float((equity - peaks).min()),
+        exposure_pct=float((counts > 0).mean() * 100) if len(counts) else 0.0,
+        max_positions=int(counts.max()) if len(counts) else 0,
+        turnover=turnover,
+        annual_turnover=turnover * periods / bars,
+        rolling_sharpe=rolling_sharpe(equity, rolling_window, periods),
+        **{name: value for name, value in curve.items()},
+        **{name: value for name, value in closed.items() if name != 'traded_notional'}
+    )
@@ -0,0 +1,201 @@
+"""
+Trade Log
+Columnar store of completed backtest trades
+
+Trades are appended into one NumPy array per field (struct of arrays) whose
+capacity doubles when full, so a long backtest pays for a handful of copies
+rather than one Python object per trade. Metrics read the columns directly;
+``Trade`` records and the DataFrame are only built when asked for.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(slots=True)
+class Trade:
+    """Represents a completed trade"""
+    symbol: str
+    entry_time: datetime
+    exit_time: datetime
+    entry_price: float
+    exit_price: float
+    quantity: int
+    pnl: float
+    return_pct: float
+    duration_hours: float
+    strategy: str
+
+
+# Numeric columns and their dtypes; symbol and strategy are stored as codes into a label table
+NUMERIC_COLUMNS = {
+    'entry_time': np.int64,      # epoch nanoseconds
+    'exit_time': np.int64,
+    'entry_price': np.float64,
+    'exit_price': np.float64,
+    'quantity': np.int64,
+    'pnl': np.float64,
+    'return_pct': np.float64,
+    'duration_hours': np.float64,
+}
+LABEL_COLUMNS = ('symbol', 'strategy')
+COLUMNS = ('symbol',) + tuple(NUMERIC_COLUMNS) + ('strategy',)
+
+
+class TradeLog:
+    """
+    Append-only struct-of-arrays trade log.
+
+    Behaves like a read-only sequence of ``Trade`` (``len``, iteration,
+    indexing), while ``column()`` and the numeric properties return read-only
+    array views without materializing any records.
+
+    Example:
+        >>> log = TradeLog()
+        >>> log.append('AAPL', entry, exit, 100.0, 103.0, 10, 29.0, 2.9, 6.5, 'sma')
+        >>> log.pnl.sum(), log.to_frame().shape
+        (29.0, (1, 10))
+    """
+
+    def __init__(self, capacity: int = 1024):
+        capacity = max(int(capacity), 1)
+        self._size = 0
+        self._columns: Dict[str, np.ndarray] = {name: np.zeros(capacity, dtype=dtype)
+                                               for name, dtype in NUMERIC_COLUMNS.items()}
+        for name in LABEL_COLUMNS:
+            self._columns[name] = np.zeros(capacity, dtype=np.int32)
+        self._labels: Dict[str, List[str]] = {name: [] for name in LABEL_COLUMNS}
+        self._codes: Dict[str, Dict[str, int]] = {name: {} for name in LABEL_COLUMNS}
+        self._tz = None
+        self._frame: Optional[pd.DataFrame] = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return len(self._columns['pnl'])
+
+    def _grow(self):
+        capacity = self.capacity * 2
+        for name, column in self._columns.items():
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            self._columns[name] = grown
+
+    def _code(self, column: str, label: str) -> int:
+        codes = self._codes[column]
+        code = codes.get(label)
+        if code is None:
+            code = codes[label] = len(self._labels[column])
+            self._labels[column].append(label)
+        return code
+
+    def _to_ns(self, timestamp: datetime) -> int:
+        stamp = pd.Timestamp(timestamp)
+        if stamp.tzinfo is not None and self._tz is None:
+            self._tz = stamp.tzinfo
+        return stamp.value
+
+    def append(self, symbol: str, entry_time: datetime, exit_time: datetime, entry_price: float,
+               exit_price: float, quantity: int, pnl: float, return_pct: float, duration_hours: float,
+               strategy: str):
+        """Record one completed trade (amortized O(1))"""
+        if self._size == self.capacity:
+            self._grow()
+        i = self._size
+        columns = self._columns
+        columns['symbol'][i] = self._code('symbol', symbol)
+        columns['strategy'][i] = self._code('strategy', strategy)
+        columns['entry_time'][i] = self._to_ns(entry_time)
+        columns['exit_time'][i] = self._to_ns(exit_time)
+        columns['entry_price'][i] = entry_price
+        columns['exit_price'][i] = exit_price
+        columns['quantity'][i] = quantity
+        columns['pnl'][i] = pnl
+        columns['return_pct'][i] = return_pct
+        columns['duration_hours'][i] = duration_hours
+        self._size += 1
+        self._frame = None
+
+    def append_trade(self, trade: Trade):
+        self.append(*(getattr(trade, name) for name in COLUMNS))
+
+    def column(self, name: str) -> np.ndarray:
+        """Read-only view of a numeric column, or the labels of 'symbol'/'strategy'"""
+        if name in LABEL_COLUMNS:
+            return np.asarray(self._labels[name], dtype=object)[self._columns[name][:self._size]]
+        view = self._columns[name][:self._size]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def pnl(self) -> np.ndarray:
+        return self.column('pnl')
+
+    @property
+    def quantity(self) -> np.ndarray:
+        return self.column('quantity')
+
+    @property
+    def entry_price(self) -> np.ndarray:
+        return self.column('entry_price')
+
+    @property
+    def return_pct(self) -> np.ndarray:
+        return self.column('return_pct')
+
+    @property
+    def duration_hours(self) -> np.ndarray:
+        return self.column('duration_hours')
+
+    def _timestamp(self, ns: int) -> pd.Timestamp:
+        return pd.Timestamp(ns, tz='UTC').tz_convert(self._tz) if self._tz is not None else pd.Timestamp(ns)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Trade, List[Trade]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._size))]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("trade index out of range")
+        columns = self._columns
+        return Trade(
+            symbol=self._labels['symbol'][columns['symbol'][index]],
+            entry_time=self._timestamp(int(columns['entry_time'][index])),
+            exit_time=self._timestamp(int(columns['exit_time'][index])),
+            entry_price=float(columns['entry_price'][index]),
+            exit_price=float(columns['exit_price'][index]),
+            quantity=int(columns['quantity'][index]),
+            pnl=float(columns['pnl'][index]),
+            return_pct=float(columns['return_pct'][index]),
+            duration_hours=float(columns['duration_hours'][index]),
+            strategy=self._labels['strategy'][columns['strategy'][index]]
+        )
+
+    def __iter__(self) -> Iterator[Trade]:
+        for i in range(self._size):
+            yield self[i]
+
+    def _times(self, name: str) -> pd.DatetimeIndex:
+        times = pd.to_datetime(self._columns[name][:self._size], unit='ns')
+        return times.tz_localize('UTC').tz_convert(self._tz) if self._tz is not None else times
+
+    def to_frame(self) -> pd.DataFrame:
+        """One row per trade; built on first call and reused until the next append"""
+        if self._frame is None:
+            data = {}
+            for name in COLUMNS:
+                if name in LABEL_COLUMNS:
+                    data[name] = pd.Categorical.from_codes(self._columns[name][:self._size],
+                                                           categories=pd.Index(self._labels[name], dtype=object))
+                elif name in ('entry_time', 'exit_time'):
+                    data[name] = self._times(name)
+                else:
+                    data[name] = self._columns[name][:self._size].copy()
+            self._frame = pd.DataFrame(data)
+        return self._frame
@@ -28,6 +28,7 @@ except ImportError:
 
 from ...utils.logging_config import get_ui_logger
 from ...config.settings import get_settings
+from .broker_state_cache import BrokerStateCache
 
 logger = get_ui_logger("alpaca_service")
 
@@ -35,12 +36,19 @@ logger = get_ui_logger("alpaca_service")
 class AlpacaService:
     """Service for interacting with Alpaca Markets API"""
 
-    def __init__(self, config_path: Optional[str] = None):
-        """Initialize Alpaca service with configuration"""
+    def __init__(self, config_path: Optional[str] = None, state_cache: Optional[BrokerStateCache] = None):
+        """
+        Initialize Alpaca service with configuration
+
+        Account, position and order reads are served from ``state_cache``
+        (a default ``BrokerStateCache`` when omitted), which is refreshed in the
+        background once connected and invalidated by order submits and cancels.
+        """
         self.config = self._load_config(config_path)
         self.client = None
         self.stream = None
         self._connected = False
+        self.state_cache = state_cache or BrokerStateCache()
 
         # Initialize connection
         self.connect()
@@ -142,6 +150,8 @@ class AlpacaService:
             logger.info(f"   Portfolio Value: ${float(account.portfolio_value):,.2f}")
 
             self._connected = True
+            self.state_cache.invalidate()
+            self.state_cache.start()
             return True
 
         except Exception as e:
@@ -154,84 +164,113 @@ class AlpacaService:
         return self._connected and self.client is not None
 
     def get_account_info(self) -> Optional[Dict]:
-        """Get account information"""
+        """Get account information (served from the state cache)"""
         if not self.is_connected():
             return None
 
         try:
-            account = self.client.get_account()
-            return {
-                'account_id': account.id,
-                'buying_power': float(account.buying_power),
-                'portfolio_value': float(account.portfolio_value),
-                'cash': float(account.cash),
-                'daytrading_buying_power': float(account.daytrading_buying_power),
-                'trading_blocked': account.trading_blocked,
-                'account_blocked': account.account_blocked,
-                'pattern_day_trader': account.pattern_day_trader
-            }
+            return dict(self.state_cache.get('account', self._fetch_account_info))
         except Exception as e:
             logger.error(f"Error getting account info: {e}")
             return None
 
     def get_positions(self) -> List[Dict]:
-        """Get current positions"""
+        """Get current positions (served from the state cache)"""
         if not self.is_connected():
             return []
 
         try:
-            positions = self.client.list_positions()
-            return [
-                {
-                    'symbol': pos.symbol,
-                    'qty': int(pos.qty),
-                    'market_value': float(pos.market_value),
-                    'cost_basis': float(pos.cost_basis),
-                    'unrealized_pl': float(pos.unrealized_pl),
-                    'unrealized_plpc': float(pos.unrealized_plpc),
-                    'side': pos.side,
-                    'avg_entry_price': float(pos.avg_entry_price)
-                }
-                for pos in positions
-            ]
+            return [dict(pos) for pos in self.state_cache.get('positions', self._fetch_positions)]
         except Exception as e:
             logger.error(f"Error getting positions: {e}")
             return []
 
     def get_orders(self, status: str = 'all', limit: int = 50) -> List[Dict]:
-        """Get recent orders"""
+        """Get recent orders (served from the state cache, keyed by status and limit)"""
         if not self.is_connected():
             return []
 
         try:
-            orders = self.client.list_orders(
-                status=status,
-                limit=limit,
-                direction='desc'
-            )
-            return [
-                {
-                    'id': order.id,
-                    'symbol': order.symbol,
-                    'qty': int(order.qty),
-                    'filled_qty': int(order.filled_qty) if order.filled_qty else 0,
-                    'side': order.side,
-                    'order_type': order.order_type,
-                    'time_in_force': order.time_in_force,
-                    'status': order.status,
-                    'submitted_at': order.submitted_at.isoformat() if order.submitted_at else None,
-                    'filled_at': order.filled_at.isoformat() if order.filled_at else None,
-                    'filled_avg_price': float(order.filled_avg_price) if order.filled_avg_price else None
-                }
-                for order in orders
-            ]
+            orders = self.state_cache.get('orders', lambda: self._fetch_orders(status, limit), status, limit)
+            return [dict(order) for order in orders]
         except Exception as e:
             logger.error(f"Error getting orders: {e}")
             return []
 
+    def _fetch_account_info(self) -> Dict:
+        account = self.client.get_account()
+        return {
+            'account_id': account.id,
+            'buying_power': float(account.buying_power),
+            'portfolio_value': float(account.portfolio_value),
+            'cash': float(account.cash),
+            'daytrading_buying_power': float(account.daytrading_buying_power),
+            'trading_blocked': account.trading_blocked,
+            'account_blocked': account.account_blocked,
+            'pattern_day_trader': account.pattern_day_trader
+        }
+
+    def _fetch_positions(self) -> List[Dict]:
+        return [
+            {
+                'symbol': pos.symbol,
+                'qty': int(pos.qty),
+                'market_value': float(pos.market_value),
+                'cost_basis': float(pos.cost_basis),
+                'unrealized_pl': float(pos.unrealized_pl),
+                'unrealized_plpc': float(pos.unrealized_plpc),
+                'side': pos.side,
+                'avg_entry_price': float(pos.avg_entry_price)
+            }
+            for pos in self.client.list_positions()
+        ]
+
+    def _fetch_orders(self, status: str, limit: int) -> List[Dict]:
+        orders = self.client.list_orders(
+            status=status,
+            limit=limit,
+            direction='desc'
+        )
+        return [self._order_to_dict(order) for order in orders]
+
+    def get_order_by_client_id(self, client_order_id: str) -> Optional[Dict]:
+        """Get an order by its client order ID (None if the broker never received it)"""
+        if not self.is_connected():
+            return None
+
+        try:
+            return self._order_to_dict(self.client.get_order_by_client_order_id(client_order_id))
+        except Exception as e:
+            logger.debug(f"No order for client order ID {client_order_id}: {e}")
+            return None
+
+    @staticmethod
+    def _order_to_dict(order) -> Dict:
+        return {
+            'id': order.id,
+            'client_order_id': order.client_order_id,
+            'symbol': order.symbol,
+            'qty': int(order.qty),
+            'filled_qty': int(order.filled_qty) if order.filled_qty else 0,
+            'side': order.side,
+            'order_type': order.order_type,
+            'time_in_force': order.time_in_force,
+            'status': order.status,
+            'submitted_at': order.submitted_at.isoformat() if order.submitted_at else None,
+            'filled_at': order.filled_at.isoformat() if order.filled_at else None,
+            'filled_avg_price': float(order.filled_avg_price) if order.filled_avg_price else None
+        }
+
     def submit_order(self, symbol: str, qty: int, side: str,
-                     order_type: str = 'market', time_in_force: str = 'day') -> Optional[Dict]:
-        """Submit a trading order"""
+                     order_type: str = 'market', time_in_force: str = 'day',
+                     client_order_id: Optional[str] = None) -> Optional[Dict]:
+        """
+        Submit a trading order
+
+        A ``client_order_id`` makes retries idempotent: Alpaca rejects a second
+        order with the same ID, and the original can be fetched with
+        ``get_order_by_client_id``.
+        """
         if not self.is_connected():
             logger.error("Not connected to Alpaca")
             return None
@@ -251,13 +290,15 @@ class AlpacaService:
                 qty=qty,
                 side=side,
                 type=order_type,
-                time_in_force=time_in_force
+                time_in_force=time_in_force,
+                client_order_id=client_order_id
             )
 
             logger.info(f"[SUCCESS] Order submitted: {side} {qty} {symbol}")
 
             return {
                 'id': order.id,
+                'client_order_id': client_order_id or getattr(order, 'client_order_id', None),
                 'symbol': order.symbol,
                 'qty': int(order.qty),
                 'side': order.side,
@@ -269,6 +310,9 @@ class AlpacaService:
         except Exception as e:
             logger.error(f"[ERROR] Error submitting order: {e}")
             return None
+        finally:
+            # Even a failed submit may have reached the broker
+            self.state_cache.invalidate('orders', 'positions', 'account')
 
     def cancel_order(self, order_id: str) -> bool:
         """Cancel an order"""
@@ -282,6 +326,8 @@ class AlpacaService:
         except Exception as e:
             logger.error(f"[ERROR] Error cancelling order: {e}")
             return False
+        finally:
+            self.state_cache.invalidate('orders', 'account')
 
     def get_market_data(self, symbol: str, timeframe: str = '1Day',
                         start: Optional[datetime] = None, end: Optional[datetime] = None) -> pd.DataFrame:
@@ -384,7 +430,8 @@ class AlpacaService:
             'connected': self._connected,
             'mode': self.config['trading']['mode'] if self.config else 'unknown',
             'base_url': getattr(self.client, '_base_url', None) if self.client else None,
-            'account_info': self.get_account_info() if self._connected else None
+            'account_info': self.get_account_info() if self._connected else None,
+            'state_cache': self.state_cache.get_stats()
         }
 
 
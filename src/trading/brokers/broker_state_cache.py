@@ -0,0 +1,200 @@
+"""
+Broker State Cache
+Short-lived in-memory copy of broker account, position and order state
+
+Dashboard callbacks read the same few REST resources from several callbacks
+and every open browser tab. The cache serves those reads from memory:
+each resource has its own TTL, concurrent misses for the same key share a
+single REST call, a background thread reloads keys that are still being read
+just before they expire, and writes invalidate the resources they change.
+"""
+
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from ...utils.logging_config import get_combined_logger
+from ...utils.metrics import get_metrics_registry
+
+logger = get_combined_logger("mltrading.broker_state_cache")
+
+# Seconds a loaded value is served before the next read goes to the broker
+DEFAULT_TTLS = {'account': 10.0, 'positions': 5.0, 'orders': 5.0}
+
+
+@dataclass
+class _Entry:
+    loader: Callable[[], Any]
+    value: Any = None
+    loaded_at: float = 0.0   # monotonic; 0 means no usable value
+    last_read: float = 0.0
+
+
+class BrokerStateCache:
+    """
+    Per-key TTL cache with request coalescing and background refresh.
+
+    Keys are ``(resource, *args)`` tuples; the resource selects the TTL and is
+    the unit of invalidation. A load started before an invalidation is never
+    stored, so a refresh racing an order submit cannot resurrect stale state.
+
+    Example:
+        >>> cache = BrokerStateCache(refresh_interval=2.0)
+        >>> cache.get('orders', lambda: fetch_orders('all', 20), 'all', 20)
+        >>> cache.invalidate('orders', 'positions')
+    """
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, default_ttl: float = 5.0,
+                 refresh_interval: float = 2.0, idle_timeout: Optional[float] = None, name: str = 'broker_state'):
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.default_ttl = default_ttl
+        self.refresh_interval = refresh_interval
+        self.idle_timeout = idle_timeout
+
+        self._entries: Dict[Tuple[Hashable, ...], _Entry] = {}
+        self._loading: Dict[Tuple[Hashable, ...], Future] = {}
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {'hits': 0, 'misses': 0, 'coalesced': 0, 'refreshes': 0,
+                      'refresh_errors': 0, 'invalidations': 0}
+
+        metrics = get_metrics_registry()
+        self._counters = {
+            result: metrics.counter('mltrading_cache_requests_total', 'Cache lookups by result',
+                                    cache=name, result=result)
+            for result in ('hit', 'miss', 'coalesced')
+        }
+
+    def ttl(self, resource: str) -> float:
+        return self.ttls.get(resource, self.default_ttl)
+
+    def idle_window(self, resource: str) -> float:
+        """Seconds without a read after which a key is no longer refreshed (one TTL unless overridden)"""
+        return self.idle_timeout if self.idle_timeout is not None else self.ttl(resource)
+
+    def get(self, resource: str, loader: Callable[[], Any], *args: Hashable) -> Any:
+        """
+        Return the cached value for ``(resource, *args)``, loading it if stale.
+
+        Exceptions from ``loader`` propagate to the caller and to every caller
+        coalesced onto the same load; failures are never cached.
+        """
+        key = (resource,) + args
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry(loader)
+            entry.loader = loader
+            entry.last_read = now
+            if entry.loaded_at and now - entry.loaded_at < self.ttl(resource):
+                self._record('hits', 'hit')
+                return entry.value
+
+            future = self._loading.get(key)
+            if future is None:
+                future = self._loading[key] = Future()
+                generation = self._generations.get(resource, 0)
+                self._record('misses', 'miss')
+            else:
+                self._record('coalesced', 'coalesced')
+                generation = None
+
+        if generation is None:
+            return future.result()
+        return self._load(key, loader, future, generation)
+
+    def _record(self, stat: str, result: str):
+        self.stats[stat] += 1
+        self._counters[result].inc()
+
+    def _load(self, key: Tuple[Hashable, ...], loader: Callable[[], Any], future: Future, generation: int) -> Any:
+        try:
+            value = loader()
+        except BaseException as e:
+            with self._lock:
+                if self._loading.get(key) is future:
+                    del self._loading[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            if self._loading.get(key) is future:
+                del self._loading[key]
+            entry = self._entries.get(key)
+            if entry is not None and self._generations.get(key[0], 0) == generation:
+                entry.value, entry.loaded_at = value, time.monotonic()
+        future.set_result(value)
+        return value
+
+    def invalidate(self, *resources: str):
+        """Drop cached values (all resources when none are given); in-flight loads are not stored"""
+        with self._lock:
+            keys = [key for key in self._entries if not resources or key[0] in resources]
+            for resource in {key[0] for key in keys} | set(resources):
+                self._generations[resource] = self._generations.get(resource, 0) + 1
+            for key in keys:
+                entry = self._entries[key]
+                entry.value, entry.loaded_at = None, 0.0
+                # Later readers start a fresh load instead of joining the pre-invalidation one
+                self._loading.pop(key, None)
+            self.stats['invalidations'] += 1
+
+    def refresh(self) -> int:
+        """
+        Reload keys that would expire before the next refresh and forget idle ones; returns keys reloaded.
+
+        Only values served from memory since they were loaded are reloaded, so
+        each background call stands in for at least one REST call a reader
+        would otherwise have made.
+        """
+        now = time.monotonic()
+        jobs = []
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if now - entry.last_read > self.idle_window(key[0]):
+                    del self._entries[key]
+                elif (entry.loaded_at and entry.last_read > entry.loaded_at
+                      and now - entry.loaded_at >= self.ttl(key[0]) - self.refresh_interval
+                      and key not in self._loading):
+                    future = self._loading[key] = Future()
+                    jobs.append((key, entry.loader, future, self._generations.get(key[0], 0)))
+
+        for job in jobs:
+            try:
+                self._load(*job)
+                self.stats['refreshes'] += 1
+            except Exception as e:
+                self.stats['refresh_errors'] += 1
+                logger.warning(f"Background refresh of {job[0]} failed: {e}")
+        return len(jobs)
+
+    def start(self):
+        """Start the background refresh thread (no-op if running or refresh is disabled)"""
+        if self.refresh_interval <= 0 or (self._thread and self._thread.is_alive()):
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._refresh_loop, name='broker-state-refresh', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _refresh_loop(self):
+        while not self._stop_event.wait(self.refresh_interval):
+            self.refresh()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = len(self._entries)
+            loading = len(self._loading)
+        return {**self.stats, 'entries': entries, 'loading': loading, 'ttls': dict(self.ttls),
+                'refresh_interval': self.refresh_interval,
+                'refreshing': bool(self._thread and self._thread.is_alive())}
@@ -0,0 +1,110 @@
+"""
+Fake Broker
+In-memory stand-in for AlpacaService used by tests and dry runs
+
+Implements the order methods the order router and strategy manager use, with
+the same dictionary shapes AlpacaService returns. Latency, transient failures,
+lost acknowledgements and fills can be scripted.
+"""
+
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+
+class FakeBroker:
+    """
+    Scriptable in-memory broker.
+
+    Example:
+        >>> broker = FakeBroker(latency=0.05)
+        >>> broker.fail_next(1, accepted=True)   # order lands, acknowledgement is lost
+        >>> broker.submit_order('AAPL', 10, 'buy', client_order_id='a-1') is None
+        True
+        >>> broker.get_order_by_client_id('a-1')['status']
+        'accepted'
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.orders: Dict[str, Dict] = {}
+        self.submissions: List[str] = []
+        self.max_concurrent_submits = 0
+        self._active_submits = 0
+        self._failures: List[bool] = []
+        self._lock = threading.Lock()
+
+    def is_connected(self) -> bool:
+        return True
+
+    def fail_next(self, count: int = 1, accepted: bool = False):
+        """Make the next ``count`` submits return None; ``accepted`` keeps the order (lost ack)"""
+        with self._lock:
+            self._failures.extend([accepted] * count)
+
+    def submit_order(self, symbol: str, qty: int, side: str, order_type: str = 'market',
+                     time_in_force: str = 'day', client_order_id: Optional[str] = None) -> Optional[Dict]:
+        with self._lock:
+            self._active_submits += 1
+            self.max_concurrent_submits = max(self.max_concurrent_submits, self._active_submits)
+            self.submissions.append(client_order_id)
+        try:
+            time.sleep(self.latency)
+            with self._lock:
+                failure = self._failures.pop(0) if self._failures else None
+                # Like Alpaca, a reused client order ID is rejected (AlpacaService returns None)
+                if client_order_id in self.orders or (failure is not None and not failure):
+                    return None
+                order = {
+                    'id': uuid.uuid4().hex,
+                    'client_order_id': client_order_id or uuid.uuid4().hex,
+                    'symbol': symbol,
+                    'qty': int(qty),
+                    'filled_qty': 0,
+                    'side': side,
+                    'order_type': order_type,
+                    'time_in_force': time_in_force,
+                    'status': 'accepted',
+                    'submitted_at': datetime.now(timezone.utc).isoformat(),
+                    'filled_at': None,
+                    'filled_avg_price': None
+                }
+                self.orders[order['client_order_id']] = order
+                return None if failure else dict(order)
+        finally:
+            with self._lock:
+                self._active_submits -= 1
+
+    def get_order_by_client_id(self, client_order_id: str) -> Optional[Dict]:
+        with self._lock:
+            order = self.orders.get(client_order_id)
+            return dict(order) if order else None
+
+    def get_orders(self, status: str = 'all', limit: int = 50) -> List[Dict]:
+        with self._lock:
+            orders = [dict(order) for order in reversed(list(self.orders.values()))]
+        if status == 'open':
+            orders = [order for order in orders if order['status'] in ('accepted', 'new', 'partially_filled')]
+        return orders[:limit]
+
+    def cancel_order(self, order_id: str) -> bool:
+        with self._lock:
+            for order in self.orders.values():
+                if order['id'] == order_id and order['status'] in ('accepted', 'new', 'partially_filled'):
+                    order['status'] = 'canceled'
+                    return True
+        return False
+
+    def fill(self, client_order_id: str, qty: int = None, price: float = 100.0):
+        """Fill an order fully, or partially when ``qty`` is less than its quantity"""
+        with self._lock:
+            order = self.orders[client_order_id]
+            order['filled_qty'] = min(order['qty'], order['filled_qty'] + (qty or order['qty']))
+            order['filled_avg_price'] = price
+            if order['filled_qty'] == order['qty']:
+                order['status'] = 'filled'
+                order['filled_at'] = datetime.now(timezone.utc).isoformat()
+            else:
+                order['status'] = 'partially_filled'
@@ -0,0 +1,410 @@
+"""
+Order Router
+Asynchronous order submission with idempotent retries and in-flight tracking
+
+Orders are queued and sent by a small pool of asyncio workers, so the legs of
+a pair trade go out concurrently instead of one round-trip after another.
+Every order carries a client order ID: a submission whose acknowledgement was
+lost is found again by that ID instead of being sent twice. Acknowledged
+orders stay in an in-memory book, updated from polled fills, until they reach
+a terminal state.
+"""
+
+import asyncio
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from ...utils.logging_config import get_combined_logger
+from ...utils.metrics import Histogram, get_metrics_registry
+
+logger = get_combined_logger("mltrading.order_router")
+
+# Broker statuses after which an order no longer changes
+TERMINAL_STATUSES = frozenset({'filled', 'canceled', 'expired', 'rejected', 'done_for_day', 'replaced', 'failed'})
+
+# Order side for each strategy signal type
+SIDE_FOR_SIGNAL = {'buy': 'buy', 'sell': 'sell', 'close_long': 'sell', 'close_short': 'buy'}
+
+
+def new_client_order_id(prefix: str = 'mlt') -> str:
+    """Unique client order ID (Alpaca accepts up to 128 characters)"""
+    return f"{prefix}-{uuid.uuid4().hex}"
+
+
+@dataclass
+class OrderRequest:
+    """An order to route"""
+    symbol: str
+    qty: int
+    side: str
+    order_type: str = 'market'
+    time_in_force: str = 'day'
+    strategy: Optional[str] = None
+    group_id: Optional[str] = None
+    client_order_id: str = field(default_factory=new_client_order_id)
+
+
+@dataclass
+class RoutedOrder:
+    """Routing state of one order"""
+    request: OrderRequest
+    status: str = 'pending'
+    broker_order_id: Optional[str] = None
+    filled_qty: int = 0
+    filled_avg_price: Optional[float] = None
+    attempts: int = 0
+    error: Optional[str] = None
+    queued_at: float = field(default_factory=time.perf_counter)
+    ack_seconds: Optional[float] = None
+    updated_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    @property
+    def client_order_id(self) -> str:
+        return self.request.client_order_id
+
+    @property
+    def terminal(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'client_order_id': self.client_order_id,
+            'broker_order_id': self.broker_order_id,
+            'symbol': self.request.symbol,
+            'qty': self.request.qty,
+            'side': self.request.side,
+            'order_type': self.request.order_type,
+            'strategy': self.request.strategy,
+            'group_id': self.request.group_id,
+            'status': self.status,
+            'filled_qty': self.filled_qty,
+            'filled_avg_price': self.filled_avg_price,
+            'attempts': self.attempts,
+            'ack_seconds': self.ack_seconds,
+            'error': self.error,
+            'updated_at': self.updated_at.isoformat()
+        }
+
+
+class OrderRouter:
+    """
+    Routes orders to a broker from a background asyncio loop.
+
+    The broker is anything with AlpacaService's ``submit_order`` (accepting
+    ``client_order_id``), ``get_order_by_client_id`` and ``get_orders``; its
+    blocking calls run on the router's thread pool. If it has a
+    ``state_cache``, its positions and account are invalidated on every fill
+    and before an order leaves the in-flight book, so a risk book built from
+    cached positions plus ``in_flight()`` never loses the filled shares.
+
+    Example:
+        >>> router = OrderRouter(get_alpaca_service())
+        >>> router.start()
+        >>> legs = router.submit_group([OrderRequest('KO', 10, 'buy'), OrderRequest('PEP', 8, 'sell')])
+        >>> [leg.result(timeout=5).status for leg in legs]
+        ['accepted', 'accepted']
+    """
+
+    def __init__(self, broker, workers: int = 4, max_retries: int = 2, retry_backoff: float = 0.25,
+                 fill_poll_interval: float = 2.0, completed_retention: int = 500):
+        """
+        Initialize router
+
+        Args:
+            broker: Broker service orders are sent to
+            workers: Orders submitted concurrently
+            max_retries: Resubmissions (same client order ID) after a failed or unacknowledged submit
+            retry_backoff: Seconds before the first retry, doubled per attempt
+            fill_poll_interval: Seconds between fill polls while orders are in flight
+            completed_retention: Terminal orders kept for lookup and for answering resubmitted client order IDs
+        """
+        self.broker = broker
+        self.workers = workers
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.fill_poll_interval = fill_poll_interval
+        self.completed_retention = completed_retention
+
+        self._orders: Dict[str, RoutedOrder] = {}
+        self._futures: Dict[str, Future] = {}
+        self._by_broker_id: Dict[str, str] = {}
+        self._completed: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+        self.ack_latency = Histogram()
+        get_metrics_registry().register_histogram('mltrading_order_ack_seconds', self.ack_latency,
+                                                  'Time from routing an order to the broker acknowledging it')
+        self.stats = {'submitted': 0, 'acked': 0, 'rejected': 0, 'failed': 0, 'retries': 0,
+                      'recovered_acks': 0, 'duplicates': 0, 'fills': 0}
+
+    # Lifecycle
+
+    def start(self):
+        """Start the routing loop in a background thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._ready.clear()
+        self._thread = threading.Thread(target=self._run_loop, name="order-router", daemon=True)
+        self._thread.start()
+        self._ready.wait(5)
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the routing loop and its thread pool; queued orders that were not sent are marked failed"""
+        loop = self._loop
+        if loop is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+        self._thread = None
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+        with self._lock:
+            unsent = [order for order in self._orders.values() if order.status == 'pending']
+        for order in unsent:
+            self._finish(order, 'failed', error='router stopped')
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Thread pool for blocking broker calls, created on first use"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="mltrading-orders")
+            return self._executor
+
+    def _run_loop(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        tasks = [loop.create_task(self._worker()) for _ in range(self.workers)]
+        tasks.append(loop.create_task(self._fill_poller()))
+        self._ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            for task in tasks:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            loop.close()
+            self._loop = None
+
+    # Submission
+
+    def submit(self, request: OrderRequest) -> Future:
+        """
+        Queue an order; the future resolves with its RoutedOrder once acknowledged or failed
+
+        Re-submitting a client order ID returns the original order's future, or,
+        once the order is terminal, a resolved future with its final state.
+        """
+        return self.submit_group([request])[0]
+
+    def submit_group(self, requests: List[OrderRequest]) -> List[Future]:
+        """Queue orders together (e.g. pair legs) so workers send them concurrently"""
+        if self._loop is None:
+            raise RuntimeError("Order router is not running")
+
+        futures, queued = [], []
+        with self._lock:
+            for request in requests:
+                existing = self._futures.get(request.client_order_id)
+                if existing is None and request.client_order_id in self._completed:
+                    existing = Future()
+                    existing.set_result(self._completed[request.client_order_id])
+                if existing is not None:
+                    self.stats['duplicates'] += 1
+                    futures.append(existing)
+                    continue
+                order = RoutedOrder(request)
+                future = Future()
+                self._orders[request.client_order_id] = order
+                self._futures[request.client_order_id] = future
+                self.stats['submitted'] += 1
+                futures.append(future)
+                queued.append(order)
+
+        self._loop.call_soon_threadsafe(lambda: [self._queue.put_nowait(order) for order in queued])
+        return futures
+
+    async def _worker(self):
+        while True:
+            order = await self._queue.get()
+            try:
+                await self._send(order)
+            except Exception as e:
+                logger.error(f"Order routing failed for {order.client_order_id}: {e}")
+                self._finish(order, 'failed', error=str(e))
+
+    async def _call(self, method: str, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, lambda: getattr(self.broker, method)(*args, **kwargs))
+
+    async def _send(self, order: RoutedOrder):
+        request = order.request
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self.stats['retries'] += 1
+                await asyncio.sleep(self.retry_backoff * 2 ** (attempt - 1))
+            order.attempts += 1
+
+            try:
+                result = await self._call('submit_order', request.symbol, request.qty, request.side,
+                                          order_type=request.order_type, time_in_force=request.time_in_force,
+                                          client_order_id=request.client_order_id)
+            except Exception as e:
+                order.error = str(e)
+                result = None
+
+            if not result:
+                # The broker may have accepted it and the acknowledgement was lost
+                try:
+                    result = await self._call('get_order_by_client_id', request.client_order_id)
+                except Exception:
+                    result = None
+                if result:
+                    self.stats['recovered_acks'] += 1
+
+            if result:
+                self._acknowledge(order, result)
+                return
+
+        self._finish(order, 'failed', error=order.error or 'not acknowledged by broker')
+
+    def _acknowledge(self, order: RoutedOrder, result: Dict[str, Any]):
+        order.ack_seconds = time.perf_counter() - order.queued_at
+        self.ack_latency.observe(order.ack_seconds)
+        self.stats['acked'] += 1
+        with self._lock:
+            order.broker_order_id = result.get('id')
+            if order.broker_order_id:
+                self._by_broker_id[order.broker_order_id] = order.client_order_id
+        future = self._futures.get(order.client_order_id)
+        self._update(order, result)
+        logger.info(f"Order acknowledged: {order.request.side} {order.request.qty} {order.request.symbol} "
+                    f"({order.client_order_id}, {order.ack_seconds * 1000:.0f}ms)")
+        if future is not None and not future.done():
+            future.set_result(order)
+
+    def _finish(self, order: RoutedOrder, status: str, error: str = None):
+        order.status = status
+        order.error = error or order.error
+        order.updated_at = datetime.now(timezone.utc)
+        if status == 'failed':
+            self.stats['failed'] += 1
+            logger.error(f"Order {order.client_order_id} for {order.request.symbol} failed: {order.error}")
+        future = self._futures.get(order.client_order_id)
+        self._retire(order)
+        if future is not None and not future.done():
+            future.set_result(order)
+
+    # Order book
+
+    def apply_update(self, update: Dict[str, Any]) -> bool:
+        """
+        Apply a broker order update (polled order or trade-update event)
+
+        Returns:
+            True if it matched an in-flight order
+        """
+        with self._lock:
+            client_id = update.get('client_order_id') or self._by_broker_id.get(update.get('id'))
+            order = self._orders.get(client_id) if client_id else None
+        if order is None or order.status == 'pending':
+            return False
+        self._update(order, update)
+        return True
+
+    def _update(self, order: RoutedOrder, update: Dict[str, Any]):
+        filled_qty = int(update.get('filled_qty') or 0)
+        if filled_qty > order.filled_qty:
+            self.stats['fills'] += 1
+            # Before the filled shares leave the in-flight remainder
+            self._invalidate_broker_state()
+            order.filled_qty = filled_qty
+        if update.get('filled_avg_price') is not None:
+            order.filled_avg_price = float(update['filled_avg_price'])
+        order.status = update.get('status') or order.status
+        order.updated_at = datetime.now(timezone.utc)
+        if order.status == 'rejected':
+            self.stats['rejected'] += 1
+        if order.terminal:
+            self._retire(order)
+
+    def _retire(self, order: RoutedOrder):
+        """Move a terminal order from the in-flight book to the bounded completed map"""
+        with self._lock:
+            in_flight = order.client_order_id in self._orders
+        if in_flight:
+            self._invalidate_broker_state()
+        with self._lock:
+            if self._orders.pop(order.client_order_id, None) is not None:
+                self._completed[order.client_order_id] = order
+                while len(self._completed) > self.completed_retention:
+                    self._completed.popitem(last=False)
+                self._futures.pop(order.client_order_id, None)
+                if order.broker_order_id:
+                    self._by_broker_id.pop(order.broker_order_id, None)
+
+    def _invalidate_broker_state(self):
+        """Drop the broker's cached positions and account so the next read includes this order"""
+        cache = getattr(self.broker, 'state_cache', None)
+        if cache is not None:
+            cache.invalidate('positions', 'account')
+
+    async def _fill_poller(self):
+        while True:
+            await asyncio.sleep(self.fill_poll_interval)
+            await self.poll_fills()
+
+    async def poll_fills(self):
+        """Refresh in-flight orders from the broker's recent orders"""
+        with self._lock:
+            acked = [order for order in self._orders.values() if order.status != 'pending']
+        if not acked:
+            return
+        try:
+            updates = await self._call('get_orders', status='all', limit=max(50, 2 * len(acked)))
+        except Exception as e:
+            logger.error(f"Fill poll failed: {e}")
+            return
+        for update in updates or []:
+            self.apply_update(update)
+
+    # Introspection
+
+    def get_order(self, client_order_id: str) -> Optional[RoutedOrder]:
+        with self._lock:
+            return self._orders.get(client_order_id) or self._completed.get(client_order_id)
+
+    def in_flight(self) -> List[Dict[str, Any]]:
+        """Orders not yet in a terminal state"""
+        with self._lock:
+            return [order.to_dict() for order in self._orders.values()]
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            in_flight = len(self._orders)
+        return {
+            **self.stats,
+            'in_flight': in_flight,
+            'queued': self._queue.qsize() if self._queue is not None else 0,
+            'ack_latency': {**self.ack_latency.snapshot(), 'p50': self.ack_latency.quantile(0.5),
+                            'p95': self.ack_latency.quantile(0.95)}
+        }
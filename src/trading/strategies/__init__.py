@@ -5,6 +5,9 @@ Contains base strategy classes and concrete strategy implementations
 
 from .base_strategy import BaseStrategy, StrategySignal, StrategyState
 from .strategy_manager import StrategyManager
+from .market_data_hub import MarketDataHub
+from .portfolio_risk import PortfolioRiskEngine, RiskLimits
 
-__all__ = ['BaseStrategy', 'StrategySignal', 'StrategyState', 'StrategyManager']
+__all__ = ['BaseStrategy', 'StrategySignal', 'StrategyState', 'StrategyManager', 'MarketDataHub',
+           'PortfolioRiskEngine', 'RiskLimits']
 
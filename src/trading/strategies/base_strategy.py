@@ -38,7 +38,7 @@ class SignalType(Enum):
     CLOSE_SHORT = "close_short"
 
 
-@dataclass
+@dataclass(slots=True)
 class StrategySignal:
     """Trading signal generated by a strategy"""
     symbol: str
@@ -58,7 +58,7 @@ class StrategySignal:
             raise ValueError(f"Signal strength must be between 0.0 and 1.0, got {self.strength}")
 
 
-@dataclass
+@dataclass(slots=True)
 class StrategyPosition:
     """Represents a position managed by a strategy"""
     symbol: str
@@ -33,7 +33,7 @@ class CustomPair:
         return f"{self.symbol_a}_{self.symbol_b}"
 
 
-@dataclass
+@dataclass(slots=True)
 class PairTrade:
     """Active pair trade position"""
     pair: CustomPair
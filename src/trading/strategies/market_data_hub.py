@@ -0,0 +1,441 @@
+"""
+Market Data Hub
+Shared rolling OHLCV buffers that feed the strategy execution loop
+
+One hub polls its source once per cycle for every symbol any strategy trades,
+appends new bars to fixed-capacity ring buffers, and wakes waiting consumers
+with the symbols that received a bar. Strategies are handed read-only windows
+of the buffers instead of their own copies of the full history.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ...utils.logging_config import get_combined_logger
+
+logger = get_combined_logger("mltrading.market_data_hub")
+
+BAR_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+
+@dataclass
+class Bar:
+    """One OHLCV bar"""
+    symbol: str
+    timestamp: datetime
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+
+
+def _to_ns(timestamp: Any) -> int:
+    """UTC epoch nanoseconds of a datetime/Timestamp (naive values are taken as UTC)"""
+    stamp = pd.Timestamp(timestamp)
+    if stamp.tzinfo is None:
+        stamp = stamp.tz_localize('UTC')
+    return int(stamp.value)
+
+
+def bars_from_frame(symbol: str, frame: pd.DataFrame) -> List[Bar]:
+    """Bars from an OHLCV DataFrame with a 'timestamp' column or a datetime index"""
+    if frame is None or frame.empty:
+        return []
+    timestamps = frame['timestamp'] if 'timestamp' in frame.columns else frame.index
+    columns = [frame[field].to_numpy(dtype=float) for field in BAR_FIELDS]
+    return [Bar(symbol, stamp, *(float(column[i]) for column in columns))
+            for i, stamp in enumerate(timestamps)]
+
+
+def _copy_on_write_active() -> bool:
+    """Whether pandas copy-on-write is in effect (always on from pandas 3)"""
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return True
+    try:
+        return pd.get_option('mode.copy_on_write') is True
+    except (KeyError, AttributeError):
+        return False
+
+
+class BarWindow:
+    """
+    Read-only view of the latest bars of one symbol.
+
+    Arrays are zero-copy slices of the ring buffer, valid until the buffer
+    wraps past them; ``to_frame`` takes a stable copy.
+    """
+
+    __slots__ = ('symbol', 'timestamps', 'open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, symbol: str, timestamps: np.ndarray, columns: Dict[str, np.ndarray]):
+        self.symbol = symbol
+        self.timestamps = timestamps
+        for field in BAR_FIELDS:
+            setattr(self, field, columns[field])
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame with a UTC 'timestamp' column and OHLCV columns, read-only"""
+        columns = {'timestamp': pd.to_datetime(self.timestamps.copy(), unit='ns', utc=True)}
+        for field in BAR_FIELDS:
+            values = getattr(self, field).copy()
+            values.flags.writeable = False
+            columns[field] = values
+        return pd.DataFrame(columns, copy=False)
+
+
+class BarBuffer:
+    """
+    Fixed-capacity OHLCV ring buffer for one symbol.
+
+    Every value is written twice, at ``pos`` and ``pos + capacity``, so the
+    latest ``n <= capacity`` bars are always one contiguous slice and windows
+    never need to be stitched together.
+    """
+
+    def __init__(self, symbol: str, capacity: int = 500):
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.symbol = symbol
+        self.capacity = capacity
+        self._timestamps = np.zeros(2 * capacity, dtype=np.int64)
+        self._columns = {field: np.zeros(2 * capacity, dtype=np.float64) for field in BAR_FIELDS}
+        self._pos = 0
+        self._count = 0
+        self.bars_appended = 0
+        self.bars_revised = 0
+        self.bars_stale = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def last_timestamp(self) -> Optional[pd.Timestamp]:
+        if not self._count:
+            return None
+        return pd.Timestamp(int(self._timestamps[self._pos + self.capacity - 1]), unit='ns', tz='UTC')
+
+    def _write(self, index: int, stamp: int, bar: Bar):
+        for offset in (index, index + self.capacity):
+            self._timestamps[offset] = stamp
+            for field in BAR_FIELDS:
+                self._columns[field][offset] = getattr(bar, field)
+
+    def append(self, bar: Bar) -> bool:
+        """
+        Add a bar; a bar for the latest timestamp replaces it, older bars are ignored
+
+        Returns:
+            True if the buffer changed
+        """
+        stamp = _to_ns(bar.timestamp)
+        if self._count:
+            last_index = (self._pos - 1) % self.capacity
+            last = self._timestamps[last_index]
+            if stamp == last:
+                # Sources re-send the latest bar; only a changed bar counts as an update
+                # (missing values arrive as NaN, which must compare equal to the NaN already stored)
+                if np.array_equal([self._columns[field][last_index] for field in BAR_FIELDS],
+                                  [getattr(bar, field) for field in BAR_FIELDS], equal_nan=True):
+                    return False
+                self._write(last_index, stamp, bar)
+                self.bars_revised += 1
+                return True
+            if stamp < last:
+                self.bars_stale += 1
+                return False
+
+        self._write(self._pos, stamp, bar)
+        self._pos = (self._pos + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+        self.bars_appended += 1
+        return True
+
+    def window(self, length: int = None) -> BarWindow:
+        """The latest ``length`` bars (all buffered bars when None)"""
+        length = self._count if length is None else min(length, self._count)
+        end = self._pos + self.capacity
+        start = end - length
+
+        def view(array: np.ndarray) -> np.ndarray:
+            sliced = array[start:end]
+            sliced.flags.writeable = False
+            return sliced
+
+        return BarWindow(self.symbol, view(self._timestamps),
+                         {field: view(column) for field, column in self._columns.items()})
+
+
+class DatabaseBarSource:
+    """Polls new rows of the local market_data table for all symbols in one query"""
+
+    def __init__(self, db_manager=None, source: str = 'yahoo', initial_lookback: timedelta = timedelta(days=30)):
+        self._db_manager = db_manager
+        self.source = source
+        self.initial_lookback = initial_lookback
+
+    @property
+    def db_manager(self):
+        if self._db_manager is None:
+            from ...data.storage.database import get_db_manager
+            self._db_manager = get_db_manager()
+        return self._db_manager
+
+    def fetch(self, symbols: List[str], since: Dict[str, Optional[pd.Timestamp]]) -> List[Bar]:
+        """
+        Bars at or after each symbol's own last seen timestamp (the last bar may have been revised).
+
+        Symbols not seen yet start ``initial_lookback`` ago; one symbol's
+        watermark never widens the scan of another.
+        """
+        if not symbols:
+            return []
+        default = pd.Timestamp(datetime.now(timezone.utc) - self.initial_lookback)
+        starts = []
+        for symbol in symbols:
+            start = since.get(symbol)
+            start = default if start is None else start
+            # market_data.timestamp is a naive UTC column
+            starts.append(start.tz_convert('UTC').tz_localize(None).to_pydatetime())
+
+        with self.db_manager.get_read_connection_context() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT m.symbol, m.timestamp, m.open, m.high, m.low, m.close, m.volume
+                    FROM unnest(%s::text[], %s::timestamp[]) AS w(symbol, since)
+                    JOIN market_data m ON m.symbol = w.symbol AND m.timestamp >= w.since
+                    WHERE m.source = %s
+                    ORDER BY m.timestamp
+                """, (list(symbols), starts, self.source))
+                return [Bar(row[0], row[1], *(float(value) if value is not None else np.nan for value in row[2:]))
+                        for row in cursor.fetchall()]
+
+
+class AlpacaBarSource:
+    """Polls bars from the Alpaca market data API, one request per symbol"""
+
+    def __init__(self, broker_service, timeframe: str = '1Hour', initial_lookback: timedelta = timedelta(days=30)):
+        self.broker_service = broker_service
+        self.timeframe = timeframe
+        self.initial_lookback = initial_lookback
+
+    def fetch(self, symbols: List[str], since: Dict[str, Optional[pd.Timestamp]]) -> List[Bar]:
+        now = datetime.now(timezone.utc)
+        bars = []
+        for symbol in symbols:
+            last = since.get(symbol)
+            start = last.to_pydatetime() if last is not None else now - self.initial_lookback
+            frame = self.broker_service.get_market_data(symbol, self.timeframe, start=start, end=now)
+            bars.extend(bars_from_frame(symbol, frame))
+        return bars
+
+
+class ReplayBarSource:
+    """
+    Replays historical bars one timestamp per fetch.
+
+    Example:
+        >>> source = ReplayBarSource.from_database(db_manager, ['AAPL', 'MSFT'], start, end)
+        >>> hub = MarketDataHub(source, poll_interval=0)
+    """
+
+    def __init__(self, frames: Dict[str, pd.DataFrame], bars_per_fetch: int = 1):
+        self.bars_per_fetch = bars_per_fetch
+        bars = [bar for symbol, frame in frames.items() for bar in bars_from_frame(symbol, frame)]
+        bars.sort(key=lambda bar: _to_ns(bar.timestamp))
+        self._steps: List[List[Bar]] = []
+        last = None
+        for bar in bars:
+            stamp = _to_ns(bar.timestamp)
+            if stamp != last:
+                self._steps.append([])
+                last = stamp
+            self._steps[-1].append(bar)
+        self._position = 0
+
+    @classmethod
+    def from_database(cls, db_manager, symbols: Iterable[str], start: datetime, end: datetime,
+                      source: str = 'yahoo', **kwargs) -> 'ReplayBarSource':
+        """Replay the stored market_data of ``symbols`` between ``start`` and ``end``"""
+        return cls({symbol: db_manager.get_market_data(symbol, start, end, source) for symbol in symbols}, **kwargs)
+
+    @property
+    def exhausted(self) -> bool:
+        return self._position >= len(self._steps)
+
+    def fetch(self, symbols: List[str], since: Dict[str, Optional[pd.Timestamp]]) -> List[Bar]:
+        wanted = set(symbols)
+        steps = self._steps[self._position:self._position + self.bars_per_fetch]
+        self._position += len(steps)
+        return [bar for step in steps for bar in step if bar.symbol in wanted]
+
+
+class MarketDataHub:
+    """
+    Shared market data for all strategies.
+
+    ``poll`` fetches once for the union of subscribed symbols; consumers block
+    in ``wait_for_bars`` until a poll delivers new bars.
+
+    Example:
+        >>> hub = MarketDataHub(DatabaseBarSource(), capacity=500)
+        >>> hub.set_symbols(['AAPL', 'MSFT'])
+        >>> hub.start()
+        >>> sequence, updated = hub.wait_for_bars(0, timeout=60)
+        >>> frames = hub.get_frames(updated, length=200)
+    """
+
+    def __init__(self, source, capacity: int = 500, poll_interval: float = 30.0):
+        self.source = source
+        self.capacity = capacity
+        self.poll_interval = poll_interval
+
+        self.buffers: Dict[str, BarBuffer] = {}
+        self._symbols: Set[str] = set()
+        self._sequence = 0
+        self._updated_at: Dict[str, int] = {}
+        self._frames: Dict[Tuple[str, Optional[int]], Tuple[int, pd.DataFrame]] = {}
+        self._condition = threading.Condition()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.stats = {'polls': 0, 'poll_errors': 0, 'bars_received': 0, 'last_poll': None,
+                      'last_poll_seconds': 0.0}
+
+    @property
+    def sequence(self) -> int:
+        return self._sequence
+
+    def set_symbols(self, symbols: Iterable[str]):
+        """Replace the polled symbol set (buffers and cached frames of dropped symbols are released)"""
+        with self._condition:
+            self._symbols = set(symbols)
+            for symbol in list(self.buffers):
+                if symbol not in self._symbols:
+                    del self.buffers[symbol]
+                    self._updated_at.pop(symbol, None)
+            for key in [key for key in self._frames if key[0] not in self._symbols]:
+                del self._frames[key]
+
+    def poll(self) -> List[str]:
+        """Fetch new bars once and wake waiters; returns the symbols that changed"""
+        started = time.perf_counter()
+        with self._condition:
+            symbols = sorted(self._symbols)
+            since = {symbol: self.buffers[symbol].last_timestamp if symbol in self.buffers else None
+                     for symbol in symbols}
+        try:
+            bars = self.source.fetch(symbols, since)
+        except Exception as e:
+            self.stats['poll_errors'] += 1
+            logger.error(f"Market data poll failed: {e}")
+            return []
+
+        updated = set()
+        with self._condition:
+            for bar in bars:
+                if bar.symbol not in self._symbols:
+                    continue
+                buffer = self.buffers.get(bar.symbol)
+                if buffer is None:
+                    buffer = self.buffers[bar.symbol] = BarBuffer(bar.symbol, self.capacity)
+                if buffer.append(bar):
+                    updated.add(bar.symbol)
+
+            self.stats['polls'] += 1
+            self.stats['bars_received'] += len(bars)
+            self.stats['last_poll'] = datetime.now(timezone.utc).isoformat()
+            self.stats['last_poll_seconds'] = time.perf_counter() - started
+            if updated:
+                self._sequence += 1
+                for symbol in updated:
+                    self._updated_at[symbol] = self._sequence
+                self._condition.notify_all()
+        return sorted(updated)
+
+    def wait_for_bars(self, after: int, timeout: float = None) -> Tuple[int, List[str]]:
+        """
+        Block until bars newer than sequence ``after`` arrive, the hub stops, or timeout
+
+        Returns:
+            (current sequence, symbols updated since ``after``)
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._sequence > after or self._stop_event.is_set(), timeout)
+            updated = sorted(symbol for symbol, seq in self._updated_at.items() if seq > after)
+            return self._sequence, updated
+
+    def get_window(self, symbol: str, length: int = None) -> Optional[BarWindow]:
+        """Zero-copy read-only window of the latest bars, or None for an unknown symbol"""
+        with self._condition:
+            buffer = self.buffers.get(symbol)
+            return buffer.window(length) if buffer is not None else None
+
+    def get_frames(self, symbols: Iterable[str], length: int = None) -> Dict[str, pd.DataFrame]:
+        """
+        Read-only OHLCV frames of the latest ``length`` bars per symbol
+
+        Frames are built once per new bar. Under copy-on-write every caller
+        asking for the same window gets a shallow copy of it, so N strategies
+        on a symbol cost one copy of the data; without copy-on-write each
+        caller gets a deep copy. Either way, columns one strategy adds or
+        values it writes never reach another strategy's frame.
+        """
+        deep = not _copy_on_write_active()
+        frames = {}
+        with self._condition:
+            for symbol in symbols:
+                buffer = self.buffers.get(symbol)
+                if buffer is None or not len(buffer):
+                    continue
+                key = (symbol, length)
+                version = self._updated_at.get(symbol, 0)
+                cached = self._frames.get(key)
+                if cached is None or cached[0] != version:
+                    cached = self._frames[key] = (version, buffer.window(length).to_frame())
+                frames[symbol] = cached[1].copy(deep=deep)
+        return frames
+
+    def start(self):
+        """Poll in a background thread every ``poll_interval`` seconds"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._poll_loop, name="market-data-hub", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop polling and release any waiters"""
+        self._stop_event.set()
+        with self._condition:
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    @property
+    def stopped(self) -> bool:
+        return self._stop_event.is_set()
+
+    def _poll_loop(self):
+        while not self._stop_event.is_set():
+            self.poll()
+            self._stop_event.wait(self.poll_interval)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._condition:
+            return {
+                **self.stats,
+                'sequence': self._sequence,
+                'symbols': len(self._symbols),
+                'buffered_bars': {symbol: len(buffer) for symbol, buffer in self.buffers.items()},
+            }
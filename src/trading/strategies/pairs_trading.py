@@ -43,7 +43,7 @@ class TradingPair:
                 self.half_life > 0 and self.half_life < 252)  # Less than 1 year
 
 
-@dataclass
+@dataclass(slots=True)
 class PairPosition:
     """Represents an active pairs trade position"""
     pair: TradingPair
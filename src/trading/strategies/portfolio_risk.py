@@ -0,0 +1,415 @@
+"""
+Portfolio Risk Engine
+Vectorized portfolio-level limits for batches of pending orders
+
+Positions, prices and sectors are held as arrays indexed by symbol, and a
+rolling covariance of bar returns is updated incrementally on every new bar.
+A batch of candidate orders is checked against the whole book in a few NumPy
+operations: gross and net exposure, per-sector exposure, position count and
+parametric (variance-covariance) VaR and expected shortfall.
+"""
+
+import time
+from dataclasses import dataclass, field
+from statistics import NormalDist
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ...utils.logging_config import get_combined_logger
+from ...utils.metrics import Histogram, get_metrics_registry
+
+logger = get_combined_logger("mltrading.portfolio_risk")
+
+# Symbols without a sector are reported under this label but not held to the sector limit
+UNKNOWN_SECTOR = 'Unknown'
+
+# Checked in this order; a candidate is rejected for the first limit it breaches
+LIMIT_CHECKS = ('positions', 'gross_exposure', 'net_exposure', 'sector_exposure', 'var', 'expected_shortfall')
+
+
+def _database_sectors(symbols: List[str]) -> Dict[str, str]:
+    from ...data.storage.database import get_db_manager
+    return get_db_manager().get_sectors(symbols)
+
+
+class RollingCovariance:
+    """
+    Sample covariance of the last ``window`` return vectors, O(n^2) per bar.
+
+    Keeps running sums of the returns and of their outer products; each update
+    adds the new bar and subtracts the one leaving the window. The sums are
+    rebuilt from the ring buffer once per window to bound floating-point drift,
+    and the matrix itself is computed on demand and cached until the next bar.
+    """
+
+    def __init__(self, n_assets: int, window: int = 120):
+        self.window = window
+        self._returns = np.zeros((window, n_assets))
+        self._count = 0
+        self._next = 0
+        self._sum = np.zeros(n_assets)
+        self._outer = np.zeros((n_assets, n_assets))
+        self._since_rebuild = 0
+        self._cov: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def update(self, returns: np.ndarray):
+        """Add one bar of returns, evicting the oldest once the window is full"""
+        if self._count == self.window:
+            oldest = self._returns[self._next]
+            self._sum -= oldest
+            self._outer -= np.outer(oldest, oldest)
+        else:
+            self._count += 1
+        self._returns[self._next] = returns
+        self._sum += returns
+        self._outer += np.outer(returns, returns)
+        self._next = (self._next + 1) % self.window
+        self._cov = None
+
+        self._since_rebuild += 1
+        if self._since_rebuild >= self.window:
+            self._rebuild()
+
+    def reset(self, returns: np.ndarray):
+        """Replace the window with the last ``window`` rows of a (bars x assets) return matrix"""
+        rows = returns[-self.window:]
+        self._returns[:] = 0.0
+        self._returns[:len(rows)] = rows
+        self._count = len(rows)
+        self._next = self._count % self.window
+        self._cov = None
+        self._rebuild()
+
+    def _rebuild(self):
+        rows = self._returns[:self._count]
+        self._sum = rows.sum(axis=0)
+        self._outer = rows.T @ rows
+        self._since_rebuild = 0
+
+    def covariance(self) -> np.ndarray:
+        if self._cov is None:
+            k = self._count
+            n = self._sum.shape[0]
+            if k < 2:
+                self._cov = np.zeros((n, n))
+            else:
+                self._cov = (self._outer - np.outer(self._sum, self._sum) / k) / (k - 1)
+        return self._cov
+
+
+@dataclass
+class RiskLimits:
+    """Portfolio limits; exposures, VaR and expected shortfall are fractions of equity"""
+    max_gross_exposure: float = 1.0
+    max_net_exposure: float = 1.0
+    max_sector_exposure: float = 0.4
+    max_positions: int = 10
+    max_var: float = 0.02                    # one-bar VaR at ``confidence``
+    max_expected_shortfall: float = 0.03
+    confidence: float = 0.95
+    min_observations: int = 20               # bars of returns before VaR/ES limits apply
+
+
+@dataclass
+class RiskDecision:
+    """Outcome for one candidate; ``metrics`` describe the book if it were accepted"""
+    accepted: bool
+    reason: Optional[str] = None
+    metrics: Dict[str, float] = field(default_factory=dict)
+
+
+class PortfolioRiskEngine:
+    """
+    Array-backed portfolio book with batch limit checks.
+
+    A candidate is a mapping of symbol -> signed share quantity; pair legs go
+    in one candidate so they are accepted or rejected together. Candidates are
+    taken in order, each against the book including the ones accepted before
+    it, and a limit only rejects a candidate that breaches it *and* makes it
+    worse, so orders that reduce risk always pass.
+
+    Symbols outside the engine's universe are ignored when setting the book.
+
+    Example:
+        >>> engine = PortfolioRiskEngine(RiskLimits(max_sector_exposure=0.3), equity=100_000)
+        >>> engine.set_symbols(['KO', 'PEP', 'AAPL'])
+        >>> engine.on_bars({'KO': (stamps, closes), ...})   # once per poll
+        >>> engine.set_book({'AAPL': 100})
+        >>> [d.accepted for d in engine.evaluate([{'KO': 50, 'PEP': -40}, {'AAPL': 200}])]
+        [True, False]
+    """
+
+    def __init__(self, limits: RiskLimits = None, equity: float = 100000.0, window: int = 120,
+                 budget_seconds: float = 0.001,
+                 sector_source: Callable[[List[str]], Dict[str, str]] = _database_sectors):
+        self.limits = limits or RiskLimits()
+        self.equity = equity
+        self.window = window
+        self.budget_seconds = budget_seconds
+        self.sector_source = sector_source
+
+        self.symbols: List[str] = []
+        self._index: Dict[str, int] = {}
+        self.quantities = np.zeros(0)
+        self.prices = np.full(0, np.nan)
+        self._sector_names: Dict[str, str] = {}
+        self._sectors_pending: set = set()
+        self._sector_codes = np.zeros(0, dtype=np.intp)
+        self._sector_labels: List[str] = []
+        self._sector_matrix = np.zeros((0, 0))
+        self._sector_limit_matrix = np.zeros((0, 0))
+        self.covariance = RollingCovariance(0, window)
+        self.last_bar_ns: Optional[int] = None
+
+        self.timing = Histogram()
+        get_metrics_registry().register_histogram('mltrading_risk_evaluation_seconds', self.timing,
+                                                  'Time to evaluate a batch of candidate orders')
+        self.stats = {'batches': 0, 'candidates': 0, 'accepted': 0, 'rejected': {}, 'over_budget': 0,
+                      'bars': 0, 'reseeds': 0}
+
+    # ------------------------------------------------------------------ universe
+
+    def set_symbols(self, symbols: Iterable[str]):
+        """Replace the universe; quantities and prices of kept symbols carry over, the covariance is reseeded"""
+        symbols = sorted(set(symbols))
+        if symbols == self.symbols:
+            return
+        index = {symbol: i for i, symbol in enumerate(symbols)}
+        quantities, prices = np.zeros(len(symbols)), np.full(len(symbols), np.nan)
+        for symbol, i in self._index.items():
+            if symbol in index:
+                quantities[index[symbol]] = self.quantities[i]
+                prices[index[symbol]] = self.prices[i]
+
+        self.symbols, self._index = symbols, index
+        self.quantities, self.prices = quantities, prices
+        self._sectors_pending.update(symbol for symbol in symbols if symbol not in self._sector_names)
+        self.covariance = RollingCovariance(len(symbols), self.window)
+        self.last_bar_ns = None
+        self._build_sector_matrix()
+
+    def set_sectors(self, sectors: Mapping[str, Optional[str]]):
+        self._sector_names.update({symbol: sector or UNKNOWN_SECTOR for symbol, sector in sectors.items()})
+        self._sectors_pending.difference_update(sectors)
+        self._build_sector_matrix()
+
+    def refresh_sectors(self):
+        """Look up sectors of symbols added since the last call (a failed lookup is retried on the next call)"""
+        if not self._sectors_pending or self.sector_source is None:
+            return
+        pending = sorted(self._sectors_pending)
+        try:
+            found = self.sector_source(pending)
+        except Exception as e:
+            logger.warning(f"Sector lookup failed for {len(pending)} symbols: {e}")
+            return
+        self.set_sectors({symbol: found.get(symbol) for symbol in pending})
+
+    def _build_sector_matrix(self):
+        names = [self._sector_names.get(symbol, UNKNOWN_SECTOR) for symbol in self.symbols]
+        self._sector_labels = sorted(set(names))
+        codes = {label: i for i, label in enumerate(self._sector_labels)}
+        self._sector_codes = np.array([codes[name] for name in names], dtype=np.intp)
+        self._sector_matrix = np.zeros((len(names), len(self._sector_labels)))
+        self._sector_matrix[np.arange(len(names)), self._sector_codes] = 1.0
+        self._sector_limit_matrix = self._sector_matrix[:, [label != UNKNOWN_SECTOR for label in self._sector_labels]]
+
+    # ------------------------------------------------------------------ prices
+
+    def on_bars(self, series: Mapping[str, Tuple[np.ndarray, np.ndarray]]) -> int:
+        """
+        Fold in new bars from (epoch-ns timestamps, closes) per symbol
+
+        A single new bar timestamp is an O(n^2) covariance update; the first
+        call, or a gap of several bars, reseeds the window from the series.
+
+        Returns:
+            Number of new bar timestamps applied
+        """
+        series = {symbol: data for symbol, data in series.items() if symbol in self._index and len(data[0])}
+        if not series:
+            return 0
+        latest = max(int(stamps[-1]) for stamps, _ in series.values())
+        if self.last_bar_ns is not None and latest <= self.last_bar_ns:
+            return 0
+
+        if self.last_bar_ns is not None:
+            new_stamps = np.unique(np.concatenate([stamps[stamps > self.last_bar_ns]
+                                                   for stamps, _ in series.values()]))
+            if len(new_stamps) == 1:
+                closes = self.prices.copy()
+                for symbol, (stamps, values) in series.items():
+                    if int(stamps[-1]) == latest:
+                        closes[self._index[symbol]] = values[-1]
+                self._apply_bar(closes)
+                self.last_bar_ns = latest
+                return 1
+
+        applied = self._seed(series)
+        self.last_bar_ns = latest
+        return applied
+
+    def _apply_bar(self, closes: np.ndarray):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = closes / self.prices - 1.0
+        self.covariance.update(np.nan_to_num(returns, nan=0.0, posinf=0.0, neginf=0.0))
+        self.prices = np.where(np.isfinite(closes), closes, self.prices)
+        self.stats['bars'] += 1
+
+    def _seed(self, series: Mapping[str, Tuple[np.ndarray, np.ndarray]]) -> int:
+        """Rebuild the covariance window on the union of bar timestamps, forward-filling prices"""
+        grid = np.unique(np.concatenate([stamps for stamps, _ in series.values()]))[-(self.window + 1):]
+        prices = np.full((len(grid), len(self.symbols)), np.nan)
+        for symbol, (stamps, values) in series.items():
+            position = np.searchsorted(stamps, grid, side='right') - 1
+            column = np.where(position >= 0, np.asarray(values, dtype=float)[np.maximum(position, 0)], np.nan)
+            prices[:, self._index[symbol]] = column
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = prices[1:] / prices[:-1] - 1.0
+        self.covariance.reset(np.nan_to_num(returns, nan=0.0, posinf=0.0, neginf=0.0))
+        self.prices = np.where(np.isfinite(prices[-1]), prices[-1], self.prices)
+        self.stats['reseeds'] += 1
+        return len(grid)
+
+    # ------------------------------------------------------------------ book
+
+    def set_book(self, quantities: Mapping[str, float], equity: float = None):
+        """Replace held quantities (signed shares) and optionally equity"""
+        self.quantities = np.zeros(len(self.symbols))
+        self.commit(quantities)
+        if equity:
+            self.equity = float(equity)
+
+    def commit(self, legs: Mapping[str, float]):
+        """Add accepted quantities to the book until the next ``set_book``"""
+        for symbol, qty in legs.items():
+            i = self._index.get(symbol)
+            if i is not None:
+                self.quantities[i] += qty
+
+    def exposures(self) -> np.ndarray:
+        return self.quantities * np.nan_to_num(self.prices, nan=0.0)
+
+    def _metrics(self, books: np.ndarray) -> Dict[str, np.ndarray]:
+        """Risk metrics of each row of a (books x symbols) dollar-exposure matrix"""
+        absolute = np.abs(books)
+        equity = self.equity
+        metrics = {
+            'positions': np.count_nonzero(books, axis=1).astype(float),
+            'gross_exposure': absolute.sum(axis=1) / equity,
+            'net_exposure': np.abs(books.sum(axis=1)) / equity,
+            'sector_exposure': (absolute @ self._sector_limit_matrix).max(axis=1, initial=0.0) / equity,
+        }
+        sigma = np.sqrt(np.maximum(((books @ self.covariance.covariance()) * books).sum(axis=1), 0.0))
+        z = NormalDist().inv_cdf(self.limits.confidence)
+        metrics['var'] = z * sigma / equity
+        metrics['expected_shortfall'] = NormalDist().pdf(z) / (1.0 - self.limits.confidence) * sigma / equity
+        return metrics
+
+    def _limit_values(self) -> Dict[str, float]:
+        limits = self.limits
+        values = {
+            'positions': limits.max_positions,
+            'gross_exposure': limits.max_gross_exposure,
+            'net_exposure': limits.max_net_exposure,
+            'sector_exposure': limits.max_sector_exposure,
+            'var': limits.max_var,
+            'expected_shortfall': limits.max_expected_shortfall,
+        }
+        if len(self.covariance) < limits.min_observations:
+            values['var'] = values['expected_shortfall'] = np.inf
+        return values
+
+    # ------------------------------------------------------------------ evaluation
+
+    def evaluate(self, candidates: Sequence[Mapping[str, float]],
+                 prices: Mapping[str, float] = None) -> List[RiskDecision]:
+        """
+        Check candidates (symbol -> signed quantity) in order against the book
+
+        ``prices`` fill in symbols the engine has no bar for yet (e.g. the
+        signal price). Candidates with a symbol outside the universe or
+        without a price are rejected as 'unpriced'.
+        """
+        started = time.perf_counter()
+        decisions = [RiskDecision(True) for _ in candidates]
+        n = len(self.symbols)
+        deltas = np.zeros((len(candidates), n))
+        unpriced = np.zeros(len(candidates), dtype=bool)
+        for row, legs in enumerate(candidates):
+            for symbol, qty in legs.items():
+                i = self._index.get(symbol)
+                if i is None:
+                    unpriced[row] = True
+                    continue
+                if not np.isfinite(self.prices[i]) and prices and prices.get(symbol):
+                    self.prices[i] = float(prices[symbol])
+                if not np.isfinite(self.prices[i]):
+                    unpriced[row] = True
+                    continue
+                deltas[row, i] += qty * self.prices[i]
+
+        limits = self._limit_values()
+        base = self.exposures()
+        pending = np.flatnonzero(~unpriced)
+        while pending.size:
+            # Book before and after each candidate, as if every pending one were accepted in turn
+            books = base + np.vstack([np.zeros(n), np.cumsum(deltas[pending], axis=0)])
+            metrics = self._metrics(books)
+            breaches = np.zeros((len(LIMIT_CHECKS), pending.size), dtype=bool)
+            for k, name in enumerate(LIMIT_CHECKS):
+                after, before = metrics[name][1:], metrics[name][:-1]
+                breaches[k] = (after > limits[name]) & (after > before + 1e-12)
+
+            rejected = np.flatnonzero(breaches.any(axis=0))
+            stop = rejected[0] if rejected.size else pending.size
+            for offset in range(pending.size if stop == pending.size else stop + 1):
+                decision = decisions[pending[offset]]
+                decision.metrics = {name: float(values[offset + 1]) for name, values in metrics.items()}
+                if offset == stop:
+                    decision.accepted = False
+                    decision.reason = LIMIT_CHECKS[int(np.argmax(breaches[:, offset]))]
+            if stop == pending.size:
+                break
+            base = books[stop]
+            pending = pending[stop + 1:]
+
+        for row in np.flatnonzero(unpriced):
+            decisions[row].accepted, decisions[row].reason = False, 'unpriced'
+
+        elapsed = time.perf_counter() - started
+        self.timing.observe(elapsed)
+        self.stats['batches'] += 1
+        self.stats['candidates'] += len(candidates)
+        for decision in decisions:
+            if decision.accepted:
+                self.stats['accepted'] += 1
+            else:
+                self.stats['rejected'][decision.reason] = self.stats['rejected'].get(decision.reason, 0) + 1
+        if elapsed > self.budget_seconds:
+            self.stats['over_budget'] += 1
+            logger.warning(f"Risk evaluation of {len(candidates)} candidates over {n} symbols took "
+                           f"{elapsed * 1000:.2f}ms (budget {self.budget_seconds * 1000:.2f}ms)")
+        return decisions
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Current book metrics, sector exposures and evaluation timing"""
+        book = self.exposures()[None, :]
+        metrics = {name: float(values[0]) for name, values in self._metrics(book).items()} if self.symbols else {}
+        sectors = (np.abs(book) @ self._sector_matrix)[0] / self.equity if self.symbols else []
+        return {
+            **self.stats,
+            'rejected': dict(self.stats['rejected']),
+            'symbols': len(self.symbols),
+            'equity': self.equity,
+            'observations': len(self.covariance),
+            'book': metrics,
+            'sectors': {label: float(value) for label, value in zip(self._sector_labels, sectors) if value},
+            'timing': {**self.timing.snapshot(), 'p50': self.timing.quantile(0.5),
+                       'p95': self.timing.quantile(0.95)}
+        }
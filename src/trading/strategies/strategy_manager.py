@@ -5,19 +5,33 @@ Manages multiple trading strategies, executes signals, and coordinates with brok
 
 from typing import Dict, List, Optional, Any, Callable
 from datetime import datetime, timezone
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from functools import partial
+import pickle
 import threading
 import time
 from dataclasses import dataclass
 
 from .base_strategy import BaseStrategy, StrategySignal, StrategyState
+from .market_data_hub import DatabaseBarSource, MarketDataHub
+from .portfolio_risk import PortfolioRiskEngine, RiskLimits
 from ..brokers.alpaca_service import AlpacaService
+from ..brokers.order_router import SIDE_FOR_SIGNAL, OrderRequest, OrderRouter
 from ...utils.logging_config import get_combined_logger, log_operation
 from ...utils.database_logging import get_trading_logger, get_performance_logger
+from ...utils.metrics import Histogram, get_metrics_registry
 
 logger = get_combined_logger("mltrading.strategy_manager")
 trading_logger = get_trading_logger()
 performance_logger = get_performance_logger()
 
+EXECUTOR_KINDS = ('thread', 'process')
+
+
+def _evaluate_strategy(strategy: BaseStrategy, market_data: Dict[str, Any]) -> List[StrategySignal]:
+    """Worker entry point; module level so process pools can pickle it"""
+    return strategy.generate_signals(market_data)
+
 
 @dataclass
 class StrategyConfig:
@@ -28,6 +42,12 @@ class StrategyConfig:
     risk_params: Dict[str, Any]
     enabled: bool = True
     max_positions: int = 5
+    lookback_bars: int = 200
+    # 'process' runs generate_signals on a pickled snapshot of the strategy, so
+    # state it caches on itself there is discarded; use it for CPU-bound, stateless work.
+    # add_strategy rejects strategies that cannot be pickled
+    executor: str = 'thread'
+    deadline_seconds: float = 10.0
 
 
 class StrategyManager:
@@ -44,7 +64,13 @@ class StrategyManager:
     def __init__(self,
                  broker_service: AlpacaService = None,
                  max_total_positions: int = 10,
-                 max_daily_orders: int = 20):
+                 max_daily_orders: int = 20,
+                 market_data_hub: MarketDataHub = None,
+                 bar_timeout: float = 60.0,
+                 max_workers: int = 4,
+                 max_processes: int = 2,
+                 order_router: OrderRouter = None,
+                 risk_engine: PortfolioRiskEngine = None):
         """
         Initialize strategy manager
 
@@ -52,10 +78,32 @@ class StrategyManager:
             broker_service: Broker service for order execution
             max_total_positions: Maximum total positions across all strategies
             max_daily_orders: Maximum orders per day
+            market_data_hub: Shared bar feed (defaults to polling the local market_data table)
+            bar_timeout: Longest wait for new bars before re-checking the loop state
+            max_workers: Threads evaluating strategies concurrently
+            max_processes: Worker processes for strategies configured with executor='process'
+            order_router: Asynchronous order router (defaults to one over broker_service)
+            risk_engine: Portfolio limits applied to each batch of signals
+                (defaults to RiskLimits with max_positions=max_total_positions)
         """
         self.broker_service = broker_service
         self.max_total_positions = max_total_positions
         self.max_daily_orders = max_daily_orders
+        self.market_data_hub = market_data_hub
+        self.bar_timeout = bar_timeout
+        self.order_router = order_router
+        self.risk_engine = risk_engine or PortfolioRiskEngine(RiskLimits(max_positions=max_total_positions))
+        self._bar_sequence = 0
+
+        # Strategy evaluation pools, created on first use
+        self.max_workers = max_workers
+        self.max_processes = max_processes
+        self._executors: Dict[str, Any] = {}
+        self._in_flight: Dict[str, Future] = {}
+        self._evaluation_stats: Dict[str, Dict[str, Any]] = {}
+        self._evaluation_lock = threading.Lock()
+        # Serializes signal processing against callers outside the loop thread
+        self._signal_lock = threading.RLock()
 
         # Strategy management
         self.strategies: Dict[str, BaseStrategy] = {}
@@ -94,6 +142,9 @@ class StrategyManager:
             if strategy_name in self.strategies:
                 logger.warning(f"Strategy {strategy_name} already exists")
                 return False
+            if strategy_config.executor not in EXECUTOR_KINDS:
+                logger.error(f"Unknown executor '{strategy_config.executor}' for strategy {strategy_name}")
+                return False
 
             # Create strategy instance
             # Remove symbols from parameters to avoid duplicate
@@ -101,6 +152,13 @@ class StrategyManager:
             params['risk_params'] = strategy_config.risk_params
 
             strategy = strategy_config.strategy_class(**params)
+            if strategy_config.executor == 'process':
+                try:
+                    pickle.dumps(strategy)
+                except Exception as e:
+                    logger.error(f"Strategy {strategy_name} cannot run with executor='process' "
+                                 f"because it cannot be pickled: {e}")
+                    return False
 
             # Initialize strategy
             strategy.initialize()
@@ -108,6 +166,7 @@ class StrategyManager:
             # Store strategy and config
             self.strategies[strategy_name] = strategy
             self.strategy_configs[strategy_name] = strategy_config
+            self._sync_hub_symbols()
 
             logger.info(f"Added strategy '{strategy_name}' with {len(strategy_config.symbols)} symbols")
 
@@ -155,6 +214,7 @@ class StrategyManager:
             # Remove from manager
             del self.strategies[strategy_name]
             del self.strategy_configs[strategy_name]
+            self._sync_hub_symbols()
 
             logger.info(f"Removed strategy '{strategy_name}'")
 
@@ -225,6 +285,18 @@ class StrategyManager:
         self.is_running = True
         self.stop_event.clear()
 
+        # One hub polls for every strategy's symbols
+        if self.market_data_hub is None:
+            capacity = max([config.lookback_bars for config in self.strategy_configs.values()] + [200])
+            self.market_data_hub = MarketDataHub(DatabaseBarSource(), capacity=capacity)
+        self._sync_hub_symbols()
+        self.market_data_hub.start()
+
+        if self.order_router is None and self.broker_service is not None:
+            self.order_router = OrderRouter(self.broker_service)
+        if self.order_router is not None:
+            self.order_router.start()
+
         # Start execution thread
         self.execution_thread = threading.Thread(target=self._execution_loop, daemon=True)
         self.execution_thread.start()
@@ -245,6 +317,9 @@ class StrategyManager:
 
         self.is_running = False
         self.stop_event.set()
+        # Releases the loop if it is waiting for bars
+        if self.market_data_hub is not None:
+            self.market_data_hub.stop()
 
         # Wait for execution thread to finish
         if self.execution_thread and self.execution_thread.is_alive():
@@ -252,6 +327,9 @@ class StrategyManager:
 
         # Stop all strategies
         self.stop_all_strategies()
+        self._shutdown_executors()
+        if self.order_router is not None:
+            self.order_router.stop()
 
         logger.info("Strategy execution stopped")
 
@@ -261,7 +339,7 @@ class StrategyManager:
         )
 
     def _execution_loop(self):
-        """Main execution loop for strategy manager"""
+        """Main execution loop for strategy manager; runs strategies when their symbols get new bars"""
         logger.info("Strategy execution loop started")
 
         while self.is_running and not self.stop_event.is_set():
@@ -269,61 +347,191 @@ class StrategyManager:
                 # Reset daily counters if needed
                 self._reset_daily_counters()
 
-                # Get market data for all symbols
-                market_data = self._get_market_data()
+                # Wake on new bars rather than a fixed sleep
+                self._bar_sequence, updated = self.market_data_hub.wait_for_bars(self._bar_sequence,
+                                                                                 timeout=self.bar_timeout)
+                if self.stop_event.is_set() or not updated:
+                    continue
+                self.run_strategies(updated)
 
-                # Process each strategy
-                for strategy_name, strategy in self.strategies.items():
-                    if strategy.state != StrategyState.RUNNING:
-                        continue
+            except Exception as e:
+                logger.error(f"Error in execution loop: {e}")
+                self.stop_event.wait(60)  # Longer wait on error
 
-                    config = self.strategy_configs[strategy_name]
-                    if not config.enabled:
-                        continue
+        logger.info("Strategy execution loop ended")
 
-                    try:
-                        # Generate signals
-                        signals = strategy.generate_signals(market_data)
+    def run_strategies(self, updated_symbols: List[str] = None):
+        """
+        Evaluate running strategies concurrently and process their signals
 
-                        # Process each signal
-                        for signal in signals:
-                            self._process_signal(signal, strategy_name)
+        Strategies are evaluated on a worker pool. Each result is processed on
+        the calling thread as soon as it arrives, so one slow strategy does not
+        hold back the others, and a strategy's signals keep their order. A
+        result not ready by the strategy's deadline is dropped and counted as
+        late; the strategy is skipped until its evaluation finishes.
 
-                    except Exception as e:
-                        logger.error(f"Error processing strategy {strategy_name}: {e}")
-                        strategy.state = StrategyState.ERROR
+        Args:
+            updated_symbols: Symbols that received new bars; strategies trading
+                none of them are skipped (None runs every strategy)
+        """
+        updated = set(updated_symbols) if updated_symbols is not None else None
+        jobs: Dict[Future, tuple] = {}
+        try:
+            self._update_risk_prices()
+        except Exception as e:
+            logger.error(f"Error updating risk engine prices: {e}")
 
-                # Sleep before next iteration
-                time.sleep(30)  # Check every 30 seconds (configurable)
+        for strategy_name, strategy in list(self.strategies.items()):
+            if strategy.state != StrategyState.RUNNING:
+                continue
 
-            except Exception as e:
-                logger.error(f"Error in execution loop: {e}")
-                time.sleep(60)  # Longer sleep on error
+            config = self.strategy_configs[strategy_name]
+            if not config.enabled:
+                continue
+            if updated is not None and updated.isdisjoint(config.symbols):
+                continue
 
-        logger.info("Strategy execution loop ended")
+            stats = self._get_evaluation_stats(strategy_name)
+            with self._evaluation_lock:
+                if strategy_name in self._in_flight:
+                    stats['skipped_in_flight'] += 1
+                    continue
 
-    def _get_market_data(self) -> Dict[str, Any]:
-        """
-        Get market data for all symbols used by strategies
+            try:
+                market_data = self._get_market_data(config.symbols, config.lookback_bars)
+                submitted = time.perf_counter()
+                future = self._executor_for(config.executor).submit(_evaluate_strategy, strategy, market_data)
+            except Exception as e:
+                logger.error(f"Error submitting strategy {strategy_name}: {e}")
+                strategy.state = StrategyState.ERROR
+                continue
+
+            with self._evaluation_lock:
+                self._in_flight[strategy_name] = future
+            future.add_done_callback(partial(self._evaluation_done, strategy_name, submitted))
+            jobs[future] = (strategy_name, submitted + config.deadline_seconds)
+
+        order = {future: index for index, future in enumerate(jobs)}
+        pending = set(jobs)
+        while pending:
+            next_deadline = min(jobs[future][1] for future in pending)
+            done, pending = wait(pending, timeout=max(0.0, next_deadline - time.perf_counter()),
+                                 return_when=FIRST_COMPLETED)
+
+            for future in sorted(done, key=order.get):
+                self._handle_evaluation(jobs[future][0], future)
+
+            now = time.perf_counter()
+            for future in [future for future in pending if jobs[future][1] <= now]:
+                pending.discard(future)
+                strategy_name = jobs[future][0]
+                future.cancel()
+                self._get_evaluation_stats(strategy_name)['late'] += 1
+                get_metrics_registry().counter('mltrading_strategy_late_results_total',
+                                               'Strategy evaluations that missed their deadline',
+                                               strategy=strategy_name).inc()
+                logger.warning(f"Strategy {strategy_name} missed its "
+                               f"{self.strategy_configs[strategy_name].deadline_seconds}s deadline; "
+                               f"dropping its signals")
+
+    def _handle_evaluation(self, strategy_name: str, future: Future):
+        """Process the signals of an on-time evaluation"""
+        strategy = self.strategies.get(strategy_name)
+        if strategy is None:
+            return
+        try:
+            signals = future.result()
+        except Exception as e:
+            logger.error(f"Error processing strategy {strategy_name}: {e}")
+            self._get_evaluation_stats(strategy_name)['errors'] += 1
+            strategy.state = StrategyState.ERROR
+            return
 
-        Returns:
-            Dictionary of symbol -> market data
-        """
-        # Collect all symbols from all strategies
+        self._process_signals(signals, strategy_name)
+
+    def _evaluation_done(self, strategy_name: str, submitted: float, future: Future):
+        """Done callback (worker thread): record timing and release the strategy"""
+        elapsed = time.perf_counter() - submitted
+        stats = self._get_evaluation_stats(strategy_name)
+        if not future.cancelled():
+            stats['timing'].observe(elapsed)
+            stats['evaluations'] += 1
+        with self._evaluation_lock:
+            if self._in_flight.get(strategy_name) is future:
+                del self._in_flight[strategy_name]
+
+    def _get_evaluation_stats(self, strategy_name: str) -> Dict[str, Any]:
+        with self._evaluation_lock:
+            stats = self._evaluation_stats.get(strategy_name)
+            if stats is None:
+                stats = self._evaluation_stats[strategy_name] = {
+                    'timing': Histogram(), 'evaluations': 0, 'late': 0, 'errors': 0, 'skipped_in_flight': 0
+                }
+                get_metrics_registry().register_histogram('mltrading_strategy_evaluation_seconds', stats['timing'],
+                                                          'Time from submitting a strategy to its signals',
+                                                          strategy=strategy_name)
+            return stats
+
+    def _executor_for(self, kind: str):
+        """Thread or process pool for strategy evaluation, created on first use"""
+        with self._evaluation_lock:
+            executor = self._executors.get(kind)
+            if executor is None:
+                if kind == 'process':
+                    executor = ProcessPoolExecutor(max_workers=self.max_processes)
+                else:
+                    executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                  thread_name_prefix="mltrading-strategy")
+                self._executors[kind] = executor
+            return executor
+
+    def _shutdown_executors(self):
+        """Stop the evaluation pools without waiting for stragglers"""
+        with self._evaluation_lock:
+            executors, self._executors = self._executors, {}
+        for executor in executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _sync_hub_symbols(self):
+        """Point the hub and the risk engine at the union of all strategies' symbols"""
         all_symbols = set()
         for config in self.strategy_configs.values():
             all_symbols.update(config.symbols)
+        self.risk_engine.set_symbols(all_symbols)
+        if self.market_data_hub is not None:
+            self.market_data_hub.set_symbols(all_symbols)
 
-        market_data = {}
+    def _update_risk_prices(self):
+        """Feed the risk engine's covariance the hub's closes (a no-op until a new bar arrives)"""
+        if self.market_data_hub is None:
+            return
+        series = {}
+        for symbol in self.risk_engine.symbols:
+            window = self.market_data_hub.get_window(symbol, self.risk_engine.window + 1)
+            if window is not None and len(window):
+                series[symbol] = (window.timestamps, window.close)
+        self.risk_engine.on_bars(series)
+
+    def _get_market_data(self, symbols: List[str] = None, lookback_bars: int = None) -> Dict[str, Any]:
+        """
+        Get market data windows from the shared hub
 
-        # For now, return empty dict - in real implementation,
-        # this would fetch live market data from your data service
-        # or use the existing data extraction system
+        Args:
+            symbols: Symbols to return (None for every strategy's symbols)
+            lookback_bars: Bars per symbol (None for everything buffered)
+
+        Returns:
+            Dictionary of symbol -> read-only OHLCV DataFrame
+        """
+        if self.market_data_hub is None:
+            return {}
 
-        # TODO: Integrate with your existing data collection system
-        # This could use the Yahoo collector or Alpaca market data
+        if symbols is None:
+            symbols = set()
+            for config in self.strategy_configs.values():
+                symbols.update(config.symbols)
 
-        return market_data
+        return self.market_data_hub.get_frames(symbols, lookback_bars)
 
     def _process_signal(self, signal: StrategySignal, strategy_name: str):
         """
@@ -333,32 +541,142 @@ class StrategyManager:
             signal: Trading signal to process
             strategy_name: Name of strategy that generated the signal
         """
-        try:
-            # Check global risk limits
-            if not self._check_global_risk_limits():
-                logger.warning("Global risk limits exceeded, skipping signal")
-                return
+        self._process_signals([signal], strategy_name)
 
-            strategy = self.strategies[strategy_name]
+    def _process_signals(self, signals: List[StrategySignal], strategy_name: str):
+        """
+        Process one evaluation's signals as a batch
+
+        Each signal is turned into order instructions by its strategy, then the
+        whole batch is checked against the portfolio risk limits at once and
+        the accepted signals are executed in order.
+
+        Args:
+            signals: Trading signals to process
+            strategy_name: Name of strategy that generated the signals
+        """
+        with self._signal_lock:
+            try:
+                # Check global risk limits
+                if not self._check_global_risk_limits():
+                    logger.warning("Global risk limits exceeded, skipping signals")
+                    return
+
+                strategy = self.strategies[strategy_name]
+
+                # Get available capital (placeholder - integrate with account info)
+                available_capital = 10000.0  # TODO: Get from broker service
+
+                # Process signals through strategy
+                pending = []
+                for signal in signals:
+                    order_instructions = strategy.process_signal(signal, available_capital)
+                    if order_instructions:
+                        pending.append((signal, order_instructions))
+                if not pending:
+                    return
+
+                legs = [self._signal_legs(signal, order_instructions) for signal, order_instructions in pending]
+                decisions = self._check_portfolio_risk(pending, legs, strategy_name)
+
+                for (signal, order_instructions), signal_legs, accepted in zip(pending, legs, decisions):
+                    if not accepted:
+                        continue
+                    if not self._check_global_risk_limits():
+                        logger.warning("Global risk limits exceeded, skipping remaining signals")
+                        break
 
-            # Get available capital (placeholder - integrate with account info)
-            available_capital = 10000.0  # TODO: Get from broker service
+                    self._execute_signal(signal, strategy_name, order_instructions)
+                    self.risk_engine.commit(signal_legs)
 
-            # Process signal through strategy
-            order_instructions = strategy.process_signal(signal, available_capital)
+                    # Notify callbacks
+                    for callback in self.signal_callbacks:
+                        try:
+                            callback(signal, strategy_name, order_instructions)
+                        except Exception as e:
+                            logger.error(f"Error in signal callback: {e}")
 
-            if order_instructions:
-                self._execute_signal(signal, strategy_name, order_instructions)
+            except Exception as e:
+                logger.error(f"Error processing signals from {strategy_name}: {e}")
+
+    @staticmethod
+    def _signal_legs(signal: StrategySignal, order_instructions: Dict[str, Any]) -> Dict[str, float]:
+        """Signed share quantity a signal's order would add to the book"""
+        side = SIDE_FOR_SIGNAL.get(signal.signal_type.value)
+        if side is None:
+            return {}
+        quantity = float(order_instructions.get('quantity', 0))
+        return {signal.symbol: quantity if side == 'buy' else -quantity}
+
+    def _check_portfolio_risk(self, pending: List[tuple], legs: List[Dict[str, float]],
+                              strategy_name: str) -> List[bool]:
+        """
+        Run a batch of signals through the portfolio risk engine
 
-                # Notify callbacks
-                for callback in self.signal_callbacks:
-                    try:
-                        callback(signal, strategy_name, order_instructions)
-                    except Exception as e:
-                        logger.error(f"Error in signal callback: {e}")
+        Legs of a pair (signals sharing metadata 'pair_name') form one candidate
+        and are accepted or rejected together.
 
-        except Exception as e:
-            logger.error(f"Error processing signal from {strategy_name}: {e}")
+        Returns:
+            Whether each signal may be executed
+        """
+        self._sync_risk_book()
+        self.risk_engine.refresh_sectors()
+
+        groups: Dict[Any, List[int]] = {}
+        for position, (signal, _) in enumerate(pending):
+            pair_name = (signal.metadata or {}).get('pair_name')
+            groups.setdefault(('pair', pair_name) if pair_name else ('signal', position), []).append(position)
+
+        candidates = []
+        for members in groups.values():
+            combined: Dict[str, float] = {}
+            for position in members:
+                for symbol, quantity in legs[position].items():
+                    combined[symbol] = combined.get(symbol, 0.0) + quantity
+            candidates.append(combined)
+
+        prices = {signal.symbol: signal.price for signal, _ in pending if signal.price}
+        decisions = self.risk_engine.evaluate(candidates, prices)
+
+        accepted = [True] * len(pending)
+        for members, decision in zip(groups.values(), decisions):
+            if decision.accepted:
+                continue
+            for position in members:
+                accepted[position] = False
+            symbols = ', '.join(pending[position][0].symbol for position in members)
+            logger.warning(f"Portfolio risk rejected {symbols} from {strategy_name}: {decision.reason} "
+                           f"({decision.metrics.get(decision.reason, float('nan')):.4f} after the trade)")
+            trading_logger.log_trading_event(
+                event_type="signal_rejected",
+                symbol=symbols,
+                strategy=strategy_name,
+                reason=decision.reason
+            )
+        return accepted
+
+    def _sync_risk_book(self):
+        """Load held and in-flight quantities into the risk engine"""
+        quantities: Dict[str, float] = {}
+        equity = None
+        if self.broker_service is not None and self.broker_service.is_connected():
+            # Served from the broker state cache, not a REST call per batch
+            for position in self.broker_service.get_positions():
+                quantities[position['symbol']] = float(position['qty'])
+            account = self.broker_service.get_account_info()
+            equity = account.get('portfolio_value') if account else None
+        else:
+            for strategy in self.strategies.values():
+                for symbol, position in strategy.positions.items():
+                    quantities[symbol] = quantities.get(symbol, 0.0) + position.quantity
+
+        if self.order_router is not None:
+            for order in self.order_router.in_flight():
+                remaining = float(order['qty']) - float(order['filled_qty'] or 0)
+                quantities[order['symbol']] = (quantities.get(order['symbol'], 0.0)
+                                               + (remaining if order['side'] == 'buy' else -remaining))
+
+        self.risk_engine.set_book(quantities, equity)
 
     def _execute_signal(self,
                         signal: StrategySignal,
@@ -373,15 +691,28 @@ class StrategyManager:
             order_instructions: Order instructions from strategy
         """
         try:
-            if not self.broker_service or not self.broker_service.is_connected():
+            side = SIDE_FOR_SIGNAL.get(signal.signal_type.value)
+            if self.order_router is not None and order_instructions and side:
+                # Queued, not awaited: the next leg of a pair goes out while this one is in flight
+                request = OrderRequest(
+                    symbol=signal.symbol,
+                    qty=int(order_instructions['quantity']),
+                    side=side,
+                    order_type=order_instructions.get('order_type', 'market'),
+                    time_in_force=order_instructions.get('time_in_force', 'day'),
+                    strategy=strategy_name,
+                    group_id=(signal.metadata or {}).get('pair_name')
+                )
+                self.order_router.submit(request)
+                order_instructions = {**order_instructions, 'client_order_id': request.client_order_id}
+                logger.info(f"Routed {side} {request.qty} {signal.symbol} from strategy {strategy_name} "
+                            f"({request.client_order_id})")
+            elif not self.broker_service or not self.broker_service.is_connected():
                 logger.warning("Broker service not available, cannot execute signal")
                 return
-
-            # TODO: Implement order placement through broker service
-            # This would integrate with your Alpaca service
-
-            logger.info(f"Would execute {signal.signal_type.value} order for {signal.symbol} "
-                        f"from strategy {strategy_name}")
+            else:
+                logger.info(f"Would execute {signal.signal_type.value} order for {signal.symbol} "
+                            f"from strategy {strategy_name}")
 
             # Log the signal execution
             trading_logger.log_trading_event(
@@ -450,9 +781,34 @@ class StrategyManager:
                                       if s.state == StrategyState.RUNNING]),
             'daily_orders': self.daily_orders_count,
             'total_positions': sum(len(s.positions) for s in self.strategies.values()),
+            'market_data': self.market_data_hub.get_stats() if self.market_data_hub else None,
+            'evaluation': self.get_evaluation_stats(),
+            'orders': self.order_router.get_stats() if self.order_router else None,
+            'risk': self.risk_engine.get_stats(),
             'strategies': strategy_statuses
         }
 
+    def get_evaluation_stats(self) -> Dict[str, Any]:
+        """Per-strategy evaluation timing (seconds), late, error and skip counts"""
+        with self._evaluation_lock:
+            items = list(self._evaluation_stats.items())
+            in_flight = set(self._in_flight)
+        evaluation = {}
+        for name, stats in items:
+            config = self.strategy_configs.get(name)
+            timing = stats['timing']
+            evaluation[name] = {
+                'executor': config.executor if config else None,
+                'deadline_seconds': config.deadline_seconds if config else None,
+                'in_flight': name in in_flight,
+                'evaluations': stats['evaluations'],
+                'late': stats['late'],
+                'errors': stats['errors'],
+                'skipped_in_flight': stats['skipped_in_flight'],
+                'timing': {**timing.snapshot(), 'p50': timing.quantile(0.5), 'p95': timing.quantile(0.95)}
+            }
+        return evaluation
+
     def get_performance_summary(self) -> Dict[str, Any]:
         """Get performance summary for all strategies"""
         total_pnl = 0.0
@@ -14,6 +14,7 @@ from threading import Lock
 import logging
 
 from .logging_config import get_combined_logger
+from .metrics import get_metrics_registry
 
 logger = get_combined_logger("mltrading.circuit_breaker")
 
@@ -25,6 +26,10 @@ class CircuitState(Enum):
     HALF_OPEN = "half_open"  # Testing recovery
 
 
+# Numeric value of each state for the mltrading_circuit_breaker_state gauge
+STATE_GAUGE_VALUES = {CircuitState.CLOSED: 0, CircuitState.HALF_OPEN: 1, CircuitState.OPEN: 2}
+
+
 @dataclass
 class CircuitBreakerConfig:
     """Circuit breaker configuration"""
@@ -81,6 +86,18 @@ class CircuitBreaker:
         self.stats = CircuitBreakerStats()
         self._lock = Lock()
 
+        metrics = get_metrics_registry()
+        self._call_counters = {
+            outcome: metrics.counter('mltrading_circuit_breaker_calls_total',
+                                     'Circuit breaker calls by outcome', breaker=name, outcome=outcome)
+            for outcome in ('success', 'failure', 'blocked')
+        }
+        self._transition_counter = metrics.counter('mltrading_circuit_breaker_transitions_total',
+                                                   'Circuit breaker state changes', breaker=name)
+        self._state_gauge = metrics.gauge('mltrading_circuit_breaker_state',
+                                          'Circuit state (0 closed, 1 half-open, 2 open)', breaker=name)
+        self._state_gauge.set(STATE_GAUGE_VALUES[self.state])
+
         # Register instance for monitoring
         with CircuitBreaker._lock:
             CircuitBreaker._instances[name] = self
@@ -122,6 +139,7 @@ class CircuitBreaker:
         with self._lock:
             self.stats.success_count += 1
             self.stats.total_calls += 1
+            self._call_counters['success'].inc()
 
             if self.state == CircuitState.HALF_OPEN:
                 if self.stats.success_count >= self.config.success_threshold:
@@ -136,6 +154,7 @@ class CircuitBreaker:
             self.stats.failure_count += 1
             self.stats.total_calls += 1
             self.stats.last_failure_time = time.time()
+            self._call_counters['failure'].inc()
 
             logger.warning(f"Circuit breaker {self.name} recorded failure: {exception}")
 
@@ -149,6 +168,8 @@ class CircuitBreaker:
         """Transition circuit breaker to open state"""
         self.state = CircuitState.OPEN
         self.stats.state_changes += 1
+        self._transition_counter.inc()
+        self._state_gauge.set(STATE_GAUGE_VALUES[self.state])
         self.stats.success_count = 0  # Reset success counter
         logger.error(f"Circuit breaker {self.name} opened after {self.stats.failure_count} failures")
 
@@ -156,6 +177,8 @@ class CircuitBreaker:
         """Transition circuit breaker to half-open state"""
         self.state = CircuitState.HALF_OPEN
         self.stats.state_changes += 1
+        self._transition_counter.inc()
+        self._state_gauge.set(STATE_GAUGE_VALUES[self.state])
         self.stats.success_count = 0  # Reset success counter for testing
         logger.info(f"Circuit breaker {self.name} half-opened for recovery testing")
 
@@ -163,6 +186,8 @@ class CircuitBreaker:
         """Transition circuit breaker to closed state"""
         self.state = CircuitState.CLOSED
         self.stats.state_changes += 1
+        self._transition_counter.inc()
+        self._state_gauge.set(STATE_GAUGE_VALUES[self.state])
         self.stats.failure_count = 0  # Reset failure counter
         logger.info(f"Circuit breaker {self.name} closed after {self.stats.success_count} successful calls")
 
@@ -202,6 +227,7 @@ class CircuitBreaker:
             if self.state == CircuitState.OPEN:
                 if not self._should_attempt_reset():
                     self.stats.blocked_calls += 1
+                    self._call_counters['blocked'].inc()
                     raise CircuitBreakerError(f"Circuit breaker {self.name} is open")
                 else:
                     self._transition_to_half_open()
@@ -30,10 +30,21 @@ class ConnectionConfig:
     BATCH_POOL_SIZE = 2  # For small batch processing
     CONCURRENT_POOL_SIZE = 3  # Only for non-connection intensive tasks
 
-    # Connection timeout and retry settings
+    # Task runner limits (database slots follow the pool size)
+    IO_TASK_WORKERS = 32  # Threads for network-bound work, not tied to the pool
+
+    # Connection timeout and pool behaviour
     CONNECTION_TIMEOUT = 30  # seconds
-    POOL_RETRY_ATTEMPTS = 3
-    POOL_RETRY_DELAY = 0.5  # seconds
+    POOL_ACQUIRE_TIMEOUT = 30  # seconds a caller waits in the pool queue
+    POOL_MAX_LIFETIME = 1800  # seconds before a connection is recycled
+    POOL_HEALTH_CHECK_AFTER = 30  # idle seconds before checkout runs SELECT 1
+    POOL_LEAK_THRESHOLD = 300  # seconds a checkout may be held before flagged as a leak
+    TRACK_CHECKOUTS = os.getenv('DB_TRACK_CHECKOUTS', 'false').lower() in ('1', 'true', 'yes')
+
+    # Read replica routing
+    REPLICA_POOL_SIZE = 4  # Read pool connections per process when a replica is configured
+    REPLICA_MAX_LAG = 30.0  # seconds of replay lag before reads fall back to the primary
+    REPLICA_LAG_CHECK_INTERVAL = 5.0  # seconds between replica lag probes
 
     @classmethod
     def get_pool_config(cls) -> Dict[str, Any]:
@@ -44,6 +55,14 @@ class ConnectionConfig:
             'timeout': cls.CONNECTION_TIMEOUT
         }
 
+    @classmethod
+    def get_task_concurrency_limits(cls) -> Dict[str, int]:
+        """Get task runner limits derived from the connection pool budget"""
+        return {
+            'db_slots': cls.get_pool_config()['max_conn'],
+            'io_workers': cls.IO_TASK_WORKERS
+        }
+
     @classmethod
     def get_connection_params(cls) -> Dict[str, Any]:
         """Get database connection parameters from unified settings"""
@@ -58,7 +77,12 @@ class ConnectionConfig:
                 'password': settings.database.password,
                 'min_conn': settings.database.min_connections,
                 'max_conn': settings.database.max_connections,
-                'timeout': settings.database.timeout
+                'timeout': settings.database.timeout,
+                'replica_host': settings.database.replica_host,
+                'replica_port': settings.database.replica_port,
+                'replica_database': settings.database.replica_name,
+                'replica_max_conn': settings.database.replica_max_connections,
+                'replica_max_lag': settings.database.replica_max_lag_seconds
             }
         except ImportError:
             # Fallback to environment variables for backward compatibility
@@ -75,7 +99,12 @@ class ConnectionConfig:
             'password': os.getenv('DB_PASSWORD', 'nishant'),
             'min_conn': cls.MIN_POOL_SIZE,
             'max_conn': cls.MAX_POOL_SIZE,
-            'timeout': cls.CONNECTION_TIMEOUT
+            'timeout': cls.CONNECTION_TIMEOUT,
+            'replica_host': os.getenv('DB_REPLICA_HOST'),
+            'replica_port': int(os.getenv('DB_REPLICA_PORT')) if os.getenv('DB_REPLICA_PORT') else None,
+            'replica_database': os.getenv('DB_REPLICA_NAME'),
+            'replica_max_conn': cls.REPLICA_POOL_SIZE,
+            'replica_max_lag': cls.REPLICA_MAX_LAG
         }
 
     @classmethod
@@ -3,16 +3,88 @@ Database Log Management Utilities
 Provides functions for managing, querying, and cleaning up database logs
 """
 
+import base64
 import json
-from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Any, Optional, Tuple
+import re
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 from pathlib import Path
 
 from ..data.storage.database import DatabaseManager
+from .log_rollups import (
+    ROLLUP_SOURCE_COLUMNS, LogRollupAggregator, bucket_quantile, merge_buckets, write_rollups
+)
 from .logging_config import get_combined_logger
 
 logger = get_combined_logger("mltrading.database_log_manager", enable_database_logging=False)
 
+# Log tables; once partition_log_tables.sql has run they are range-partitioned by day
+LOG_TABLES = ['system_logs', 'trading_events', 'performance_logs', 'error_logs',
+              'user_action_logs', 'data_collection_logs']
+ROLLUP_TABLE = 'log_rollups'
+
+# Column each partitioned table is ranged on
+PARTITION_COLUMNS = {**{table: 'timestamp' for table in LOG_TABLES}, ROLLUP_TABLE: 'bucket'}
+
+_PARTITION_SUFFIX = re.compile(r'_p(\d{8})$')
+
+# Log table DDL, run in this order by DatabaseLogManager.migrate_log_tables
+_STORAGE_DIR = Path(__file__).parent.parent / 'data' / 'storage'
+PARTITION_SQL = _STORAGE_DIR / 'partition_log_tables.sql'
+CREATE_LOG_TABLES_SQL = _STORAGE_DIR / 'create_log_tables.sql'
+
+
+# Columns converted to ISO strings for JSON consumers of query_logs
+_TIME_COLUMNS = ('timestamp', 'created_at')
+
+
+def encode_log_cursor(timestamp: datetime, log_id: int) -> str:
+    """Opaque page token for the keyset position (timestamp, id)"""
+    return base64.urlsafe_b64encode(f"{timestamp.isoformat()}|{log_id}".encode()).decode()
+
+
+def decode_log_cursor(token: str) -> Tuple[datetime, int]:
+    """Keyset position of a page token from encode_log_cursor"""
+    try:
+        stamp, log_id = base64.urlsafe_b64decode(token.encode()).decode().rsplit('|', 1)
+        return datetime.fromisoformat(stamp), int(log_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid log cursor: {token!r}") from e
+
+
+def partition_name(parent: str, day: date) -> str:
+    """Name of the daily partition of ``parent`` holding ``day`` (UTC)"""
+    return f"{parent}_p{day:%Y%m%d}"
+
+
+def partition_day(parent: str, name: str) -> Optional[date]:
+    """Day a partition name covers, or None for the default partition and foreign names"""
+    if not name.startswith(parent + '_p'):
+        return None
+    match = _PARTITION_SUFFIX.search(name)
+    return datetime.strptime(match.group(1), '%Y%m%d').date() if match else None
+
+
+def partition_bounds(day: date) -> str:
+    """Bound clause of the daily partition holding ``day``, at UTC midnights"""
+    return f"FOR VALUES FROM ('{day.isoformat()} 00:00:00+00') TO ('{(day + timedelta(days=1)).isoformat()} 00:00:00+00')"
+
+
+def partition_ddl(parent: str, day: date) -> str:
+    """CREATE statement for one daily partition, bounded at UTC midnights"""
+    return f"CREATE TABLE IF NOT EXISTS {partition_name(parent, day)} PARTITION OF {parent} {partition_bounds(day)}"
+
+
+def expired_partitions(parent: str, names: List[str], cutoff: datetime) -> List[str]:
+    """Daily partitions of ``parent`` whose whole range is older than ``cutoff``"""
+    expired = []
+    for name in names:
+        day = partition_day(parent, name)
+        if day is not None and datetime.combine(day + timedelta(days=1), datetime.min.time(),
+                                                tzinfo=timezone.utc) <= cutoff:
+            expired.append(name)
+    return sorted(expired)
+
 
 class DatabaseLogManager:
     """Manager for database-stored logs"""
@@ -20,35 +92,140 @@ class DatabaseLogManager:
     def __init__(self, db_manager: DatabaseManager = None):
         self.db_manager = db_manager or DatabaseManager()
 
+    def _rollups_available(self, cursor) -> bool:
+        """Whether log_rollups exists (partition_log_tables.sql has run) and holds any rows"""
+        cursor.execute("SELECT to_regclass(%s) IS NOT NULL", (ROLLUP_TABLE,))
+        if not cursor.fetchone()[0]:
+            return False
+        cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {ROLLUP_TABLE})")
+        return bool(cursor.fetchone()[0])
+
+    def _rollup_statistics(self, cursor) -> Dict[str, Any]:
+        """System, performance and error log statistics from the per-minute rollups"""
+        stats = {}
+        cursor.execute(f"""
+            SELECT
+                source,
+                COALESCE(SUM(event_count), 0) as events,
+                COALESCE(SUM(error_count), 0) as errors,
+                COALESCE(SUM(duration_count), 0) as timed,
+                COALESCE(SUM(duration_sum_ms), 0) as duration_sum_ms,
+                MAX(duration_max_ms) as max_duration_ms,
+                MIN(bucket) as oldest,
+                MAX(bucket) + INTERVAL '1 minute' as newest,
+                COUNT(DISTINCT component) as components,
+                COUNT(DISTINCT operation) as operations
+            FROM {ROLLUP_TABLE}
+            GROUP BY source
+        """)
+        columns = [desc[0] for desc in cursor.description]
+        by_source = {row[0]: dict(zip(columns, row)) for row in cursor.fetchall()}
+
+        cursor.execute(f"""
+            SELECT level, SUM(event_count)
+            FROM {ROLLUP_TABLE}
+            WHERE source = 'system_logs'
+            GROUP BY level
+        """)
+        levels = dict(cursor.fetchall())
+
+        # System logs statistics
+        system = by_source.get('system_logs', {})
+        stats['system_logs'] = {
+            'total_logs': system.get('events', 0),
+            'unique_components': system.get('components', 0),
+            'oldest_log': system.get('oldest'),
+            'newest_log': system.get('newest'),
+            'error_count': levels.get('ERROR', 0),
+            'warning_count': levels.get('WARNING', 0),
+            'info_count': levels.get('INFO', 0),
+            'debug_count': levels.get('DEBUG', 0)
+        }
+
+        # Performance logs statistics
+        performance = by_source.get('performance_logs', {})
+        timed = performance.get('timed', 0)
+        stats['performance_logs'] = {
+            'total_metrics': performance.get('events', 0),
+            'avg_duration_ms': performance['duration_sum_ms'] / timed if timed else None,
+            'max_duration_ms': performance.get('max_duration_ms'),
+            'error_count': performance.get('errors', 0),
+            'unique_operations': performance.get('operations', 0)
+        }
+
+        # Error logs statistics
+        errors = by_source.get('error_logs', {})
+        stats['error_logs'] = {
+            'total_errors': errors.get('events', 0),
+            'unique_error_types': errors.get('operations', 0),
+            'affected_components': errors.get('components', 0),
+            'oldest_error': errors.get('oldest'),
+            'newest_error': errors.get('newest')
+        }
+        return stats
+
+    def _raw_statistics(self, cursor) -> Dict[str, Any]:
+        """System, performance and error log statistics scanned from the raw tables (no rollups yet)"""
+        stats = {}
+        cursor.execute("""
+            SELECT
+                COUNT(*) as total_logs,
+                COUNT(DISTINCT logger_name) as unique_components,
+                MIN(timestamp) as oldest_log,
+                MAX(timestamp) as newest_log,
+                COUNT(CASE WHEN level = 'ERROR' THEN 1 END) as error_count,
+                COUNT(CASE WHEN level = 'WARNING' THEN 1 END) as warning_count,
+                COUNT(CASE WHEN level = 'INFO' THEN 1 END) as info_count,
+                COUNT(CASE WHEN level = 'DEBUG' THEN 1 END) as debug_count
+            FROM system_logs
+        """)
+        stats['system_logs'] = dict(zip([desc[0] for desc in cursor.description], cursor.fetchone()))
+
+        cursor.execute("""
+            SELECT
+                COUNT(*) as total_metrics,
+                AVG(duration_ms) as avg_duration_ms,
+                MAX(duration_ms) as max_duration_ms,
+                COUNT(CASE WHEN status = 'error' THEN 1 END) as error_count,
+                COUNT(DISTINCT operation_name) as unique_operations
+            FROM performance_logs
+        """)
+        stats['performance_logs'] = dict(zip([desc[0] for desc in cursor.description], cursor.fetchone()))
+
+        cursor.execute("""
+            SELECT
+                COUNT(*) as total_errors,
+                COUNT(DISTINCT error_type) as unique_error_types,
+                COUNT(DISTINCT component) as affected_components,
+                MIN(timestamp) as oldest_error,
+                MAX(timestamp) as newest_error
+            FROM error_logs
+        """)
+        stats['error_logs'] = dict(zip([desc[0] for desc in cursor.description], cursor.fetchone()))
+        return stats
+
     def get_log_statistics(self) -> Dict[str, Any]:
         """
         Get statistics about database logs
 
+        System, performance and error figures are read from the per-minute
+        rollups rather than by scanning the raw tables; until log_rollups
+        exists and has rows, the raw tables are scanned instead. The rollups
+        cover the raw tables' full history only if they were backfilled when
+        the tables were partitioned, which migrate_log_tables does.
+
         Returns:
             Dictionary with log statistics
         """
         try:
-            with self.db_manager.get_connection() as conn:
+            with self.db_manager.get_connection_context() as conn:
                 with conn.cursor() as cursor:
-                    stats = {}
-
-                    # System logs statistics
-                    cursor.execute("""
-                        SELECT
-                            COUNT(*) as total_logs,
-                            COUNT(DISTINCT correlation_id) as unique_correlations,
-                            MIN(timestamp) as oldest_log,
-                            MAX(timestamp) as newest_log,
-                            COUNT(CASE WHEN level = 'ERROR' THEN 1 END) as error_count,
-                            COUNT(CASE WHEN level = 'WARNING' THEN 1 END) as warning_count,
-                            COUNT(CASE WHEN level = 'INFO' THEN 1 END) as info_count,
-                            COUNT(CASE WHEN level = 'DEBUG' THEN 1 END) as debug_count
-                        FROM system_logs
-                    """)
-                    result = cursor.fetchone()
-                    stats['system_logs'] = dict(zip([desc[0] for desc in cursor.description], result))
+                    if self._rollups_available(cursor):
+                        stats = self._rollup_statistics(cursor)
+                    else:
+                        stats = self._raw_statistics(cursor)
 
-                    # Trading events statistics
+                    # Trading events are not rolled up; their table is small
                     cursor.execute("""
                         SELECT
                             COUNT(*) as total_events,
@@ -61,41 +238,15 @@ class DatabaseLogManager:
                     result = cursor.fetchone()
                     stats['trading_events'] = dict(zip([desc[0] for desc in cursor.description], result))
 
-                    # Performance logs statistics
-                    cursor.execute("""
-                        SELECT
-                            COUNT(*) as total_metrics,
-                            AVG(duration_ms) as avg_duration_ms,
-                            MAX(duration_ms) as max_duration_ms,
-                            COUNT(CASE WHEN status = 'error' THEN 1 END) as error_count,
-                            COUNT(DISTINCT operation_name) as unique_operations
-                        FROM performance_logs
-                    """)
-                    result = cursor.fetchone()
-                    stats['performance_logs'] = dict(zip([desc[0] for desc in cursor.description], result))
-
-                    # Error logs statistics
+                    # Calculate total database size, including every partition
                     cursor.execute("""
-                        SELECT
-                            COUNT(*) as total_errors,
-                            COUNT(DISTINCT error_type) as unique_error_types,
-                            COUNT(DISTINCT component) as affected_components,
-                            MIN(timestamp) as oldest_error,
-                            MAX(timestamp) as newest_error
-                        FROM error_logs
-                    """)
-                    result = cursor.fetchone()
-                    stats['error_logs'] = dict(zip([desc[0] for desc in cursor.description], result))
-
-                    # Calculate total database size
-                    cursor.execute("""
-                        SELECT
-                            pg_total_relation_size('system_logs') +
-                            pg_total_relation_size('trading_events') +
-                            pg_total_relation_size('performance_logs') +
-                            pg_total_relation_size('error_logs') +
-                            pg_total_relation_size('user_action_logs') as total_size_bytes
-                    """)
+                        SELECT COALESCE(SUM(pg_total_relation_size(c.oid)), 0) as total_size_bytes
+                        FROM pg_class c
+                        LEFT JOIN pg_inherits i ON i.inhrelid = c.oid
+                        LEFT JOIN pg_class parent ON parent.oid = i.inhparent
+                        WHERE c.relkind = 'r'
+                          AND (c.relname = ANY(%(tables)s) OR parent.relname = ANY(%(tables)s))
+                    """, {'tables': LOG_TABLES + [ROLLUP_TABLE]})
                     result = cursor.fetchone()
                     stats['total_size_bytes'] = result[0] if result[0] else 0
                     stats['total_size_mb'] = stats['total_size_bytes'] / 1024 / 1024
@@ -116,6 +267,188 @@ class DatabaseLogManager:
                 'total_size_mb': 0
             }
 
+    def get_log_rollups(self,
+                        start_time: datetime = None,
+                        end_time: datetime = None,
+                        source: str = None,
+                        component: str = None,
+                        level: str = None,
+                        operation: str = None) -> List[Dict[str, Any]]:
+        """
+        Query per-minute log rollups
+
+        Args:
+            start_time: First minute to include
+            end_time: Exclusive end of the range
+            source: Source table filter ('system_logs', 'performance_logs', ...)
+            component: Component filter
+            level: Log level filter
+            operation: Operation filter
+
+        Returns:
+            Rollup rows ordered by minute, with p95_duration_ms added
+        """
+        filters = {'bucket >= %(start_time)s': start_time, 'bucket < %(end_time)s': end_time,
+                   'source = %(source)s': source, 'component = %(component)s': component,
+                   'level = %(level)s': level, 'operation = %(operation)s': operation}
+        conditions = [condition for condition, value in filters.items() if value is not None]
+        params = {'start_time': start_time, 'end_time': end_time, 'source': source,
+                  'component': component, 'level': level, 'operation': operation}
+
+        try:
+            with self.db_manager.get_connection_context() as conn:
+                with conn.cursor() as cursor:
+                    query = f"SELECT * FROM {ROLLUP_TABLE}"
+                    if conditions:
+                        query += " WHERE " + " AND ".join(conditions)
+                    cursor.execute(query + " ORDER BY bucket, source, component, level, operation", params)
+
+                    columns = [desc[0] for desc in cursor.description]
+                    results = []
+                    for row in cursor.fetchall():
+                        entry = dict(zip(columns, row))
+                        entry['p95_duration_ms'] = bucket_quantile(entry['duration_buckets'] or [], 0.95,
+                                                                   entry['duration_max_ms'])
+                        results.append(entry)
+                    return results
+
+        except Exception as e:
+            logger.error(f"Failed to query log rollups: {e}")
+            return []
+
+    def migrate_log_tables(self) -> Dict[str, Any]:
+        """
+        Partition the log tables and build rollups for everything they hold
+
+        Runs partition_log_tables.sql, then create_log_tables.sql again for the
+        indexes and view, then backfills log_rollups from the oldest raw row.
+        Once log_rollups has rows, statistics are read from it alone, so without
+        the backfill they would silently shrink to the time since the migration.
+        Safe to re-run.
+
+        Returns:
+            Dictionary with migration and backfill results
+        """
+        try:
+            with self.db_manager.get_connection_context() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(PARTITION_SQL.read_text())
+                    cursor.execute(CREATE_LOG_TABLES_SQL.read_text())
+                    oldest = self._oldest_raw_log(cursor)
+        except Exception as e:
+            logger.error(f"Log table migration failed: {e}")
+            return {'status': 'error', 'message': str(e)}
+
+        if oldest is None:
+            return {'status': 'success', 'rows_scanned': 0, 'rollups_written': 0}
+        return self.backfill_rollups(since=oldest)
+
+    @staticmethod
+    def _oldest_raw_log(cursor) -> Optional[datetime]:
+        """Earliest timestamp across the raw tables the rollups are built from"""
+        oldest = None
+        for source in ROLLUP_SOURCE_COLUMNS:
+            cursor.execute("SELECT to_regclass(%s) IS NOT NULL", (source,))
+            if not cursor.fetchone()[0]:
+                continue
+            cursor.execute(f"SELECT MIN(timestamp) FROM {source}")
+            first = cursor.fetchone()[0]
+            if first is not None:
+                if first.tzinfo is None:
+                    first = first.replace(tzinfo=timezone.utc)
+                oldest = first if oldest is None else min(oldest, first)
+        return oldest
+
+    def backfill_rollups(self, hours: int = 24, since: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Rebuild rollups from the raw log tables
+
+        Run by migrate_log_tables over the whole raw history, or to repair a
+        range the shipper did not see. Existing rollups in the range are replaced.
+
+        Args:
+            hours: Number of hours to rebuild, ending now
+            since: Rebuild from this time instead (overrides ``hours``)
+
+        Returns:
+            Dictionary with backfill results
+        """
+        end_time = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+        if since is not None:
+            start_time = since.replace(second=0, microsecond=0)
+        else:
+            start_time = end_time - timedelta(hours=hours)
+        aggregator = LogRollupAggregator()
+        results = {'status': 'success', 'rows_scanned': 0, 'rollups_written': 0}
+
+        try:
+            with self.db_manager.get_connection_context() as conn:
+                for source, columns in ROLLUP_SOURCE_COLUMNS.items():
+                    # Named cursor streams the range instead of materialising it client-side
+                    with conn.cursor(name=f"backfill_{source}") as cursor:
+                        cursor.itersize = 5000
+                        cursor.execute(f"""
+                            SELECT {', '.join(columns)} FROM {source}
+                            WHERE timestamp >= %s AND timestamp < %s
+                        """, (start_time, end_time))
+                        for row in cursor:
+                            aggregator.add(source, dict(zip(columns, row)))
+                            results['rows_scanned'] += 1
+
+                rows = aggregator.drain()
+                with conn.cursor() as cursor:
+                    cursor.execute(f"DELETE FROM {ROLLUP_TABLE} WHERE bucket >= %s AND bucket < %s",
+                                   (start_time, end_time))
+                    if rows:
+                        write_rollups(cursor, rows)
+                results['rollups_written'] = len(rows)
+
+        except Exception as e:
+            results['status'] = 'error'
+            results['message'] = str(e)
+            logger.error(f"Log rollup backfill failed: {e}")
+
+        return results
+
+    def _log_filters(self,
+                     table: str,
+                     start_time: datetime = None,
+                     end_time: datetime = None,
+                     level: str = None,
+                     component: str = None,
+                     correlation_id: str = None) -> Tuple[List[str], Dict[str, Any]]:
+        """WHERE conditions and parameters shared by the log queries and exports"""
+        if table not in LOG_TABLES:
+            raise ValueError(f"Unknown log table: {table}")
+
+        conditions = []
+        params = {}
+
+        if start_time:
+            conditions.append("timestamp >= %(start_time)s")
+            params['start_time'] = start_time
+
+        if end_time:
+            conditions.append("timestamp <= %(end_time)s")
+            params['end_time'] = end_time
+
+        if level and table == 'system_logs':
+            conditions.append("level = %(level)s")
+            params['level'] = level
+
+        if component:
+            if table == 'system_logs':
+                conditions.append("logger_name LIKE %(component)s")
+                params['component'] = f"%{component}%"
+            elif table in ['performance_logs', 'error_logs']:
+                conditions.append("component = %(component)s")
+                params['component'] = component
+
+        if correlation_id:
+            conditions.append("correlation_id = %(correlation_id)s")
+            params['correlation_id'] = correlation_id
+
+        return conditions, params
 
     def query_logs(self,
                    table: str = 'system_logs',
@@ -124,9 +457,10 @@ class DatabaseLogManager:
                    level: str = None,
                    component: str = None,
                    correlation_id: str = None,
-                   limit: int = 1000) -> List[Dict[str, Any]]:
+                   limit: int = 1000,
+                   before: Tuple[datetime, int] = None) -> List[Dict[str, Any]]:
         """
-        Query logs from database with filters
+        Query logs from database with filters, newest first
 
         Args:
             table: Table to query ('system_logs', 'trading_events', etc.)
@@ -136,60 +470,39 @@ class DatabaseLogManager:
             component: Component filter
             correlation_id: Correlation ID filter
             limit: Maximum number of results
+            before: Keyset position (timestamp, id); only older entries are returned
 
         Returns:
             List of log entries
         """
         try:
-            with self.db_manager.get_connection() as conn:
+            conditions, params = self._log_filters(table, start_time, end_time, level, component, correlation_id)
+            if before is not None:
+                # Row comparison matches the (timestamp, id) index, so deep pages cost the same as the first
+                conditions.append("(timestamp, id) < (%(before_timestamp)s, %(before_id)s)")
+                params['before_timestamp'], params['before_id'] = before
+
+            query = f"SELECT * FROM {table}"
+            if conditions:
+                query += " WHERE " + " AND ".join(conditions)
+            query += " ORDER BY timestamp DESC, id DESC"
+            if limit:
+                query += " LIMIT %(limit)s"
+                params['limit'] = int(limit)
+
+            with self.db_manager.get_read_connection_context() as conn:
                 with conn.cursor() as cursor:
-                    # Build query dynamically
-                    base_query = f"SELECT * FROM {table}"
-                    conditions = []
-                    params = {}
-
-                    if start_time:
-                        conditions.append("timestamp >= %(start_time)s")
-                        params['start_time'] = start_time
-
-                    if end_time:
-                        conditions.append("timestamp <= %(end_time)s")
-                        params['end_time'] = end_time
-
-                    if level and table == 'system_logs':
-                        conditions.append("level = %(level)s")
-                        params['level'] = level
-
-                    if component:
-                        if table == 'system_logs':
-                            conditions.append("logger_name LIKE %(component)s")
-                            params['component'] = f"%{component}%"
-                        elif table in ['performance_logs', 'error_logs']:
-                            conditions.append("component = %(component)s")
-                            params['component'] = component
-
-                    if correlation_id:
-                        conditions.append("correlation_id = %(correlation_id)s")
-                        params['correlation_id'] = correlation_id
-
-                    if conditions:
-                        base_query += " WHERE " + " AND ".join(conditions)
-
-                    base_query += " ORDER BY timestamp DESC"
-
-                    if limit:
-                        base_query += f" LIMIT {limit}"
-
-                    cursor.execute(base_query, params)
+                    cursor.execute(query, params)
                     columns = [desc[0] for desc in cursor.description]
+                    time_columns = [i for i, column in enumerate(columns) if column in _TIME_COLUMNS]
                     results = []
 
                     for row in cursor.fetchall():
                         entry = dict(zip(columns, row))
                         # Convert datetime objects to ISO strings for JSON serialization
-                        for key, value in entry.items():
-                            if isinstance(value, datetime):
-                                entry[key] = value.isoformat()
+                        for i in time_columns:
+                            if row[i] is not None:
+                                entry[columns[i]] = row[i].isoformat()
                         results.append(entry)
 
                     return results
@@ -198,68 +511,130 @@ class DatabaseLogManager:
             logger.error(f"Failed to query logs from {table}: {e}")
             return []
 
+    def query_logs_page(self,
+                        table: str = 'system_logs',
+                        page_size: int = 100,
+                        cursor: str = None,
+                        **filters) -> Dict[str, Any]:
+        """
+        One page of logs, newest first, using keyset pagination on (timestamp, id)
+
+        Args:
+            table: Table to query
+            page_size: Entries per page
+            cursor: ``next_cursor`` of the previous page (None for the first page)
+            **filters: start_time, end_time, level, component, correlation_id as in query_logs
+
+        Returns:
+            Dictionary with the page's logs and next_cursor (None on the last page)
+        """
+        before = decode_log_cursor(cursor) if cursor else None
+        # One extra row tells whether another page follows
+        logs = self.query_logs(table=table, limit=page_size + 1, before=before, **filters)
+        next_cursor = None
+        if len(logs) > page_size:
+            logs = logs[:page_size]
+            last = logs[-1]
+            next_cursor = encode_log_cursor(datetime.fromisoformat(last['timestamp']), last['id'])
+        return {'logs': logs, 'next_cursor': next_cursor}
+
+    def iter_logs(self,
+                  table: str = 'system_logs',
+                  start_time: datetime = None,
+                  end_time: datetime = None,
+                  level: str = None,
+                  component: str = None,
+                  correlation_id: str = None,
+                  batch_size: int = 5000) -> Iterator[Dict[str, Any]]:
+        """
+        Stream logs oldest first through a server-side cursor
+
+        Rows are fetched ``batch_size`` at a time, so memory stays flat however
+        large the range is. Values keep their database types. The connection is
+        held until the generator is exhausted or closed.
+
+        Args:
+            table: Table to read
+            start_time: Start time filter
+            end_time: End time filter
+            level: Log level filter
+            component: Component filter
+            correlation_id: Correlation ID filter
+            batch_size: Rows per round trip
+
+        Yields:
+            Log entries as dictionaries
+        """
+        conditions, params = self._log_filters(table, start_time, end_time, level, component, correlation_id)
+        query = f"SELECT * FROM {table}"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY timestamp, id"
+
+        with self.db_manager.get_read_connection_context() as conn:
+            with conn.cursor(name=f"iter_{table}") as cursor:
+                cursor.itersize = batch_size
+                cursor.execute(query, params)
+                columns = None
+                for row in cursor:
+                    if columns is None:
+                        columns = [desc[0] for desc in cursor.description]
+                    yield dict(zip(columns, row))
 
     def cleanup_old_logs(self,
                         older_than_days: int = 30,
-                        table: str = None) -> Dict[str, Any]:
+                        table: str = None,
+                        rollup_older_than_days: int = 90) -> Dict[str, Any]:
         """
         Clean up old logs from database
 
+        Partitioned tables drop whole daily partitions, which needs no
+        VACUUM afterwards; only the default partition is cleaned with DELETE.
+        Tables that have not been partitioned yet fall back to DELETE.
+
         Args:
             older_than_days: Delete logs older than this many days
             table: Specific table to clean (None for all tables)
+            rollup_older_than_days: Retention of log_rollups when cleaning all tables
 
         Returns:
             Dictionary with cleanup results
         """
-        cutoff_date = datetime.now(timezone.utc) - timedelta(days=older_than_days)
-        tables_to_clean = [table] if table else [
-            'system_logs', 'trading_events', 'performance_logs',
-            'error_logs', 'user_action_logs'
-        ]
+        now = datetime.now(timezone.utc)
+        cutoff_date = now - timedelta(days=older_than_days)
+        cutoffs = {name: cutoff_date for name in ([table] if table else LOG_TABLES)}
+        if table is None:
+            cutoffs[ROLLUP_TABLE] = now - timedelta(days=rollup_older_than_days)
 
         results = {
             'status': 'success',
             'cutoff_date': cutoff_date.isoformat(),
             'tables_cleaned': {},
+            'partitions_dropped': {},
             'total_deleted': 0,
             'errors': []
         }
 
         try:
-            with self.db_manager.get_connection() as conn:
+            with self.db_manager.get_connection_context() as conn:
                 with conn.cursor() as cursor:
-                    for table_name in tables_to_clean:
+                    for table_name, cutoff in cutoffs.items():
                         try:
-                            # Check if table exists
-                            cursor.execute("""
-                                SELECT EXISTS (
-                                    SELECT FROM information_schema.tables
-                                    WHERE table_name = %s
-                                )
-                            """, (table_name,))
-
-                            if not cursor.fetchone()[0]:
+                            cursor.execute("SELECT relkind FROM pg_class WHERE relname = %s", (table_name,))
+                            row = cursor.fetchone()
+                            if row is None:
                                 continue
+                            column = PARTITION_COLUMNS.get(table_name, 'timestamp')
 
-                            # Count records to be deleted
-                            cursor.execute("""
-                                SELECT COUNT(*) FROM {table_name}
-                                WHERE timestamp < %s
-                            """, (cutoff_date,))
-                            count_to_delete = cursor.fetchone()[0]
-
-                            if count_to_delete > 0:
-                                # Delete old records
-                                cursor.execute("""
-                                    DELETE FROM {table_name}
-                                    WHERE timestamp < %s
-                                """, (cutoff_date,))
-
-                                results['tables_cleaned'][table_name] = count_to_delete
-                                results['total_deleted'] += count_to_delete
+                            if row[0] == 'p':
+                                deleted, dropped = self._drop_expired_partitions(cursor, table_name, column, cutoff)
+                                results['partitions_dropped'][table_name] = dropped
                             else:
-                                results['tables_cleaned'][table_name] = 0
+                                cursor.execute(f"DELETE FROM {table_name} WHERE {column} < %s", (cutoff,))
+                                deleted = cursor.rowcount
+
+                            results['tables_cleaned'][table_name] = deleted
+                            results['total_deleted'] += deleted
 
                         except Exception as e:
                             error_msg = f"Failed to clean table {table_name}: {e}"
@@ -268,6 +643,8 @@ class DatabaseLogManager:
 
                     conn.commit()
 
+            self.ensure_log_partitions()
+
         except Exception as e:
             results['status'] = 'error'
             results['message'] = str(e)
@@ -275,6 +652,114 @@ class DatabaseLogManager:
 
         return results
 
+    def _drop_expired_partitions(self, cursor, table_name: str, column: str,
+                                 cutoff: datetime) -> Tuple[int, List[str]]:
+        """Drop daily partitions wholly older than cutoff; returns (estimated rows, dropped names)"""
+        cursor.execute("""
+            SELECT c.relname, GREATEST(c.reltuples, 0)::bigint
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            JOIN pg_class parent ON parent.oid = i.inhparent
+            WHERE parent.relname = %s
+        """, (table_name,))
+        estimates = dict(cursor.fetchall())
+        dropped = expired_partitions(table_name, list(estimates), cutoff)
+
+        for name in dropped:
+            cursor.execute(f"DROP TABLE IF EXISTS {name}")
+
+        # Rows that landed outside the daily ranges
+        deleted = 0
+        if f"{table_name}_default" in estimates:
+            cursor.execute(f"DELETE FROM {table_name}_default WHERE {column} < %s", (cutoff,))
+            deleted = cursor.rowcount
+
+        return deleted + sum(estimates[name] for name in dropped), dropped
+
+    def ensure_log_partitions(self, days_ahead: int = 7) -> Dict[str, Any]:
+        """
+        Create daily partitions for today and the next ``days_ahead`` days
+
+        Each partition is created under its own savepoint, so one failure does
+        not abort the rest. Rows for a missing day that already landed in the
+        default partition are moved into the new partition before it is attached.
+
+        Args:
+            days_ahead: Number of future days to pre-create
+
+        Returns:
+            Dictionary with the partitions created and rows moved per table
+        """
+        today = datetime.now(timezone.utc).date()
+        days = [today + timedelta(days=offset) for offset in range(days_ahead + 1)]
+        results = {'status': 'success', 'partitions_created': {}, 'rows_moved': {}, 'errors': []}
+
+        try:
+            with self.db_manager.get_connection_context() as conn:
+                with conn.cursor() as cursor:
+                    for table_name, column in PARTITION_COLUMNS.items():
+                        cursor.execute("SELECT relkind FROM pg_class WHERE relname = %s", (table_name,))
+                        row = cursor.fetchone()
+                        if row is None or row[0] != 'p':
+                            continue
+
+                        cursor.execute("SELECT relname FROM pg_class WHERE relname = ANY(%s)",
+                                       ([partition_name(table_name, day) for day in days] + [f"{table_name}_default"],))
+                        existing = {name for (name,) in cursor.fetchall()}
+                        has_default = f"{table_name}_default" in existing
+                        created, moved = [], 0
+                        for day in days:
+                            name = partition_name(table_name, day)
+                            if name in existing:
+                                continue
+                            cursor.execute("SAVEPOINT log_partition")
+                            try:
+                                moved += self._create_partition(cursor, table_name, column, day, has_default)
+                                cursor.execute("RELEASE SAVEPOINT log_partition")
+                                created.append(name)
+                            except Exception as e:
+                                cursor.execute("ROLLBACK TO SAVEPOINT log_partition")
+                                error_msg = f"Failed to create partition {name}: {e}"
+                                results['errors'].append(error_msg)
+                                logger.error(error_msg)
+                        results['partitions_created'][table_name] = created
+                        results['rows_moved'][table_name] = moved
+
+        except Exception as e:
+            results['status'] = 'error'
+            results['message'] = str(e)
+            logger.error(f"Log partition maintenance failed: {e}")
+
+        return results
+
+    def _create_partition(self, cursor, table_name: str, column: str, day: date, has_default: bool) -> int:
+        """Create the partition for ``day``; returns the rows moved into it from the default partition"""
+        name = partition_name(table_name, day)
+        default = f"{table_name}_default"
+        lower = datetime.combine(day, datetime.min.time(), tzinfo=timezone.utc)
+        upper = lower + timedelta(days=1)
+
+        stranded = False
+        if has_default:
+            cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {default} WHERE {column} >= %s AND {column} < %s)",
+                           (lower, upper))
+            stranded = cursor.fetchone()[0]
+        if not stranded:
+            cursor.execute(partition_ddl(table_name, day))
+            return 0
+
+        # CREATE ... PARTITION OF fails while the default partition holds rows of the new range
+        cursor.execute(f"CREATE TABLE {name} (LIKE {table_name} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+        cursor.execute(f"""
+            WITH moved AS (
+                DELETE FROM {default} WHERE {column} >= %s AND {column} < %s RETURNING *
+            )
+            INSERT INTO {name} SELECT * FROM moved
+        """, (lower, upper))
+        moved = cursor.rowcount
+        cursor.execute(f"ALTER TABLE {table_name} ATTACH PARTITION {name} {partition_bounds(day)}")
+        logger.info(f"Moved {moved} rows from {default} into {name}")
+        return moved
 
     def vacuum_analyze(self) -> Dict[str, Any]:
         """
@@ -283,8 +768,7 @@ class DatabaseLogManager:
         Returns:
             Dictionary with vacuum results
         """
-        tables = ['system_logs', 'trading_events', 'performance_logs',
-                 'error_logs', 'user_action_logs']
+        tables = LOG_TABLES + [ROLLUP_TABLE]
 
         results = {
             'status': 'success',
@@ -293,7 +777,7 @@ class DatabaseLogManager:
         }
 
         try:
-            with self.db_manager.get_connection() as conn:
+            with self.db_manager.get_connection_context() as conn:
                 # Set autocommit for VACUUM operations
                 conn.autocommit = True
 
@@ -356,33 +840,43 @@ class DatabaseLogManager:
             hours: Number of hours to analyze
 
         Returns:
-            Performance summary
+            Performance summary, read from the per-minute rollups (or the raw
+            performance_logs table until log_rollups exists and has rows);
+            see migrate_log_tables for backfilling rollups over older data
         """
         start_time = datetime.now(timezone.utc) - timedelta(hours=hours)
 
         try:
-            with self.db_manager.get_connection() as conn:
+            with self.db_manager.get_connection_context() as conn:
                 with conn.cursor() as cursor:
-                    cursor.execute("""
+                    if not self._rollups_available(cursor):
+                        return self._raw_performance_summary(cursor, start_time, hours)
+
+                    cursor.execute(f"""
                         SELECT
-                            operation_name,
-                            COUNT(*) as call_count,
-                            AVG(duration_ms) as avg_duration_ms,
-                            MIN(duration_ms) as min_duration_ms,
-                            MAX(duration_ms) as max_duration_ms,
-                            COUNT(CASE WHEN status = 'error' THEN 1 END) as error_count,
-                            COUNT(CASE WHEN status = 'success' THEN 1 END) as success_count
-                        FROM performance_logs
-                        WHERE timestamp >= %s
-                        GROUP BY operation_name
-                        ORDER BY avg_duration_ms DESC
-                    """, (start_time,))
+                            operation as operation_name,
+                            SUM(event_count) as call_count,
+                            SUM(duration_sum_ms) / NULLIF(SUM(duration_count), 0) as avg_duration_ms,
+                            MIN(duration_min_ms) as min_duration_ms,
+                            MAX(duration_max_ms) as max_duration_ms,
+                            SUM(error_count) as error_count,
+                            SUM(event_count) - SUM(error_count) as success_count,
+                            array_agg(duration_buckets) as duration_buckets
+                        FROM {ROLLUP_TABLE}
+                        WHERE source = 'performance_logs' AND bucket >= %s
+                        GROUP BY operation
+                        ORDER BY avg_duration_ms DESC NULLS LAST
+                    """, (start_time.replace(second=0, microsecond=0),))
 
                     columns = [desc[0] for desc in cursor.description]
                     results = []
 
                     for row in cursor.fetchall():
                         entry = dict(zip(columns, row))
+                        buckets = merge_buckets(entry.pop('duration_buckets'))
+                        for name, q in (('p50_duration_ms', 0.5), ('p95_duration_ms', 0.95),
+                                        ('p99_duration_ms', 0.99)):
+                            entry[name] = bucket_quantile(buckets, q, entry['max_duration_ms'])
                         # Calculate success rate
                         total_calls = entry['call_count']
                         if total_calls > 0:
@@ -405,15 +899,54 @@ class DatabaseLogManager:
                 'operations': []
             }
 
+    def _raw_performance_summary(self, cursor, start_time: datetime, hours: int) -> Dict[str, Any]:
+        """get_performance_summary computed by scanning performance_logs"""
+        cursor.execute("""
+            SELECT
+                operation_name,
+                COUNT(*) as call_count,
+                AVG(duration_ms) as avg_duration_ms,
+                MIN(duration_ms) as min_duration_ms,
+                MAX(duration_ms) as max_duration_ms,
+                COUNT(CASE WHEN status = 'error' THEN 1 END) as error_count,
+                COUNT(CASE WHEN status <> 'error' THEN 1 END) as success_count,
+                percentile_cont(0.5) WITHIN GROUP (ORDER BY duration_ms) as p50_duration_ms,
+                percentile_cont(0.95) WITHIN GROUP (ORDER BY duration_ms) as p95_duration_ms,
+                percentile_cont(0.99) WITHIN GROUP (ORDER BY duration_ms) as p99_duration_ms
+            FROM performance_logs
+            WHERE timestamp >= %s
+            GROUP BY operation_name
+            ORDER BY avg_duration_ms DESC NULLS LAST
+        """, (start_time,))
+
+        columns = [desc[0] for desc in cursor.description]
+        results = []
+        for row in cursor.fetchall():
+            entry = dict(zip(columns, row))
+            total_calls = entry['call_count']
+            entry['success_rate'] = entry['success_count'] / total_calls * 100 if total_calls > 0 else 0
+            results.append(entry)
+
+        return {
+            'status': 'success',
+            'time_range_hours': hours,
+            'operations': results
+        }
 
     def export_logs_to_csv(self,
                           table: str,
                           output_path: Path,
                           start_time: datetime = None,
                           end_time: datetime = None,
-                          limit: int = None) -> Dict[str, Any]:
+                          limit: int = None,
+                          level: str = None,
+                          component: str = None,
+                          correlation_id: str = None) -> Dict[str, Any]:
         """
-        Export logs to CSV file
+        Export logs to CSV file, oldest first
+
+        The server writes the CSV with COPY ... TO STDOUT and it is streamed
+        straight into the file, so no rows are built in Python.
 
         Args:
             table: Table to export
@@ -421,34 +954,42 @@ class DatabaseLogManager:
             start_time: Start time filter
             end_time: End time filter
             limit: Maximum number of records
+            level: Log level filter
+            component: Component filter
+            correlation_id: Correlation ID filter
 
         Returns:
             Export results
         """
         try:
-            import pandas as pd
-
-            logs = self.query_logs(
-                table=table,
-                # start_time=start_time,  # Currently unused
-                end_time=end_time,
-                limit=limit
-            )
+            conditions, params = self._log_filters(table, start_time, end_time, level, component, correlation_id)
+            query = f"SELECT * FROM {table}"
+            if conditions:
+                query += " WHERE " + " AND ".join(conditions)
+            query += " ORDER BY timestamp, id"
+            if limit:
+                query += " LIMIT %(limit)s"
+                params['limit'] = int(limit)
+
+            with self.db_manager.get_read_connection_context() as conn:
+                with conn.cursor() as cursor:
+                    # COPY takes no bind parameters; mogrify quotes them client-side
+                    select = cursor.mogrify(query, params).decode()
+                    with open(output_path, 'w', newline='', encoding='utf-8') as f:
+                        cursor.copy_expert(f"COPY ({select}) TO STDOUT WITH (FORMAT csv, HEADER)", f)
+                    exported = max(cursor.rowcount, 0)
 
-            if not logs:
+            if not exported:
                 return {
                     'status': 'warning',
                     'message': 'No logs found to export',
                     'records_exported': 0
                 }
 
-            df = pd.DataFrame(logs)
-            df.to_csv(output_path, index=False)
-
             return {
                 'status': 'success',
-                'message': f'Exported {len(logs)} records to {output_path}',
-                'records_exported': len(logs),
+                'message': f'Exported {exported} records to {output_path}',
+                'records_exported': exported,
                 'output_path': str(output_path)
             }
 
@@ -460,6 +1001,7 @@ class DatabaseLogManager:
                 'records_exported': 0
             }
 
+
 # Global instance
 _db_log_manager = None
 
@@ -5,63 +5,61 @@ Implements logging to PostgreSQL database with connection pooling and error hand
 
 import logging
 import json
-import threading
 import time
 import traceback
 import psutil
 import os
 from datetime import datetime, timezone
-from typing import Dict, Any, Optional, List
-from queue import Queue, Empty
+from typing import Dict, Any, Optional
 from contextlib import contextmanager
 
 from ..data.storage.database import DatabaseManager
+from .log_shipping import LogShipper, get_log_shipper
 from .logging_config import get_correlation_id, sanitize_log_message
+from .metrics import get_metrics_registry
 
 
 class DatabaseLogHandler(logging.Handler):
     """
     Custom logging handler that writes logs to PostgreSQL database
+
+    Records are handed to the process-wide LogShipper, which writes every
+    log table with COPY over one dedicated connection and spills to disk
+    instead of dropping when the database cannot keep up.
     """
 
     def __init__(self, db_manager: DatabaseManager = None,
                  table_name: str = "system_logs",
                  max_queue_size: int = 2000,
                  batch_size: int = 100,
-                 flush_interval: float = 10.0):
+                 flush_interval: float = 10.0,
+                 shipper: LogShipper = None):
         """
         Initialize database log handler
 
         Args:
-            db_manager: Database manager instance
+            db_manager: Unused; kept for compatibility (the shipper has its own connection)
             table_name: Table name for logs
-            max_queue_size: Maximum queue size before dropping logs
-            batch_size: Number of logs to write in one batch
-            flush_interval: Seconds between batch writes
+            max_queue_size: Unused; queue depth is bounded by the shared shipper
+            batch_size: Unused; the shipper sizes batches from queue depth
+            flush_interval: Unused; the shipper flushes on its own interval
+            shipper: Log shipper to use (defaults to the process-wide one)
         """
         super().__init__()
 
-        self.db_manager = db_manager or DatabaseManager()
         self.table_name = table_name
-        self.max_queue_size = max_queue_size
-        self.batch_size = batch_size
-        self.flush_interval = flush_interval
-
-        # Thread-safe queue for log records
-        self.log_queue = Queue(maxsize=max_queue_size)
-        self.shutdown_event = threading.Event()
-
-        # Background thread for writing logs
-        self.writer_thread = threading.Thread(target=self._log_writer, daemon=True)
-        self.writer_thread.start()
+        self.shipper = shipper or get_log_shipper()
 
         # Statistics
         self.stats = {
-            'logs_written': 0,
-            'logs_dropped': 0,
-            'write_errors': 0,
-            'last_write': None
+            'logs_enqueued': 0,
+            'logs_dropped': 0
         }
+        metrics = get_metrics_registry()
+        self._enqueued_counter = metrics.counter('mltrading_log_records_total', 'Log records handed to the shipper',
+                                                 table=table_name, outcome='enqueued')
+        self._dropped_counter = metrics.counter('mltrading_log_records_total', 'Log records handed to the shipper',
+                                                table=table_name, outcome='dropped')
 
     def emit(self, record):
         """
@@ -104,12 +102,13 @@ class DatabaseLogHandler(logging.Handler):
                 'metadata': self._extract_metadata(record)
             }
 
-            # Add to queue (non-blocking)
-            try:
-                self.log_queue.put_nowait(log_entry)
-            except Exception:
-                # Queue is full, drop the log entry
+            # Non-blocking; spilled to disk if the shipper's queue is full
+            if self.shipper.ship(self.table_name, log_entry):
+                self.stats['logs_enqueued'] += 1
+                self._enqueued_counter.inc()
+            else:
                 self.stats['logs_dropped'] += 1
+                self._dropped_counter.inc()
 
         except Exception as e:
             # Don't raise exceptions from logging handlers
@@ -150,106 +149,19 @@ class DatabaseLogHandler(logging.Handler):
 
         return metadata
 
-    def _log_writer(self):
-        """
-        Background thread that writes logs to database in batches
-        """
-        batch = []
-        last_flush = time.time()
-
-        while not self.shutdown_event.is_set():
-            try:
-                # Collect logs from queue
-                while len(batch) < self.batch_size:
-                    try:
-                        timeout = max(0.1, self.flush_interval - (time.time() - last_flush))
-                        log_entry = self.log_queue.get(timeout=timeout)
-                        batch.append(log_entry)
-                    except Empty:
-                        break
-
-                # Write batch if we have logs or enough time has passed
-                if batch and (len(batch) >= self.batch_size or
-                              time.time() - last_flush >= self.flush_interval):
-                    self._write_batch(batch)
-                    batch.clear()
-                    last_flush = time.time()
-
-            except Exception as e:
-                self.stats['write_errors'] += 1
-                # Clear batch to avoid infinite error loop
-                batch.clear()
-                time.sleep(1)  # Brief pause before retrying
-
-    def _write_batch(self, batch: List[Dict[str, Any]]):
-        """
-        Write a batch of log entries to database
-
-        Args:
-            batch: List of log entries
-        """
-        if not batch:
-            return
-
-        conn = None
-        try:
-            conn = self.db_manager.get_connection()
-            with conn.cursor() as cursor:
-                # Prepare SQL
-                sql = """
-                INSERT INTO {self.table_name}
-                (timestamp, level, logger_name, correlation_id, message,
-                 module, function_name, line_number, thread_name, process_id, metadata)
-                VALUES (%(timestamp)s, %(level)s, %(logger_name)s, %(correlation_id)s, %(message)s,
-                        %(module)s, %(function_name)s, %(line_number)s, %(thread_name)s, %(process_id)s, %(metadata)s)
-                """
-
-                # Execute batch insert
-                cursor.executemany(sql, batch)
-                conn.commit()
-
-                self.stats['logs_written'] += len(batch)
-                self.stats['last_write'] = datetime.now()
-
-        except Exception as e:
-            self.stats['write_errors'] += 1
-            # Log to file as fallback (avoid infinite recursion)
-            try:
-                fallback_logger = logging.getLogger('database_log_fallback')
-                fallback_logger.error(f"Failed to write {len(batch)} logs to database: {e}")
-            except Exception:
-                pass  # Give up if fallback also fails
-        finally:
-            if conn:
-                try:
-                    self.db_manager.return_connection(conn)
-                except Exception:
-                    pass
-
 
     def flush(self):
         """
         Flush any pending log records
         """
-        # Signal the writer thread to flush
-        start_time = time.time()
-        while not self.log_queue.empty() and time.time() - start_time < 5:
-            time.sleep(0.1)
+        self.shipper.flush()
 
 
     def close(self):
         """
-        Close the handler and clean up resources
+        Close the handler; the shared shipper keeps running for other handlers
         """
-        self.shutdown_event.set()
-
-        # Flush remaining logs
         self.flush()
-
-        # Wait for writer thread to finish
-        if self.writer_thread.is_alive():
-            self.writer_thread.join(timeout=10)
-
         super().close()
 
 
@@ -262,57 +174,33 @@ class DatabaseLogHandler(logging.Handler):
         """
         return {
             **self.stats,
-            'queue_size': self.log_queue.qsize(),
-            'thread_alive': self.writer_thread.is_alive()
+            **{f'table_{name}': value for name, value in self.shipper.get_table_stats(self.table_name).items()},
+            'shipper': self.shipper.get_stats()
         }
 
 
 class BatchedLogger:
     """
-    Base class for batched database logging with connection pooling optimization
+    Base class for batched database logging through the shared log shipper
     """
 
 
     def __init__(self, db_manager: DatabaseManager = None, table_name: str = None,
-                 batch_size: int = 50, flush_interval: float = 5.0):
-        self.db_manager = db_manager or DatabaseManager()
+                 batch_size: int = 50, flush_interval: float = 5.0, shipper: LogShipper = None):
         self.table_name = table_name
         self.batch_size = batch_size
         self.flush_interval = flush_interval
-        self.batch = []
-        self.last_flush = time.time()
-        self._lock = threading.Lock()
+        self.shipper = shipper or get_log_shipper()
 
 
     def _add_to_batch(self, data: Dict[str, Any]):
-        """Add data to batch and flush if necessary"""
-        with self._lock:
-            self.batch.append(data)
-
-            # Check if we should flush
-            should_flush = (len(self.batch) >= self.batch_size or
-                          time.time() - self.last_flush >= self.flush_interval)
-
-            if should_flush:
-                self._flush_batch()
+        """Queue data for the shipper, which batches and COPYs it"""
+        self.shipper.ship(self.table_name, data)
 
 
     def _flush_batch(self):
-        """Flush the current batch to database"""
-        if not self.batch:
-            return
-
-        current_batch = self.batch.copy()
-        self.batch.clear()
-        self.last_flush = time.time()
-
-        # Write batch in background thread to avoid blocking
-        threading.Thread(target=self._write_batch, args=(current_batch,), daemon=True).start()
-
-
-    def _write_batch(self, batch: List[Dict[str, Any]]):
-        """Override in subclasses"""
-        pass
+        """Wait for queued rows to be written or spilled"""
+        self.shipper.flush()
 
 
 class DataCollectionLogger(BatchedLogger):
@@ -364,36 +252,6 @@ class DataCollectionLogger(BatchedLogger):
             fallback_logger.error(f"Failed to log data collection event: {e}")
 
 
-    def _write_batch(self, batch: List[Dict[str, Any]]):
-        """Write batch of data collection logs to database"""
-        if not batch:
-            return
-
-        conn = None
-        try:
-            conn = self.db_manager.get_connection()
-            with conn.cursor() as cursor:
-                sql = """
-                INSERT INTO data_collection_logs
-                (timestamp, operation_type, data_source, symbol, records_processed,
-                 duration_ms, status, correlation_id, metadata)
-                VALUES (%(timestamp)s, %(operation_type)s, %(data_source)s, %(symbol)s,
-                        %(records_processed)s, %(duration_ms)s, %(status)s, %(correlation_id)s, %(metadata)s)
-                """
-                cursor.executemany(sql, batch)
-                conn.commit()
-
-        except Exception as e:
-            fallback_logger = logging.getLogger('data_collection_fallback')
-            fallback_logger.error(f"Failed to write data collection batch: {e}")
-        finally:
-            if conn:
-                try:
-                    self.db_manager.return_connection(conn)
-                except Exception:
-                    pass
-
-
 class UIInteractionLogger:
     """
     Specialized logger for UI interaction events
@@ -432,7 +290,7 @@ class UIInteractionLogger:
                 'metadata': json.dumps(metadata) if metadata else None
             }
 
-            with self.db_manager.get_connection() as conn:
+            with self.db_manager.get_connection_context() as conn:
                 with conn.cursor() as cursor:
                     sql = """
                     INSERT INTO ui_interaction_logs
@@ -492,7 +350,7 @@ class APIRequestLogger:
                 'metadata': json.dumps(metadata) if metadata else None
             }
 
-            with self.db_manager.get_connection() as conn:
+            with self.db_manager.get_connection_context() as conn:
                 with conn.cursor() as cursor:
                     sql = """
                     INSERT INTO user_action_logs
@@ -511,14 +369,14 @@ class APIRequestLogger:
             fallback_logger.error(f"Failed to log API request: {e}")
 
 
-class ErrorLogger:
+class ErrorLogger(BatchedLogger):
     """
     Specialized logger for error events
     """
 
 
     def __init__(self, db_manager: DatabaseManager = None):
-        self.db_manager = db_manager or DatabaseManager()
+        super().__init__(db_manager, 'error_logs', batch_size=25, flush_interval=3.0)
 
 
     def log_error(self, error_type: str, error_message: str, component: str = None,
@@ -561,34 +419,22 @@ class ErrorLogger:
                 'metadata': json.dumps(metadata) if metadata else None
             }
 
-            with self.db_manager.get_connection() as conn:
-                with conn.cursor() as cursor:
-                    sql = """
-                    INSERT INTO error_logs
-                    (timestamp, error_type, error_message, component, severity, stack_trace,
-                     source_file, source_line, source_function, user_impact, correlation_id,
-                     first_occurrence, occurrence_count, resolution_status, metadata)
-                    VALUES (%(timestamp)s, %(error_type)s, %(error_message)s, %(component)s,
-                            %(severity)s, %(stack_trace)s, %(source_file)s, %(source_line)s,
-                            %(source_function)s, %(user_impact)s, %(correlation_id)s,
-                            %(first_occurrence)s, %(occurrence_count)s, %(resolution_status)s, %(metadata)s)
-                    """
-                    cursor.execute(sql, data)
-                    conn.commit()
+            # Shipped like every other log row, so it also reaches the rollups
+            self._add_to_batch(data)
 
         except Exception as e:
             fallback_logger = logging.getLogger('error_fallback')
             fallback_logger.error(f"Failed to log error to database: {e}")
 
 
-class TradingEventLogger:
+class TradingEventLogger(BatchedLogger):
     """
     Specialized logger for trading events
     """
 
 
     def __init__(self, db_manager: DatabaseManager = None):
-        self.db_manager = db_manager or DatabaseManager()
+        super().__init__(db_manager, 'trading_events', batch_size=25, flush_interval=3.0)
 
 
     def log_trading_event(self, event_type: str, symbol: str = None,
@@ -624,17 +470,7 @@ class TradingEventLogger:
                 'metadata': json.dumps(metadata) if metadata else None
             }
 
-            with self.db_manager.get_connection() as conn:
-                with conn.cursor() as cursor:
-                    sql = """
-                    INSERT INTO trading_events
-                    (timestamp, event_type, symbol, side, quantity, price,
-                     order_id, strategy, correlation_id, metadata)
-                    VALUES (%(timestamp)s, %(event_type)s, %(symbol)s, %(side)s, %(quantity)s,
-                            %(price)s, %(order_id)s, %(strategy)s, %(correlation_id)s, %(metadata)s)
-                    """
-                    cursor.execute(sql, event_data)
-                    conn.commit()
+            self._add_to_batch(event_data)
 
         except Exception as e:
             # Fallback to file logging
@@ -642,14 +478,14 @@ class TradingEventLogger:
             fallback_logger.error(f"Failed to log trading event: {e}")
 
 
-class PerformanceLogger:
+class PerformanceLogger(BatchedLogger):
     """
     Specialized logger for performance metrics
     """
 
 
     def __init__(self, db_manager: DatabaseManager = None):
-        self.db_manager = db_manager or DatabaseManager()
+        super().__init__(db_manager, 'performance_logs', batch_size=75, flush_interval=8.0)
 
 
     def log_performance(self, operation_name: str, duration_ms: float,
@@ -688,17 +524,7 @@ class PerformanceLogger:
                 'metadata': json.dumps(metadata) if metadata else None
             }
 
-            with self.db_manager.get_connection() as conn:
-                with conn.cursor() as cursor:
-                    sql = """
-                    INSERT INTO performance_logs
-                    (timestamp, operation_name, duration_ms, status, component,
-                     correlation_id, memory_usage_mb, cpu_usage_percent, metadata)
-                    VALUES (%(timestamp)s, %(operation_name)s, %(duration_ms)s, %(status)s, %(component)s,
-                            %(correlation_id)s, %(memory_usage_mb)s, %(cpu_usage_percent)s, %(metadata)s)
-                    """
-                    cursor.execute(sql, perf_data)
-                    conn.commit()
+            self._add_to_batch(perf_data)
 
         except Exception as e:
             # Fallback to file logging
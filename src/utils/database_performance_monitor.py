@@ -13,6 +13,7 @@ from dataclasses import dataclass
 try:
     from ..data.storage.database import DatabaseManager
     from .logging_config import get_ui_logger
+    from .metrics import get_metrics_registry
 except ImportError:
     # Handle direct script execution
     import sys
@@ -21,6 +22,7 @@ except ImportError:
     sys.path.append(str(Path(__file__).parent.parent))
     from data.storage.database import DatabaseManager
     from utils.logging_config import get_ui_logger
+    from utils.metrics import get_metrics_registry
 
 
 @dataclass
@@ -63,6 +65,11 @@ class DatabasePerformanceMonitor:
         self.query_metrics: List[QueryMetrics] = []
         self.slow_query_threshold = 1.0  # seconds
 
+        metrics = get_metrics_registry()
+        self.query_seconds = metrics.histogram('mltrading_db_query_seconds', 'Monitored query execution time')
+        self.slow_queries = metrics.counter('mltrading_db_slow_queries_total',
+                                            'Monitored queries over the slow query threshold')
+
     @contextmanager
     def monitor_query(self, sql: str, parameters: Optional[tuple] = None):
         """
@@ -80,9 +87,11 @@ class DatabasePerformanceMonitor:
 
         finally:
             execution_time = time.time() - start_time
+            self.query_seconds.observe(execution_time)
 
             # Log slow queries immediately
             if execution_time > self.slow_query_threshold:
+                self.slow_queries.inc()
                 self.logger.warning(f"Slow query detected: {execution_time:.3f}s - {sql[:100]}...")
 
             # Store metrics for analysis
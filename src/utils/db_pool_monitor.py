@@ -7,6 +7,38 @@ import time
 import threading
 from typing import Dict, Any
 from ..data.storage.database import DatabaseManager
+from .metrics import MetricsRegistry, get_metrics_registry
+
+
+def export_pool_metrics(db_manager: DatabaseManager, registry: MetricsRegistry):
+    """Publish pool sizes, waiters, counters and wait/checkout histograms of the primary and replica pools"""
+    pools = {'primary': db_manager.pool, 'replica': getattr(db_manager, 'read_pool', None)}
+    for role, pool in pools.items():
+        if pool is None:
+            continue
+        pool_stats = pool.get_stats()
+        registry.gauge('mltrading_db_pool_connections', 'Pooled connections by state',
+                       pool=role, state='used').set(pool_stats['used_connections'])
+        registry.gauge('mltrading_db_pool_connections', 'Pooled connections by state',
+                       pool=role, state='available').set(pool_stats['available_connections'])
+        registry.gauge('mltrading_db_pool_max_connections', 'Pool size limit',
+                       pool=role).set(pool_stats['max_connections'])
+        registry.gauge('mltrading_db_pool_waiters', 'Threads waiting for a connection',
+                       pool=role).set(pool_stats['waiters'])
+        registry.counter('mltrading_db_pool_acquire_timeouts_total', 'Connection acquires that timed out',
+                         pool=role).set_total(pool_stats['timeouts'])
+        registry.counter('mltrading_db_pool_leaks_total', 'Checkouts held longer than the leak threshold',
+                         pool=role).set_total(pool_stats['leaks_detected'])
+        registry.register_histogram('mltrading_db_pool_wait_seconds', pool.wait_histogram,
+                                    'Time spent waiting for a pooled connection', pool=role)
+        registry.register_histogram('mltrading_db_pool_checkout_seconds', pool.checkout_histogram,
+                                    'Time a connection stays checked out', pool=role)
+
+
+def register_pool_metrics(db_manager: DatabaseManager):
+    """Publish ``db_manager``'s pools on every metrics scrape (replaces any earlier pool collector)"""
+    # Pool numbers are read at scrape time rather than pushed from the pool's hot path
+    get_metrics_registry().register_collector('db_pool', lambda registry: export_pool_metrics(db_manager, registry))
 
 
 class ConnectionPoolMonitor:
@@ -20,21 +52,41 @@ class ConnectionPoolMonitor:
             'connection_errors': 0,
             'last_check': None
         }
+        register_pool_metrics(db_manager)
 
     def get_pool_status(self) -> Dict[str, Any]:
-        """Get current connection pool status"""
+        """Get current connection pool status, wait metrics and leak counts"""
         try:
             if self.db_manager.pool:
-                # Get basic pool information
-                pool = self.db_manager.pool
+                pool_stats = self.db_manager.get_pool_stats()
                 self.stats.update({
-                    'min_connections': pool.minconn,
-                    'max_connections': pool.maxconn,
-                    'pool_size': len(pool._pool) + len(pool._used),
-                    'available_connections': len(pool._pool),
-                    'used_connections': len(pool._used),
+                    'min_connections': pool_stats['min_connections'],
+                    'max_connections': pool_stats['max_connections'],
+                    'pool_size': pool_stats['pool_size'],
+                    'available_connections': pool_stats['available_connections'],
+                    'used_connections': pool_stats['used_connections'],
+                    'waiters': pool_stats['waiters'],
+                    'acquire_timeouts': pool_stats['timeouts'],
+                    'leaks_detected': pool_stats['leaks_detected'],
+                    'recycled_connections': pool_stats['recycled'],
+                    'health_check_failures': pool_stats['health_check_failures'],
+                    'total_wait_seconds': pool_stats['total_wait_seconds'],
+                    'wait_time': pool_stats['wait_time'],
+                    'checkout_duration': pool_stats['checkout_duration'],
                     'last_check': time.time()
                 })
+                all_stats = self.db_manager.get_all_pool_stats()
+                replica_stats = all_stats['replica']
+                self.stats['read_routing'] = all_stats['routing']
+                if replica_stats:
+                    self.stats['replica'] = {
+                        'pool_size': replica_stats['pool_size'],
+                        'used_connections': replica_stats['used_connections'],
+                        'waiters': replica_stats['waiters'],
+                        'acquire_timeouts': replica_stats['timeouts'],
+                        'total_wait_seconds': replica_stats['total_wait_seconds'],
+                        'wait_time': replica_stats['wait_time'],
+                    }
             else:
                 self.stats.update({
                     'pool_status': 'fallback_mode',
@@ -46,6 +98,10 @@ class ConnectionPoolMonitor:
 
         return self.stats.copy()
 
+    def export_metrics(self, registry: MetricsRegistry):
+        """Publish the monitored manager's pool metrics into ``registry``"""
+        export_pool_metrics(self.db_manager, registry)
+
     def test_connection(self) -> bool:
         """Test if we can get a connection from the pool"""
         try:
@@ -64,14 +120,8 @@ class ConnectionPoolMonitor:
         """Close idle connections if possible"""
         try:
             if self.db_manager.pool:
-                pool = self.db_manager.pool
                 # Close connections that exceed minimum
-                while len(pool._pool) > pool.minconn:
-                    try:
-                        conn = pool._pool.pop()
-                        conn.close()
-                    except Exception:
-                        break
+                self.db_manager.pool.close_idle()
         except Exception as e:
             self.stats['last_error'] = str(e)
 
@@ -98,6 +148,11 @@ def monitor_pool_health(db_manager: DatabaseManager, interval: int = 30):
                     print(
                         f"WARNING: Database pool heavily used: {status['used_connections']}/{status['max_connections']}")
 
+                # Log warning if callers are queueing for connections
+                if status.get('waiters', 0) > 0:
+                    print(f"WARNING: {status['waiters']} threads waiting for a database connection "
+                          f"(p95 wait {status['wait_time'].get('p95', 0):.3f}s)")
+
                 # Test connection health
                 if not monitor.test_connection():
                     print("WARNING: Database connection test failed")
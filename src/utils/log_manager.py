@@ -5,6 +5,7 @@ Provides convenient functions for managing logs across the application
 
 import os
 import atexit
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Dict, Any, Optional
 
@@ -16,6 +17,7 @@ from .logging_config import (
     get_log_statistics,
     get_combined_logger
 )
+from .log_rollups import summarize_rollups
 
 
 class LogManager:
@@ -173,12 +175,42 @@ class LogManager:
                 health['checks']['statistics'] = 'failed'
                 health['status'] = 'warning'
 
+            self._check_recent_errors(health)
+
         except Exception as e:
             health['status'] = 'unhealthy'
             health['checks']['health_check'] = f'failed: {e}'
 
         return health
 
+    def _check_recent_errors(self, health: Dict[str, Any], minutes: int = 15, max_error_rate: float = 0.05):
+        """Add the error rate of the last ``minutes`` from the database log rollups to ``health``"""
+        from .database_log_manager import get_database_log_manager
+
+        rollups = get_database_log_manager().get_log_rollups(
+            start_time=datetime.now(timezone.utc) - timedelta(minutes=minutes))
+        if not rollups:
+            # Database down or nothing logged yet; the file checks above still apply
+            health['checks']['recent_errors'] = 'no_data'
+            return
+
+        summary = summarize_rollups(rollups)
+        error_rate = summary['errors'] / summary['events'] if summary['events'] else 0.0
+        health['recent_activity'] = {
+            'minutes': minutes,
+            'events': summary['events'],
+            'errors': summary['errors'],
+            'error_rate': error_rate,
+        }
+        if error_rate > max_error_rate:
+            health['checks']['recent_errors'] = 'elevated'
+            if health['status'] == 'healthy':
+                health['status'] = 'warning'
+            health['recommendations'].append(
+                f'Error rate {error_rate:.1%} over the last {minutes} minutes, check the error logs')
+        else:
+            health['checks']['recent_errors'] = 'ok'
+
     def emergency_cleanup(self) -> Dict[str, Any]:
         """
         Perform emergency cleanup when disk space is low
@@ -0,0 +1,292 @@
+"""
+Log Rollups
+Per-minute aggregates of the log tables, maintained as rows are shipped
+
+Every row the log shipper writes is folded into an in-memory rollup keyed by
+(minute, source table, component, level, operation): event and error counts
+plus a fixed-bucket duration histogram. Rollups are upserted into
+``log_rollups`` a few times a minute, so statistics, performance summaries
+and health checks read a few hundred aggregate rows instead of scanning the
+raw log tables.
+"""
+
+import bisect
+import json
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Duration bucket upper bounds in milliseconds (+Inf is implicit); the length
+# of log_rollups.duration_buckets is len(ROLLUP_DURATION_BUCKETS_MS) + 1
+ROLLUP_DURATION_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+ROLLUP_COLUMNS = ('bucket', 'source', 'component', 'level', 'operation', 'event_count', 'error_count',
+                  'duration_count', 'duration_sum_ms', 'duration_min_ms', 'duration_max_ms', 'duration_buckets')
+
+# Increments are added to an existing minute row; bucket arrays add element-wise
+ROLLUP_UPSERT_SQL = f"""
+    INSERT INTO log_rollups ({', '.join(ROLLUP_COLUMNS)})
+    VALUES ({', '.join(['%s'] * len(ROLLUP_COLUMNS))})
+    ON CONFLICT (bucket, source, component, level, operation) DO UPDATE SET
+        event_count = log_rollups.event_count + EXCLUDED.event_count,
+        error_count = log_rollups.error_count + EXCLUDED.error_count,
+        duration_count = log_rollups.duration_count + EXCLUDED.duration_count,
+        duration_sum_ms = log_rollups.duration_sum_ms + EXCLUDED.duration_sum_ms,
+        duration_min_ms = LEAST(log_rollups.duration_min_ms, EXCLUDED.duration_min_ms),
+        duration_max_ms = GREATEST(log_rollups.duration_max_ms, EXCLUDED.duration_max_ms),
+        duration_buckets = ARRAY(
+            SELECT COALESCE(a, 0) + COALESCE(b, 0)
+            FROM unnest(log_rollups.duration_buckets, EXCLUDED.duration_buckets) AS t(a, b)
+        )
+"""
+
+ERROR_LEVELS = ('ERROR', 'CRITICAL')
+
+# Raw columns rollup_dimensions reads, per source table (used to backfill rollups)
+ROLLUP_SOURCE_COLUMNS = {
+    'system_logs': ('timestamp', 'level', 'logger_name'),
+    'performance_logs': ('timestamp', 'operation_name', 'duration_ms', 'status', 'component', 'metadata'),
+    'data_collection_logs': ('timestamp', 'operation_type', 'data_source', 'duration_ms', 'status'),
+    'error_logs': ('timestamp', 'component', 'error_type'),
+    'trading_events': ('timestamp', 'strategy', 'event_type'),
+}
+
+# Widths of the rollup key columns
+_KEY_WIDTH = 100
+
+RollupKey = Tuple[datetime, str, str, str, str]
+
+
+def _minute(value: Any) -> datetime:
+    """Start of the UTC minute of a row timestamp (datetime or ISO string from the spill file)"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if not isinstance(value, datetime):
+        value = datetime.now(timezone.utc)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).replace(second=0, microsecond=0)
+
+
+def rollup_dimensions(table: str, row: Dict[str, Any]) -> Tuple[str, str, str, bool]:
+    """(component, level, operation, is_error) a row of ``table`` is rolled up under"""
+    if table == 'system_logs':
+        level = row.get('level') or ''
+        return row.get('logger_name') or '', level, '', level in ERROR_LEVELS
+    if table == 'performance_logs':
+        is_error = row.get('status') == 'error'
+        return row.get('component') or '', 'ERROR' if is_error else 'INFO', row.get('operation_name') or '', is_error
+    if table == 'data_collection_logs':
+        is_error = row.get('status') in ('error', 'failed')
+        return row.get('data_source') or '', 'ERROR' if is_error else 'INFO', row.get('operation_type') or '', is_error
+    if table == 'error_logs':
+        return row.get('component') or '', 'ERROR', row.get('error_type') or '', True
+    if table == 'trading_events':
+        return row.get('strategy') or '', 'INFO', row.get('event_type') or '', False
+    return '', '', '', False
+
+
+def bucket_quantile(counts: Sequence[int], q: float, observed_max: Optional[float] = None,
+                    bounds: Sequence[float] = ROLLUP_DURATION_BUCKETS_MS) -> Optional[float]:
+    """Estimate a quantile in ms from rollup bucket counts (upper bound of the matching bucket)"""
+    total = sum(counts)
+    if total == 0:
+        return None
+    target = q * total
+    running = 0
+    for index, count in enumerate(counts):
+        running += count
+        if running >= target:
+            return float(bounds[index]) if index < len(bounds) else observed_max
+    return observed_max
+
+
+def merge_buckets(arrays: Iterable[Optional[Sequence[int]]], size: int = len(ROLLUP_DURATION_BUCKETS_MS) + 1) -> List[int]:
+    """Element-wise sum of bucket arrays (None entries are skipped)"""
+    merged = [0] * size
+    for array in arrays:
+        for index, count in enumerate(array or ()):
+            if index < size:
+                merged[index] += count or 0
+    return merged
+
+
+def summarize_rollups(rows: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Totals of rollup rows read back from ``log_rollups``
+
+    Returns:
+        Dictionary with event and error totals, events per level, errors per
+        (source, component, operation) and per-operation call counts, mean and
+        p95 durations, slowest first
+    """
+    summary = {'events': 0, 'errors': 0, 'levels': {}, 'error_sources': {}, 'operations': []}
+    durations: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        summary['events'] += row['event_count'] or 0
+        summary['errors'] += row['error_count'] or 0
+        level = row['level'] or 'UNKNOWN'
+        summary['levels'][level] = summary['levels'].get(level, 0) + (row['event_count'] or 0)
+        if row['error_count']:
+            source = (row['source'], row['component'], row['operation'])
+            summary['error_sources'][source] = summary['error_sources'].get(source, 0) + row['error_count']
+        if row['duration_count']:
+            name = row['operation'] or row['component'] or row['source']
+            entry = durations.setdefault(name, {'count': 0, 'sum_ms': 0.0, 'max_ms': None, 'buckets': []})
+            entry['count'] += row['duration_count']
+            entry['sum_ms'] += row['duration_sum_ms'] or 0.0
+            if row['duration_max_ms'] is not None:
+                entry['max_ms'] = max(entry['max_ms'] or 0.0, row['duration_max_ms'])
+            entry['buckets'].append(row['duration_buckets'])
+
+    for name, entry in durations.items():
+        summary['operations'].append({
+            'operation': name,
+            'calls': entry['count'],
+            'avg_ms': entry['sum_ms'] / entry['count'],
+            'p95_ms': bucket_quantile(merge_buckets(entry['buckets']), 0.95, entry['max_ms']),
+            'max_ms': entry['max_ms'],
+        })
+    summary['operations'].sort(key=lambda op: op['p95_ms'] or 0.0, reverse=True)
+    return summary
+
+
+def _summary_metadata(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Metadata of an operation tracer summary row ({} for ordinary rows)"""
+    if row.get('status') != 'summary':
+        return {}
+    metadata = row.get('metadata')
+    if isinstance(metadata, str):
+        try:
+            metadata = json.loads(metadata)
+        except ValueError:
+            return {}
+    return metadata if isinstance(metadata, dict) else {}
+
+
+class _Rollup:
+    """Counters of one rollup key"""
+
+    __slots__ = ('event_count', 'error_count', 'duration_count', 'duration_sum', 'duration_min', 'duration_max',
+                 'buckets')
+
+    def __init__(self, bucket_count: int):
+        self.event_count = 0
+        self.error_count = 0
+        self.duration_count = 0
+        self.duration_sum = 0.0
+        self.duration_min: Optional[float] = None
+        self.duration_max: Optional[float] = None
+        self.buckets = [0] * bucket_count
+
+
+class LogRollupAggregator:
+    """
+    In-memory per-minute rollups waiting to be upserted.
+
+    Example:
+        >>> aggregator = LogRollupAggregator()
+        >>> aggregator.add('performance_logs', {'timestamp': datetime.now(timezone.utc),
+        ...                                     'operation_name': 'load', 'duration_ms': 12.5, 'status': 'success'})
+        >>> aggregator.drain()[0]['event_count']
+        1
+    """
+
+    def __init__(self, bounds: Sequence[float] = ROLLUP_DURATION_BUCKETS_MS):
+        self.bounds = tuple(bounds)
+        self._rollups: Dict[RollupKey, _Rollup] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._rollups)
+
+    def _get(self, key: RollupKey) -> _Rollup:
+        rollup = self._rollups.get(key)
+        if rollup is None:
+            rollup = self._rollups[key] = _Rollup(len(self.bounds) + 1)
+        return rollup
+
+    def add(self, table: str, row: Dict[str, Any]):
+        """Fold one shipped row into its minute"""
+        component, level, operation, is_error = rollup_dimensions(table, row)
+        key = (_minute(row.get('timestamp')), table, component[:_KEY_WIDTH], level[:20], operation[:_KEY_WIDTH])
+        duration = row.get('duration_ms')
+        metadata = _summary_metadata(row) if table == 'performance_logs' else {}
+
+        if metadata.get('count'):
+            # Operation tracer summary: one row stands for ``count`` calls, of which the
+            # ``sampled`` ones (every failure among them) were already shipped as their own rows
+            count = int(metadata['count'])
+            sampled = int(metadata.get('sampled', 0))
+            calls = count - sampled
+            if calls <= 0:
+                return
+            errors = max(int(metadata.get('errors', 0)) - sampled, 0)
+            total = None
+            if duration is not None:
+                total = float(metadata.get('total_ms', float(duration) * count))
+                total = max(total - float(metadata.get('sampled_ms', float(duration) * sampled)), 0.0)
+            with self._lock:
+                rollup = self._get(key)
+                rollup.event_count += calls
+                rollup.error_count += errors
+                if total is not None:
+                    self._observe(rollup, total / calls, calls, total=total,
+                                  peak=float(metadata.get('max_ms', duration)))
+            return
+
+        with self._lock:
+            rollup = self._get(key)
+            rollup.event_count += 1
+            rollup.error_count += is_error
+            if duration is not None:
+                self._observe(rollup, float(duration), 1)
+
+    def _observe(self, rollup: _Rollup, duration: float, weight: int, total: float = None, peak: float = None):
+        rollup.buckets[bisect.bisect_left(self.bounds, duration)] += weight
+        rollup.duration_count += weight
+        rollup.duration_sum += duration * weight if total is None else total
+        rollup.duration_min = duration if rollup.duration_min is None else min(rollup.duration_min, duration)
+        high = duration if peak is None else peak
+        rollup.duration_max = high if rollup.duration_max is None else max(rollup.duration_max, high)
+
+    def add_batch(self, batch: Iterable[Tuple[str, Dict[str, Any]]]):
+        for table, row in batch:
+            self.add(table, row)
+
+    def drain(self) -> List[Dict[str, Any]]:
+        """Take all pending rollups as rows in ROLLUP_COLUMNS order"""
+        with self._lock:
+            rollups, self._rollups = self._rollups, {}
+        return [{
+            'bucket': key[0], 'source': key[1], 'component': key[2], 'level': key[3], 'operation': key[4],
+            'event_count': rollup.event_count,
+            'error_count': rollup.error_count,
+            'duration_count': rollup.duration_count,
+            'duration_sum_ms': rollup.duration_sum,
+            'duration_min_ms': rollup.duration_min,
+            'duration_max_ms': rollup.duration_max,
+            'duration_buckets': list(rollup.buckets),
+        } for key, rollup in rollups.items()]
+
+    def restore(self, rows: Iterable[Dict[str, Any]]):
+        """Merge drained rows back after a failed upsert"""
+        with self._lock:
+            for row in rows:
+                key = (row['bucket'], row['source'], row['component'], row['level'], row['operation'])
+                rollup = self._get(key)
+                rollup.event_count += row['event_count']
+                rollup.error_count += row['error_count']
+                rollup.duration_count += row['duration_count']
+                rollup.duration_sum += row['duration_sum_ms']
+                for name, pick in (('duration_min', min), ('duration_max', max)):
+                    value = row[f'{name}_ms']
+                    current = getattr(rollup, name)
+                    if value is not None:
+                        setattr(rollup, name, value if current is None else pick(current, value))
+                rollup.buckets = merge_buckets([rollup.buckets, row['duration_buckets']], len(rollup.buckets))
+
+
+def write_rollups(cursor, rows: List[Dict[str, Any]]):
+    """Upsert drained rollup rows"""
+    cursor.executemany(ROLLUP_UPSERT_SQL, [tuple(row[column] for column in ROLLUP_COLUMNS) for row in rows])
@@ -0,0 +1,605 @@
+"""
+Log Shipping Pipeline
+Ships log rows from every database logger to PostgreSQL over one dedicated connection
+
+Rows are queued without blocking the caller and written by a single thread
+with ``COPY ... FROM STDIN``. The batch size grows with the queue depth, and
+when the database is slow or down (or the queue is full) rows are appended
+to a spill file on disk instead of being dropped, then replayed once writes
+succeed again. Only connection-level failures are retried: when the database
+rejects the data itself (bad values, constraint violations) the batch is
+bisected and the offending rows go to a dead-letter file, so neither live
+writes nor replay can get stuck behind one bad row. A spilled chunk that
+keeps failing with a schema error (a missing column or table) is
+dead-lettered after ``max_replay_attempts`` replays instead of cycling
+through spill and replay forever. Written rows are also
+folded into per-minute rollups that are upserted into ``log_rollups`` every
+``rollup_interval`` seconds. The writer thread also pre-creates the daily log
+partitions when it starts and every ``partition_interval`` seconds.
+"""
+
+import atexit
+import io
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from pathlib import Path
+from queue import Empty, Full, Queue
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import psycopg2
+
+from .log_rollups import LogRollupAggregator, write_rollups
+from .metrics import Histogram, MetricsRegistry, get_metrics_registry
+
+# Column order COPY writes for each log table
+LOG_TABLE_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    'system_logs': ('timestamp', 'level', 'logger_name', 'correlation_id', 'message', 'module',
+                    'function_name', 'line_number', 'thread_name', 'process_id', 'metadata'),
+    'data_collection_logs': ('timestamp', 'operation_type', 'data_source', 'symbol', 'records_processed',
+                             'duration_ms', 'status', 'correlation_id', 'metadata'),
+    'error_logs': ('timestamp', 'error_type', 'error_message', 'component', 'severity', 'stack_trace',
+                   'source_file', 'source_line', 'source_function', 'user_impact', 'correlation_id',
+                   'first_occurrence', 'occurrence_count', 'resolution_status', 'metadata'),
+    'performance_logs': ('timestamp', 'operation_name', 'duration_ms', 'status', 'component',
+                         'correlation_id', 'memory_usage_mb', 'cpu_usage_percent', 'metadata'),
+    'trading_events': ('timestamp', 'event_type', 'symbol', 'side', 'quantity', 'price', 'order_id', 'strategy',
+                       'correlation_id', 'metadata'),
+}
+
+# NOT NULL columns without a default; rows missing one are rejected by ship()
+REQUIRED_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    'system_logs': ('level', 'logger_name', 'message'),
+    'data_collection_logs': ('operation_type',),
+    'error_logs': ('error_type', 'error_message'),
+    'performance_logs': ('operation_name', 'duration_ms', 'status'),
+    'trading_events': ('event_type',),
+}
+
+# Errors caused by the rows themselves: retrying cannot help, so the bad rows are dead-lettered
+ROW_ERRORS = (psycopg2.DataError, psycopg2.IntegrityError)
+
+# Errors from the statement the batch needs (missing column or table): every row fails the same way,
+# so a spilled chunk is only replayed a bounded number of times before it is dead-lettered
+SCHEMA_ERRORS = (psycopg2.ProgrammingError,)
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+SPILL_FILE = 'log_spill.jsonl'
+REPLAY_FILE = 'log_spill.replay.jsonl'
+DEAD_LETTER_FILE = 'log_dead_letter.jsonl'
+
+# 'database' in the name keeps these messages out of DatabaseLogHandler (no feedback loop)
+shipping_logger = logging.getLogger('mltrading.database_log_shipping')
+
+
+def _csv_field(value: Any) -> str:
+    """Format one value for COPY CSV: unquoted empty is NULL, everything else is quoted text or a number"""
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, (datetime, date)):
+        value = value.isoformat()
+    elif isinstance(value, (dict, list)):
+        value = json.dumps(value, default=str)
+    else:
+        value = str(value)
+    return '"' + value.replace('"', '""') + '"'
+
+
+def rows_to_csv(rows: Iterable[Dict[str, Any]], columns: Tuple[str, ...]) -> io.StringIO:
+    """Render log rows as a COPY-ready CSV buffer (missing keys become NULL)"""
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write(','.join(_csv_field(row.get(col)) for col in columns))
+        buffer.write('\n')
+    buffer.seek(0)
+    return buffer
+
+
+def default_spill_dir() -> Path:
+    """LOG_SPILL_DIR if set, else logs/spill under the project root (independent of the working directory)"""
+    return Path(os.getenv('LOG_SPILL_DIR') or PROJECT_ROOT / 'logs' / 'spill')
+
+
+def _dedicated_connection():
+    """Open the shipper's own autocommit connection, outside the application pool"""
+    import psycopg2
+    from ..data.storage.database import get_db_manager
+
+    db = get_db_manager()
+    conn = psycopg2.connect(host=db.host, port=db.port, database=db.database, user=db.user,
+                            password=db.password, connect_timeout=db.timeout,
+                            application_name='mltrading-log-shipper')
+    conn.autocommit = True
+    return conn
+
+
+class LogShipper:
+    """
+    Asynchronous, batched, back-pressured writer for the log tables.
+
+    Example:
+        >>> shipper = get_log_shipper()
+        >>> shipper.ship('performance_logs', {'operation_name': 'load', 'duration_ms': 12.5, 'status': 'success'})
+        True
+        >>> shipper.get_stats()['enqueued']
+        1
+    """
+
+    def __init__(self, connection_factory: Callable[[], Any] = None,
+                 spill_dir: str = None,
+                 max_queue_size: int = 10000,
+                 min_batch_size: int = 50,
+                 max_batch_size: int = 2000,
+                 flush_interval: float = 2.0,
+                 max_spill_bytes: int = 256 * 1024 * 1024,
+                 max_backoff: float = 30.0,
+                 max_replay_attempts: int = 5,
+                 rollup_interval: Optional[float] = 10.0,
+                 partition_maintenance: Callable[[], Any] = None,
+                 partition_interval: float = 3600.0,
+                 start: bool = True):
+        """
+        Args:
+            connection_factory: Returns a new autocommit connection (defaults to a direct psycopg2 connection)
+            spill_dir: Directory of the spill and dead-letter files (defaults to ``default_spill_dir()``)
+            max_queue_size: In-memory rows before new rows go straight to the spill file
+            min_batch_size: Rows that trigger a write before ``flush_interval`` elapses
+            max_batch_size: Upper bound of the adaptive batch size
+            flush_interval: Longest time a row waits in memory
+            max_spill_bytes: Spill file size above which rows are dropped
+            max_backoff: Longest pause between reconnect attempts
+            max_replay_attempts: Replays of a spilled chunk failing with a schema error before it is dead-lettered
+            rollup_interval: Seconds between log_rollups upserts (None disables rollups)
+            partition_maintenance: Creates upcoming log partitions; run when the writer starts
+                and every ``partition_interval`` seconds (None disables it)
+            partition_interval: Seconds between partition maintenance runs
+            start: Start the writer thread
+        """
+        self.connection_factory = connection_factory or _dedicated_connection
+        self.spill_dir = Path(spill_dir) if spill_dir else default_spill_dir()
+        self.spill_path = self.spill_dir / SPILL_FILE
+        self.replay_path = self.spill_dir / REPLAY_FILE
+        self.dead_letter_path = self.spill_dir / DEAD_LETTER_FILE
+        self.max_queue_size = max_queue_size
+        self.min_batch_size = min_batch_size
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.max_spill_bytes = max_spill_bytes
+        self.max_backoff = max_backoff
+        self.max_replay_attempts = max_replay_attempts
+        self.rollup_interval = rollup_interval
+        self.rollups = LogRollupAggregator() if rollup_interval is not None else None
+        self._next_rollup_flush = time.time() + (rollup_interval or 0)
+        self.partition_maintenance = partition_maintenance
+        self.partition_interval = partition_interval
+        self._next_partition_check = time.time()
+
+        self.log_queue: Queue = Queue(maxsize=max_queue_size)
+        self.shutdown_event = threading.Event()
+        self._conn = None
+        self._busy = False
+        self._retry_at = 0.0
+        self._backoff = 0.0
+        self._last_error: Optional[Exception] = None
+        self._replay_failures = 0
+        self._spill_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._counters = defaultdict(int)
+        self._table_counters: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.write_seconds = Histogram()
+        self.last_batch_size = 0
+        self.last_write: Optional[datetime] = None
+
+        self.writer_thread = threading.Thread(target=self._writer_loop, name='log-shipper', daemon=True)
+        if start:
+            self.writer_thread.start()
+
+    # Producer side
+
+    def ship(self, table: str, row: Dict[str, Any]) -> bool:
+        """
+        Queue one row for ``table`` without blocking.
+
+        A missing ``timestamp`` is filled in here, since COPY would otherwise
+        send NULL instead of letting the column default apply.
+
+        Returns:
+            False if the row was rejected (a required column is missing) or
+            dropped (queue full and spill file unavailable)
+        """
+        if table not in LOG_TABLE_COLUMNS:
+            raise ValueError(f"Unknown log table: {table}")
+        missing = [column for column in REQUIRED_COLUMNS[table] if row.get(column) is None]
+        if missing:
+            self._count_rows('rejected', [(table, row)])
+            shipping_logger.warning(f"Rejected {table} row missing {', '.join(missing)}")
+            return False
+        if row.get('timestamp') is None:
+            row = {**row, 'timestamp': datetime.now(timezone.utc)}
+        try:
+            self.log_queue.put_nowait((table, row))
+            self._count_rows('enqueued', [(table, row)])
+            return True
+        except Full:
+            # Back-pressure: keep the row on disk rather than blocking the caller or losing it
+            return self._spill([(table, row)]) > 0
+
+    # Writer side
+
+    def _writer_loop(self):
+        """Collect adaptive batches from the queue, write them with COPY, replay spilled rows when healthy"""
+        while not self.shutdown_event.is_set():
+            try:
+                batch = self._collect_batch()
+                if batch:
+                    try:
+                        self._write_or_spill(batch)
+                    finally:
+                        self._busy = False
+                elif self._healthy():
+                    self._replay_spill()
+                if time.time() >= self._next_rollup_flush:
+                    self._flush_rollups()
+                if (self.partition_maintenance is not None and time.time() >= self._next_partition_check
+                        and self._healthy()):
+                    self._maintain_partitions()
+            except Exception as e:
+                self._count('write_errors')
+                shipping_logger.error(f"Log shipper loop error: {e}")
+                time.sleep(1)
+        self._drain()
+
+    def target_batch_size(self) -> int:
+        """Batch size for the current queue depth, between min_batch_size and max_batch_size"""
+        return max(self.min_batch_size, min(self.max_batch_size, self.log_queue.qsize()))
+
+    def _collect_batch(self) -> List[Tuple[str, Dict[str, Any]]]:
+        batch_size = self.target_batch_size()
+        batch = []
+        deadline = time.time() + self.flush_interval
+        while len(batch) < batch_size and not self.shutdown_event.is_set():
+            try:
+                batch.append(self.log_queue.get(timeout=max(0.05, min(0.5, deadline - time.time()))))
+                self._busy = True
+            except Empty:
+                if batch and time.time() >= deadline:
+                    break
+                if not batch:
+                    return batch
+        return batch
+
+    def _healthy(self) -> bool:
+        return time.time() >= self._retry_at
+
+    def _write_or_spill(self, batch: List[Tuple[str, Dict[str, Any]]]):
+        written = self._copy_batch(batch) if self._healthy() else None
+        if written is None:
+            self._spill(batch)
+        else:
+            self._count_rows('written', written)
+
+    def _copy_batch(self, batch: List[Tuple[str, Dict[str, Any]]]) -> Optional[List[Tuple[str, Dict[str, Any]]]]:
+        """
+        COPY a batch grouped by table.
+
+        Returns:
+            The rows written (rows the database rejected are dead-lettered), or
+            None after a connection-level failure, which also starts a backoff
+        """
+        by_table: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for table, row in batch:
+            by_table[table].append(row)
+
+        start = time.perf_counter()
+        written = []
+        try:
+            conn = self._connection()
+            for table, rows in by_table.items():
+                written.extend((table, row) for row in self._copy_rows(conn, table, rows))
+        except Exception as e:
+            self._last_error = e
+            self._count('write_errors')
+            self._reset_connection()
+            self._backoff = min(self.max_backoff, max(1.0, self._backoff * 2))
+            self._retry_at = time.time() + self._backoff
+            shipping_logger.error(f"Failed to ship {len(batch)} log rows, retrying in {self._backoff:.0f}s: {e}")
+            return None
+
+        self.write_seconds.observe(time.perf_counter() - start)
+        if self.rollups is not None:
+            self.rollups.add_batch(written)
+        self._backoff = 0.0
+        self._retry_at = 0.0
+        self.last_batch_size = len(batch)
+        self.last_write = datetime.now()
+        self._count('batches')
+        return written
+
+    def _copy_rows(self, conn, table: str, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """COPY rows into one table, bisecting around rows the database rejects; returns the rows written"""
+        columns = LOG_TABLE_COLUMNS[table]
+        try:
+            with conn.cursor() as cursor:
+                cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+                                   rows_to_csv(rows, columns))
+            if not getattr(conn, 'autocommit', True):
+                conn.commit()
+            return rows
+        except ROW_ERRORS as e:
+            if not getattr(conn, 'autocommit', True):
+                conn.rollback()
+            if len(rows) == 1:
+                self._dead_letter([(table, rows[0])], e)
+                return []
+            middle = len(rows) // 2
+            return self._copy_rows(conn, table, rows[:middle]) + self._copy_rows(conn, table, rows[middle:])
+
+    def _dead_letter(self, batch: List[Tuple[str, Dict[str, Any]]], error: Exception):
+        """Set aside rows the database rejected, with the error, for inspection (never replayed)"""
+        shipping_logger.error(f"Dead-lettered {len(batch)} log rows: {error}")
+        with self._spill_lock:
+            try:
+                self.spill_dir.mkdir(parents=True, exist_ok=True)
+                with open(self.dead_letter_path, 'a', encoding='utf-8') as dead_letter:
+                    for table, row in batch:
+                        dead_letter.write(json.dumps({'table': table, 'row': row, 'error': str(error).strip()},
+                                                     default=str) + '\n')
+            except OSError as e:
+                shipping_logger.error(f"Failed to dead-letter {len(batch)} log rows: {e}")
+        self._count_rows('dead_lettered', batch)
+
+    def _flush_rollups(self) -> bool:
+        """Upsert pending rollups; they stay pending (and merge with new ones) if the write fails"""
+        if self.rollups is None:
+            return True
+        self._next_rollup_flush = time.time() + self.rollup_interval
+        if not len(self.rollups):
+            return True
+        if not self._healthy():
+            return False
+        rows = self.rollups.drain()
+        try:
+            conn = self._connection()
+            with conn.cursor() as cursor:
+                write_rollups(cursor, rows)
+            if not getattr(conn, 'autocommit', True):
+                conn.commit()
+        except Exception as e:
+            self.rollups.restore(rows)
+            self._count('rollup_errors')
+            self._reset_connection()
+            shipping_logger.error(f"Failed to write {len(rows)} log rollups: {e}")
+            return False
+        self._count('rollups_written', len(rows))
+        return True
+
+    def _maintain_partitions(self):
+        """Run partition maintenance; a failure only waits for the next interval"""
+        self._next_partition_check = time.time() + self.partition_interval
+        try:
+            self.partition_maintenance()
+        except Exception as e:
+            self._count('partition_errors')
+            shipping_logger.error(f"Log partition maintenance failed: {e}")
+
+    def _connection(self):
+        if self._conn is None or getattr(self._conn, 'closed', False):
+            self._conn = self.connection_factory()
+        return self._conn
+
+    def _reset_connection(self):
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+        self._conn = None
+
+    # Spill buffer
+
+    def _spill(self, batch: List[Tuple[str, Dict[str, Any]]]) -> int:
+        """Append rows to the spill file; rows beyond max_spill_bytes (or on I/O errors) are dropped"""
+        with self._spill_lock:
+            try:
+                self.spill_dir.mkdir(parents=True, exist_ok=True)
+                size = self.spill_path.stat().st_size if self.spill_path.exists() else 0
+                written = 0
+                with open(self.spill_path, 'a', encoding='utf-8') as spill:
+                    for table, row in batch:
+                        line = json.dumps({'table': table, 'row': row}, default=str) + '\n'
+                        if size + len(line) > self.max_spill_bytes:
+                            break
+                        spill.write(line)
+                        size += len(line)
+                        written += 1
+            except OSError as e:
+                shipping_logger.error(f"Failed to spill {len(batch)} log rows: {e}")
+                written = 0
+        self._count_rows('spilled', batch[:written])
+        self._count_rows('dropped', batch[written:])
+        return written
+
+    def _replay_spill(self):
+        """Write spilled rows back in max_batch_size chunks, resuming from the recorded offset"""
+        with self._spill_lock:
+            if not self.replay_path.exists():
+                if not self.spill_path.exists() or self.spill_path.stat().st_size == 0:
+                    return
+                os.replace(self.spill_path, self.replay_path)
+                self._write_offset(0)
+
+        offset_path = self.replay_path.with_suffix('.offset')
+        offset = int(offset_path.read_text() or 0) if offset_path.exists() else 0
+        with open(self.replay_path, 'r', encoding='utf-8') as replay:
+            replay.seek(offset)
+            while not self.shutdown_event.is_set() and self.log_queue.qsize() < self.min_batch_size:
+                batch = []
+                for line in iter(replay.readline, ''):
+                    try:
+                        entry = json.loads(line)
+                        batch.append((entry['table'], entry['row']))
+                    except (ValueError, KeyError):
+                        self._count('dropped')
+                    if len(batch) >= self.max_batch_size:
+                        break
+                if not batch:
+                    break
+                written = self._copy_batch(batch)
+                if written is None:
+                    if not isinstance(self._last_error, SCHEMA_ERRORS):
+                        return
+                    self._replay_failures += 1
+                    if self._replay_failures < self.max_replay_attempts:
+                        return
+                    # The schema rejects this chunk on every attempt; set it aside and move on
+                    self._dead_letter(batch, self._last_error)
+                    written = []
+                self._replay_failures = 0
+                self._count('replayed', len(written))
+                self._count_rows('written', written)
+                self._write_offset(replay.tell())
+            else:
+                # New rows are waiting (or shutting down); resume from the offset later
+                return
+        self.replay_path.unlink()
+        offset_path.unlink(missing_ok=True)
+
+    def _write_offset(self, offset: int):
+        self.replay_path.with_suffix('.offset').write_text(str(offset))
+
+    def spill_backlog_bytes(self) -> int:
+        """Bytes waiting on disk for replay"""
+        total = 0
+        for path in (self.spill_path, self.replay_path):
+            if path.exists():
+                total += path.stat().st_size
+        offset_path = self.replay_path.with_suffix('.offset')
+        if self.replay_path.exists() and offset_path.exists():
+            total -= int(offset_path.read_text() or 0)
+        return total
+
+    # Lifecycle
+
+    def _drain(self):
+        """Write (or spill) whatever is still queued at shutdown"""
+        batch = []
+        while True:
+            try:
+                batch.append(self.log_queue.get_nowait())
+            except Empty:
+                break
+        if batch:
+            self._write_or_spill(batch)
+        self._flush_rollups()
+        self._reset_connection()
+
+    def flush(self, timeout: float = 5.0):
+        """Wait until queued rows have been written or spilled"""
+        start_time = time.time()
+        while (not self.log_queue.empty() or self._busy) and time.time() - start_time < timeout:
+            time.sleep(0.05)
+
+    def close(self, timeout: float = 10.0):
+        """Stop the writer; queued rows are written or spilled before it exits"""
+        self.shutdown_event.set()
+        if self.writer_thread.is_alive():
+            self.writer_thread.join(timeout=timeout)
+        elif not self.log_queue.empty():
+            self._drain()
+
+    # Counters
+
+    def _count(self, name: str, n: int = 1):
+        with self._stats_lock:
+            self._counters[name] += n
+
+    def _count_rows(self, name: str, batch: List[Tuple[str, Dict[str, Any]]]):
+        with self._stats_lock:
+            self._counters[name] += len(batch)
+            for table, _ in batch:
+                self._table_counters[table][name] += 1
+
+    def get_table_stats(self, table: str) -> Dict[str, int]:
+        """enqueued/written/spilled/dropped/rejected/dead-lettered counts for one table"""
+        with self._stats_lock:
+            counters = self._table_counters.get(table, {})
+            return {name: counters.get(name, 0)
+                    for name in ('enqueued', 'written', 'spilled', 'dropped', 'rejected', 'dead_lettered')}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Shipping counters, queue depth, spill backlog and write latency"""
+        with self._stats_lock:
+            counters = dict(self._counters)
+        return {
+            **{name: counters.get(name, 0)
+               for name in ('enqueued', 'written', 'spilled', 'replayed', 'dropped', 'rejected', 'dead_lettered',
+                            'write_errors', 'batches', 'rollups_written', 'rollup_errors', 'partition_errors')},
+            'pending_rollups': len(self.rollups) if self.rollups is not None else 0,
+            'queue_size': self.log_queue.qsize(),
+            'target_batch_size': self.target_batch_size(),
+            'last_batch_size': self.last_batch_size,
+            'last_write': self.last_write,
+            'spill_backlog_bytes': self.spill_backlog_bytes(),
+            'backoff_seconds': self._backoff,
+            'write_latency': self.write_seconds.snapshot(),
+            'thread_alive': self.writer_thread.is_alive(),
+        }
+
+    def export_metrics(self, registry: MetricsRegistry):
+        """Publish shipping counters, queue depth and spill backlog (registered as a scrape-time collector)"""
+        with self._stats_lock:
+            counters = dict(self._counters)
+        for name in ('written', 'spilled', 'replayed', 'dropped', 'rejected', 'dead_lettered'):
+            registry.counter('mltrading_log_shipper_rows_total', 'Log rows by shipping outcome',
+                             outcome=name).set_total(counters.get(name, 0))
+        registry.counter('mltrading_log_shipper_write_errors_total', 'Failed COPY batches').set_total(
+            counters.get('write_errors', 0))
+        registry.gauge('mltrading_log_shipper_queue_size', 'Rows waiting for the writer thread').set(
+            self.log_queue.qsize())
+        registry.gauge('mltrading_log_shipper_spill_bytes', 'Bytes spilled to disk awaiting replay').set(
+            self.spill_backlog_bytes())
+        registry.register_histogram('mltrading_log_shipper_write_seconds', self.write_seconds,
+                                    'COPY batch write latency')
+
+
+def _ensure_log_partitions():
+    # Imported here: the log manager's own dependencies log through this module
+    from .database_log_manager import get_database_log_manager
+    results = get_database_log_manager().ensure_log_partitions()
+    if results['status'] != 'success':
+        raise RuntimeError(results.get('message'))
+
+
+_log_shipper: Optional[LogShipper] = None
+_log_shipper_lock = threading.Lock()
+
+
+def get_log_shipper() -> LogShipper:
+    """Get the process-wide log shipper (one writer thread and one connection for all log tables)"""
+    global _log_shipper
+    if _log_shipper is None:
+        with _log_shipper_lock:
+            if _log_shipper is None:
+                _log_shipper = LogShipper(partition_maintenance=_ensure_log_partitions)
+                get_metrics_registry().register_collector('log_shipper', _log_shipper.export_metrics)
+                # Short-lived processes (Prefect flows, scripts) would otherwise lose the queued rows
+                atexit.register(shutdown_log_shipper)
+    return _log_shipper
+
+
+def shutdown_log_shipper():
+    """Flush and stop the process-wide log shipper"""
+    global _log_shipper
+    with _log_shipper_lock:
+        if _log_shipper is not None:
+            get_metrics_registry().unregister_collector('log_shipper')
+            _log_shipper.close()
+            _log_shipper = None
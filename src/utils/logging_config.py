@@ -14,6 +14,8 @@ from typing import Dict, Any, Optional, Union
 from contextlib import contextmanager
 from concurrent.futures import ThreadPoolExecutor
 
+from .operation_tracer import get_operation_tracer
+
 # Import database logging components
 try:
     from .database_logging import DatabaseLogHandler
@@ -123,16 +125,8 @@ def setup_logger(name: str, log_file: str = None, level: str = "INFO",
     # Database handler (if enabled and available)
     if enable_database_logging and DATABASE_LOGGING_AVAILABLE and DatabaseLogHandler:
         try:
-            from ..data.storage.database import DatabaseManager
-            db_manager = DatabaseManager()
-
-            db_handler = DatabaseLogHandler(
-                db_manager=db_manager,
-                table_name="system_logs",
-                max_queue_size=1000,
-                batch_size=50,
-                flush_interval=5.0
-            )
+            # All database handlers share one log shipper (one writer thread and connection)
+            db_handler = DatabaseLogHandler(table_name="system_logs")
             db_handler.setLevel(getattr(logging, db_log_level.upper()))
             logger.addHandler(db_handler)
 
@@ -607,12 +601,48 @@ def set_correlation_id(correlation_id: str):
     _correlation_context.correlation_id = correlation_id
 
 
+def _log_operation_failure(operation_name: str, logger: logging.Logger, correlation_id: str,
+                           duration_ms: float, error: Exception, clean_metadata: Dict[str, str]):
+    """Log a failed operation to the logger and to performance_logs (never sampled out)"""
+    error_msg = sanitize_log_message(str(error))
+    logger.error(f"[{correlation_id}] Failed operation: {operation_name} after {duration_ms:.2f}ms - {error_msg}",
+                 extra={'correlation_id': correlation_id, 'operation': operation_name,
+                        'duration_ms': duration_ms, 'status': 'error', 'error': error_msg},
+                 exc_info=True)
+
+    # Log performance event for failed operations too
+    try:
+        from .resilient_database_logging import get_resilient_performance_logger
+        perf_logger = get_resilient_performance_logger()
+
+        # Clean metadata to avoid conflicts
+        error_metadata = {k: v for k, v in clean_metadata.items()
+                          if k not in ['component', 'correlation_id']}
+        error_metadata['error'] = error_msg
+
+        perf_logger.log_performance(
+            operation_name=operation_name,
+            duration_ms=duration_ms,
+            status='error',
+            component=clean_metadata.get('component', 'unknown'),
+            **error_metadata
+        )
+    except Exception:
+        # Fail silently - primary logging to file already succeeded
+        pass
+
+
 @contextmanager
 def log_operation(operation_name: str, logger: logging.Logger = None,
                   log_args: bool = False, **metadata: Any):
     """
     Context manager for logging operations with automatic timing and error handling
 
+    Every call is timed into the operation tracer's histograms. Start/completion
+    lines and the per-call performance row are only written for sampled calls
+    (see ``logging.operation_sample_rates``) and only when the logger has INFO
+    enabled; failures are always logged in full.
+
     Args:
         operation_name: Name of the operation being performed
         logger: Logger instance to use
@@ -622,8 +652,28 @@ def log_operation(operation_name: str, logger: logging.Logger = None,
     if logger is None:
         logger = get_combined_logger("mltrading.operation")
 
+    tracer = get_operation_tracer()
+    key = tracer.key_for(operation_name)
+    sampled = logger.isEnabledFor(logging.INFO) and tracer.should_sample(key)
+    start_time = time.perf_counter()
+
+    if not sampled:
+        # Fast path: timing only, metadata is sanitized just if the operation fails
+        failed = False
+        try:
+            yield
+        except Exception as e:
+            failed = True
+            duration_ms = (time.perf_counter() - start_time) * 1000
+            _log_operation_failure(operation_name, logger, get_correlation_id(), duration_ms, e,
+                                   {k: sanitize_log_message(str(v)) for k, v in metadata.items()})
+            raise
+        finally:
+            # A failure wrote its own performance row, so it counts as sampled
+            tracer.record(key, time.perf_counter() - start_time, error=failed, sampled=failed)
+        return
+
     correlation_id = get_correlation_id()
-    start_time = time.time()
 
     # Sanitize metadata
     clean_metadata = {k: sanitize_log_message(str(v)) for k, v in metadata.items()}
@@ -634,7 +684,9 @@ def log_operation(operation_name: str, logger: logging.Logger = None,
                            'metadata': clean_metadata if log_args else {}})
         yield
 
-        duration_ms = (time.time() - start_time) * 1000
+        elapsed = time.perf_counter() - start_time
+        tracer.record(key, elapsed, sampled=True)
+        duration_ms = elapsed * 1000
         logger.info(f"[{correlation_id}] Completed operation: {operation_name} in {duration_ms:.2f}ms",
                     extra={'correlation_id': correlation_id, 'operation': operation_name,
                            'duration_ms': duration_ms, 'status': 'success'})
@@ -644,34 +696,9 @@ def log_operation(operation_name: str, logger: logging.Logger = None,
                               {**clean_metadata, 'correlation_id': correlation_id}, logger)
 
     except Exception as e:
-        duration_ms = (time.time() - start_time) * 1000
-        error_msg = sanitize_log_message(str(e))
-        logger.error(f"[{correlation_id}] Failed operation: {operation_name} after {duration_ms:.2f}ms - {error_msg}",
-                     extra={'correlation_id': correlation_id, 'operation': operation_name,
-                            'duration_ms': duration_ms, 'status': 'error', 'error': error_msg},
-                     exc_info=True)
-
-        # Log performance event for failed operations too
-        try:
-            from .resilient_database_logging import get_resilient_performance_logger
-            perf_logger = get_resilient_performance_logger()
-
-            # Clean metadata to avoid conflicts
-            error_metadata = {k: v for k, v in clean_metadata.items()
-                              if k not in ['component', 'correlation_id']}
-            error_metadata['error'] = error_msg
-
-            perf_logger.log_performance(
-                operation_name=operation_name,
-                duration_ms=duration_ms,
-                status='error',
-                component=clean_metadata.get('component', 'unknown'),
-                **error_metadata
-            )
-        except Exception:
-            # Fail silently - primary logging to file already succeeded
-            pass
-
+        elapsed = time.perf_counter() - start_time
+        tracer.record(key, elapsed, error=True, sampled=True)
+        _log_operation_failure(operation_name, logger, correlation_id, elapsed * 1000, e, clean_metadata)
         raise
 
 
@@ -0,0 +1,322 @@
+"""
+Lightweight in-process metric primitives.
+
+Fixed-bucket histograms used by hot-path components (connection pool,
+task runners) to record latency distributions without writing log rows,
+plus counters, gauges and a registry that renders everything in the
+Prometheus text exposition format for the ``/metrics`` endpoints.
+"""
+
+import bisect
+import math
+import threading
+from typing import Callable, Dict, Any, List, Optional, Sequence, Tuple
+
+# Content type of the Prometheus text exposition format
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Default latency buckets in seconds (upper bounds, +Inf is implicit)
+DEFAULT_LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram with cumulative sum/count.
+
+    Observations take one short lock; buckets are upper bounds and an
+    implicit +Inf bucket catches everything above the last bound.
+
+    Example:
+        >>> h = Histogram()
+        >>> h.observe(0.004)
+        >>> h.snapshot()['count']
+        1
+    """
+
+    def __init__(self, buckets: Optional[Sequence[float]] = None):
+        self.buckets = tuple(sorted(buckets or DEFAULT_LATENCY_BUCKETS))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        """Record one observation"""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+            if value > self._max:
+                self._max = value
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile from bucket bounds (upper bound of the matching bucket)"""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._count
+            observed_max = self._max
+        if total == 0:
+            return 0.0
+        target = q * total
+        running = 0
+        for index, bucket_count in enumerate(counts):
+            running += bucket_count
+            if running >= target:
+                return self.buckets[index] if index < len(self.buckets) else observed_max
+        return observed_max
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get a point-in-time copy of the histogram"""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._count
+            total_sum = self._sum
+            observed_max = self._max
+        labels = [str(b) for b in self.buckets] + ['+Inf']
+        return {
+            'buckets': dict(zip(labels, counts)),
+            'count': total,
+            'sum': total_sum,
+            'avg': (total_sum / total) if total else 0.0,
+            'max': observed_max,
+        }
+
+    def reset(self):
+        """Clear all observations"""
+        with self._lock:
+            self._counts = [0] * (len(self.buckets) + 1)
+            self._sum = 0.0
+            self._count = 0
+            self._max = 0.0
+
+
+class Counter:
+    """
+    Monotonic counter.
+
+    Example:
+        >>> c = Counter()
+        >>> c.inc()
+        >>> c.value
+        1.0
+    """
+
+    __slots__ = ('_value', '_lock')
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        """Add ``amount`` (must not be negative)"""
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        with self._lock:
+            self._value += amount
+
+    def set_total(self, total: float):
+        """Mirror a monotonic count maintained elsewhere (e.g. a component's stats dict)"""
+        self._value = float(total)
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+
+class Gauge:
+    """Value that can go up and down (queue depth, pool size, circuit state)"""
+
+    __slots__ = ('_value', '_lock')
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float):
+        self._value = float(value)
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.inc(-amount)
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+
+_METRIC_TYPES = {'counter': Counter, 'gauge': Gauge, 'histogram': Histogram}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class _MetricFamily:
+    """All label combinations of one metric name"""
+
+    __slots__ = ('name', 'kind', 'help', 'children')
+
+    def __init__(self, name: str, kind: str, help_text: str):
+        self.name = name
+        self.kind = kind
+        self.help = help_text
+        self.children: Dict[LabelKey, Any] = {}
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if math.isnan(value):
+        return 'NaN'
+    return repr(float(value))
+
+
+def _escape(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: LabelKey, extra: Tuple[str, str] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((label, str(value)) for label, value in labels.items()))
+
+
+class MetricsRegistry:
+    """
+    Named counters, gauges and histograms with optional labels.
+
+    Metrics are created on first use and shared afterwards, so components
+    look their children up once and keep the reference for the hot path.
+    Components whose numbers already live in a stats dict register a
+    collector instead; collectors run just before each render.
+
+    Example:
+        >>> registry = MetricsRegistry()
+        >>> calls = registry.counter('mltrading_api_calls_total', 'API calls', endpoint='bars')
+        >>> calls.inc()
+        >>> print(registry.render())
+        # HELP mltrading_api_calls_total API calls
+        # TYPE mltrading_api_calls_total counter
+        mltrading_api_calls_total{endpoint="bars"} 1.0
+        <BLANKLINE>
+    """
+
+    def __init__(self):
+        self._families: Dict[str, _MetricFamily] = {}
+        self._collectors: Dict[str, Callable[['MetricsRegistry'], None]] = {}
+        self._lock = threading.Lock()
+
+    def _child(self, kind: str, name: str, help_text: str, labels: Dict[str, Any], factory: Callable[[], Any]):
+        key = _label_key(labels)
+        family = self._families.get(name)
+        if family is not None:
+            child = family.children.get(key)
+            if child is not None and family.kind == kind:
+                return child
+        with self._lock:
+            family = self._families.setdefault(name, _MetricFamily(name, kind, help_text))
+            if family.kind != kind:
+                raise ValueError(f"Metric {name} is already registered as a {family.kind}")
+            child = family.children.get(key)
+            if child is None:
+                child = family.children[key] = factory()
+            return child
+
+    def counter(self, name: str, help_text: str = '', **labels: Any) -> Counter:
+        """Get or create a counter"""
+        return self._child('counter', name, help_text, labels, Counter)
+
+    def gauge(self, name: str, help_text: str = '', **labels: Any) -> Gauge:
+        """Get or create a gauge"""
+        return self._child('gauge', name, help_text, labels, Gauge)
+
+    def histogram(self, name: str, help_text: str = '', buckets: Optional[Sequence[float]] = None,
+                  **labels: Any) -> Histogram:
+        """Get or create a histogram"""
+        return self._child('histogram', name, help_text, labels, lambda: Histogram(buckets))
+
+    def register_histogram(self, name: str, histogram: Histogram, help_text: str = '', **labels: Any):
+        """Expose a histogram a component already owns (replaces any previous one with the same labels)"""
+        if self._child('histogram', name, help_text, labels, lambda: histogram) is not histogram:
+            with self._lock:
+                self._families[name].children[_label_key(labels)] = histogram
+
+    def register_collector(self, key: str, collector: Callable[['MetricsRegistry'], None]):
+        """Run ``collector(registry)`` before every render; re-registering a key replaces it"""
+        with self._lock:
+            self._collectors[key] = collector
+
+    def unregister_collector(self, key: str):
+        with self._lock:
+            self._collectors.pop(key, None)
+
+    def collect(self):
+        """Run all collectors (failures are ignored so one broken source cannot break a scrape)"""
+        with self._lock:
+            collectors = list(self._collectors.values())
+        for collector in collectors:
+            try:
+                collector(self)
+            except Exception:
+                pass
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format"""
+        self.collect()
+        with self._lock:
+            families = [(family, list(family.children.items())) for family in self._families.values()]
+
+        lines: List[str] = []
+        for family, children in sorted(families, key=lambda item: item[0].name):
+            if family.help:
+                help_text = family.help.replace('\\', '\\\\').replace('\n', '\\n')
+                lines.append(f"# HELP {family.name} {help_text}")
+            lines.append(f"# TYPE {family.name} {family.kind}")
+            for labels, child in sorted(children):
+                if family.kind != 'histogram':
+                    lines.append(f"{family.name}{_format_labels(labels)} {_format_value(child.value)}")
+                    continue
+                snapshot = child.snapshot()
+                cumulative = 0
+                for bound, count in snapshot['buckets'].items():
+                    cumulative += count
+                    le = bound if bound == '+Inf' else _format_value(float(bound))
+                    lines.append(f"{family.name}_bucket{_format_labels(labels, ('le', le))} {cumulative}")
+                lines.append(f"{family.name}_sum{_format_labels(labels)} {_format_value(snapshot['sum'])}")
+                lines.append(f"{family.name}_count{_format_labels(labels)} {snapshot['count']}")
+        return '\n'.join(lines) + '\n' if lines else ''
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Current values keyed by metric name, then by rendered label set"""
+        self.collect()
+        with self._lock:
+            families = [(family, list(family.children.items())) for family in self._families.values()]
+        return {
+            family.name: {_format_labels(labels): child.snapshot() if family.kind == 'histogram' else child.value
+                          for labels, child in children}
+            for family, children in families
+        }
+
+
+_metrics_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Get the process-wide metrics registry"""
+    return _metrics_registry
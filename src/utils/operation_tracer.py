@@ -0,0 +1,248 @@
+"""
+Operation Tracer
+Sampling and in-memory aggregation for log_operation
+
+Every traced operation is timed into a per-operation histogram, but only a
+sampled fraction of calls emits the start/completion log lines and a
+performance_logs row. The histograms are flushed periodically as one summary
+row per operation, so tight loops over hundreds of symbols cost a timer and
+a histogram update per call instead of two log lines and a database write.
+"""
+
+import atexit
+import fnmatch
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from .metrics import Histogram
+
+# Operation durations in seconds (upper bounds, +Inf is implicit)
+OPERATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+# Distinct operation names remembered before the name -> key cache is reset
+MAX_CACHED_NAMES = 10000
+
+
+class _OperationStats:
+    """Timing histogram and outcome counts of one operation key"""
+
+    __slots__ = ('histogram', 'errors', 'sampled', 'sampled_seconds')
+
+    def __init__(self):
+        self.histogram = Histogram(OPERATION_BUCKETS)
+        self.errors = 0
+        self.sampled = 0
+        self.sampled_seconds = 0.0
+
+
+class OperationTracer:
+    """
+    Per-operation sampling decisions and timing histograms.
+
+    Sample rates are keyed by operation name or fnmatch pattern; calls whose
+    name matches a pattern are aggregated under that pattern, so per-symbol
+    names such as ``store_phase1_features_AAPL`` share one histogram.
+
+    Example:
+        >>> tracer = OperationTracer({'load_historical_data': 0.5, 'store_phase1_features_*': 0.1})
+        >>> key = tracer.key_for('store_phase1_features_AAPL')
+        >>> key
+        'store_phase1_features_*'
+        >>> tracer.record(key, 0.012)
+        >>> tracer.flush()[0]['count']
+        1
+    """
+
+    def __init__(self, sample_rates: Optional[Dict[str, float]] = None, default_rate: float = 1.0,
+                 summary_interval: float = 60.0, sink: Callable[[Dict[str, Any]], None] = None,
+                 rng: Callable[[], float] = random.random):
+        """
+        Args:
+            sample_rates: Operation name or pattern -> fraction of calls logged in full (0.0-1.0)
+            default_rate: Rate for operations without an entry
+            summary_interval: Seconds between summary flushes (0 disables periodic flushing)
+            sink: Receives each summary row on flush
+            rng: Uniform [0, 1) source for sampling decisions
+        """
+        self.sink = sink
+        self.rng = rng
+        self._lock = threading.Lock()
+        self._stats: Dict[str, _OperationStats] = {}
+        self._key_cache: Dict[str, str] = {}
+        self._last_flush = time.time()
+        self.configure(sample_rates or {}, default_rate, summary_interval)
+
+    def configure(self, sample_rates: Optional[Dict[str, float]] = None, default_rate: Optional[float] = None,
+                  summary_interval: Optional[float] = None):
+        """Replace the sample rates and/or flush interval"""
+        with self._lock:
+            if sample_rates is not None:
+                self.exact_rates = {name: rate for name, rate in sample_rates.items()
+                                    if not any(ch in name for ch in '*?[')}
+                self.pattern_rates = [(pattern, rate) for pattern, rate in sample_rates.items()
+                                      if pattern not in self.exact_rates]
+                self._key_cache.clear()
+            if default_rate is not None:
+                self.default_rate = default_rate
+            if summary_interval is not None:
+                self.summary_interval = summary_interval
+
+    def key_for(self, operation_name: str) -> str:
+        """Aggregation key of an operation: its name, or the first sample-rate pattern it matches"""
+        key = self._key_cache.get(operation_name)
+        if key is None:
+            key = operation_name
+            if operation_name not in self.exact_rates:
+                for pattern, _ in self.pattern_rates:
+                    if fnmatch.fnmatchcase(operation_name, pattern):
+                        key = pattern
+                        break
+            if len(self._key_cache) >= MAX_CACHED_NAMES:
+                self._key_cache.clear()
+            self._key_cache[operation_name] = key
+        return key
+
+    def sample_rate(self, key: str) -> float:
+        if key in self.exact_rates:
+            return self.exact_rates[key]
+        for pattern, rate in self.pattern_rates:
+            if pattern == key:
+                return rate
+        return self.default_rate
+
+    def should_sample(self, key: str) -> bool:
+        """Whether this call of ``key`` is logged in full"""
+        rate = self.sample_rate(key)
+        if rate >= 1.0:
+            return True
+        if rate <= 0.0:
+            return False
+        return self.rng() < rate
+
+    def record(self, key: str, duration_seconds: float, error: bool = False, sampled: bool = False):
+        """
+        Add one call to the histogram of ``key``, flushing summaries when the interval has passed.
+
+        ``sampled`` marks calls that also wrote their own performance row, so
+        the summary can tell them apart from the calls it alone accounts for.
+        """
+        stats = self._stats.get(key)
+        if stats is None:
+            with self._lock:
+                stats = self._stats.setdefault(key, _OperationStats())
+        stats.histogram.observe(duration_seconds)
+        if error or sampled:
+            with self._lock:
+                stats.errors += error
+                if sampled:
+                    stats.sampled += 1
+                    stats.sampled_seconds += duration_seconds
+        if self.summary_interval and time.time() - self._last_flush >= self.summary_interval:
+            self.flush()
+
+    def flush(self) -> List[Dict[str, Any]]:
+        """
+        Emit one summary row per operation seen since the last flush and reset the histograms.
+
+        Returns:
+            The summary rows (durations in milliseconds)
+        """
+        with self._lock:
+            stats, self._stats = self._stats, {}
+            started, self._last_flush = self._last_flush, time.time()
+
+        rows = []
+        for key, entry in stats.items():
+            histogram = entry.histogram
+            if histogram.count == 0:
+                continue
+            snapshot = histogram.snapshot()
+            rows.append({
+                'operation': key,
+                'count': histogram.count,
+                'errors': entry.errors,
+                'sampled': entry.sampled,
+                'sampled_ms': entry.sampled_seconds * 1000,
+                'sample_rate': self.sample_rate(key),
+                'mean_ms': histogram.sum / histogram.count * 1000,
+                'p50_ms': histogram.quantile(0.5) * 1000,
+                'p95_ms': histogram.quantile(0.95) * 1000,
+                'p99_ms': histogram.quantile(0.99) * 1000,
+                'max_ms': snapshot['max'] * 1000,
+                'total_ms': histogram.sum * 1000,
+                'interval_seconds': round(self._last_flush - started, 3),
+            })
+
+        if self.sink is not None:
+            for row in rows:
+                try:
+                    self.sink(row)
+                except Exception:
+                    # Summaries are best effort; never break the traced code
+                    pass
+        return rows
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Unflushed counts and mean duration per operation"""
+        with self._lock:
+            stats = dict(self._stats)
+        return {key: {'count': entry.histogram.count, 'errors': entry.errors, 'sampled': entry.sampled,
+                      'mean_ms': entry.histogram.sum / entry.histogram.count * 1000 if entry.histogram.count else 0.0}
+                for key, entry in stats.items()}
+
+
+def _write_summary_row(row: Dict[str, Any]):
+    """Store a summary as one performance_logs row (status 'summary', duration is the mean)"""
+    from .resilient_database_logging import get_resilient_performance_logger
+
+    metadata = {name: value for name, value in row.items() if name not in ('operation', 'mean_ms')}
+    get_resilient_performance_logger().log_performance(
+        operation_name=row['operation'],
+        duration_ms=row['mean_ms'],
+        status='summary',
+        component='operation_tracer',
+        **metadata
+    )
+
+
+def _settings_sampling() -> Dict[str, Any]:
+    """Sampling options from unified settings (defaults when settings are unavailable)"""
+    try:
+        from ..config.settings import get_settings
+        logging_settings = get_settings().logging
+        return {
+            'sample_rates': dict(logging_settings.operation_sample_rates),
+            'default_rate': logging_settings.default_operation_sample_rate,
+            'summary_interval': logging_settings.operation_summary_interval_seconds,
+        }
+    except Exception:
+        return {}
+
+
+_operation_tracer: Optional[OperationTracer] = None
+_operation_tracer_lock = threading.Lock()
+
+
+def get_operation_tracer() -> OperationTracer:
+    """Get the process-wide operation tracer, configured from the logging settings"""
+    global _operation_tracer
+    if _operation_tracer is None:
+        with _operation_tracer_lock:
+            if _operation_tracer is None:
+                _operation_tracer = OperationTracer(sink=_write_summary_row, **_settings_sampling())
+                atexit.register(_operation_tracer.flush)
+    return _operation_tracer
+
+
+def configure_operation_sampling(sample_rates: Optional[Dict[str, float]] = None,
+                                 default_rate: Optional[float] = None,
+                                 summary_interval: Optional[float] = None):
+    """
+    Set sample rates at runtime, e.g. around a backtest sweep.
+
+    Example:
+        >>> configure_operation_sampling({'backtest_*': 0.01, 'fetch_yahoo_data_*': 0.05})
+    """
+    get_operation_tracer().configure(sample_rates, default_rate, summary_interval)
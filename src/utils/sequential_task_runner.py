@@ -1,185 +1,348 @@
 """
-Sequential Task Runner
-Alternative to concurrent execution to prevent connection pool exhaustion
+Bounded Concurrency Task Runner
+Runs flow work concurrently while capping in-flight database work to the
+connection pool budget defined in ConnectionConfig
 """
 
 import asyncio
+import contextvars
+import threading
 import time
+from collections import deque
 from typing import List, Callable, Any, Dict, Optional
 from concurrent.futures import ThreadPoolExecutor
 import logging
 
+from .connection_config import ConnectionConfig
+
 logger = logging.getLogger("mltrading.sequential_runner")
 
+# Error fragments that indicate the connection pool (or server) is saturated
+POOL_PRESSURE_MARKERS = ("pool exhausted", "too many clients", "timed out waiting for connection")
+
 
-class SequentialTaskRunner:
+class AdaptiveLimiter:
     """
-    Sequential task runner that processes tasks one at a time to prevent
-    database connection pool exhaustion.
+    Asyncio concurrency limiter whose limit can move at runtime.
 
-    Alternative to ConcurrentTaskRunner for connection-intensive workflows.
+    Uses additive-increase / multiplicative-decrease: every ``increase_after``
+    clean completions raise the limit by one (up to ``max_limit``), and any
+    pool-pressure signal halves it (down to ``min_limit``).
     """
 
-    def __init__(self, max_workers: int = 1, batch_size: int = 10):
+    def __init__(self, max_limit: int, min_limit: int = 1, increase_after: int = 10):
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.limit = self.max_limit
+        self.increase_after = increase_after
+        self.in_flight = 0
+        self.waiting = 0
+        self._clean_streak = 0
+        self._condition: Optional[asyncio.Condition] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_condition(self) -> asyncio.Condition:
+        # Created lazily, and again for each new loop: a condition stays bound to the
+        # loop that first used it, so a later asyncio.run() would otherwise fail
+        loop = asyncio.get_running_loop()
+        if self._condition is None or self._loop is not loop:
+            self._condition = asyncio.Condition()
+            self._loop = loop
+        return self._condition
+
+    async def acquire(self) -> float:
+        """Wait for a slot and return the time spent waiting (seconds)"""
+        condition = self._get_condition()
+        start = time.perf_counter()
+        async with condition:
+            self.waiting += 1
+            try:
+                await condition.wait_for(lambda: self.in_flight < self.limit)
+            finally:
+                self.waiting -= 1
+            self.in_flight += 1
+        return time.perf_counter() - start
+
+    async def release(self):
+        """Release a slot and wake waiters"""
+        condition = self._get_condition()
+        async with condition:
+            self.in_flight -= 1
+            condition.notify_all()
+
+    def record_success(self):
+        """Count a clean completion towards the next limit increase"""
+        self._clean_streak += 1
+        if self._clean_streak >= self.increase_after and self.limit < self.max_limit:
+            self.limit += 1
+            self._clean_streak = 0
+            logger.debug(f"Concurrency limit raised to {self.limit}")
+
+    def record_pressure(self):
+        """Halve the limit after the pool reported pressure"""
+        self._clean_streak = 0
+        new_limit = max(self.min_limit, self.limit // 2)
+        if new_limit != self.limit:
+            logger.warning(f"Connection pool pressure detected, concurrency limit {self.limit} -> {new_limit}")
+            self.limit = new_limit
+
+
+class BoundedConcurrencyRunner:
+    """
+    Concurrent task runner with a database-aware concurrency cap.
+
+    Database-bound work is limited by an adaptive semaphore sized from the
+    connection pool (``ConnectionConfig`` max pool size), so tasks queue for a
+    slot instead of fighting over pool connections. Network-only work is not
+    limited beyond the shared executor. A single thread pool is reused for the
+    lifetime of the runner.
+
+    Example:
+        >>> runner = BoundedConcurrencyRunner()
+        >>> results = asyncio.run(runner.map(store_symbol, symbols))
+        >>> prices = asyncio.run(runner.map(fetch_quote, symbols, uses_db=False))
+        >>> runner.get_metrics()['throughput_per_sec']
+        12.4
+    """
+
+    def __init__(self, db_concurrency: Optional[int] = None, io_workers: Optional[int] = None,
+                 adaptive: bool = True, pool_wait_probe: Optional[Callable[[], float]] = None,
+                 pool_wait_threshold: float = 0.25):
         """
-        Initialize sequential runner.
+        Initialize runner.
 
         Args:
-            max_workers: Always 1 for true sequential processing
-            batch_size: Number of tasks to process before connection cleanup
+            db_concurrency: Max in-flight database tasks (defaults to the pool size)
+            io_workers: Thread pool size shared by all synchronous tasks
+            adaptive: Whether to adjust the database limit from observed pool pressure
+            pool_wait_probe: Optional callable returning cumulative pool wait seconds
+            pool_wait_threshold: Growth in pool wait seconds between observations treated as pressure
         """
-        self.max_workers = 1  # Force sequential
-        self.batch_size = batch_size
-        self.completed_tasks = 0
-
-    async def map(self, func: Callable, items: List[Any]) -> List[Any]:
+        limits = ConnectionConfig.get_task_concurrency_limits()
+        self.db_concurrency = db_concurrency or limits['db_slots']
+        self.io_workers = io_workers or limits['io_workers']
+        self.adaptive = adaptive
+        self.pool_wait_probe = pool_wait_probe
+        self.pool_wait_threshold = pool_wait_threshold
+
+        self._db_limiter = AdaptiveLimiter(self.db_concurrency)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._last_pool_wait = None
+
+        self.metrics = {
+            'submitted': 0,
+            'completed': 0,
+            'failed': 0,
+            'queued': 0,
+            'in_flight': 0,
+            'pressure_events': 0,
+            'total_task_time': 0.0,
+            'total_slot_wait': 0.0,
+        }
+        self._recent_completions: deque = deque(maxlen=256)
+        self._started_at: Optional[float] = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Shared thread pool, created on first use"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.io_workers,
+                                                    thread_name_prefix="mltrading-task")
+            return self._executor
+
+    async def map(self, func: Callable, items: List[Any], uses_db: bool = True) -> List[Any]:
         """
-        Process items sequentially to avoid connection conflicts.
+        Process items concurrently, bounded by the database limit when needed.
 
         Args:
-            func: Function to apply to each item
+            func: Function (sync or async) to apply to each item
             items: List of items to process
+            uses_db: Whether each call holds a database connection
 
         Returns:
-            List of results in same order as input
+            List of results in same order as input (None for failed items)
         """
-        results = []
         total_items = len(items)
-
-        logger.info(f"Starting sequential processing of {total_items} items")
-
-        for i, item in enumerate(items):
-            try:
-                start_time = time.time()
-
-                # Process item
-                result = await self._run_task(func, item)
-                results.append(result)
-
-                elapsed = time.time() - start_time
-                self.completed_tasks += 1
-
-                logger.info(f"Completed {i + 1}/{total_items} - {item} in {elapsed:.2f}s")
-
-                # Periodic cleanup to prevent connection buildup
-                if self.completed_tasks % self.batch_size == 0:
-                    await self._cleanup_connections()
-
-                # Small delay to prevent overwhelming the database
-                await asyncio.sleep(0.1)
-
-            except Exception as e:
-                logger.error(f"Task failed for {item}: {e}")
-                results.append(None)  # Maintain result order
-
-        logger.info(
-            f"Sequential processing completed: {len([r for r in results if r is not None])}/{total_items} successful")
-        return results
+        if self._started_at is None:
+            self._started_at = time.time()
+
+        logger.info(f"Starting bounded processing of {total_items} items "
+                    f"(db_limit={self._db_limiter.limit if uses_db else 'none'}, workers={self.io_workers})")
+
+        self.metrics['submitted'] += total_items
+        self.metrics['queued'] += total_items
+        results = await asyncio.gather(*(self._run_item(func, item, uses_db) for item in items))
+
+        successful = len([r for r in results if r is not None])
+        logger.info(f"Bounded processing completed: {successful}/{total_items} successful")
+        return list(results)
+
+    async def _run_item(self, func: Callable, item: Any, uses_db: bool) -> Any:
+        """Run one item, holding a database slot if required"""
+        slot_wait = 0.0
+        if uses_db:
+            slot_wait = await self._db_limiter.acquire()
+        self.metrics['queued'] -= 1
+        self.metrics['in_flight'] += 1
+        self.metrics['total_slot_wait'] += slot_wait
+
+        start_time = time.perf_counter()
+        try:
+            result = await self._run_task(func, item)
+            self.metrics['completed'] += 1
+            if uses_db:
+                self._observe(None)
+            return result
+        except Exception as e:
+            self.metrics['failed'] += 1
+            if uses_db:
+                self._observe(e)
+            logger.error(f"Task failed for {item}: {e}")
+            return None  # Maintain result order
+        finally:
+            elapsed = time.perf_counter() - start_time
+            self.metrics['total_task_time'] += elapsed
+            self.metrics['in_flight'] -= 1
+            self._recent_completions.append(time.time())
+            if uses_db:
+                await self._db_limiter.release()
 
     async def _run_task(self, func: Callable, item: Any) -> Any:
-        """Run a single task"""
+        """Run a single task on the event loop or the shared executor"""
         if asyncio.iscoroutinefunction(func):
             return await func(item)
-        else:
-            # Run sync function in thread pool
-            loop = asyncio.get_event_loop()
-            with ThreadPoolExecutor(max_workers=1) as executor:
-                return await loop.run_in_executor(executor, func, item)
+        # Carry context variables into the worker, as asyncio.to_thread does, so
+        # Prefect tasks called from a flow still see the flow run context
+        context = contextvars.copy_context()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, context.run, func, item)
 
-    async def _cleanup_connections(self):
-        """Periodic cleanup to prevent connection leaks"""
-        logger.debug(f"Performing connection cleanup after {self.batch_size} tasks")
-        # Small delay to allow connections to be returned to pool
-        await asyncio.sleep(0.5)
+    def _observe(self, error: Optional[Exception]):
+        """Feed the outcome of a database task into the adaptive limiter"""
+        if not self.adaptive:
+            return
 
+        pressure = error is not None and any(m in str(error).lower() for m in POOL_PRESSURE_MARKERS)
 
-class BatchSequentialRunner:
-    """
-    Processes tasks in small sequential batches for better throughput
-    while still avoiding connection pool exhaustion.
-    """
-
-    def __init__(self, batch_size: int = 5, delay_between_batches: float = 1.0):
-        """
-        Initialize batch sequential runner.
+        if not pressure and self.pool_wait_probe is not None:
+            try:
+                total_wait = self.pool_wait_probe()
+                if self._last_pool_wait is not None:
+                    pressure = (total_wait - self._last_pool_wait) > self.pool_wait_threshold
+                self._last_pool_wait = total_wait
+            except Exception as e:
+                logger.debug(f"Pool wait probe failed: {e}")
 
-        Args:
-            batch_size: Size of each sequential batch
-            delay_between_batches: Delay between batches (seconds)
-        """
-        self.batch_size = batch_size
-        self.delay_between_batches = delay_between_batches
+        if pressure:
+            self.metrics['pressure_events'] += 1
+            self._db_limiter.record_pressure()
+        elif error is None:
+            self._db_limiter.record_success()
 
-    async def process_batches(self, func: Callable, items: List[Any]) -> List[Any]:
+    def get_metrics(self) -> Dict[str, Any]:
         """
-        Process items in sequential batches.
-
-        Args:
-            func: Function to apply to each item
-            items: List of items to process
+        Get throughput and queue-depth metrics.
 
         Returns:
-            List of results in same order as input
+            Dictionary with counters, current limits and throughput
         """
-        all_results = []
-        total_items = len(items)
-
-        # Split into batches
-        batches = [items[i:i + self.batch_size] for i in range(0, total_items, self.batch_size)]
-
-        logger.info(f"Processing {total_items} items in {len(batches)} sequential batches of {self.batch_size}")
-
-        for batch_num, batch in enumerate(batches):
-            logger.info(f"Processing batch {batch_num + 1}/{len(batches)} ({len(batch)} items)")
-
-            # Process this batch sequentially
-            batch_results = []
-            for item in batch:
-                try:
-                    if asyncio.iscoroutinefunction(func):
-                        result = await func(item)
-                    else:
-                        loop = asyncio.get_event_loop()
-                        with ThreadPoolExecutor(max_workers=1) as executor:
-                            result = await loop.run_in_executor(executor, func, item)
-                    batch_results.append(result)
-                except Exception as e:
-                    logger.error(f"Task failed for {item}: {e}")
-                    batch_results.append(None)
+        now = time.time()
+        window = [t for t in self._recent_completions if now - t <= 60]
+        finished = self.metrics['completed'] + self.metrics['failed']
+        elapsed = (now - self._started_at) if self._started_at else 0.0
+
+        return {
+            **self.metrics,
+            'queue_depth': self.metrics['queued'],
+            'db_limit': self._db_limiter.limit,
+            'db_limit_max': self._db_limiter.max_limit,
+            'db_in_flight': self._db_limiter.in_flight,
+            'db_waiting': self._db_limiter.waiting,
+            'throughput_per_sec': (finished / elapsed) if elapsed > 0 else 0.0,
+            'recent_throughput_per_sec': len(window) / 60.0,
+            'avg_task_time': (self.metrics['total_task_time'] / finished) if finished else 0.0,
+            'avg_slot_wait': (self.metrics['total_slot_wait'] / finished) if finished else 0.0,
+        }
+
+    def shutdown(self, wait: bool = True):
+        """Shut down the shared executor"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+
+
+class SequentialTaskRunner(BoundedConcurrencyRunner):
+    """
+    Strictly sequential variant (one task in flight at a time).
 
-            all_results.extend(batch_results)
+    Kept for callers that need ordered side effects; prefer
+    BoundedConcurrencyRunner for throughput.
+    """
 
-            # Delay between batches to allow connection cleanup
-            if batch_num < len(batches) - 1:  # Don't delay after last batch
-                logger.debug(f"Waiting {self.delay_between_batches}s before next batch")
-                await asyncio.sleep(self.delay_between_batches)
+    def __init__(self, batch_size: int = 10):
+        super().__init__(db_concurrency=1, io_workers=1, adaptive=False)
+        self.batch_size = batch_size
 
-        successful = len([r for r in all_results if r is not None])
-        logger.info(f"Batch sequential processing completed: {successful}/{total_items} successful")
 
-        return all_results
+# Factory function to choose appropriate runner
 
 
-# Factory function to choose appropriate runner
+def _pool_wait_probe(db_manager: Any) -> Optional[Callable[[], float]]:
+    """Cumulative pool wait reader for a DatabaseManager, if it has a pool"""
+    if db_manager is not None and getattr(db_manager, 'pool', None) is not None:
+        return lambda: db_manager.pool.total_wait_seconds
+    return None
 
 
-def get_safe_task_runner(total_tasks: int, connection_sensitive: bool = True) -> Any:
+def get_safe_task_runner(total_tasks: int, connection_sensitive: bool = True, db_manager: Any = None) -> Any:
     """
     Get appropriate task runner based on task characteristics.
 
     Args:
         total_tasks: Total number of tasks to process
         connection_sensitive: Whether tasks are database connection intensive
+        db_manager: Optional DatabaseManager whose pool waits drive the adaptive limit
 
     Returns:
         Appropriate task runner instance
     """
     if connection_sensitive:
-        if total_tasks <= 20:
-            return SequentialTaskRunner(batch_size=10)
-        else:
-            return BatchSequentialRunner(batch_size=5, delay_between_batches=2.0)
+        # Database work queues on pool-sized slots instead of running serially
+        return BoundedConcurrencyRunner(pool_wait_probe=_pool_wait_probe(db_manager))
     else:
         # For non-connection intensive tasks, can use higher concurrency
         from prefect.task_runners import ConcurrentTaskRunner
         return ConcurrentTaskRunner(max_workers=min(4, max(1, total_tasks // 10)))
+
+
+def run_bounded(func: Callable, items: List[Any], db_manager: Any = None,
+                db_concurrency: Optional[int] = None, uses_db: bool = True) -> List[Any]:
+    """
+    Run database-bound work over items from synchronous code such as a Prefect flow.
+
+    Items run on a BoundedConcurrencyRunner sized to the connection pool (or
+    to ``db_concurrency`` when given) that is shut down afterwards; with
+    ``uses_db=False`` only the shared executor bounds them. Prefect tasks may
+    be passed directly and keep the calling flow's run context.
+
+    Args:
+        func: Function or Prefect task to apply to each item
+        items: List of items to process
+        db_manager: Optional DatabaseManager whose pool waits drive the adaptive limit
+        db_concurrency: Optional cap on in-flight items below the pool size
+        uses_db: Whether each call holds a database connection
+
+    Returns:
+        List of results in same order as input (None for failed items)
+    """
+    limit = ConnectionConfig.get_task_concurrency_limits()['db_slots']
+    if db_concurrency:
+        limit = min(limit, db_concurrency)
+    runner = BoundedConcurrencyRunner(db_concurrency=limit, pool_wait_probe=_pool_wait_probe(db_manager))
+    try:
+        return asyncio.run(runner.map(func, items, uses_db=uses_db))
+    finally:
+        runner.shutdown()
@@ -4,6 +4,7 @@ Triggered after Yahoo data collection to calculate technical indicators
 """
 
 import sys
+from functools import partial
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Any
@@ -13,13 +14,14 @@ import pytz
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
 from prefect import flow, task
-from prefect.task_runners import ConcurrentTaskRunner
 from prefect.logging import get_run_logger
 from prefect.runtime import flow_run
 
 from src.data.processors.feature_engineering import TradingFeatureEngine
 from src.utils.logging_config import get_combined_logger
+from src.utils.resilient_database_logging import get_resilient_performance_logger
 from src.data.storage.database import get_db_manager
+from src.utils.sequential_task_runner import run_bounded
 
 # Market hours configuration
 MARKET_TIMEZONE = pytz.timezone('America/New_York')
@@ -50,7 +52,7 @@ def initialize_feature_tables() -> bool:
         logger.info("Checking feature engineering tables...")
         # Tables already exist from SQL schema, just verify connectivity
         db_manager = get_db_manager()
-        with db_manager.get_connection() as conn:
+        with db_manager.get_connection_context() as conn:
             with conn.cursor() as cursor:
                 cursor.execute("SELECT 1 FROM feature_engineered_data LIMIT 1")
 
@@ -74,7 +76,7 @@ def get_symbols_needing_features() -> List[str]:
 
     try:
         db_manager = get_db_manager()
-        with db_manager.get_connection() as conn:
+        with db_manager.get_connection_context() as conn:
             with conn.cursor() as cursor:
                 # Find symbols with recent market data but no recent features
                 query = """
@@ -191,23 +193,15 @@ def log_feature_workflow_metrics(summary: Dict[str, Any]) -> None:
             f"{summary['success_rate']:.1f}% success rate"
         )
 
-        # Store metrics in performance_logs table
-        db_manager = get_db_manager()
-        with db_manager.get_connection() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute("""
-                    INSERT INTO performance_logs
-                    (operation_name, duration_ms, status, component, metadata)
-                    VALUES (%s, %s, %s, %s, %s)
-                """, (
-                    'feature_engineering_workflow',
-                    0,  # Duration will be calculated by Prefect
-                    'success' if summary['failed_calculations'] == 0 else 'partial_success',
-                    'prefect_workflow',
-                    f'{{"symbols_processed": {summary["successful_calculations"]}, '
-                    f'"total_symbols": {summary["total_symbols"]}}}'
-                ))
-                conn.commit()
+        # Store metrics in performance_logs through the log shipper, which also feeds the log rollups
+        get_resilient_performance_logger().log_performance(
+            operation_name='feature_engineering_workflow',
+            duration_ms=0,  # Duration will be calculated by Prefect
+            status='success' if summary['failed_calculations'] == 0 else 'partial_success',
+            component='prefect_workflow',
+            symbols_processed=summary['successful_calculations'],
+            total_symbols=summary['total_symbols']
+        )
 
         logger.info("Feature workflow metrics logged successfully")
 
@@ -217,7 +211,6 @@ def log_feature_workflow_metrics(summary: Dict[str, Any]) -> None:
 @flow(
     name="feature-engineering-workflow-phase1-and-2",
     description="Calculates Phase 1+2 features (36 total) after Yahoo data collection - exact notebook compliance",
-    task_runner=ConcurrentTaskRunner(max_workers=1),
     log_prints=True,
     flow_run_name=generate_feature_flow_run_name
 )
@@ -265,8 +258,11 @@ def feature_engineering_flow(initial_run: bool = False) -> Dict[str, Any]:
 
     logger.info(f"Starting feature calculation for {len(symbols)} symbols")
 
-    # Calculate features for all symbols concurrently (Phase 1+2)
-    calculation_results = calculate_features_for_symbol.map(symbols, [initial_run] * len(symbols))
+    # Calculate features for all symbols concurrently (Phase 1+2), bounded by the connection pool
+    results = run_bounded(partial(calculate_features_for_symbol, initial_run=initial_run), symbols,
+                          db_manager=get_db_manager())
+    calculation_results = [result or {'symbol': symbol, 'status': 'error', 'message': 'Task failed'}
+                           for symbol, result in zip(symbols, results)]
 
     # Generate summary
     summary = generate_feature_summary(calculation_results)
@@ -7,6 +7,7 @@ Uses proven subprocess isolation for reliable connection management
 import sys
 import subprocess
 import time
+from functools import partial
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Any
@@ -16,12 +17,13 @@ import pytz
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
 from prefect import flow, task
-from prefect.task_runners import ConcurrentTaskRunner
 from prefect.logging import get_run_logger
 from prefect.runtime import flow_run
 
 from src.utils.logging_config import get_combined_logger
+from src.utils.resilient_database_logging import get_resilient_performance_logger
 from src.data.storage.database import get_db_manager
+from src.utils.sequential_task_runner import run_bounded
 
 # Market hours configuration
 MARKET_TIMEZONE = pytz.timezone('America/New_York')
@@ -43,7 +45,7 @@ def initialize_comprehensive_feature_tables() -> bool:
     try:
         logger.info("Checking comprehensive feature engineering tables...")
         db_manager = get_db_manager()
-        with db_manager.get_connection() as conn:
+        with db_manager.get_connection_context() as conn:
             with conn.cursor() as cursor:
                 cursor.execute("SELECT 1 FROM feature_engineered_data LIMIT 1")
 
@@ -62,7 +64,7 @@ def get_symbols_needing_comprehensive_features() -> List[str]:
 
     try:
         db_manager = get_db_manager()
-        with db_manager.get_connection() as conn:
+        with db_manager.get_connection_context() as conn:
             with conn.cursor() as cursor:
                 # Find symbols with recent market data but no recent comprehensive features (version 3.0)
                 query = """
@@ -185,37 +187,18 @@ except Exception as e:
 @task
 def calculate_comprehensive_features_batch_subprocess(symbols: List[str], initial_run: bool = False, batch_size: int = 3) -> List[Dict[str, Any]]:
     """
-    Calculate comprehensive features for multiple symbols using subprocess isolation in small batches
-    Reduced batch size due to increased computational complexity of comprehensive features
+    Calculate comprehensive features for multiple symbols using subprocess isolation
+    Runs up to batch_size subprocesses at once, never more than the connection pool size,
+    because every subprocess opens its own database connections
     """
     logger = get_run_logger()
 
-    all_results = []
+    logger.info(f"Processing comprehensive features for {len(symbols)} symbols, up to {batch_size} subprocesses at a time")
+    results = run_bounded(partial(calculate_comprehensive_features_for_symbol_subprocess, initial_run=initial_run), symbols,
+                          db_concurrency=batch_size)
 
-    # Process in smaller batches due to computational complexity
-    for i in range(0, len(symbols), batch_size):
-        batch = symbols[i:i + batch_size]
-        batch_num = i // batch_size + 1
-        total_batches = (len(symbols) + batch_size - 1) // batch_size
-
-        logger.info(f"Processing comprehensive features batch {batch_num}/{total_batches}: {batch}")
-
-        batch_results = []
-        for symbol in batch:
-            result = calculate_comprehensive_features_for_symbol_subprocess(symbol, initial_run)
-            batch_results.append(result)
-
-            # Small delay between symbols in batch
-            time.sleep(1)  # Slightly longer delay for comprehensive features
-
-        all_results.extend(batch_results)
-
-        # Pause between batches
-        if i + batch_size < len(symbols):
-            logger.info(f"Completed comprehensive features batch {batch_num}/{total_batches}, pausing 3 seconds...")
-            time.sleep(3)  # Longer pause for comprehensive features
-
-    return all_results
+    return [result or {'symbol': symbol, 'status': 'error', 'message': 'Task failed'}
+            for symbol, result in zip(symbols, results)]
 
 
 @task
@@ -261,22 +244,17 @@ def log_comprehensive_feature_workflow_metrics(summary: Dict[str, Any]) -> None:
             f"~{summary['feature_count']} features per symbol"
         )
 
-        # Store metrics in performance_logs table
-        db_manager = get_db_manager()
-        with db_manager.get_connection() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute("""
-                    INSERT INTO performance_logs
-                    (operation_name, duration_ms, status, component, metadata)
-                    VALUES (%s, %s, %s, %s, %s)
-                """, (
-                    'comprehensive_feature_engineering_workflow_subprocess',
-                    0,  # Duration will be calculated by Prefect
-                    'success' if summary['failed_calculations'] == 0 else 'partial_success',
-                    'prefect_workflow',
-                    f'{{"symbols_processed": {summary["successful_calculations"]}, "total_symbols": {summary["total_symbols"]}, "feature_type": "{summary["feature_type"]}", "feature_count": "{summary["feature_count"]}"}}'
-                ))
-                conn.commit()
+        # Store metrics in performance_logs through the log shipper, which also feeds the log rollups
+        get_resilient_performance_logger().log_performance(
+            operation_name='comprehensive_feature_engineering_workflow_subprocess',
+            duration_ms=0,  # Duration will be calculated by Prefect
+            status='success' if summary['failed_calculations'] == 0 else 'partial_success',
+            component='prefect_workflow',
+            symbols_processed=summary['successful_calculations'],
+            total_symbols=summary['total_symbols'],
+            feature_type=summary['feature_type'],
+            feature_count=str(summary['feature_count'])
+        )
 
         logger.info("Comprehensive feature workflow metrics logged successfully")
 
@@ -287,7 +265,6 @@ def log_comprehensive_feature_workflow_metrics(summary: Dict[str, Any]) -> None:
 @flow(
     name="comprehensive-feature-engineering-workflow-subprocess",
     description="Calculates comprehensive Phase 1+2+3 features (~90+ indicators) using subprocess isolation",
-    task_runner=ConcurrentTaskRunner(max_workers=1),
     log_prints=True,
     flow_run_name=generate_comprehensive_feature_flow_run_name
 )
@@ -341,7 +318,7 @@ def comprehensive_feature_engineering_flow_subprocess(initial_run: bool = False)
 
     logger.info(f"Starting subprocess-based comprehensive feature calculation for {len(symbols)} symbols")
 
-    # Calculate comprehensive features using subprocess isolation in batches
+    # Calculate comprehensive features using subprocess isolation, a few subprocesses at a time
     calculation_results = calculate_comprehensive_features_batch_subprocess(symbols, initial_run, batch_size=3)
 
     # Generate summary
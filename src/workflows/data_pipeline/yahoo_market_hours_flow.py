@@ -4,6 +4,7 @@ Collects market data every hour during trading hours on weekdays
 """
 
 import sys
+from functools import partial
 from datetime import datetime, time
 from pathlib import Path
 from typing import List, Dict, Any
@@ -13,14 +14,14 @@ import pytz
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
 from prefect import flow, task
-from prefect.task_runners import ConcurrentTaskRunner
 from prefect.logging import get_run_logger
 from prefect.runtime import flow_run
 
 from src.data.collectors.yahoo_collector import fetch_yahoo_data, prepare_data_for_insert
 from src.utils.logging_config import get_combined_logger
+from src.utils.resilient_database_logging import get_resilient_performance_logger
 from src.data.storage.database import get_db_manager
-from src.utils.sequential_task_runner import get_safe_task_runner
+from src.utils.sequential_task_runner import run_bounded
 
 # Market hours configuration
 MARKET_TIMEZONE = pytz.timezone('America/New_York')
@@ -99,7 +100,7 @@ def get_active_symbols() -> List[str]:
 
     try:
         db_manager = get_db_manager()
-        with db_manager.get_connection() as conn:
+        with db_manager.get_connection_context() as conn:
             with conn.cursor() as cursor:
                 # Get active symbols from stock_info table
                 cursor.execute("""
@@ -127,21 +128,20 @@ def get_active_symbols() -> List[str]:
 
 
 @task(retries=3, retry_delay_seconds=120)
-def collect_symbol_data(symbol: str, period: str = "1d") -> Dict[str, Any]:
+def fetch_symbol_data(symbol: str, period: str = "1d") -> Dict[str, Any]:
     """
-    Collect data for a single symbol
+    Fetch data for a single symbol from Yahoo Finance (network only, no database connection)
 
     Args:
         symbol: Stock symbol to collect
         period: Time period for data collection
 
     Returns:
-        Dictionary with collection results
+        Dictionary with the records ready for insertion, or the error result
     """
     logger = get_run_logger()
 
     try:
-        # Fetch data from Yahoo Finance
         logger.info(f"Collecting data for {symbol}")
         df = fetch_yahoo_data(symbol=symbol, period=period, interval='1h')
 
@@ -153,12 +153,43 @@ def collect_symbol_data(symbol: str, period: str = "1d") -> Dict[str, Any]:
                 'message': f"No data available for {symbol}"
             }
 
-        # Prepare data for database insertion
-        records = prepare_data_for_insert(df)
+        return {
+            'symbol': symbol,
+            'status': 'fetched',
+            'records': prepare_data_for_insert(df)
+        }
 
-        # Insert into database
+    except Exception as e:
+        logger.error(f"Failed to fetch data for {symbol}: {e}")
+        return {
+            'symbol': symbol,
+            'status': 'error',
+            'records_collected': 0,
+            'message': str(e)
+        }
+
+
+@task(retries=3, retry_delay_seconds=120)
+def store_symbol_data(fetched: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Insert the records fetched for a single symbol
+
+    Args:
+        fetched: Result of fetch_symbol_data
+
+    Returns:
+        Dictionary with collection results
+    """
+    if fetched['status'] != 'fetched':
+        return fetched
+
+    logger = get_run_logger()
+    symbol = fetched['symbol']
+    records = fetched['records']
+
+    try:
         db_manager = get_db_manager()
-        with db_manager.get_connection() as conn:
+        with db_manager.get_connection_context() as conn:
             with conn.cursor() as cursor:
                 for record in records:
                     cursor.execute("""
@@ -181,7 +212,6 @@ def collect_symbol_data(symbol: str, period: str = "1d") -> Dict[str, Any]:
                         record['volume'],
                         record['source']
                     ))
-                conn.commit()
 
         return {
             'symbol': symbol,
@@ -191,7 +221,7 @@ def collect_symbol_data(symbol: str, period: str = "1d") -> Dict[str, Any]:
         }
 
     except Exception as e:
-        logger.error(f"Failed to collect data for {symbol}: {e}")
+        logger.error(f"Failed to store data for {symbol}: {e}")
         return {
             'symbol': symbol,
             'status': 'error',
@@ -257,22 +287,15 @@ def log_workflow_metrics(summary: Dict[str, Any]) -> None:
             f"{summary['success_rate']:.1f}% success rate"
         )
 
-        # Store metrics in performance_logs table
-        db_manager = get_db_manager()
-        with db_manager.get_connection() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute("""
-                    INSERT INTO performance_logs
-                    (operation_name, duration_ms, status, component, metadata)
-                    VALUES (%s, %s, %s, %s, %s)
-                """, (
-                    'yahoo_market_hours_collection',
-                    0,  # Duration will be calculated by Prefect
-                    'success' if summary['failed_collections'] == 0 else 'partial_success',
-                    'prefect_workflow',
-                    f'{{"symbols_collected": {summary["successful_collections"]}, "total_records": {summary["total_records_collected"]}}}'
-                ))
-                conn.commit()
+        # Store metrics in performance_logs through the log shipper, which also feeds the log rollups
+        get_resilient_performance_logger().log_performance(
+            operation_name='yahoo_market_hours_collection',
+            duration_ms=0,  # Duration will be calculated by Prefect
+            status='success' if summary['failed_collections'] == 0 else 'partial_success',
+            component='prefect_workflow',
+            symbols_collected=summary['successful_collections'],
+            total_records=summary['total_records_collected']
+        )
 
         logger.info("Workflow metrics logged successfully")
 
@@ -282,8 +305,8 @@ def log_workflow_metrics(summary: Dict[str, Any]) -> None:
 
 @flow(
     name="yahoo-market-hours-data-collection",
-    description="Collects Yahoo Finance data during market hours with sequential processing (default) to prevent "
-                "connection exhaustion",
+    description="Collects Yahoo Finance data during market hours with concurrency bounded by the connection pool "
+                "to prevent connection exhaustion",
     log_prints=True,
     flow_run_name=generate_flow_run_name
 )
@@ -297,7 +320,7 @@ def yahoo_market_hours_collection_flow(data_period: str = "3d") -> Dict[str, Any
     Data Collection:
     - 5-10 minutes for 3d period (incremental updates)
     - 15-30 minutes for 1y period (comprehensive data)
-    - Concurrent processing with 5 workers
+    - Concurrent Yahoo fetches, then inserts capped at the connection pool size
 
     Returns:
         Workflow execution summary for data collection only
@@ -334,8 +357,12 @@ def yahoo_market_hours_collection_flow(data_period: str = "3d") -> Dict[str, Any
     # Collect data for all symbols concurrently
     logger.info(f"Starting concurrent collection for {len(symbols)} symbols")
 
-    # Use Prefect's mapping for concurrent execution with specified data period
-    collection_results = collect_symbol_data.map(symbols, [data_period] * len(symbols))
+    # Fetch without holding database slots, then insert with at most pool-size inserts in flight
+    failed = {'status': 'error', 'records_collected': 0, 'message': 'Task failed'}
+    fetched = run_bounded(partial(fetch_symbol_data, period=data_period), symbols, uses_db=False)
+    fetched = [result or {'symbol': symbol, **failed} for symbol, result in zip(symbols, fetched)]
+    results = run_bounded(store_symbol_data, fetched, db_manager=get_db_manager())
+    collection_results = [result or {'symbol': symbol, **failed} for symbol, result in zip(symbols, results)]
 
     # Generate summary
     summary = generate_collection_summary(collection_results)
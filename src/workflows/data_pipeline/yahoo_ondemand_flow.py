@@ -53,7 +53,7 @@ def get_symbols_for_collection(limit: int = 20) -> List[str]:
 
     try:
         db_manager = get_db_manager()
-        with db_manager.get_connection() as conn:
+        with db_manager.get_connection_context() as conn:
             with conn.cursor() as cursor:
                 # Get active symbols from stock_info table
                 cursor.execute("""
@@ -113,7 +113,7 @@ def collect_symbol_data_ondemand(symbol: str, period: str = "1d") -> Dict[str, A
 
         # Insert into database
         db_manager = get_db_manager()
-        with db_manager.get_connection() as conn:
+        with db_manager.get_connection_context() as conn:
             with conn.cursor() as cursor:
                 for record in records:
                     cursor.execute("""
@@ -11,6 +11,10 @@ import logging
 from pathlib import Path
 from unittest.mock import patch
 import os
+import tempfile
+
+# Keep the log shipper's spill files out of the working tree (set before anything creates the shipper)
+os.environ.setdefault('LOG_SPILL_DIR', tempfile.mkdtemp(prefix='mltrading-log-spill-'))
 
 # Add project root to path once
 project_root = Path(__file__).parent.parent
@@ -0,0 +1,229 @@
+"""
+Unit tests for the broker state cache
+Tests per-resource TTLs, coalesced REST calls, invalidation on writes and background refresh
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.trading.brokers.alpaca_service import AlpacaService
+from src.trading.brokers.broker_state_cache import BrokerStateCache
+
+
+class FakeRestClient:
+    """Stands in for alpaca_trade_api.REST, counting calls per endpoint"""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = {'get_account': 0, 'list_positions': 0, 'list_orders': 0}
+        self.cash = 1000.0
+        self.positions = [('AAPL', 10)]
+        self.orders = []
+        self.unavailable = False
+        self._lock = threading.Lock()
+
+    def _call(self, name):
+        with self._lock:
+            self.calls[name] += 1
+        time.sleep(self.latency)
+        if self.unavailable:
+            raise RuntimeError('503 Service Unavailable')
+
+    def get_account(self):
+        self._call('get_account')
+        return SimpleNamespace(id='acct-1', buying_power=str(self.cash * 2), portfolio_value='5000',
+                               cash=str(self.cash), daytrading_buying_power='0', trading_blocked=False,
+                               account_blocked=False, pattern_day_trader=False)
+
+    def list_positions(self):
+        self._call('list_positions')
+        return [SimpleNamespace(symbol=symbol, qty=str(qty), market_value='1500', cost_basis='1400',
+                                unrealized_pl='100', unrealized_plpc='0.07', side='long', avg_entry_price='140')
+                for symbol, qty in self.positions]
+
+    def list_orders(self, status, limit, direction):
+        self._call('list_orders')
+        return self.orders[:limit]
+
+    def submit_order(self, symbol, qty, side, type, time_in_force, client_order_id=None):
+        order = SimpleNamespace(id=f'o-{len(self.orders)}', client_order_id=client_order_id, symbol=symbol,
+                                qty=str(qty), filled_qty='0', side=side, order_type=type,
+                                time_in_force=time_in_force, status='accepted', submitted_at=None,
+                                filled_at=None, filled_avg_price=None)
+        self.orders.insert(0, order)
+        self.cash -= 100.0
+        return order
+
+    def cancel_order(self, order_id):
+        for order in self.orders:
+            if order.id == order_id:
+                order.status = 'canceled'
+
+
+@pytest.fixture
+def client():
+    return FakeRestClient()
+
+
+def make_service(client, **cache_options):
+    config = {'trading': {'mode': 'paper'}, 'risk': {'emergency_stop': False, 'max_position_size': 1000}}
+    cache = BrokerStateCache(**{'refresh_interval': 0, **cache_options})
+    with patch.object(AlpacaService, '_load_config', return_value=config):
+        with patch.object(AlpacaService, 'connect', return_value=True):
+            service = AlpacaService(state_cache=cache)
+    service.client = client
+    service._connected = True
+    return service
+
+
+class TestCaching:
+
+    def test_reads_within_ttl_hit_memory(self, client):
+        service = make_service(client)
+        for _ in range(3):
+            assert service.get_account_info()['cash'] == 1000.0
+            assert service.get_positions()[0]['symbol'] == 'AAPL'
+            service.get_orders(status='all', limit=20)
+        service.get_orders(status='open', limit=20)
+
+        assert client.calls == {'get_account': 1, 'list_positions': 1, 'list_orders': 2}
+        assert service.state_cache.get_stats()['hits'] == 6
+
+    def test_expired_resource_reloads_on_its_own_ttl(self, client):
+        service = make_service(client, ttls={'account': 60.0, 'positions': 0.05})
+        service.get_account_info()
+        service.get_positions()
+        time.sleep(0.06)
+        service.get_account_info()
+        service.get_positions()
+        assert (client.calls['get_account'], client.calls['list_positions']) == (1, 2)
+
+    def test_callers_cannot_mutate_cached_state(self, client):
+        service = make_service(client)
+        service.get_positions()[0]['qty'] = 0
+        assert service.get_positions()[0]['qty'] == 10
+
+    def test_failures_are_not_cached(self, client):
+        service = make_service(client)
+        client.unavailable = True
+        assert service.get_account_info() is None
+        client.unavailable = False
+        assert service.get_account_info()['account_id'] == 'acct-1'
+
+
+class TestCoalescing:
+
+    def test_concurrent_misses_share_one_call(self):
+        client = FakeRestClient(latency=0.1)
+        service = make_service(client)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(service.get_positions())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert len(results) == 8 and all(result[0]['symbol'] == 'AAPL' for result in results)
+        assert client.calls['list_positions'] == 1
+        assert service.state_cache.get_stats()['coalesced'] == 7
+
+
+class TestInvalidation:
+
+    def test_submit_and_cancel_invalidate(self, client):
+        service = make_service(client)
+        assert service.get_orders(limit=20) == []
+        service.get_account_info()
+
+        order = service.submit_order('AAPL', 5, 'buy')
+        assert [o['id'] for o in service.get_orders(limit=20)] == [order['id']]
+        assert service.get_account_info()['cash'] == 900.0
+
+        assert service.cancel_order(order['id'])
+        assert service.get_orders(limit=20)[0]['status'] == 'canceled'
+        assert client.calls['list_orders'] == 3
+
+    def test_load_racing_an_invalidation_is_not_stored(self):
+        cache = BrokerStateCache(refresh_interval=0)
+        started, release = threading.Event(), threading.Event()
+
+        def slow_load():
+            started.set()
+            release.wait(5)
+            return 'before submit'
+
+        reader = threading.Thread(target=cache.get, args=('orders', slow_load))
+        reader.start()
+        started.wait(5)
+        cache.invalidate('orders')
+        release.set()
+        reader.join(timeout=5)
+
+        assert cache.get('orders', lambda: 'after submit') == 'after submit'
+
+
+class TestBackgroundRefresh:
+
+    def test_refresh_keeps_read_keys_warm(self, client):
+        service = make_service(client, ttls={'account': 0.2}, refresh_interval=0.05)
+        service.get_account_info()
+        service.get_account_info()
+        service.state_cache.start()
+        try:
+            client.cash = 750.0
+            time.sleep(0.2)
+            assert service.get_account_info()['cash'] == 750.0
+            assert service.state_cache.get_stats()['misses'] == 1
+        finally:
+            service.state_cache.stop()
+
+    def test_idle_keys_are_forgotten(self, client):
+        cache = BrokerStateCache(refresh_interval=0, idle_timeout=0.01)
+        cache.get('orders', lambda: [], 'all', 20)
+        time.sleep(0.02)
+        assert cache.refresh() == 0
+        assert cache.get_stats()['entries'] == 0
+
+    def test_only_served_keys_near_expiry_are_reloaded(self):
+        cache = BrokerStateCache(ttls={'orders': 0.2}, refresh_interval=0.05)
+        loads = []
+        cache.get('orders', lambda: loads.append('read once'), 'once')
+        cache.get('orders', lambda: loads.append('read twice'), 'twice')
+        cache.get('orders', lambda: loads.append('read twice'), 'twice')
+
+        # Fresh values are left alone until they would expire before the next tick
+        assert cache.refresh() == 0
+        time.sleep(0.16)
+        assert cache.refresh() == 1
+        assert loads == ['read once', 'read twice', 'read twice']
+
+    def test_refresh_makes_fewer_calls_than_reads(self, client):
+        service = make_service(client, ttls={'positions': 0.1}, refresh_interval=0.02)
+        service.state_cache.start()
+        try:
+            reads = 0
+            deadline = time.monotonic() + 0.5
+            while time.monotonic() < deadline:
+                service.get_positions()
+                reads += 1
+                time.sleep(0.03)
+            service.state_cache.stop()
+            calls = client.calls['list_positions']
+            time.sleep(0.15)
+            assert calls < reads
+            # Nobody reads any more: the key goes idle instead of being reloaded forever
+            service.state_cache.refresh()
+            assert client.calls['list_positions'] == calls
+            assert service.state_cache.get_stats()['entries'] == 0
+        finally:
+            service.state_cache.stop()
@@ -0,0 +1,117 @@
+"""
+Unit tests for DatabaseManager checkout tracing and leak detection
+Reproduces pool exhaustion caused by `with get_connection() as conn:`
+"""
+
+import functools
+import time
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.data.storage import database
+from src.data.storage.connection_pool import BlockingConnectionPool, PoolTimeoutError
+
+
+class PsycopgLikeConnection:
+    """Mimics psycopg2: `with conn:` ends the transaction but keeps the connection checked out"""
+
+    def __init__(self):
+        self.closed = 0
+        self.commits = 0
+        self.rollbacks = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def get_transaction_status(self):
+        return 0
+
+    def close(self):
+        self.closed = 1
+
+
+@pytest.fixture
+def db_manager():
+    """DatabaseManager backed by a two-connection pool of fake connections"""
+    pool_factory = functools.partial(BlockingConnectionPool, connection_factory=PsycopgLikeConnection)
+    with patch.object(database, 'BlockingConnectionPool', pool_factory):
+        manager = database.DatabaseManager(host='localhost', port=5432, database='test', user='test',
+                                           password='test', min_conn=1, max_conn=2, track_checkouts=True)
+    yield manager
+    manager.close()
+
+
+def load_rows_like_call_sites(db_manager):
+    """The pattern previously used by load_historical_data, store_phase1_features, query_logs..."""
+    with db_manager.get_connection() as conn:
+        conn.commit()
+
+
+class TestConnectionLeaks:
+    """Test leak reproduction and the pool-returning context manager"""
+
+    def test_connection_context_manager_exhausts_pool(self, db_manager):
+        """`with get_connection() as conn:` never returns connections to the pool"""
+        load_rows_like_call_sites(db_manager)
+        load_rows_like_call_sites(db_manager)
+
+        with pytest.raises(PoolTimeoutError):
+            db_manager.get_connection(timeout=0.05)
+        assert db_manager.get_pool_stats()['used_connections'] == 2
+
+    def test_outstanding_checkouts_record_caller_stack(self, db_manager):
+        """Tracking mode points at the code that leaked the connection"""
+        load_rows_like_call_sites(db_manager)
+
+        checkouts = db_manager.get_outstanding_checkouts()
+        assert len(checkouts) == 1
+        assert 'load_rows_like_call_sites' in checkouts[0]['stack']
+
+    def test_long_held_checkouts_flagged(self, db_manager):
+        """Checkouts held past the threshold are reported"""
+        conn = db_manager.get_connection()
+        time.sleep(0.02)
+
+        assert len(db_manager.find_long_held_checkouts(threshold=0.01)) == 1
+        assert db_manager.find_long_held_checkouts(threshold=60) == []
+        db_manager.return_connection(conn)
+        assert db_manager.get_outstanding_checkouts() == []
+
+    def test_connection_context_returns_to_pool(self, db_manager):
+        """get_connection_context can be used any number of times without exhausting the pool"""
+        for _ in range(10):
+            with db_manager.get_connection_context() as conn:
+                pass
+
+        assert conn.commits >= 1
+        assert db_manager.get_outstanding_checkouts() == []
+        assert db_manager.get_pool_stats()['used_connections'] == 0
+
+    def test_connection_context_rolls_back_and_returns_on_error(self, db_manager):
+        """Errors roll back the transaction and still release the connection"""
+        with pytest.raises(ValueError):
+            with db_manager.get_connection_context() as conn:
+                raise ValueError("query failed")
+
+        assert conn.rollbacks == 1
+        assert db_manager.get_pool_stats()['used_connections'] == 0
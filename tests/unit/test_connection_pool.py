@@ -0,0 +1,188 @@
+"""
+Unit tests for BlockingConnectionPool
+Tests FIFO waiting, timeouts, health checks, recycling and metrics
+"""
+
+import threading
+import time
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.data.storage.connection_pool import BlockingConnectionPool, PoolTimeoutError
+
+
+class FakeCursor:
+    """Minimal cursor supporting the health-check query"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def execute(self, query, params=None):
+        if self.conn.broken:
+            raise RuntimeError("server closed the connection unexpectedly")
+
+    def fetchone(self):
+        return (1,)
+
+
+class FakeConnection:
+    """Stand-in for a psycopg2 connection"""
+
+    def __init__(self):
+        self.closed = 0
+        self.broken = False
+
+    def cursor(self, *args, **kwargs):
+        return FakeCursor(self)
+
+    def get_transaction_status(self):
+        return 0
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = 1
+
+
+def make_pool(minconn=0, maxconn=2, **kwargs):
+    created = []
+
+    def factory():
+        conn = FakeConnection()
+        created.append(conn)
+        return conn
+
+    pool = BlockingConnectionPool(minconn, maxconn, connection_factory=factory, **kwargs)
+    return pool, created
+
+
+class TestBlockingConnectionPool:
+    """Test pool checkout behaviour"""
+
+    def test_opens_minconn_up_front(self):
+        pool, created = make_pool(minconn=2, maxconn=3)
+        assert len(created) == 2
+        assert pool.get_stats()['available_connections'] == 2
+
+    def test_reuses_returned_connections(self):
+        pool, created = make_pool(maxconn=1)
+        conn = pool.getconn()
+        pool.putconn(conn)
+        assert pool.getconn() is conn
+        assert len(created) == 1
+
+    def test_exhausted_pool_times_out(self):
+        pool, _ = make_pool(maxconn=1)
+        pool.getconn()
+        with pytest.raises(PoolTimeoutError, match="timed out waiting for connection"):
+            pool.getconn(timeout=0.05)
+        stats = pool.get_stats()
+        assert stats['timeouts'] == 1
+        assert stats['waiters'] == 0
+
+    def test_waiters_are_served_in_fifo_order(self):
+        pool, _ = make_pool(maxconn=1)
+        held = pool.getconn()
+        order = []
+
+        def worker(name):
+            conn = pool.getconn(timeout=5)
+            order.append(name)
+            time.sleep(0.01)
+            pool.putconn(conn)
+
+        threads = []
+        for name in ['first', 'second', 'third']:
+            thread = threading.Thread(target=worker, args=(name,))
+            thread.start()
+            threads.append(thread)
+            # Make sure each thread is queued before the next one arrives
+            while pool.get_stats()['waiters'] < len(threads):
+                time.sleep(0.001)
+
+        pool.putconn(held)
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert order == ['first', 'second', 'third']
+        assert pool.get_stats()['waited'] == 3
+
+    def test_never_exceeds_maxconn_under_contention(self):
+        pool, created = make_pool(maxconn=3)
+        errors = []
+
+        def worker():
+            try:
+                for _ in range(20):
+                    conn = pool.getconn(timeout=5)
+                    assert pool.get_stats()['used_connections'] <= 3
+                    pool.putconn(conn)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+
+        assert not errors
+        assert len(created) <= 3
+        assert pool.get_stats()['acquired'] == 160
+
+    def test_broken_connection_replaced_on_checkout(self):
+        pool, created = make_pool(maxconn=1, health_check_after=0)
+        conn = pool.getconn()
+        pool.putconn(conn)
+        conn.broken = True
+
+        replacement = pool.getconn()
+        assert replacement is not conn
+        assert conn.closed
+        assert pool.get_stats()['health_check_failures'] == 1
+
+    def test_expired_connection_recycled(self):
+        pool, created = make_pool(maxconn=1, max_lifetime=0.01)
+        conn = pool.getconn()
+        time.sleep(0.02)
+        pool.putconn(conn)
+
+        assert conn.closed
+        assert pool.get_stats()['recycled'] == 1
+        assert pool.getconn() is not conn
+
+    def test_long_checkout_counted_as_leak_once(self):
+        pool, _ = make_pool(maxconn=1, leak_threshold=0.01)
+        pool.getconn()
+        time.sleep(0.02)
+        assert pool.detect_leaks() == 1
+        assert pool.detect_leaks() == 0
+        assert pool.get_stats()['leaks_detected'] == 1
+
+    def test_wait_and_checkout_histograms(self):
+        pool, _ = make_pool(maxconn=1)
+        conn = pool.getconn()
+        pool.putconn(conn)
+        stats = pool.get_stats()
+        assert stats['wait_time']['count'] == 1
+        assert stats['checkout_duration']['count'] == 1
+
+    def test_closed_pool_refuses_checkout(self):
+        pool, created = make_pool(minconn=1, maxconn=1)
+        pool.closeall()
+        assert created[0].closed
+        with pytest.raises(Exception, match="closed"):
+            pool.getconn()
@@ -0,0 +1,134 @@
+"""
+Unit tests for feature engineering kernels
+Tests the single-pass NaN repair and the one-groupby intraday features against the
+previous multi-pass implementations
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.data.processors.feature_engineering import TradingFeatureEngine
+
+
+def legacy_clean(df):
+    """Previous clean_sequence_data, minus logging"""
+    clean = df.copy().ffill().bfill()
+    if clean.isnull().sum().sum() > 0:
+        clean = clean.fillna(0)
+    return clean, clean.isnull().sum().sum() == 0
+
+
+def legacy_intraday(df):
+    """Previous calculate_intraday_features, minus logging"""
+    df['date'] = df['timestamp'].dt.date
+    daily_opens = df.groupby('date')['open'].transform('first')
+    df['returns_from_daily_open'] = ((df['close'] - daily_opens) / daily_opens).fillna(0)
+    df['intraday_high'] = df.groupby('date')['high'].transform('max')
+    df['intraday_low'] = df.groupby('date')['low'].transform('min')
+    intraday_range = df['intraday_high'] - df['intraday_low']
+    df['intraday_range_pct'] = (intraday_range / daily_opens).fillna(0)
+    df['position_in_range'] = ((df['close'] - df['intraday_low']) /
+                               intraday_range.replace(0, np.nan)).fillna(0.5)
+    df['dist_from_intraday_high'] = ((df['close'] - df['intraday_high']) / df['intraday_high']).fillna(0)
+    df['dist_from_intraday_low'] = ((df['close'] - df['intraday_low']) / df['intraday_low']).fillna(0)
+    return df
+
+
+def make_bars(days=6, seed=0):
+    rng = np.random.default_rng(seed)
+    # Uneven days: a half day and a missing bar
+    stamps = []
+    for d, day in enumerate(pd.bdate_range('2024-03-04', periods=days)):
+        bars = 4 if d == 2 else 7
+        stamps.extend(day + pd.Timedelta(hours=9, minutes=30) + pd.to_timedelta(np.arange(bars), unit='h'))
+    close = 100 + rng.normal(size=len(stamps)).cumsum()
+    df = pd.DataFrame({
+        'timestamp': pd.DatetimeIndex(stamps),
+        'open': close + rng.normal(scale=0.1, size=len(stamps)),
+        'high': close + 1.0,
+        'low': close - 1.0,
+        'close': close,
+        'volume': rng.integers(1000, 5000, size=len(stamps)),
+        'symbol': 'AAPL',
+    })
+    df.loc[3, 'open'] = np.nan
+    return df
+
+
+@pytest.fixture
+def engine():
+    with patch('src.data.processors.feature_engineering.get_db_manager'):
+        yield TradingFeatureEngine()
+
+
+class TestCleanSequenceData:
+
+    def test_matches_previous_multi_pass_cleaning(self, engine):
+        df = make_bars()
+        df['rsi_1d'] = np.where(np.arange(len(df)) < 10, np.nan, 50.0)
+        df['empty'] = np.nan
+        df.loc[[5, 20], 'close'] = np.nan
+
+        cleaned, is_clean = engine.clean_sequence_data(df)
+        expected, expected_clean = legacy_clean(df)
+
+        pd.testing.assert_frame_equal(cleaned, expected)
+        assert is_clean and expected_clean
+        assert df['empty'].isna().all()
+
+    def test_clean_input_returned_as_copy(self, engine):
+        df = make_bars().dropna()
+        cleaned, is_clean = engine.clean_sequence_data(df)
+        assert is_clean
+        assert cleaned is not df
+        pd.testing.assert_frame_equal(cleaned, df)
+
+
+class TestIntradayFeatures:
+
+    def test_matches_previous_groupby_passes(self, engine):
+        result = engine.calculate_intraday_features(make_bars())
+        expected = legacy_intraday(make_bars())
+
+        for col in ['date', 'returns_from_daily_open', 'intraday_high', 'intraday_low', 'intraday_range_pct',
+                    'position_in_range', 'dist_from_intraday_high', 'dist_from_intraday_low']:
+            pd.testing.assert_series_equal(result[col], expected[col])
+
+    def test_overnight_gap_uses_previous_day_last_close(self, engine):
+        df = make_bars()
+        result = engine.calculate_intraday_features(df.copy())
+
+        day = df['timestamp'].dt.normalize()
+        first_open = df.groupby(day)['open'].transform('first')
+        prev_close = day.map(df.groupby(day)['close'].last().shift(1))
+        expected = ((first_open - prev_close) / prev_close).fillna(0)
+
+        np.testing.assert_allclose(result['overnight_gap'], expected)
+        # Every bar of a day shares the gap, including the first bar after the half day
+        assert (result['overnight_gap'][day == day.unique()[0]] == 0).all()
+        assert result.groupby(day)['overnight_gap'].nunique().max() == 1
+
+
+class TestRollingStatistics:
+
+    def test_kernel_moments_match_pandas_rolling(self, engine):
+        df = make_bars(days=12)
+        df['returns'] = df['close'].pct_change()
+        result = engine.calculate_rolling_statistics(df.copy())
+
+        for window in engine.ROLLING_WINDOWS:
+            rolling = df['returns'].rolling(window)
+            for stat in ['mean', 'std', 'skew', 'kurt']:
+                np.testing.assert_allclose(result[f'returns_{stat}_{window}h'], getattr(rolling, stat)(),
+                                           rtol=1e-6, atol=1e-9)
+        assert list(result.columns[-15:-10]) == ['returns_mean_6h', 'returns_std_6h', 'returns_skew_6h',
+                                                 'returns_kurt_6h', 'price_momentum_6h']
@@ -0,0 +1,132 @@
+"""
+Unit tests for the coalescing feature frame loader
+Tests single-flight loading, column projection and FeatureDataService integration
+"""
+
+import threading
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.dashboard.services.feature_frame_loader import CoalescingFrameLoader
+
+
+def make_frame():
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-01', periods=3, freq='h'),
+        'close': [100.0, 101.0, 102.0],
+        'macd': [0.1, 0.2, 0.3],
+        'rsi_1d': [40.0, 50.0, 60.0],
+    })
+
+
+class TestCoalescingFrameLoader:
+    """Test shared loading and per-caller projections"""
+
+    def test_concurrent_callers_share_one_load(self):
+        loader = CoalescingFrameLoader()
+        release = threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            release.wait(5)
+            return make_frame()
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(loader.load('AAPL', fetch, ['close'])))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        while loader.get_stats()['coalesced'] < 7:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert len(calls) == 1
+        assert len(results) == 8
+        assert loader.get_stats()['loads'] == 1
+
+    def test_projection_keeps_frame_order_and_skips_missing(self):
+        loader = CoalescingFrameLoader()
+        df = loader.load('AAPL', make_frame, columns=['rsi_1d', 'timestamp', 'not_a_column'])
+        assert list(df.columns) == ['timestamp', 'rsi_1d']
+
+    def test_projection_mutation_does_not_leak(self):
+        loader = CoalescingFrameLoader()
+        first = loader.load('AAPL', make_frame, columns=['close'])
+        first.loc[0, 'close'] = -1.0
+
+        second = loader.load('AAPL', make_frame, columns=['close'])
+        assert second.loc[0, 'close'] == 100.0
+        assert loader.get_stats()['hits'] == 1
+
+    def test_expired_frame_reloaded(self):
+        loader = CoalescingFrameLoader(ttl=0)
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            return make_frame()
+
+        loader.load('AAPL', fetch)
+        time.sleep(0.01)
+        loader.load('AAPL', fetch)
+        assert len(calls) == 2
+
+    def test_failed_load_is_not_cached(self):
+        loader = CoalescingFrameLoader()
+
+        def failing():
+            raise RuntimeError("query failed")
+
+        with pytest.raises(RuntimeError):
+            loader.load('AAPL', failing)
+        assert loader.load('AAPL', make_frame, ['close']).shape == (3, 1)
+        assert loader.get_stats()['errors'] == 1
+
+    def test_empty_load_is_not_cached(self):
+        loader = CoalescingFrameLoader()
+        assert loader.load('AAPL', pd.DataFrame).empty
+        assert loader.get_stats()['cached_frames'] == 0
+        assert loader.load('AAPL', make_frame, ['close']).shape == (3, 1)
+
+
+class TestFeatureDataServiceCoalescing:
+    """Test that dashboard services share one query per (symbol, days, version)"""
+
+    def test_services_share_query(self):
+        from src.dashboard.services.feature_data_service import FeatureDataService
+        from src.data.storage.feature_reader import FeatureReader
+
+        first, second = FeatureDataService(), FeatureDataService()
+        first.frame_loader.invalidate()
+        with patch.object(FeatureReader, 'read', return_value=make_frame()) as read:
+            macd = first.get_feature_data('COALESCE', 30, columns=['timestamp', 'macd'])
+            rsi = second.get_feature_data('COALESCE', 30, columns=['rsi_1d'])
+            second.get_feature_data('COALESCE', 30, feature_version='2.0')
+
+        assert read.call_count == 2
+        assert list(macd.columns) == ['timestamp', 'macd']
+        assert list(rsi.columns) == ['rsi_1d']
+        first.frame_loader.invalidate()
+
+    def test_transient_error_does_not_blank_later_reads(self):
+        from src.dashboard.services.feature_data_service import FeatureDataService
+        from src.data.storage.feature_reader import FeatureReader
+
+        service = FeatureDataService()
+        service.frame_loader.invalidate()
+        with patch.object(FeatureReader, 'read', side_effect=[RuntimeError("connection reset"), make_frame()]):
+            assert service.get_feature_data('RETRY', 30).empty
+            assert list(service.get_feature_data('RETRY', 30, columns=['macd']).columns) == ['macd']
+        service.frame_loader.invalidate()
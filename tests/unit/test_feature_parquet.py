@@ -0,0 +1,189 @@
+"""
+Unit tests for the Parquet feature export
+Tests partitioned writes, watermark-based incremental updates, pruning and tensors
+"""
+
+import json
+import sys
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.data.storage.feature_parquet import FeatureParquetExporter, FeatureParquetReader
+from src.data.storage.feature_reader import FEATURE_TABLE_COLUMNS
+
+
+class FeatureTable:
+    """In-memory stand-in for feature_engineered_data answering the exporter's queries"""
+
+    def __init__(self):
+        self.rows = pd.DataFrame(columns=['symbol', 'timestamp', 'close', 'returns', 'rsi_1d', 'updated_at'])
+        self.copies = []
+
+    def upsert(self, symbol, timestamps, close, updated_at):
+        new = pd.DataFrame({
+            'symbol': symbol,
+            'timestamp': pd.to_datetime(timestamps),
+            'close': close,
+            'returns': np.asarray(close) / 100.0,
+            'rsi_1d': 50.0,
+            # Rows written by one upsert get successive updated_at values, like row-by-row NOW() calls
+            'updated_at': pd.Timestamp(updated_at) + pd.to_timedelta(np.arange(len(close)), unit='s'),
+        })
+        self.rows = pd.concat([self.rows, new]).drop_duplicates(['symbol', 'timestamp'], keep='last')
+
+    def matching(self, params):
+        rows = self.rows
+        symbols = next((p for p in params if isinstance(p, list)), None)
+        if symbols is not None:
+            rows = rows[rows['symbol'].isin(symbols)]
+        bounds = [p for p in params if isinstance(p, datetime)]
+        if bounds:
+            rows = rows[rows['updated_at'] >= pd.Timestamp(bounds[-1])]
+        return rows.sort_values(['symbol', 'timestamp'])
+
+
+class FakeCursor:
+
+    def __init__(self, table):
+        self.table = table
+        self.result = []
+        self.params = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def execute(self, query, params=None):
+        if 'information_schema' in query:
+            self.result = [(col,) for col in FEATURE_TABLE_COLUMNS]
+        else:
+            self.result = [(s,) for s in self.table.matching(params or [])['symbol'].unique()]
+
+    def fetchall(self):
+        return self.result
+
+    def mogrify(self, query, params):
+        self.params = params
+        return query
+
+    def copy_expert(self, sql, buffer):
+        self.table.copies.append(sql)
+        select = sql[sql.index('SELECT ') + 7:sql.index(' FROM')]
+        columns = [col.strip('"') for col in select.split(', ')]
+        self.table.matching(self.params)[columns].to_csv(buffer, index=False)
+
+
+class FakeDbManager:
+
+    def __init__(self, table):
+        self.table = table
+
+    @contextmanager
+    def get_read_connection_context(self):
+        table = self.table
+
+        class Connection:
+            def cursor(self):
+                return FakeCursor(table)
+
+        yield Connection()
+
+
+@pytest.fixture
+def table():
+    table = FeatureTable()
+    table.upsert('AAPL', pd.date_range('2024-01-30 10:00', periods=4, freq='D'), [1.0, 2.0, 3.0, 4.0],
+                 '2024-02-03 00:00')
+    table.upsert('MSFT', pd.date_range('2024-01-31 10:00', periods=2, freq='D'), [10.0, 20.0], '2024-02-03 00:00')
+    return table
+
+
+@pytest.fixture
+def exporter(table, tmp_path):
+    return FeatureParquetExporter(FakeDbManager(table), tmp_path, columns=['close', 'returns', 'rsi_1d'])
+
+
+class TestFeatureParquetExporter:
+
+    def test_writes_symbol_year_month_partitions(self, exporter, tmp_path):
+        result = exporter.export()
+
+        assert result['rows'] == 6
+        files = sorted(str(p.relative_to(tmp_path)) for p in tmp_path.rglob('*.parquet'))
+        assert files == ['symbol=AAPL/year=2024/month=1/part-0.parquet',
+                         'symbol=AAPL/year=2024/month=2/part-0.parquet',
+                         'symbol=MSFT/year=2024/month=1/part-0.parquet',
+                         'symbol=MSFT/year=2024/month=2/part-0.parquet']
+
+    def test_manifest_records_watermark_and_column_stats(self, exporter, tmp_path):
+        exporter.export()
+        manifest = json.loads((tmp_path / '_manifest.json').read_text())
+
+        assert manifest['watermark'] == '2024-02-03T00:00:03'
+        stats = manifest['partitions']['symbol=AAPL/year=2024/month=1/part-0.parquet']
+        assert stats['rows'] == 2
+        assert stats['columns']['close'] == {'min': 1.0, 'max': 2.0, 'null_count': 0}
+
+    def test_incremental_export_only_pulls_updated_rows(self, exporter, table, tmp_path):
+        exporter.export()
+        table.upsert('AAPL', ['2024-02-02 10:00', '2024-02-03 10:00'], [30.0, 5.0], '2024-02-04 00:00')
+
+        result = exporter.export()
+
+        assert result['rows'] == 2
+        assert result['symbols'] == 1
+        df = FeatureParquetReader(tmp_path).read(['AAPL'], columns=['close'])
+        assert df['close'].tolist() == [1.0, 2.0, 3.0, 30.0, 5.0]
+
+
+class TestFeatureParquetReader:
+
+    def test_prunes_partitions_by_symbol_and_month(self, exporter, tmp_path):
+        exporter.export()
+        reader = FeatureParquetReader(tmp_path)
+
+        files = reader.partition_files(['AAPL'], start=datetime(2024, 2, 1))
+        assert [str(f.relative_to(tmp_path)) for f in files] == ['symbol=AAPL/year=2024/month=2/part-0.parquet']
+
+    def test_reads_only_requested_columns_and_rows(self, exporter, tmp_path):
+        exporter.export()
+        df = FeatureParquetReader(tmp_path).read(['AAPL', 'MSFT'], columns=['rsi_1d'],
+                                                 start=datetime(2024, 2, 1))
+
+        assert list(df.columns) == ['symbol', 'timestamp', 'rsi_1d']
+        assert isinstance(df['symbol'].dtype, pd.CategoricalDtype)
+        assert len(df) == 3
+        assert df['rsi_1d'].dtype == np.float32
+
+    def test_to_tensor_aligns_symbols_on_time(self, exporter, tmp_path):
+        exporter.export()
+        tensor = FeatureParquetReader(tmp_path).to_tensor(['AAPL', 'MSFT'], columns=['close', 'returns'])
+
+        assert tensor.values.shape == (2, 4, 2)
+        assert tensor.features == ['close', 'returns']
+        assert tensor.values.dtype == np.float32
+        # MSFT has no row on the first AAPL timestamp
+        assert np.isnan(tensor.values[1, 0, 0])
+        assert tensor.values[1, 1, 0] == 10.0
+        np.testing.assert_allclose(tensor.values[0, :, 0], [1.0, 2.0, 3.0, 4.0])
+
+    def test_to_tensor_accepts_a_single_symbol(self, exporter, tmp_path):
+        exporter.export()
+        tensor = FeatureParquetReader(tmp_path).to_tensor('AAPL', columns=['close'])
+
+        assert tensor.symbols == ['AAPL']
+        assert tensor.values.shape == (1, 4, 1)
+        np.testing.assert_allclose(tensor.values[0, :, 0], [1.0, 2.0, 3.0, 4.0])
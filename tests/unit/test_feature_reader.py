@@ -0,0 +1,168 @@
+"""
+Unit tests for the typed feature reader
+Tests column projection, compact dtypes, schema drift and COPY parsing
+"""
+
+import io
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.data.storage.feature_reader import (
+    FEATURE_SETS, FEATURE_TABLE_COLUMNS, FeatureReader, compact_feature_frame, resolve_columns
+)
+
+
+class CopyCursor:
+    """Fake cursor serving information_schema and COPY output"""
+
+    def __init__(self, server):
+        self.server = server
+        self.rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def execute(self, query, params=None):
+        self.server['queries'].append(query)
+        self.rows = [(col,) for col in self.server['table_columns']]
+
+    def fetchall(self):
+        return self.rows
+
+    def mogrify(self, query, params):
+        self.server['params'] = params
+        return query.encode()
+
+    def copy_expert(self, sql, buffer):
+        self.server['copy_sql'] = sql
+        buffer.write(self.server['csv'])
+
+
+class FakeDbManager:
+
+    def __init__(self, server):
+        self.server = server
+
+    @contextmanager
+    def get_read_connection_context(self):
+        server = self.server
+
+        class Connection:
+            def cursor(self):
+                return CopyCursor(server)
+
+        yield Connection()
+
+
+def make_server(csv, table_columns=None):
+    return {
+        'csv': csv,
+        'table_columns': table_columns or FEATURE_TABLE_COLUMNS,
+        'queries': [],
+    }
+
+
+class TestColumnResolution:
+
+    def test_feature_set_expands_with_key_columns_first(self):
+        assert resolve_columns('rsi_family') == ['symbol', 'timestamp', 'rsi_1d', 'rsi_3d', 'rsi_1w', 'rsi_2w',
+                                                  'rsi_ema']
+
+    def test_mixed_names_follow_table_order(self):
+        assert resolve_columns(['macd', 'close']) == ['symbol', 'timestamp', 'close', 'macd']
+
+    def test_default_excludes_metadata(self):
+        columns = resolve_columns(None)
+        assert 'created_at' not in columns and 'id' not in columns
+        assert 'williams_r' in columns
+
+
+class TestFeatureReader:
+
+    def test_selects_only_requested_columns(self):
+        csv = "symbol,timestamp,close,rsi_1d,is_market_open\nAAPL,2024-01-02 10:00:00,185.5,55.5,t\n"
+        server = make_server(csv)
+        reader = FeatureReader(FakeDbManager(server))
+
+        df = reader.read('AAPL', columns=['close', 'rsi_1d', 'is_market_open'], days=30)
+
+        select = server['copy_sql']
+        assert select.startswith('COPY (SELECT "symbol", "timestamp", "close", "rsi_1d", (COALESCE("is_market_open"')
+        assert 'SELECT *' not in select
+        assert server['params'] == [['AAPL'], '3.0', 30]
+        assert list(df.columns) == ['symbol', 'timestamp', 'close', 'rsi_1d', 'is_market_open']
+
+    def test_materializes_compact_dtypes(self):
+        csv = ("symbol,timestamp,close,rsi_1d,hour,is_market_open\n"
+               "AAPL,2024-01-02 10:00:00,185.5,,10,t\n"
+               "MSFT,2024-01-02 10:00:00,370.25,42.0,10,f\n")
+        reader = FeatureReader(FakeDbManager(make_server(csv)))
+
+        df = reader.read(['AAPL', 'MSFT'], columns=['close', 'rsi_1d', 'hour', 'is_market_open'])
+
+        assert isinstance(df['symbol'].dtype, pd.CategoricalDtype)
+        assert pd.api.types.is_datetime64_any_dtype(df['timestamp'])
+        assert df['close'].dtype == np.float64
+        assert df['rsi_1d'].dtype == np.float32 and np.isnan(df['rsi_1d'].iloc[0])
+        assert df['hour'].dtype == np.int8
+        assert df['is_market_open'].tolist() == [True, False]
+
+    def test_columns_missing_from_table_are_skipped(self):
+        csv = "symbol,timestamp,close\nAAPL,2024-01-02 10:00:00,185.5\n"
+        table_columns = [col for col in FEATURE_TABLE_COLUMNS if col != 'vol_ratio_med_long']
+        server = make_server(csv, table_columns)
+        reader = FeatureReader(FakeDbManager(server))
+
+        df = reader.read('AAPL', columns=['close', 'vol_ratio_med_long'])
+
+        assert 'vol_ratio_med_long' not in server['copy_sql']
+        assert list(df.columns) == ['symbol', 'timestamp', 'close']
+
+    def test_schema_lookup_cached(self):
+        csv = "symbol,timestamp,close\nAAPL,2024-01-02 10:00:00,185.5\n"
+        server = make_server(csv)
+        reader = FeatureReader(FakeDbManager(server))
+        reader.read('AAPL', columns=['close'])
+        reader.read('AAPL', columns=['close'])
+        assert len(server['queries']) == 1
+
+    def test_nullable_integer_column_falls_back_to_float(self):
+        df = FeatureReader.parse_csv(io.StringIO("symbol,timestamp,hour\nAAPL,2024-01-02 10:00:00,\n"),
+                                     ['symbol', 'timestamp', 'hour'])
+        assert df['hour'].dtype == np.float32
+
+
+class TestCompactFrame:
+
+    def test_compact_frame_halves_feature_memory(self):
+        rows = 2000
+        rng = np.random.default_rng(0)
+        columns = resolve_columns(None)
+        wide = pd.DataFrame({col: rng.normal(size=rows) for col in columns})
+        wide['symbol'] = np.repeat(['AAPL', 'MSFT', 'NVDA', 'AMZN'], rows // 4).astype(object)
+        wide['timestamp'] = pd.date_range('2024-01-01', periods=rows, freq='h')
+        wide['hour'] = wide['timestamp'].dt.hour
+        wide['day_of_week'] = wide['timestamp'].dt.dayofweek
+        for flag in ['is_market_open', 'is_morning', 'is_afternoon']:
+            wide[flag] = 1
+
+        compact = compact_feature_frame(wide)
+
+        # OHLCV keeps its float64 precision; everything else is at most half its original size
+        ohlcv = FEATURE_SETS['ohlcv']
+        assert (compact[ohlcv].dtypes == np.float64).all()
+        assert compact.drop(columns=ohlcv).memory_usage(deep=True).sum() < \
+               wide.drop(columns=ohlcv).memory_usage(deep=True).sum() / 2
+        assert compact['is_morning'].dtype == bool
+        np.testing.assert_allclose(compact['rsi_1d'], wide['rsi_1d'], rtol=1e-6)
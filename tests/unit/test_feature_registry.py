@@ -0,0 +1,154 @@
+"""
+Unit tests for the feature registry
+Tests dependency resolution, selective computation and the derived column sets
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.data.processors import feature_registry
+from src.data.processors.feature_registry import FEATURE_REGISTRY, FeatureDefinition, FeatureRegistry
+
+# Column list prepare_features_for_storage wrote before it was derived from the registry
+LEGACY_STORAGE_COLUMNS = (
+    ['symbol', 'timestamp', 'open', 'high', 'low', 'close', 'volume',
+     'returns', 'log_returns', 'high_low_pct', 'open_close_pct', 'price_acceleration', 'returns_sign',
+     'hour', 'day_of_week', 'date', 'hour_sin', 'hour_cos', 'dow_sin', 'dow_cos', 'is_market_open',
+     'price_ma_short', 'price_ma_med', 'price_ma_long', 'price_to_ma_short', 'price_to_ma_med',
+     'price_to_ma_long', 'ma_short_to_med', 'ma_med_to_long',
+     'realized_vol_short', 'realized_vol_med', 'realized_vol_long', 'gk_volatility', 'vol_of_vol',
+     'bb_upper', 'bb_lower', 'bb_position', 'bb_squeeze', 'macd', 'macd_signal', 'macd_histogram',
+     'macd_normalized', 'atr', 'atr_normalized', 'williams_r',
+     'volume_ma', 'volume_ratio', 'log_volume', 'vpt', 'vpt_ma', 'vpt_normalized', 'mfi',
+     'rsi_1d', 'rsi_3d', 'rsi_1w', 'rsi_2w', 'rsi_ema',
+     'is_morning', 'is_afternoon', 'hours_since_open', 'hours_to_close',
+     'returns_from_daily_open', 'intraday_high', 'intraday_low', 'intraday_range_pct', 'position_in_range',
+     'overnight_gap', 'dist_from_intraday_high', 'dist_from_intraday_low'] +
+    [f'{feat}_lag_{lag}' for lag in [1, 2, 4, 8, 24] for feat in ['returns', 'vol', 'volume_ratio']] +
+    [f'{feat}_{window}h' for window in [6, 12, 24]
+     for feat in ['returns_mean', 'returns_std', 'returns_skew', 'returns_kurt', 'price_momentum']] +
+    ['returns_squared', 'vol_ratio_short_med', 'vol_ratio_med_long',
+     'source', 'feature_version', 'created_at', 'updated_at']
+)
+
+
+def make_bars(days=60, seed=5):
+    rng = np.random.default_rng(seed)
+    stamps = [day + pd.Timedelta(hours=9, minutes=30) + pd.Timedelta(hours=h)
+              for day in pd.bdate_range('2024-01-02', periods=days) for h in range(7)]
+    n = len(stamps)
+    close = 100 * np.exp(np.cumsum(rng.normal(scale=0.004, size=n)))
+    return pd.DataFrame({
+        'symbol': 'AAPL',
+        'timestamp': pd.DatetimeIndex(stamps),
+        'open': close * (1 + rng.normal(scale=0.001, size=n)),
+        'high': close * 1.003,
+        'low': close * 0.997,
+        'close': close,
+        'volume': rng.integers(1000, 9000, size=n).astype(float),
+    })
+
+
+def legacy_rsi(close, window):
+    delta = close.diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window).mean()
+    return 100 - (100 / (1 + gain / (loss + 1e-10)))
+
+
+class TestResolution:
+
+    def test_dependencies_come_first(self):
+        plan = [node.name for node in FEATURE_REGISTRY.resolve('vol_of_vol')]
+        assert plan == ['foundation', 'realized_volatility', 'vol_of_vol']
+
+    def test_shared_intermediate_planned_once(self):
+        plan = [node.name for node in FEATURE_REGISTRY.resolve('rsi_family')]
+        assert plan == ['price_delta', 'delta_gain_loss', 'rsi_windows', 'rsi_ema']
+
+    def test_available_columns_are_not_recomputed(self):
+        plan = [node.name for node in FEATURE_REGISTRY.resolve('vol_lags', available=['realized_vol_short'])]
+        assert plan == ['vol_lags']
+
+    def test_lookback_accumulates_along_chain(self):
+        assert FEATURE_REGISTRY.lookback('vol_of_vol') == 2 + 120 + 24
+        assert FEATURE_REGISTRY.lookback() == 480
+
+    def test_cycle_detected(self):
+        registry = FeatureRegistry()
+        registry.register(FeatureDefinition('a', ('x',), ('y',), lambda ctx: {}))
+        registry.register(FeatureDefinition('b', ('y',), ('x',), lambda ctx: {}))
+        with pytest.raises(ValueError, match='cycle'):
+            registry.resolve('a')
+
+    def test_unknown_name_rejected(self):
+        with pytest.raises(KeyError):
+            FEATURE_REGISTRY.resolve('not_a_feature')
+
+    def test_duplicate_output_rejected(self):
+        registry = FeatureRegistry()
+        registry.register(FeatureDefinition('a', ('x',), ('close',), lambda ctx: {}))
+        with pytest.raises(ValueError):
+            registry.register(FeatureDefinition('b', ('x',), ('close',), lambda ctx: {}))
+
+
+class TestSelectiveCompute:
+
+    def test_only_requested_features_computed(self):
+        features = FEATURE_REGISTRY.compute(make_bars(), ['rsi_1d', 'macd'])
+        assert set(features) == set(FEATURE_REGISTRY.columns(['rsi_windows', 'macd']))
+
+    def test_rsi_delta_computed_once(self):
+        df = make_bars()
+        calls = []
+        node = FEATURE_REGISTRY.producer('price_delta')
+        counting = FeatureDefinition(**{**node.__dict__, 'compute': lambda ctx: calls.append(1) or node.compute(ctx)})
+        with patch.dict(FEATURE_REGISTRY._nodes, {'price_delta': counting}), \
+                patch.dict(FEATURE_REGISTRY._producers, {'price_delta': counting}):
+            features = FEATURE_REGISTRY.compute(df, 'rsi_family')
+        assert len(calls) == 1
+        for rsi_name, window in feature_registry.RSI_WINDOWS.items():
+            pd.testing.assert_series_equal(features[rsi_name], legacy_rsi(df['close'], window), check_names=False)
+
+    def test_short_frames_skip_node_and_dependents(self):
+        registry = FeatureRegistry()
+        registry.register(FeatureDefinition('slow', ('s',), ('close',), lambda ctx: {'s': ctx['close']},
+                                            min_rows=100))
+        registry.register(FeatureDefinition('fast', ('f',), ('s',), lambda ctx: {'f': ctx['s']}))
+        assert registry.compute(make_bars(days=2), 'fast') == {}
+
+    def test_fallback_used_when_compute_fails(self):
+        df = make_bars(days=3)
+        df['close'] = 'bad'
+        features = FEATURE_REGISTRY.compute(df, 'intraday')
+        assert (features['returns_from_daily_open'] == 0.5).all()
+        assert 'intraday_high' not in features
+
+
+class TestDerivedColumns:
+
+    def test_storage_columns_match_legacy_schema(self):
+        columns = FEATURE_REGISTRY.storage_columns()
+        assert len(columns) == len(set(columns))
+        assert set(columns) == set(LEGACY_STORAGE_COLUMNS)
+
+    def test_intermediates_not_persisted(self):
+        assert 'price_delta' not in FEATURE_REGISTRY.storage_columns()
+
+    def test_engine_phase3_matches_registry(self):
+        with patch('src.data.processors.feature_engineering.get_db_manager'):
+            from src.data.processors.feature_engineering import TradingFeatureEngine
+            engine = TradingFeatureEngine()
+        result = engine.calculate_phase3_comprehensive_features(make_bars())
+        stored = set(FEATURE_REGISTRY.storage_columns())
+        assert stored <= set(result.columns)
+        assert not result[sorted(stored - {'date'})].isna().any().any()
@@ -0,0 +1,127 @@
+"""
+Unit tests for the dashboard log index
+Tests tail reads, incremental parsing, rotation handling and filter push-down
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.dashboard.utils.log_index import LogFileIndex, LogIndex, make_filter
+
+START = datetime(2025, 8, 1, 9, 0, 0)
+
+
+def log_line(minute, message, component='mltrading.ui.dashboard', level='INFO'):
+    stamp = START + timedelta(minutes=minute)
+    return f"{stamp:%Y-%m-%d %H:%M:%S},{minute % 1000:03d} - {component} - {level} - {message}\n"
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    path = tmp_path / 'app.log'
+    lines = [log_line(minute, f"entry {minute}", level='ERROR' if minute % 10 == 0 else 'INFO')
+             for minute in range(2000)]
+    path.write_text(''.join(lines))
+    return path
+
+
+def small_index(path, **options):
+    return LogFileIndex(str(path), **{'block_size': 4096, 'index_stride': 8192, **options})
+
+
+class TestTailReads:
+
+    def test_recent_window_reads_only_the_tail(self, log_file):
+        index = small_index(log_file)
+        entries = index.query(since=START + timedelta(minutes=1990))
+        assert [entry.message for entry in entries] == [f"entry {minute}" for minute in range(1990, 2000)]
+        assert index.bytes_parsed < log_file.stat().st_size / 10
+
+    def test_wider_window_extends_backward(self, log_file):
+        index = small_index(log_file)
+        index.query(since=START + timedelta(minutes=1990))
+        entries = index.query(since=START + timedelta(minutes=1000))
+        assert len(entries) == 1000
+        assert entries[0].message == "entry 1000"
+
+    def test_all_time_with_full_cache_streams_the_rest(self, log_file):
+        index = small_index(log_file, max_entries=300)
+        entries = index.query()
+        assert len(entries) == 2000
+        assert [entry.message for entry in entries[:2]] == ["entry 0", "entry 1"]
+        assert len(index.entries) < 2000
+
+    def test_backward_extension_never_overfills_the_cache(self, log_file):
+        index = small_index(log_file, max_entries=300)
+        index.query(since=START + timedelta(minutes=1990))
+        entries = index.query(since=START + timedelta(minutes=1000))
+        assert [entry.message for entry in entries] == [f"entry {minute}" for minute in range(1000, 2000)]
+        assert len(index.entries) == 300
+        assert index.entries[-1].message == "entry 1999"
+
+
+class TestIncrementalParsing:
+
+    def test_appended_lines_and_continuations(self, log_file):
+        index = small_index(log_file)
+        index.query(since=START + timedelta(minutes=1995))
+        parsed = index.bytes_parsed
+
+        with open(log_file, 'a') as f:
+            f.write(log_line(2000, "boom", level='ERROR'))
+            f.write("Traceback (most recent call last):\n")
+        entries = index.query(since=START + timedelta(minutes=1995))
+        assert entries[-1].message == "boom"
+        assert entries[-1].raw.endswith("Traceback (most recent call last):")
+        assert index.bytes_parsed - parsed < 200
+
+        with open(log_file, 'a') as f:
+            f.write("ValueError: bad\n")
+            f.write(log_line(2001, "partial"))
+            f.write("2025-08-02 ")
+        entries = index.query(since=START + timedelta(minutes=1995))
+        assert entries[-2].raw.endswith("ValueError: bad")
+        assert entries[-1].message == "partial"
+
+    def test_truncated_file_is_reindexed(self, log_file):
+        index = small_index(log_file)
+        index.query(since=START)
+        log_file.write_text(log_line(5, "fresh"))
+        assert [entry.message for entry in index.query()] == ["fresh"]
+
+    def test_missing_file(self, tmp_path):
+        assert small_index(tmp_path / 'missing.log').query() == []
+
+
+class TestFilters:
+
+    def test_filters_apply_before_materialization(self, log_file):
+        index = LogIndex([str(log_file)], block_size=4096)
+        logs = index.query(since=START + timedelta(minutes=1900), level_filter='ERROR')
+        assert len(logs) == 10
+        assert logs[0]['message'] == "entry 1990"
+        assert set(logs[0]) == {'timestamp', 'level', 'component', 'message', 'raw'}
+
+    def test_combined_filter(self):
+        match = make_filter(component_filter='Dashboard', symbol_filter='AAPL', event_type_filter='trading')
+        index_entry = type('Entry', (), {'level': 'INFO', 'component': 'mltrading.ui.dashboard',
+                                         'message': 'Trading signal for AAPL'})
+        assert match(index_entry)
+        index_entry.message = 'Trading signal for MSFT'
+        assert not match(index_entry)
+        assert make_filter() is None
+
+    def test_merges_files_newest_first(self, tmp_path):
+        first, second = tmp_path / 'a.log', tmp_path / 'b.log'
+        first.write_text(log_line(1, "a1") + log_line(3, "a3"))
+        second.write_text("2025-08-01 09:02:00 - WARNING - b2\n")
+        logs = LogIndex([str(first), str(second)]).query()
+        assert [log['message'] for log in logs] == ["a3", "b2", "a1"]
+        assert logs[1]['component'] == 'yahoo_extraction'
@@ -0,0 +1,140 @@
+"""
+Unit tests for database log queries
+Tests keyset page tokens, paginated queries, server-side streaming and COPY export
+"""
+
+import sys
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.database_log_manager import DatabaseLogManager, decode_log_cursor, encode_log_cursor
+
+START = datetime(2024, 1, 2, 15, 0, tzinfo=timezone.utc)
+
+
+class FakeCursor:
+    """Answers queries from a fixed row list; keeps SQL, params and cursor options"""
+
+    def __init__(self, db, name=None):
+        self.db = db
+        self.name = name
+        self.itersize = None
+        self.rowcount = -1
+        self.description = [('id',), ('timestamp',), ('message',)]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def execute(self, sql, params=None):
+        self.db.executed.append((sql, params, self.name, self))
+        rows = sorted(self.db.rows, key=lambda row: (row[1], row[0]), reverse='DESC' in sql)
+        if params and 'before_id' in params:
+            position = (params['before_timestamp'], params['before_id'])
+            rows = [row for row in rows if (row[1], row[0]) < position]
+        if params and 'limit' in params:
+            rows = rows[:params['limit']]
+        self.result = rows
+
+    def fetchall(self):
+        return self.result
+
+    def __iter__(self):
+        return iter(self.result)
+
+    def mogrify(self, sql, params):
+        return (sql % {key: repr(value) for key, value in params.items()}).encode()
+
+    def copy_expert(self, sql, f):
+        self.db.executed.append((sql, None, self.name, self))
+        f.write('id,timestamp,message\n1,x,a\n')
+        self.rowcount = 1
+
+
+class FakeDatabase:
+
+    def __init__(self, count=0):
+        self.rows = [(i, START + timedelta(minutes=i // 2), f"entry {i}") for i in range(count)]
+        self.executed = []
+
+    @contextmanager
+    def get_read_connection_context(self):
+        db = self
+        yield type('Connection', (), {'cursor': lambda self, name=None: FakeCursor(db, name)})()
+
+
+class TestCursorTokens:
+
+    def test_round_trip(self):
+        token = encode_log_cursor(START, 42)
+        assert decode_log_cursor(token) == (START, 42)
+
+    def test_garbage_rejected(self):
+        with pytest.raises(ValueError):
+            decode_log_cursor('not-a-cursor')
+
+
+class TestPagination:
+
+    def test_pages_walk_every_entry_once(self):
+        manager = DatabaseLogManager(db_manager=FakeDatabase(count=25))
+        seen, token, pages = [], None, 0
+        while True:
+            page = manager.query_logs_page(page_size=10, cursor=token)
+            seen.extend(log['id'] for log in page['logs'])
+            pages += 1
+            token = page['next_cursor']
+            if token is None:
+                break
+        assert pages == 3
+        assert seen == sorted(range(25), key=lambda i: (i // 2, i), reverse=True)
+
+    def test_keyset_condition_and_order(self):
+        db = FakeDatabase(count=5)
+        manager = DatabaseLogManager(db_manager=db)
+        logs = manager.query_logs(level='ERROR', limit=2, before=(START + timedelta(minutes=1), 2))
+        sql, params = db.executed[-1][:2]
+        assert "(timestamp, id) < (%(before_timestamp)s, %(before_id)s)" in sql
+        assert sql.endswith("ORDER BY timestamp DESC, id DESC LIMIT %(limit)s")
+        assert (params['level'], params['limit']) == ('ERROR', 2)
+        assert [log['id'] for log in logs] == [1, 0]
+        assert logs[0]['timestamp'] == START.isoformat()
+
+    def test_unknown_table_returns_nothing(self):
+        db = FakeDatabase(count=3)
+        assert DatabaseLogManager(db_manager=db).query_logs(table='orders; DROP TABLE x') == []
+        assert db.executed == []
+
+
+class TestStreaming:
+
+    def test_iter_logs_uses_server_side_cursor(self):
+        db = FakeDatabase(count=4)
+        manager = DatabaseLogManager(db_manager=db)
+        rows = list(manager.iter_logs(table='error_logs', component='db', batch_size=500))
+        sql, params, name, cursor = db.executed[-1]
+        assert name == 'iter_error_logs' and cursor.itersize == 500
+        assert sql.endswith("ORDER BY timestamp, id")
+        assert params == {'component': 'db'}
+        assert [row['id'] for row in rows] == [0, 1, 2, 3]
+        assert rows[0]['timestamp'] == START
+
+    def test_export_copies_to_file(self, tmp_path):
+        db = FakeDatabase()
+        manager = DatabaseLogManager(db_manager=db)
+        output = tmp_path / 'logs.csv'
+        result = manager.export_logs_to_csv('system_logs', output, start_time=START, limit=10)
+        sql = db.executed[-1][0]
+        assert sql.startswith("COPY (SELECT * FROM system_logs WHERE timestamp >= ")
+        assert sql.endswith("ORDER BY timestamp, id LIMIT 10) TO STDOUT WITH (FORMAT csv, HEADER)")
+        assert (result['status'], result['records_exported']) == ('success', 1)
+        assert output.read_text().startswith('id,timestamp,message\n')
@@ -0,0 +1,447 @@
+"""
+Unit tests for per-minute log rollups and log table partition maintenance
+Tests aggregation, summary weighting, quantiles, shipper upserts, rollup readers, partition creation and retention
+"""
+
+import json
+import sys
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.database_log_manager import (
+    ROLLUP_TABLE, DatabaseLogManager, expired_partitions, partition_day, partition_ddl, partition_name
+)
+from src.utils.database_logging import ErrorLogger, PerformanceLogger, TradingEventLogger
+from src.utils.log_rollups import (
+    ROLLUP_COLUMNS, ROLLUP_DURATION_BUCKETS_MS, LogRollupAggregator, bucket_quantile, merge_buckets,
+    summarize_rollups
+)
+from src.utils.log_shipping import LogShipper
+from src.utils.operation_tracer import OperationTracer
+
+MINUTE = datetime(2024, 1, 2, 15, 30, tzinfo=timezone.utc)
+
+
+def perf_row(name, duration, second=0, status='success', metadata=None):
+    return {'timestamp': MINUTE.replace(second=second), 'operation_name': name, 'duration_ms': duration,
+            'status': status, 'component': 'trading', 'metadata': metadata}
+
+
+class FakeCursor:
+
+    def __init__(self, server):
+        self.server = server
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def copy_expert(self, sql, buffer):
+        buffer.read()
+
+    def executemany(self, sql, rows):
+        if self.server.down:
+            raise ConnectionError("server down")
+        self.server.upserts.extend(rows)
+
+
+class FakeServer:
+
+    def __init__(self):
+        self.down = False
+        self.upserts = []
+
+    def connect(self):
+        server = self
+        return type('Connection', (), {'autocommit': True, 'closed': False,
+                                        'cursor': lambda self: FakeCursor(server),
+                                        'close': lambda self: None})()
+
+
+class TestAggregation:
+
+    def test_rows_fold_into_minute_buckets(self):
+        aggregator = LogRollupAggregator()
+        aggregator.add('performance_logs', perf_row('load', 3.0, second=5))
+        aggregator.add('performance_logs', perf_row('load', 40.0, second=50))
+        aggregator.add('performance_logs', perf_row('load', 700.0, status='error'))
+        aggregator.add('system_logs', {'timestamp': MINUTE, 'level': 'ERROR', 'logger_name': 'mltrading.x'})
+
+        rows = {(row['source'], row['level']): row for row in aggregator.drain()}
+        perf = rows[('performance_logs', 'INFO')]
+        assert perf['bucket'] == MINUTE
+        assert (perf['event_count'], perf['error_count'], perf['duration_count']) == (2, 0, 2)
+        assert (perf['duration_min_ms'], perf['duration_max_ms'], perf['duration_sum_ms']) == (3.0, 40.0, 43.0)
+        assert len(perf['duration_buckets']) == len(ROLLUP_DURATION_BUCKETS_MS) + 1
+        assert sum(perf['duration_buckets']) == 2
+        assert rows[('performance_logs', 'ERROR')]['error_count'] == 1
+        system = rows[('system_logs', 'ERROR')]
+        assert (system['component'], system['error_count']) == ('mltrading.x', 1)
+        assert len(aggregator) == 0
+
+    def test_tracer_summary_counts_every_call(self):
+        aggregator = LogRollupAggregator()
+        metadata = json.dumps({'count': 50, 'errors': 2, 'total_ms': 600.0, 'max_ms': 90.0})
+        aggregator.add('performance_logs', perf_row('load_AAPL', 12.0, status='summary', metadata=metadata))
+        row = aggregator.drain()[0]
+        assert (row['event_count'], row['error_count'], row['duration_count']) == (50, 2, 50)
+        assert (row['duration_sum_ms'], row['duration_max_ms']) == (600.0, 90.0)
+
+    def test_summary_counts_only_calls_without_their_own_row(self):
+        tracer = OperationTracer(summary_interval=0)
+        for duration in (0.010, 0.020, 0.030):
+            tracer.record('load', duration, sampled=True)
+        for duration in (0.005, 0.015):
+            tracer.record('load', duration)
+        summary = tracer.flush()[0]
+
+        aggregator = LogRollupAggregator()
+        for duration in (10.0, 20.0, 30.0):
+            aggregator.add('performance_logs', perf_row('load', duration))
+        metadata = {name: value for name, value in summary.items() if name not in ('operation', 'mean_ms')}
+        aggregator.add('performance_logs', perf_row('load', summary['mean_ms'], status='summary',
+                                                    metadata=json.dumps(metadata)))
+
+        row = aggregator.drain()[0]
+        assert (row['event_count'], row['duration_count']) == (5, 5)
+        assert row['duration_sum_ms'] == pytest.approx(80.0)
+
+    def test_fully_sampled_summary_adds_nothing(self):
+        aggregator = LogRollupAggregator()
+        metadata = json.dumps({'count': 3, 'errors': 0, 'sampled': 3, 'sampled_ms': 36.0, 'total_ms': 36.0})
+        aggregator.add('performance_logs', perf_row('load', 12.0, status='summary', metadata=metadata))
+        assert len(aggregator) == 0
+
+    def test_spilled_rows_with_string_timestamps(self):
+        aggregator = LogRollupAggregator()
+        aggregator.add('error_logs', {'timestamp': '2024-01-02T15:30:42+00:00', 'component': 'db',
+                                      'error_type': 'OperationalError'})
+        row = aggregator.drain()[0]
+        assert (row['bucket'], row['level'], row['operation']) == (MINUTE, 'ERROR', 'OperationalError')
+
+    def test_restore_merges_with_new_rows(self):
+        aggregator = LogRollupAggregator()
+        aggregator.add('performance_logs', perf_row('load', 2.0))
+        rows = aggregator.drain()
+        aggregator.add('performance_logs', perf_row('load', 20.0))
+        aggregator.restore(rows)
+        row = aggregator.drain()[0]
+        assert (row['event_count'], row['duration_min_ms'], row['duration_max_ms']) == (2, 2.0, 20.0)
+
+    def test_bucket_quantiles(self):
+        counts = merge_buckets([[0, 8, 1], None, [0, 0, 0, 1]])
+        assert counts[:4] == [0, 8, 1, 1]
+        assert bucket_quantile(counts, 0.5) == 5.0
+        assert bucket_quantile(counts, 0.95) == 25.0
+        assert bucket_quantile([0, 0, 3], 0.99, observed_max=42.0, bounds=(1, 5)) == 42.0
+        assert bucket_quantile([0, 0], 0.5) is None
+
+
+class TestShipperRollups:
+
+    def test_copied_rows_are_upserted(self, tmp_path):
+        server = FakeServer()
+        shipper = LogShipper(connection_factory=server.connect, spill_dir=str(tmp_path), start=False)
+        shipper._write_or_spill([('performance_logs', perf_row('load', 3.0)),
+                                 ('performance_logs', perf_row('load', 4.0))])
+        assert shipper._flush_rollups()
+
+        assert len(server.upserts) == 1
+        row = dict(zip(ROLLUP_COLUMNS, server.upserts[0]))
+        assert (row['source'], row['operation'], row['event_count']) == ('performance_logs', 'load', 2)
+        assert shipper.get_stats()['rollups_written'] == 1
+
+    def test_failed_upsert_keeps_rollups(self, tmp_path):
+        server = FakeServer()
+        shipper = LogShipper(connection_factory=server.connect, spill_dir=str(tmp_path), start=False)
+        shipper._write_or_spill([('performance_logs', perf_row('load', 3.0))])
+        server.down = True
+        assert not shipper._flush_rollups()
+        stats = shipper.get_stats()
+        assert (stats['rollup_errors'], stats['pending_rollups']) == (1, 1)
+
+        server.down = False
+        assert shipper._flush_rollups()
+        assert dict(zip(ROLLUP_COLUMNS, server.upserts[0]))['event_count'] == 1
+
+
+    def test_application_loggers_reach_the_rollups(self, tmp_path):
+        server = FakeServer()
+        shipper = LogShipper(connection_factory=server.connect, spill_dir=str(tmp_path), start=False)
+        with patch('src.utils.database_logging.get_log_shipper', return_value=shipper):
+            PerformanceLogger().log_performance('evaluate_strategy', 12.0, component='strategy_manager')
+            ErrorLogger().log_error('ValueError', 'bad signal', component='strategy_manager')
+            TradingEventLogger().log_trading_event('signal_generated', symbol='AAPL', strategy='momentum')
+        shipper._write_or_spill(shipper._collect_batch())
+        assert shipper._flush_rollups()
+
+        rows = {row[1]: dict(zip(ROLLUP_COLUMNS, row)) for row in server.upserts}
+        assert set(rows) == {'performance_logs', 'error_logs', 'trading_events'}
+        assert (rows['performance_logs']['operation'], rows['performance_logs']['duration_sum_ms']) == \
+               ('evaluate_strategy', 12.0)
+        assert rows['trading_events']['component'] == 'momentum'
+
+
+class ScriptedCursor:
+    """Answers each query with the first canned result whose key appears in the SQL"""
+
+    def __init__(self, answers):
+        self.answers = answers
+        self.queries = []
+        self.description = None
+        self._rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def execute(self, sql, params=None):
+        self.queries.append(sql)
+        columns, self._rows = next(answer for key, answer in self.answers.items() if key in sql)
+        self.description = [(column,) for column in columns]
+
+    def fetchone(self):
+        return self._rows[0]
+
+    def fetchall(self):
+        return self._rows
+
+
+class ScriptedDatabase:
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    @contextmanager
+    def get_connection_context(self):
+        yield type('Connection', (), {'cursor': lambda conn: self.cursor})()
+
+
+class TestRawFallback:
+
+    def test_summary_scans_raw_table_without_rollups(self):
+        cursor = ScriptedCursor({
+            'to_regclass': (['exists'], [(False,)]),
+            'FROM performance_logs': (['operation_name', 'call_count', 'success_count'], [('load', 4, 3)]),
+        })
+        summary = DatabaseLogManager(ScriptedDatabase(cursor)).get_performance_summary()
+
+        assert summary['status'] == 'success'
+        assert summary['operations'][0]['success_rate'] == 75.0
+        assert not any(ROLLUP_TABLE in query for query in cursor.queries[1:])
+
+    def test_statistics_scan_raw_tables_when_rollups_are_empty(self):
+        cursor = ScriptedCursor({
+            'to_regclass': (['exists'], [(True,)]),
+            'SELECT EXISTS': (['exists'], [(False,)]),
+            'FROM system_logs': (['total_logs'], [(7,)]),
+            'FROM performance_logs': (['total_metrics'], [(5,)]),
+            'FROM error_logs': (['total_errors'], [(2,)]),
+            'FROM trading_events': (['total_events'], [(1,)]),
+            'pg_total_relation_size': (['total_size_bytes'], [(1024,)]),
+        })
+        stats = DatabaseLogManager(ScriptedDatabase(cursor)).get_log_statistics()
+
+        assert stats['status'] == 'success'
+        assert (stats['system_logs']['total_logs'], stats['performance_logs']['total_metrics'],
+                stats['error_logs']['total_errors']) == (7, 5, 2)
+
+
+class TestMigration:
+
+    def test_migration_backfills_rollups_from_the_oldest_raw_log(self):
+        oldest = datetime(2023, 11, 5, 8, 0)
+        cursor = ScriptedCursor({
+            'PARTITION BY RANGE': ([], []),
+            'recent_system_activity': ([], []),
+            'to_regclass': (['exists'], [(True,)]),
+            'MIN(timestamp) FROM system_logs': (['min'], [(oldest,)]),
+            'MIN(timestamp) FROM': (['min'], [(datetime(2024, 1, 1),)]),
+        })
+        manager = DatabaseLogManager(ScriptedDatabase(cursor))
+        with patch.object(DatabaseLogManager, 'backfill_rollups',
+                          return_value={'status': 'success', 'rows_scanned': 3, 'rollups_written': 2}) as backfill:
+            assert manager.migrate_log_tables()['rollups_written'] == 2
+
+        backfill.assert_called_once_with(since=oldest.replace(tzinfo=timezone.utc))
+        assert 'partition' in cursor.queries[0].lower() and 'CREATE TABLE IF NOT EXISTS system_logs' in cursor.queries[1]
+
+    def test_migration_of_empty_tables_skips_the_backfill(self):
+        cursor = ScriptedCursor({
+            'PARTITION BY RANGE': ([], []),
+            'recent_system_activity': ([], []),
+            'to_regclass': (['exists'], [(False,)]),
+        })
+        with patch.object(DatabaseLogManager, 'backfill_rollups') as backfill:
+            result = DatabaseLogManager(ScriptedDatabase(cursor)).migrate_log_tables()
+
+        assert result['status'] == 'success'
+        backfill.assert_not_called()
+
+
+class TestPartitions:
+
+    def test_partition_names_round_trip(self):
+        name = partition_name('system_logs', date(2024, 1, 2))
+        assert name == 'system_logs_p20240102'
+        assert partition_day('system_logs', name) == date(2024, 1, 2)
+        assert partition_day('system_logs', 'system_logs_default') is None
+        assert partition_day('system_logs', 'error_logs_p20240102') is None
+        assert "FROM ('2024-01-02 00:00:00+00') TO ('2024-01-03 00:00:00+00')" in \
+               partition_ddl('system_logs', date(2024, 1, 2))
+
+    def test_only_whole_days_before_cutoff_expire(self):
+        names = ['system_logs_p20240101', 'system_logs_p20240102', 'system_logs_p20240103',
+                 'system_logs_default']
+        cutoff = datetime(2024, 1, 3, 6, 0, tzinfo=timezone.utc)
+        assert expired_partitions('system_logs', names, cutoff) == ['system_logs_p20240101',
+                                                                     'system_logs_p20240102']
+
+    def test_failed_partition_rolls_back_only_itself(self):
+        today = datetime.now(timezone.utc).date()
+        failing = partition_name('system_logs', today + timedelta(days=1))
+        cursor = PartitionCursor(default_has_rows=True, fail_on=f"CREATE TABLE IF NOT EXISTS {failing} ")
+        results = DatabaseLogManager(ScriptedDatabase(cursor)).ensure_log_partitions(days_ahead=2)
+
+        # Today's rows sat in the default partition: moved, then the new table attached
+        today_name = partition_name('system_logs', today)
+        assert any(f"INSERT INTO {today_name} SELECT * FROM moved" in query for query in cursor.queries)
+        assert any(f"ATTACH PARTITION {today_name}" in query for query in cursor.queries)
+        assert results['rows_moved']['system_logs'] == 3
+
+        assert cursor.queries.count("ROLLBACK TO SAVEPOINT log_partition") == 1
+        assert results['partitions_created']['system_logs'] == [today_name,
+                                                                partition_name('system_logs', today + timedelta(days=2))]
+        assert len(results['errors']) == 1 and failing in results['errors'][0]
+
+    def test_shipper_runs_partition_maintenance(self, tmp_path):
+        calls = []
+
+        def maintenance():
+            calls.append(1)
+            raise RuntimeError('database is down')
+
+        shipper = LogShipper(connection_factory=FakeServer().connect, spill_dir=str(tmp_path),
+                             flush_interval=0.05, rollup_interval=None, partition_maintenance=maintenance)
+        shipper.flush()
+        shipper.close()
+
+        # Ran once on start; the failure waits for the next interval instead of retrying every loop
+        assert calls == [1]
+        assert shipper.get_stats()['partition_errors'] == 1
+
+
+class PartitionCursor:
+    """Catalog with only system_logs partitioned, holding no daily partitions yet"""
+
+    def __init__(self, default_has_rows=False, fail_on=None):
+        self.default_has_rows = default_has_rows
+        self.fail_on = fail_on
+        self.queries = []
+        self.rowcount = 0
+        self._rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def execute(self, sql, params=None):
+        self.queries.append(sql)
+        if self.fail_on and self.fail_on in sql:
+            raise RuntimeError('relation already exists')
+        if 'SELECT relkind' in sql:
+            self._rows = [('p',)] if params[0] == 'system_logs' else []
+        elif 'SELECT relname' in sql:
+            self._rows = [('system_logs_default',)] if 'system_logs_default' in params[0] else []
+        elif 'SELECT EXISTS' in sql:
+            # Only today's range has rows stranded in the default partition
+            self._rows = [(self.default_has_rows and params[0].date() == datetime.now(timezone.utc).date(),)]
+        elif 'moved' in sql:
+            self.rowcount = 3
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def fetchall(self):
+        return self._rows
+
+
+def rollup_row(source, component, level, operation, events, errors=0, durations=None):
+    durations = durations or []
+    buckets = [0] * (len(ROLLUP_DURATION_BUCKETS_MS) + 1)
+    for duration in durations:
+        buckets[next((i for i, bound in enumerate(ROLLUP_DURATION_BUCKETS_MS) if duration <= bound),
+                     len(ROLLUP_DURATION_BUCKETS_MS))] += 1
+    return (MINUTE, source, component, level, operation, events, errors, len(durations), float(sum(durations)),
+            min(durations, default=None), max(durations, default=None), buckets)
+
+
+def rollup_manager(rows):
+    return DatabaseLogManager(ScriptedDatabase(ScriptedCursor({'log_rollups': (list(ROLLUP_COLUMNS), rows)})))
+
+
+def text_of(component):
+    children = getattr(component, 'children', component)
+    if isinstance(children, (list, tuple)):
+        return ' '.join(text_of(child) for child in children)
+    return text_of(children) if hasattr(children, 'children') else str(children)
+
+
+class TestRollupReaders:
+
+    ROWS = [
+        rollup_row('system_logs', 'mltrading.ui.dashboard', 'INFO', '', 90),
+        rollup_row('system_logs', 'mltrading.ui.dashboard', 'WARNING', '', 4),
+        rollup_row('error_logs', 'trading', 'ERROR', 'TimeoutError', 6, errors=6),
+        rollup_row('performance_logs', 'trading', 'INFO', 'load_bars', 3, durations=[20, 40, 400]),
+    ]
+
+    def test_summary_totals_and_slowest_operations(self):
+        summary = summarize_rollups(rollup_manager(self.ROWS).get_log_rollups())
+        assert (summary['events'], summary['errors'], summary['levels']['WARNING']) == (103, 6, 4)
+        assert summary['error_sources'] == {('error_logs', 'trading', 'TimeoutError'): 6}
+        assert summary['operations'] == [{'operation': 'load_bars', 'calls': 3, 'avg_ms': pytest.approx(153.33, 0.01),
+                                          'p95_ms': 500.0, 'max_ms': 400.0}]
+
+    def test_logs_tab_analytics_read_the_rollups(self):
+        from src.dashboard.utils.log_viewer import generate_rollup_analytics, load_log_rollups
+
+        with patch('src.utils.database_log_manager.get_database_log_manager',
+                   return_value=rollup_manager(self.ROWS)):
+            rollups = load_log_rollups('all', 'all', '24h')
+            assert len(load_log_rollups('mltrading.ui', 'all', '24h')) == 2
+        text = text_of(generate_rollup_analytics(rollups))
+
+        assert 'Total Errors: 6' in text and 'trading / TimeoutError (6 times)' in text
+        assert 'load_bars: 3 calls' in text
+
+    def test_logs_tab_falls_back_to_files_when_the_database_is_down(self):
+        from src.dashboard.utils.log_viewer import load_log_rollups
+
+        with patch('src.utils.database_log_manager.get_database_log_manager', side_effect=RuntimeError('down')):
+            assert load_log_rollups() == []
+
+    def test_health_check_reports_the_recent_error_rate(self, tmp_path):
+        from src.utils.log_manager import LogManager
+
+        with patch('src.utils.database_log_manager.get_database_log_manager',
+                   return_value=rollup_manager(self.ROWS)):
+            health = LogManager(logs_dir=tmp_path).health_check()
+
+        assert health['checks']['recent_errors'] == 'elevated'
+        assert health['recent_activity']['error_rate'] == pytest.approx(6 / 103)
+        assert health['status'] == 'warning'
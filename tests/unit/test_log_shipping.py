@@ -0,0 +1,304 @@
+"""
+Unit tests for the log shipping pipeline
+Tests COPY batching, adaptive batch size, disk spill and replay
+"""
+
+import logging
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import psycopg2
+import psycopg2.errors
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.database_logging import DatabaseLogHandler
+from src.utils.log_shipping import LOG_TABLE_COLUMNS, LogShipper, default_spill_dir, rows_to_csv
+
+
+class FakeServer:
+    """Records COPY statements; fails while ``down`` is set, rejects any COPY containing ``bad`` text
+    and rejects every COPY while ``missing_column`` names a column the table lacks"""
+
+    def __init__(self):
+        self.down = False
+        self.bad = None
+        self.missing_column = None
+        self.copies = []
+        self.connections = 0
+
+    def connect(self):
+        if self.down:
+            raise ConnectionError("server down")
+        self.connections += 1
+        return FakeConnection(self)
+
+    def rows(self, table):
+        return [line for sql, data in self.copies if f"COPY {table} " in sql for line in data.splitlines()]
+
+
+class FakeConnection:
+
+    def __init__(self, server):
+        self.server = server
+        self.closed = False
+        self.autocommit = True
+
+    def cursor(self):
+        return FakeCursor(self.server)
+
+    def close(self):
+        self.closed = True
+
+
+class FakeCursor:
+
+    def __init__(self, server):
+        self.server = server
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def copy_expert(self, sql, buffer):
+        if self.server.down:
+            raise ConnectionError("server down")
+        if self.server.missing_column:
+            raise psycopg2.errors.UndefinedColumn(f'column "{self.server.missing_column}" does not exist')
+        data = buffer.read()
+        if self.server.bad and self.server.bad in data:
+            raise psycopg2.DataError("numeric field overflow")
+        self.server.copies.append((sql, data))
+
+
+def perf_row(name, duration=1.5):
+    return {'timestamp': datetime(2024, 1, 2, 15, 30, tzinfo=timezone.utc), 'operation_name': name,
+            'duration_ms': duration, 'status': 'success', 'component': None, 'metadata': {'k': 'v'}}
+
+
+@pytest.fixture
+def server():
+    return FakeServer()
+
+
+@pytest.fixture
+def shipper(server, tmp_path):
+    shipper = LogShipper(connection_factory=server.connect, spill_dir=str(tmp_path), max_queue_size=100,
+                         min_batch_size=2, max_batch_size=10, flush_interval=0.05, start=False)
+    yield shipper
+    shipper.shutdown_event.set()
+
+
+def drain(shipper):
+    while not shipper.log_queue.empty():
+        shipper._write_or_spill(shipper._collect_batch())
+
+
+class TestCsvEncoding:
+
+    def test_null_empty_and_quotes(self):
+        columns = ('message', 'component', 'line_number', 'metadata', 'user_impact')
+        text = rows_to_csv([{'message': 'say "hi"\nbye', 'component': '', 'line_number': 7,
+                             'metadata': {'a': 1}, 'user_impact': False}], columns).read()
+        assert text == '"say ""hi""\nbye","",7,"{""a"": 1}",false\n'
+
+    def test_missing_keys_are_null(self):
+        assert rows_to_csv([{'level': 'INFO'}], ('level', 'message')).read() == '"INFO",\n'
+
+
+class TestShipping:
+
+    def test_batches_are_copied_per_table(self, shipper, server):
+        shipper.ship('performance_logs', perf_row('a'))
+        shipper.ship('system_logs', {'level': 'INFO', 'logger_name': 'test', 'message': 'hello'})
+        shipper.ship('performance_logs', perf_row('b'))
+        drain(shipper)
+
+        assert len(server.copies) == 2
+        sql = server.copies[0][0]
+        assert sql == f"COPY performance_logs ({', '.join(LOG_TABLE_COLUMNS['performance_logs'])}) " \
+                      "FROM STDIN WITH (FORMAT csv)"
+        assert len(server.rows('performance_logs')) == 2
+        assert server.connections == 1
+        stats = shipper.get_stats()
+        assert (stats['enqueued'], stats['written'], stats['spilled'], stats['dropped']) == (3, 3, 0, 0)
+        assert shipper.get_table_stats('performance_logs')['written'] == 2
+
+    def test_batch_size_follows_queue_depth(self, shipper):
+        assert shipper.target_batch_size() == 2
+        for i in range(7):
+            shipper.ship('performance_logs', perf_row(str(i)))
+        assert shipper.target_batch_size() == 7
+        for i in range(20):
+            shipper.ship('performance_logs', perf_row(str(i)))
+        assert shipper.target_batch_size() == 10
+
+    def test_unknown_table_rejected(self, shipper):
+        with pytest.raises(ValueError):
+            shipper.ship('orders', {})
+
+    def test_rows_missing_required_columns_are_rejected(self, shipper, server):
+        assert not shipper.ship('performance_logs', {'operation_name': 'load', 'duration_ms': 12.5})
+        assert shipper.ship('performance_logs', {'operation_name': 'load', 'duration_ms': 12.5,
+                                                 'status': 'success'})
+        drain(shipper)
+
+        rows = server.rows('performance_logs')
+        assert len(rows) == 1 and not rows[0].startswith(',')  # timestamp filled in, not NULL
+        assert shipper.get_table_stats('performance_logs')['rejected'] == 1
+
+    def test_spill_dir_defaults_outside_the_working_directory(self, server, monkeypatch, tmp_path):
+        monkeypatch.delenv('LOG_SPILL_DIR', raising=False)
+        assert default_spill_dir() == project_root / 'logs' / 'spill'
+        monkeypatch.setenv('LOG_SPILL_DIR', str(tmp_path))
+        assert LogShipper(connection_factory=server.connect, start=False).spill_dir == tmp_path
+
+
+class TestRejectedRows:
+
+    def test_bad_row_is_dead_lettered_and_the_rest_written(self, shipper, server):
+        server.bad = '"poison"'
+        for name in ('a', 'b', 'poison', 'c', 'd'):
+            shipper.ship('performance_logs', perf_row(name))
+        drain(shipper)
+
+        assert len(server.rows('performance_logs')) == 4
+        stats = shipper.get_stats()
+        assert (stats['written'], stats['dead_lettered'], stats['spilled']) == (4, 1, 0)
+        assert shipper._healthy() and shipper.spill_backlog_bytes() == 0
+        assert '"poison"' in shipper.dead_letter_path.read_text()
+
+    def test_replay_moves_past_bad_rows(self, shipper, server):
+        server.bad = '"poison"'
+        shipper.max_batch_size = 2
+        shipper._spill([('performance_logs', perf_row(name)) for name in ('a', 'poison', 'b', 'c')])
+        shipper._replay_spill()
+
+        assert len(server.rows('performance_logs')) == 3
+        assert shipper.get_stats()['dead_lettered'] == 1
+        assert shipper.spill_backlog_bytes() == 0 and not shipper.replay_path.exists()
+
+    def test_schema_error_dead_letters_after_bounded_replays(self, shipper, server):
+        server.missing_column = 'component'
+        shipper.max_replay_attempts = 3
+        for name in ('a', 'b', 'c'):
+            shipper.ship('performance_logs', perf_row(name))
+        drain(shipper)
+        assert shipper.get_stats()['spilled'] == 3
+
+        for _ in range(shipper.max_replay_attempts - 1):
+            shipper._replay_spill()
+            assert shipper.get_stats()['dead_lettered'] == 0 and shipper.spill_backlog_bytes() > 0
+        shipper._replay_spill()
+
+        stats = shipper.get_stats()
+        assert (stats['dead_lettered'], stats['written'], stats['replayed']) == (3, 0, 0)
+        assert shipper.spill_backlog_bytes() == 0 and not shipper.replay_path.exists()
+        assert 'column \\"component\\" does not exist' in shipper.dead_letter_path.read_text()
+
+    def test_outage_does_not_count_towards_replay_attempts(self, shipper, server):
+        shipper.max_replay_attempts = 1
+        shipper._spill([('performance_logs', perf_row('a'))])
+        server.down = True
+        shipper._replay_spill()
+        shipper._replay_spill()
+
+        server.down = False
+        shipper._replay_spill()
+        stats = shipper.get_stats()
+        assert (stats['dead_lettered'], stats['replayed']) == (0, 1)
+
+
+class TestSpillAndReplay:
+
+    def test_outage_spills_then_replays(self, shipper, server):
+        server.down = True
+        for i in range(5):
+            shipper.ship('performance_logs', perf_row(str(i)))
+        drain(shipper)
+        assert shipper.get_stats()['spilled'] == 5
+        assert shipper.spill_backlog_bytes() > 0
+        assert server.copies == []
+
+        server.down = False
+        shipper._retry_at = 0.0
+        shipper._replay_spill()
+
+        stats = shipper.get_stats()
+        assert (stats['written'], stats['replayed'], stats['dropped']) == (5, 5, 0)
+        assert len(server.rows('performance_logs')) == 5
+        assert shipper.spill_backlog_bytes() == 0
+        assert not shipper.replay_path.exists()
+
+    def test_failed_replay_resumes_from_offset(self, shipper, server):
+        shipper.max_batch_size = 2
+        shipper._spill([('performance_logs', perf_row(str(i))) for i in range(5)])
+
+        # First chunk lands, then the server drops
+        original = FakeCursor.copy_expert
+
+        def flaky(cursor, sql, buffer):
+            original(cursor, sql, buffer)
+            server.down = True
+
+        FakeCursor.copy_expert = flaky
+        try:
+            shipper._replay_spill()
+        finally:
+            FakeCursor.copy_expert = original
+        assert len(server.rows('performance_logs')) == 2
+
+        server.down = False
+        shipper._replay_spill()
+        assert len(server.rows('performance_logs')) == 5
+        assert shipper.get_stats()['replayed'] == 5
+
+    def test_full_queue_spills_instead_of_dropping(self, server, tmp_path):
+        shipper = LogShipper(connection_factory=server.connect, spill_dir=str(tmp_path), max_queue_size=1,
+                             start=False)
+        assert shipper.ship('error_logs', {'error_type': 'ValueError', 'error_message': 'bad value'})
+        assert shipper.ship('error_logs', {'error_type': 'KeyError', 'error_message': 'missing'})
+        stats = shipper.get_stats()
+        assert (stats['enqueued'], stats['spilled'], stats['dropped']) == (1, 1, 0)
+
+    def test_spill_cap_drops_and_counts(self, shipper):
+        shipper.max_spill_bytes = 300
+        written = shipper._spill([('performance_logs', perf_row(str(i))) for i in range(10)])
+        stats = shipper.get_stats()
+        assert 0 < written < 10
+        assert stats['dropped'] == 10 - written
+
+
+class TestWriterThread:
+
+    def test_close_ships_everything(self, server, tmp_path):
+        shipper = LogShipper(connection_factory=server.connect, spill_dir=str(tmp_path), flush_interval=0.05)
+        for i in range(30):
+            shipper.ship('performance_logs', perf_row(str(i)))
+        shipper.flush()
+        shipper.close()
+        assert len(server.rows('performance_logs')) == 30
+        assert shipper.get_stats()['written'] == 30
+
+
+class TestDatabaseLogHandler:
+
+    def test_records_go_to_shipper(self, shipper, server):
+        handler = DatabaseLogHandler(table_name='system_logs', shipper=shipper)
+        logger = logging.getLogger('mltrading.test_log_shipping')
+        logger.addHandler(handler)
+        try:
+            logger.warning("disk at %d%%", 91)
+        finally:
+            logger.removeHandler(handler)
+        drain(shipper)
+
+        rows = server.rows('system_logs')
+        assert len(rows) == 1 and '"disk at 91%"' in rows[0]
+        assert handler.get_stats()['table_written'] == 1
@@ -0,0 +1,224 @@
+"""
+Unit tests for the strategy market data hub
+Tests ring buffer windows, replay polling, new-bar wakeups and strategy dispatch
+"""
+
+import sys
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.trading.strategies.base_strategy import BaseStrategy
+from src.trading.strategies.market_data_hub import (
+    Bar, BarBuffer, DatabaseBarSource, MarketDataHub, ReplayBarSource, _copy_on_write_active
+)
+from src.trading.strategies.strategy_manager import StrategyConfig, StrategyManager
+
+START = pd.Timestamp('2024-01-02 14:00', tz='UTC')
+
+
+def bar(symbol, hour, close=100.0):
+    return Bar(symbol, START + pd.Timedelta(hours=hour), close, close + 1, close - 1, close, 1000.0)
+
+
+def frame(hours, offset=0.0):
+    return pd.DataFrame({
+        'timestamp': [(START + pd.Timedelta(hours=h)).tz_localize(None) for h in hours],
+        'open': [100.0 + offset + h for h in hours], 'high': [101.0 + offset + h for h in hours],
+        'low': [99.0 + offset + h for h in hours], 'close': [100.0 + offset + h for h in hours],
+        'volume': [1000.0] * len(hours),
+    })
+
+
+class RecordingStrategy(BaseStrategy):
+
+    def __init__(self, symbols, **kwargs):
+        super().__init__(name="Recording", symbols=symbols, **kwargs)
+        self.calls = []
+
+    def generate_signals(self, market_data):
+        self.calls.append({symbol: len(data) for symbol, data in market_data.items()})
+        return []
+
+    def calculate_position_size(self, signal, available_capital):
+        return 0
+
+
+class TestBarBuffer:
+
+    def test_window_after_wrap_is_contiguous_and_read_only(self):
+        buffer = BarBuffer('AAPL', capacity=3)
+        for hour in range(5):
+            buffer.append(bar('AAPL', hour, close=100.0 + hour))
+
+        window = buffer.window()
+        assert list(window.close) == [102.0, 103.0, 104.0]
+        assert list(buffer.window(2).close) == [103.0, 104.0]
+        assert np.shares_memory(window.close, buffer._columns['close'])
+        with pytest.raises(ValueError):
+            window.close[0] = 0.0
+        assert buffer.last_timestamp == START + pd.Timedelta(hours=4)
+
+    def test_revised_and_stale_bars(self):
+        buffer = BarBuffer('AAPL', capacity=3)
+        assert buffer.append(bar('AAPL', 1))
+        assert not buffer.append(bar('AAPL', 1))
+        assert buffer.append(bar('AAPL', 1, close=105.0))
+        assert not buffer.append(bar('AAPL', 0))
+        assert (len(buffer), buffer.bars_revised, buffer.bars_stale) == (1, 1, 1)
+        assert buffer.window().to_frame()['close'].tolist() == [105.0]
+
+    def test_resent_bar_with_missing_values_is_unchanged(self):
+        buffer = BarBuffer('AAPL', capacity=3)
+        assert buffer.append(Bar('AAPL', START, 100.0, 101.0, 99.0, 100.0, np.nan))
+        assert not buffer.append(Bar('AAPL', START, 100.0, 101.0, 99.0, 100.0, np.nan))
+        assert buffer.append(Bar('AAPL', START, 100.0, 101.0, 99.0, 100.0, 500.0))
+        assert buffer.bars_revised == 1
+
+
+class RecordingDatabase:
+    """Answers the bar query with no rows, keeping its parameters"""
+
+    def __init__(self):
+        self.params = None
+
+    @contextmanager
+    def get_read_connection_context(self):
+        database = self
+
+        class Cursor:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *args):
+                return False
+
+            def execute(self, sql, params):
+                database.params = params
+
+            def fetchall(self):
+                return []
+
+        yield type('Connection', (), {'cursor': lambda conn: Cursor()})()
+
+
+class TestDatabaseBarSource:
+
+    def test_each_symbol_is_scanned_from_its_own_watermark(self):
+        database = RecordingDatabase()
+        source = DatabaseBarSource(database, initial_lookback=pd.Timedelta(days=30))
+        source.fetch(['AAPL', 'NEW'], {'AAPL': START + pd.Timedelta(hours=5), 'NEW': None})
+
+        symbols, starts, name = database.params
+        assert (symbols, name) == (['AAPL', 'NEW'], 'yahoo')
+        assert starts[0] == (START + pd.Timedelta(hours=5)).tz_localize(None).to_pydatetime()
+        # Only the symbol without a watermark falls back to the initial lookback
+        assert pd.Timestamp.now(tz='UTC').tz_localize(None) - pd.Timestamp(starts[1]) > pd.Timedelta(days=29)
+
+
+class TestHub:
+
+    def test_replay_releases_one_timestamp_per_poll(self):
+        source = ReplayBarSource({'AAPL': frame([0, 1, 2]), 'MSFT': frame([1, 2], offset=50)})
+        hub = MarketDataHub(source, capacity=10)
+        hub.set_symbols(['AAPL', 'MSFT'])
+
+        assert hub.poll() == ['AAPL']
+        assert hub.poll() == ['AAPL', 'MSFT']
+        frames = hub.get_frames(['AAPL', 'MSFT'])
+        assert frames['AAPL']['close'].tolist() == [100.0, 101.0]
+        assert frames['MSFT']['timestamp'].iloc[-1] == START + pd.Timedelta(hours=1)
+        shared = hub.get_frames(['AAPL'])['AAPL']
+        assert shared is not frames['AAPL']
+        assert np.shares_memory(shared['close'].to_numpy(), frames['AAPL']['close'].to_numpy()) \
+            == _copy_on_write_active()
+
+        hub.poll()
+        hub.poll()
+        assert source.exhausted
+        assert hub.get_stats()['buffered_bars'] == {'AAPL': 3, 'MSFT': 2}
+
+    def test_strategies_cannot_change_each_others_frames(self):
+        hub = MarketDataHub(ReplayBarSource({'AAPL': frame([0, 1])}, bars_per_fetch=2))
+        hub.set_symbols(['AAPL'])
+        hub.poll()
+
+        mine, theirs = hub.get_frames(['AAPL'])['AAPL'], hub.get_frames(['AAPL'])['AAPL']
+        mine['sma'] = mine['close'].rolling(2).mean()
+        mine.loc[0, 'close'] = 0.0
+        assert 'sma' not in theirs.columns
+        assert theirs['close'].tolist() == [100.0, 101.0]
+        assert hub.get_frames(['AAPL'])['AAPL']['close'].tolist() == [100.0, 101.0]
+
+    @pytest.mark.parametrize('copy_on_write', [False, True])
+    def test_frames_stay_isolated_with_and_without_copy_on_write(self, copy_on_write):
+        if int(pd.__version__.split('.')[0]) >= 3 and not copy_on_write:
+            pytest.skip("copy-on-write cannot be disabled from pandas 3")
+        with pd.option_context('mode.copy_on_write', copy_on_write):
+            hub = MarketDataHub(ReplayBarSource({'AAPL': frame([0, 1])}, bars_per_fetch=2))
+            hub.set_symbols(['AAPL'])
+            hub.poll()
+
+            mine, theirs = hub.get_frames(['AAPL'])['AAPL'], hub.get_frames(['AAPL'])['AAPL']
+            mine.loc[0, 'close'] = 0.0
+            mine['close'] *= 2
+            assert theirs['close'].tolist() == [100.0, 101.0]
+            assert hub.get_frames(['AAPL'])['AAPL']['close'].tolist() == [100.0, 101.0]
+
+    def test_dropped_symbols_release_cached_frames(self):
+        hub = MarketDataHub(ReplayBarSource({'AAPL': frame([0]), 'MSFT': frame([0], offset=50)}))
+        hub.set_symbols(['AAPL', 'MSFT'])
+        hub.poll()
+        hub.get_frames(['AAPL', 'MSFT'])
+        hub.get_frames(['MSFT'], length=1)
+
+        hub.set_symbols(['AAPL'])
+        assert [symbol for symbol, _ in hub._frames] == ['AAPL']
+
+    def test_wait_for_bars_reports_updated_symbols(self):
+        hub = MarketDataHub(ReplayBarSource({'AAPL': frame([0]), 'MSFT': frame([0, 1])}))
+        hub.set_symbols(['AAPL', 'MSFT'])
+        assert hub.wait_for_bars(0, timeout=0.01) == (0, [])
+
+        hub.poll()
+        sequence, updated = hub.wait_for_bars(0, timeout=1)
+        assert (sequence, updated) == (1, ['AAPL', 'MSFT'])
+        hub.poll()
+        assert hub.wait_for_bars(sequence, timeout=1) == (2, ['MSFT'])
+
+    def test_stop_releases_waiters(self):
+        hub = MarketDataHub(ReplayBarSource({}))
+        result = []
+        waiter = threading.Thread(target=lambda: result.append(hub.wait_for_bars(0, timeout=10)))
+        waiter.start()
+        hub.stop()
+        waiter.join(timeout=2)
+        assert result == [(0, [])]
+
+
+class TestStrategyDispatch:
+
+    def test_only_strategies_with_new_bars_run(self):
+        hub = MarketDataHub(ReplayBarSource({'AAPL': frame(range(5)), 'MSFT': frame([4])}), capacity=50)
+        manager = StrategyManager(market_data_hub=hub)
+        for name, symbols in (('aapl', ['AAPL']), ('msft', ['MSFT'])):
+            manager.add_strategy(name, StrategyConfig(RecordingStrategy, symbols, {'symbols': symbols}, {},
+                                                      lookback_bars=3))
+            manager.start_strategy(name)
+
+        for _ in range(4):
+            manager.run_strategies(hub.poll())
+        assert manager.strategies['aapl'].calls == [{'AAPL': 1}, {'AAPL': 2}, {'AAPL': 3}, {'AAPL': 3}]
+        assert manager.strategies['msft'].calls == []
+
+        manager.run_strategies(hub.poll())
+        assert manager.strategies['msft'].calls == [{'MSFT': 1}]
+        assert manager.get_status()['market_data']['polls'] == 5
@@ -0,0 +1,143 @@
+"""
+Unit tests for the in-process metrics registry
+Tests counters, gauges, histogram exposition and component reporting
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.metrics import Counter, Histogram, MetricsRegistry, get_metrics_registry
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+class TestPrimitives:
+
+    def test_counter_rejects_decrease(self):
+        counter = Counter()
+        counter.inc(2)
+        with pytest.raises(ValueError):
+            counter.inc(-1)
+        assert counter.value == 2.0
+
+    def test_children_are_shared_per_label_set(self, registry):
+        a = registry.counter('jobs_total', 'Jobs', queue='fast')
+        assert registry.counter('jobs_total', queue='fast') is a
+        assert registry.counter('jobs_total', queue='slow') is not a
+
+    def test_kind_conflict_rejected(self, registry):
+        registry.counter('jobs_total')
+        with pytest.raises(ValueError):
+            registry.gauge('jobs_total')
+
+
+class TestExposition:
+
+    def test_counter_and_gauge_lines(self, registry):
+        registry.counter('jobs_total', 'Jobs run', queue='a"b').inc(3)
+        registry.gauge('queue_depth').set(7)
+        text = registry.render()
+        assert '# HELP jobs_total Jobs run\n# TYPE jobs_total counter\njobs_total{queue="a\\"b"} 3.0\n' in text
+        assert '# TYPE queue_depth gauge\nqueue_depth 7.0\n' in text
+
+    def test_histogram_buckets_are_cumulative(self, registry):
+        histogram = registry.histogram('latency_seconds', 'Latency', buckets=(0.1, 1.0), op='read')
+        for value in (0.05, 0.5, 0.7, 5.0):
+            histogram.observe(value)
+        lines = registry.render().splitlines()
+        assert 'latency_seconds_bucket{op="read",le="0.1"} 1' in lines
+        assert 'latency_seconds_bucket{op="read",le="1.0"} 3' in lines
+        assert 'latency_seconds_bucket{op="read",le="+Inf"} 4' in lines
+        assert 'latency_seconds_count{op="read"} 4' in lines
+        assert 'latency_seconds_sum{op="read"} 6.25' in lines
+
+    def test_registered_histogram_and_collectors(self, registry):
+        owned = Histogram((1.0,))
+        owned.observe(0.5)
+        registry.register_histogram('owned_seconds', owned)
+        registry.register_collector('depth', lambda r: r.gauge('depth').set(4))
+        registry.register_collector('broken', lambda r: 1 / 0)
+        snapshot = registry.snapshot()
+        assert snapshot['owned_seconds']['']['count'] == 1
+        assert snapshot['depth'][''] == 4.0
+
+        registry.unregister_collector('depth')
+        registry.gauge('depth').set(0)
+        assert registry.snapshot()['depth'][''] == 0.0
+
+
+class TestComponentReporting:
+
+    def test_circuit_breaker_reports_outcomes_and_state(self):
+        from src.utils.circuit_breaker import CircuitBreaker, CircuitBreakerConfig, CircuitBreakerError
+
+        breaker = CircuitBreaker('metrics_test_breaker', CircuitBreakerConfig(failure_threshold=1))
+        breaker.call(lambda: 1)
+        with pytest.raises(ZeroDivisionError):
+            breaker.call(lambda: 1 / 0)
+        with pytest.raises(CircuitBreakerError):
+            breaker.call(lambda: 1)
+
+        snapshot = get_metrics_registry().snapshot()
+        calls = snapshot['mltrading_circuit_breaker_calls_total']
+        assert calls['{breaker="metrics_test_breaker",outcome="success"}'] == 1
+        assert calls['{breaker="metrics_test_breaker",outcome="failure"}'] == 1
+        assert calls['{breaker="metrics_test_breaker",outcome="blocked"}'] == 1
+        assert snapshot['mltrading_circuit_breaker_state']['{breaker="metrics_test_breaker"}'] == 2
+
+    def test_cache_service_reports_hits_and_misses(self):
+        from src.dashboard.services.cache_service import CacheService
+
+        cache = CacheService(name='metrics_test_cache')
+        cache.get('missing')
+        cache.set('key', 1)
+        cache.get('key')
+
+        snapshot = get_metrics_registry().snapshot()
+        requests = snapshot['mltrading_cache_requests_total']
+        assert requests['{cache="metrics_test_cache",result="hit"}'] == 1
+        assert requests['{cache="metrics_test_cache",result="miss"}'] == 1
+        assert snapshot['mltrading_cache_entries']['{cache="metrics_test_cache"}'] == 1
+        assert cache.get_cache_stats()['hit_rate'] == 0.5
+
+    def test_api_metrics_endpoint_exposes_pool_series(self, monkeypatch):
+        from fastapi.testclient import TestClient
+        from src.api.main import app
+        from src.data.storage import database
+        from src.data.storage.connection_pool import BlockingConnectionPool
+
+        class Connection:
+            closed = 0
+
+            def get_transaction_status(self):
+                return 0
+
+            def rollback(self):
+                pass
+
+            def close(self):
+                self.closed = 1
+
+        pool = BlockingConnectionPool(0, 2, connection_factory=Connection)
+        pool.putconn(pool.getconn())
+        manager = type('Manager', (), {'pool': pool, 'read_pool': None})()
+        monkeypatch.setattr(database, 'db_manager', None)
+        monkeypatch.setattr(database, 'DatabaseManager', lambda **kwargs: manager)
+        try:
+            text = TestClient(app).get('/metrics').text
+        finally:
+            get_metrics_registry().unregister_collector('db_pool')
+
+        assert 'mltrading_db_pool_max_connections{pool="primary"} 2.0' in text
+        assert 'mltrading_db_pool_wait_seconds_count{pool="primary"} 1' in text
+        assert 'mltrading_db_pool_checkout_seconds_count{pool="primary"} 1' in text
+        assert 'mltrading_db_pool_waiters{pool="primary"} 0.0' in text
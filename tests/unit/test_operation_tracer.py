@@ -0,0 +1,133 @@
+"""
+Unit tests for log_operation sampling and timing aggregation
+Tests pattern keys, sample decisions, summary flushes and the level-aware fast path
+"""
+
+import logging
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils import logging_config
+from src.utils.operation_tracer import OperationTracer
+
+
+@pytest.fixture
+def tracer():
+    return OperationTracer({'store_phase1_features_*': 0.1, 'load_historical_data': 0.0},
+                           summary_interval=0, rng=lambda: 0.5)
+
+
+@pytest.fixture
+def quiet_logger():
+    logger = logging.getLogger('mltrading.test_operation_tracer')
+    logger.propagate = False
+    logger.setLevel(logging.WARNING)
+    yield logger
+    logger.setLevel(logging.NOTSET)
+    logger.propagate = True
+
+
+class TestSampling:
+
+    def test_pattern_groups_per_symbol_names(self, tracer):
+        assert tracer.key_for('store_phase1_features_AAPL') == 'store_phase1_features_*'
+        assert tracer.key_for('store_phase1_features_MSFT') == 'store_phase1_features_*'
+        assert tracer.key_for('calculate_phase1_features') == 'calculate_phase1_features'
+
+    def test_rates(self, tracer):
+        assert not tracer.should_sample('store_phase1_features_*')
+        assert not tracer.should_sample('load_historical_data')
+        assert tracer.should_sample('calculate_phase1_features')
+        tracer.rng = lambda: 0.05
+        assert tracer.should_sample('store_phase1_features_*')
+
+    def test_configure_replaces_rates(self, tracer):
+        tracer.key_for('store_phase1_features_AAPL')
+        tracer.configure({'backtest_*': 0.5}, default_rate=0.0)
+        assert tracer.key_for('store_phase1_features_AAPL') == 'store_phase1_features_AAPL'
+        assert tracer.sample_rate('store_phase1_features_AAPL') == 0.0
+        assert tracer.sample_rate(tracer.key_for('backtest_momentum')) == 0.5
+
+
+class TestSummaries:
+
+    def test_flush_emits_one_row_per_operation(self, tracer):
+        rows = []
+        tracer.sink = rows.append
+        for duration in (0.002, 0.004, 0.2):
+            tracer.record('store_phase1_features_*', duration)
+        tracer.record('store_phase1_features_*', 0.003, error=True, sampled=True)
+
+        assert tracer.flush() == rows
+        assert len(rows) == 1
+        row = rows[0]
+        assert (row['operation'], row['count'], row['errors'], row['sampled']) == \
+               ('store_phase1_features_*', 4, 1, 1)
+        assert row['mean_ms'] == pytest.approx(52.25)
+        assert row['max_ms'] == pytest.approx(200.0)
+        assert row['p50_ms'] <= row['p95_ms'] <= row['p99_ms']
+        assert tracer.flush() == []
+
+    def test_interval_triggers_flush(self):
+        rows = []
+        tracer = OperationTracer(summary_interval=60, sink=rows.append)
+        tracer.record('op', 0.01)
+        assert rows == []
+        tracer._last_flush -= 61
+        tracer.record('op', 0.01)
+        assert len(rows) == 1 and rows[0]['count'] == 2
+
+    def test_failing_sink_is_ignored(self, tracer):
+        tracer.sink = lambda row: 1 / 0
+        tracer.record('op', 0.01)
+        assert len(tracer.flush()) == 1
+
+
+class TestLogOperation:
+
+    def test_disabled_level_skips_logging_but_times(self, tracer, quiet_logger):
+        with patch.object(logging_config, 'get_operation_tracer', return_value=tracer), \
+                patch.object(logging_config, 'sanitize_log_message') as sanitize, \
+                patch.object(logging_config, 'log_performance_event') as perf_event:
+            with logging_config.log_operation('calculate_phase1_features', quiet_logger, symbol='AAPL'):
+                pass
+        sanitize.assert_not_called()
+        perf_event.assert_not_called()
+        assert tracer.get_stats()['calculate_phase1_features']['count'] == 1
+
+    def test_sampled_out_call_only_records(self, tracer, caplog):
+        logger = logging.getLogger('mltrading.test_operation_tracer.sampled')
+        with patch.object(logging_config, 'get_operation_tracer', return_value=tracer), \
+                patch.object(logging_config, 'log_performance_event') as perf_event, \
+                caplog.at_level(logging.INFO, logger=logger.name):
+            for symbol in ('AAPL', 'MSFT'):
+                with logging_config.log_operation(f'store_phase1_features_{symbol}', logger):
+                    pass
+            with logging_config.log_operation('calculate_phase1_features', logger):
+                pass
+
+        assert perf_event.call_count == 1
+        messages = [record.getMessage() for record in caplog.records]
+        assert len(messages) == 2
+        assert all('calculate_phase1_features' in message for message in messages)
+        stats = tracer.get_stats()
+        assert stats['store_phase1_features_*']['count'] == 2
+        assert stats['store_phase1_features_*']['sampled'] == 0
+
+    def test_failures_always_logged(self, tracer, quiet_logger):
+        with patch.object(logging_config, 'get_operation_tracer', return_value=tracer), \
+                patch.object(logging_config, '_log_operation_failure') as failure:
+            with pytest.raises(ValueError):
+                with logging_config.log_operation('load_historical_data', quiet_logger, symbol='AAPL'):
+                    raise ValueError('no rows')
+        failure.assert_called_once()
+        assert failure.call_args.args[0] == 'load_historical_data'
+        assert failure.call_args.args[5] == {'symbol': 'AAPL'}
+        assert tracer.get_stats()['load_historical_data']['errors'] == 1
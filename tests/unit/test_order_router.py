@@ -0,0 +1,155 @@
+"""
+Unit tests for the asynchronous order router
+Tests concurrent leg submission, idempotent retries, fill tracking and strategy manager routing
+"""
+
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.trading.brokers.fake_broker import FakeBroker
+from src.trading.brokers.order_router import OrderRequest, OrderRouter
+
+
+@pytest.fixture
+def broker():
+    return FakeBroker(latency=0.1)
+
+
+@pytest.fixture
+def router(broker):
+    router = OrderRouter(broker, workers=4, retry_backoff=0.01, fill_poll_interval=0.05)
+    router.start()
+    yield router
+    router.stop()
+
+
+class TestSubmission:
+
+    def test_pair_legs_are_sent_concurrently(self, router, broker):
+        started = time.perf_counter()
+        legs = router.submit_group([OrderRequest('KO', 10, 'buy', group_id='KO_PEP'),
+                                    OrderRequest('PEP', 8, 'sell', group_id='KO_PEP')])
+        orders = [leg.result(timeout=5) for leg in legs]
+
+        assert [order.status for order in orders] == ['accepted', 'accepted']
+        assert broker.max_concurrent_submits == 2
+        assert time.perf_counter() - started < 0.19
+        assert router.get_stats()['ack_latency']['count'] == 2
+        assert all(order.ack_seconds >= 0.1 for order in orders)
+
+    def test_resubmitting_a_client_order_id_is_idempotent(self, router, broker):
+        request = OrderRequest('AAPL', 5, 'buy')
+        first = router.submit(request)
+        second = router.submit(OrderRequest('AAPL', 5, 'buy', client_order_id=request.client_order_id))
+        assert second is first
+        first.result(timeout=5)
+        assert broker.submissions == [request.client_order_id]
+        assert router.get_stats()['duplicates'] == 1
+
+    def test_resubmitting_a_retired_order_returns_its_final_state(self, router, broker):
+        broker.fail_next(3)
+        request = OrderRequest('AAPL', 5, 'buy')
+        failed = router.submit(request).result(timeout=5)
+        assert failed.status == 'failed' and router.in_flight() == []
+
+        again = router.submit(OrderRequest('AAPL', 5, 'buy', client_order_id=request.client_order_id))
+        assert again.result(timeout=0) is failed
+        assert broker.submissions == [request.client_order_id] * 3
+
+    def test_retired_orders_are_bounded(self, broker):
+        router = OrderRouter(broker, retry_backoff=0.01, completed_retention=2)
+        router.start()
+        try:
+            broker.fail_next(9)
+            requests = [OrderRequest('AAPL', 5, 'buy') for _ in range(3)]
+            for request in requests:
+                router.submit(request).result(timeout=5)
+            assert router.get_order(requests[0].client_order_id) is None
+            assert [router.get_order(r.client_order_id).status for r in requests[1:]] == ['failed', 'failed']
+        finally:
+            router.stop()
+
+    def test_stop_shuts_down_the_thread_pool(self, broker):
+        router = OrderRouter(broker)
+        router.start()
+        router.submit(OrderRequest('AAPL', 5, 'buy')).result(timeout=5)
+        executor = router.executor
+        router.stop()
+        assert executor._shutdown and router._executor is None
+
+
+class TestRetries:
+
+    def test_lost_ack_is_recovered_without_a_second_order(self, router, broker):
+        broker.fail_next(1, accepted=True)
+        order = router.submit(OrderRequest('AAPL', 5, 'buy')).result(timeout=5)
+        assert (order.status, order.attempts) == ('accepted', 1)
+        assert len(broker.orders) == 1
+        assert router.get_stats()['recovered_acks'] == 1
+
+    def test_transient_failure_retries_with_same_id(self, router, broker):
+        broker.fail_next(1)
+        request = OrderRequest('AAPL', 5, 'buy')
+        order = router.submit(request).result(timeout=5)
+        assert (order.status, order.attempts) == ('accepted', 2)
+        assert broker.submissions == [request.client_order_id] * 2
+
+    def test_gives_up_after_max_retries(self, router, broker):
+        broker.fail_next(3)
+        order = router.submit(OrderRequest('AAPL', 5, 'buy')).result(timeout=5)
+        assert (order.status, order.attempts) == ('failed', 3)
+        assert router.in_flight() == []
+        assert router.get_stats()['failed'] == 1
+
+
+class TestOrderBook:
+
+    def test_fills_update_then_retire_orders(self, router, broker):
+        request = OrderRequest('AAPL', 10, 'buy')
+        router.submit(request).result(timeout=5)
+        assert [order['client_order_id'] for order in router.in_flight()] == [request.client_order_id]
+
+        broker.fill(request.client_order_id, qty=4, price=101.0)
+        assert router.apply_update(broker.get_order_by_client_id(request.client_order_id))
+        assert router.in_flight()[0]['status'] == 'partially_filled'
+        assert router.in_flight()[0]['filled_qty'] == 4
+
+        broker.fill(request.client_order_id, price=101.5)
+        for _ in range(100):
+            if not router.in_flight():
+                break
+            time.sleep(0.01)
+        order = router.get_order(request.client_order_id)
+        assert (order.status, order.filled_qty, order.filled_avg_price) == ('filled', 10, 101.5)
+        assert router.in_flight() == []
+
+
+class TestStrategyManagerRouting:
+
+    def test_signals_are_routed_with_client_order_ids(self, router, broker):
+        from src.trading.strategies.base_strategy import SignalType, StrategySignal
+        from src.trading.strategies.strategy_manager import StrategyManager
+
+        manager = StrategyManager(order_router=router)
+        routed = []
+        manager.add_order_callback(lambda signal, name, instructions: routed.append(instructions))
+        signal = StrategySignal('KO', SignalType.CLOSE_LONG, 0.8, datetime.now(timezone.utc),
+                                metadata={'pair_name': 'KO_PEP'})
+        manager._execute_signal(signal, 'pairs', {'quantity': 7, 'order_type': 'market', 'time_in_force': 'day'})
+
+        client_order_id = routed[0]['client_order_id']
+        order = router.get_order(client_order_id)
+        assert (order.request.side, order.request.qty, order.request.group_id) == ('sell', 7, 'KO_PEP')
+        for _ in range(100):
+            if broker.get_order_by_client_id(client_order_id):
+                break
+            time.sleep(0.01)
+        assert broker.get_order_by_client_id(client_order_id)['symbol'] == 'KO'
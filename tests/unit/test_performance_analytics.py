@@ -0,0 +1,107 @@
+"""
+Unit tests for the vectorized performance analytics
+Tests bar-frequency annualization, Sortino/Calmar, drawdown durations, rolling Sharpe, exposure and sweep scoring
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.trading.backtesting.performance_analytics import (
+    analyze, concurrent_positions, equity_metrics, periods_per_year, rolling_sharpe
+)
+from src.trading.backtesting.trade_log import TradeLog
+
+
+def market_hours(days=20):
+    """Seven hourly bars per weekday, as stored for US equities"""
+    sessions = pd.bdate_range('2024-01-02', periods=days)
+    return pd.DatetimeIndex([day + pd.Timedelta(hours=14 + h) for day in sessions for h in range(7)])
+
+
+class TestAnnualization:
+
+    def test_periods_follow_bar_spacing(self):
+        assert periods_per_year(market_hours()) == pytest.approx(252 * 7)
+        assert periods_per_year(pd.bdate_range('2024-01-02', periods=60)) == 252
+        assert periods_per_year(pd.date_range('2024-01-05', periods=20, freq='W-FRI')) == 52
+        assert periods_per_year(market_hours()[:1]) == 252
+
+    def test_hourly_sharpe_uses_hourly_periods(self):
+        rng = np.random.default_rng(5)
+        stamps = market_hours()
+        equity = 10_000 * np.cumprod(1 + rng.normal(0.0005, 0.002, len(stamps)))
+        returns = equity[1:] / equity[:-1] - 1
+
+        report = analyze(equity, stamps)
+        expected = returns.mean() / returns.std(ddof=1) * np.sqrt(252 * 7)
+        assert report.sharpe_ratio == pytest.approx(expected)
+        assert report.volatility == pytest.approx(returns.std(ddof=1) * np.sqrt(252 * 7) * 100)
+
+
+class TestEquityMetrics:
+
+    def test_ratios_and_drawdown_durations_by_hand(self):
+        equity = np.array([100.0, 110.0, 99.0, 104.5, 110.0, 121.0, 115.0])
+        metrics = equity_metrics(equity, periods=252)
+        returns = equity[1:] / equity[:-1] - 1
+
+        downside = np.sqrt((np.minimum(returns, 0) ** 2).mean())
+        assert metrics['sortino_ratio'] == pytest.approx(returns.mean() / downside * np.sqrt(252))
+        assert metrics['max_drawdown_pct'] == pytest.approx(-10.0)
+        annual = (1.15 ** (252 / 6) - 1) * 100
+        assert metrics['annual_return_pct'] == pytest.approx(annual)
+        assert metrics['calmar_ratio'] == pytest.approx(annual / 10.0)
+        # Bars 2-3 sit below the 110 high (regained at bar 4); the last bar is below 121
+        assert (metrics['max_drawdown_duration'], metrics['current_drawdown_duration']) == (2, 1)
+
+    def test_rolling_sharpe_matches_pandas(self):
+        equity = 100 * np.cumprod(1 + np.random.default_rng(6).normal(0, 0.01, 300))
+        returns = pd.Series(equity).pct_change().dropna()
+        rolling = returns.rolling(20)
+        expected = (rolling.mean() / rolling.std() * np.sqrt(1764)).to_numpy()
+
+        np.testing.assert_allclose(rolling_sharpe(equity, 20, 1764), expected, rtol=1e-8, equal_nan=True)
+
+    def test_sweep_rows_match_single_curves_and_stay_fast(self):
+        rng = np.random.default_rng(7)
+        curves = 10_000 * np.cumprod(1 + rng.normal(0.0002, 0.01, size=(2000, 500)), axis=1)
+
+        started = time.perf_counter()
+        sweep = equity_metrics(curves, periods=1764)
+        elapsed = time.perf_counter() - started
+
+        for row in (0, 1234, 1999):
+            single = equity_metrics(curves[row], periods=1764)
+            for name, value in single.items():
+                assert sweep[name][row] == pytest.approx(value), name
+        assert elapsed < 1.0
+
+
+class TestPositionsAndTurnover:
+
+    def test_exposure_max_positions_and_turnover_from_trades(self):
+        stamps = market_hours(2)
+        log = TradeLog()
+        log.append('AAPL', stamps[1], stamps[4], 100.0, 102.0, 10, 20.0, 2.0, 3.0, 'sma')
+        log.append('MSFT', stamps[2], stamps[5], 50.0, 49.0, 20, -20.0, -2.0, 3.0, 'sma')
+        equity = np.full(len(stamps), 10_000.0)
+
+        counts = concurrent_positions(stamps, log.column('entry_time'), log.column('exit_time'))
+        assert counts.tolist() == [0, 1, 2, 2, 1, 0] + [0] * 8
+
+        report = analyze(equity, stamps, log)
+        assert report.max_positions == 2
+        assert report.exposure_pct == pytest.approx(4 / 14 * 100)
+        assert report.turnover == pytest.approx((1000 + 1020 + 1000 + 980) / 10_000)
+        assert report.annual_turnover == pytest.approx(report.turnover * 252 * 7 / 13)
+        assert (report.total_trades, report.win_rate, report.profit_factor) == (2, 50.0, 1.0)
+        assert 'rolling_sharpe' not in report.to_dict()
@@ -0,0 +1,228 @@
+"""
+Unit tests for the portfolio risk engine
+Tests the incremental covariance, batch limit checks, pair candidates and strategy manager gating
+"""
+
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.trading.brokers.broker_state_cache import BrokerStateCache
+from src.trading.brokers.fake_broker import FakeBroker
+from src.trading.brokers.order_router import OrderRequest, OrderRouter
+from src.trading.strategies.base_strategy import BaseStrategy, SignalType, StrategySignal
+from src.trading.strategies.market_data_hub import MarketDataHub, ReplayBarSource
+from src.trading.strategies.portfolio_risk import PortfolioRiskEngine, RiskLimits, RollingCovariance
+from src.trading.strategies.strategy_manager import StrategyConfig, StrategyManager
+
+HOUR = 3_600_000_000_000
+
+
+def random_walk(rng, n_bars, n_assets, start=100.0):
+    return start * np.exp(np.cumsum(rng.normal(0, 0.01, size=(n_bars, n_assets)), axis=0))
+
+
+def make_engine(symbols, sectors=None, closes=None, **limits):
+    engine = PortfolioRiskEngine(RiskLimits(**limits), equity=100_000.0, window=60, sector_source=None)
+    engine.set_symbols(symbols)
+    engine.set_sectors(sectors or {})
+    if closes is None:
+        closes = np.full((2, len(symbols)), 100.0)
+    stamps = np.arange(len(closes), dtype=np.int64) * HOUR
+    engine.on_bars({symbol: (stamps, closes[:, i]) for i, symbol in enumerate(sorted(symbols))})
+    return engine
+
+
+class TestRollingCovariance:
+
+    def test_matches_numpy_after_the_window_wraps(self):
+        returns = np.random.default_rng(1).normal(0, 0.01, size=(250, 4))
+        rolling = RollingCovariance(4, window=60)
+        for row in returns:
+            rolling.update(row)
+        assert len(rolling) == 60
+        np.testing.assert_allclose(rolling.covariance(), np.cov(returns[-60:], rowvar=False), atol=1e-12)
+
+    def test_engine_seeds_then_updates_per_bar(self):
+        rng = np.random.default_rng(2)
+        closes = random_walk(rng, 100, 3)
+        symbols = ['AAA', 'BBB', 'CCC']
+        stamps = np.arange(100, dtype=np.int64) * HOUR
+        engine = PortfolioRiskEngine(window=60, sector_source=None)
+        engine.set_symbols(symbols)
+
+        assert engine.on_bars({s: (stamps[:80], closes[:80, i]) for i, s in enumerate(symbols)}) == 61
+        for bar in range(80, 100):
+            assert engine.on_bars({s: (stamps[:bar + 1], closes[:bar + 1, i]) for i, s in enumerate(symbols)}) == 1
+        assert engine.on_bars({s: (stamps, closes[:, i]) for i, s in enumerate(symbols)}) == 0
+
+        returns = closes[1:] / closes[:-1] - 1
+        np.testing.assert_allclose(engine.covariance.covariance(), np.cov(returns[-60:], rowvar=False), atol=1e-12)
+        assert engine.get_stats()['bars'] == 20
+
+
+class TestLimits:
+
+    def test_exposure_sector_and_position_limits(self):
+        engine = make_engine(['AAPL', 'MSFT', 'XOM'], {'AAPL': 'Tech', 'MSFT': 'Tech', 'XOM': 'Energy'},
+                             max_gross_exposure=0.5, max_sector_exposure=0.3, max_positions=2)
+        engine.set_book({'AAPL': 200})
+
+        decisions = engine.evaluate([{'MSFT': 150}, {'XOM': 250}, {'XOM': 100}, {'MSFT': -50}, {'TSLA': 1}])
+        assert [(d.accepted, d.reason) for d in decisions] == [
+            (False, 'sector_exposure'), (True, None), (False, 'gross_exposure'), (False, 'positions'),
+            (False, 'unpriced')]
+        assert decisions[1].metrics['gross_exposure'] == pytest.approx(0.45)
+        assert engine.get_stats()['rejected'] == {'sector_exposure': 1, 'gross_exposure': 1, 'positions': 1,
+                                                  'unpriced': 1}
+
+    def test_symbols_without_a_sector_are_not_held_to_the_sector_limit(self):
+        engine = make_engine(['AAPL', 'MSFT', 'XOM'], {'XOM': 'Energy'}, max_sector_exposure=0.3)
+        decisions = engine.evaluate([{'AAPL': 200, 'MSFT': 200}, {'XOM': 400}])
+        assert [(d.accepted, d.reason) for d in decisions] == [(True, None), (False, 'sector_exposure')]
+
+    def test_failed_sector_lookup_is_retried(self):
+        answers = [RuntimeError('database is down'), {'AAPL': 'Tech'}]
+
+        def lookup(symbols):
+            answer = answers.pop(0)
+            if isinstance(answer, Exception):
+                raise answer
+            return answer
+
+        engine = PortfolioRiskEngine(equity=100_000.0, sector_source=lookup)
+        engine.set_symbols(['AAPL', 'MSFT'])
+        engine.refresh_sectors()
+        engine.refresh_sectors()
+        engine.refresh_sectors()
+
+        # The lookup succeeded on the second call; MSFT has no row and stays Unknown without more lookups
+        assert answers == []
+        assert engine._sector_labels == ['Tech', 'Unknown']
+
+    def test_reducing_trades_pass_when_already_over_a_limit(self):
+        engine = make_engine(['AAPL', 'MSFT'], max_gross_exposure=0.5)
+        engine.set_book({'AAPL': 800})
+        decisions = engine.evaluate([{'AAPL': -100}, {'MSFT': 10}])
+        assert [(d.accepted, d.reason) for d in decisions] == [(True, None), (False, 'gross_exposure')]
+        assert decisions[0].metrics['gross_exposure'] == pytest.approx(0.7)
+
+    def test_hedged_pair_passes_var_where_one_leg_fails(self):
+        rng = np.random.default_rng(3)
+        common = rng.normal(0, 0.01, size=200)
+        noise = rng.normal(0, 0.001, size=(200, 2))
+        closes = 100.0 * np.exp(np.cumsum(common[:, None] + noise, axis=0))
+        engine = make_engine(['KO', 'PEP'], closes=closes, max_var=0.01, max_gross_exposure=3.0,
+                             max_sector_exposure=3.0)
+
+        # $100k a leg: about 1.6% one-bar VaR alone, a fraction of that hedged
+        legs = {'KO': 100_000 / closes[-1, 0], 'PEP': -100_000 / closes[-1, 1]}
+        single, pair = engine.evaluate([{'KO': legs['KO']}, legs])
+        assert (single.accepted, single.reason) == (False, 'var')
+        assert pair.accepted and pair.metrics['var'] < 0.01 < single.metrics['var']
+
+
+class TestBudget:
+
+    def test_batch_of_signals_within_a_millisecond(self):
+        rng = np.random.default_rng(4)
+        symbols = [f'S{i:03d}' for i in range(100)]
+        engine = make_engine(symbols, {s: f'sector{i % 11}' for i, s in enumerate(symbols)},
+                             closes=random_walk(rng, 61, 100))
+        engine.set_book({symbol: 10 for symbol in symbols[:40]})
+        candidates = [{symbols[i]: 5, symbols[i + 1]: -5} for i in range(0, 40, 2)]
+
+        timings = []
+        for _ in range(25):
+            started = time.perf_counter()
+            engine.evaluate(candidates)
+            timings.append(time.perf_counter() - started)
+        assert statistics.median(timings) < 0.001
+
+
+class MultiSignalStrategy(BaseStrategy):
+
+    def __init__(self, symbols, quantity=100, **kwargs):
+        super().__init__(name="MultiSignal", symbols=symbols, **kwargs)
+        self.quantity = quantity
+
+    def generate_signals(self, market_data):
+        return [StrategySignal(symbol, SignalType.BUY, 0.9, datetime.now(timezone.utc)) for symbol in self.symbols]
+
+    def calculate_position_size(self, signal, available_capital):
+        return self.quantity
+
+
+class CachedBroker(FakeBroker):
+    """FakeBroker whose positions and account are read through a BrokerStateCache, like AlpacaService"""
+
+    def __init__(self):
+        super().__init__()
+        self.state_cache = BrokerStateCache(ttls={'positions': 60.0, 'account': 60.0})
+
+    def get_positions(self):
+        return self.state_cache.get('positions', lambda: [
+            {'symbol': order['symbol'], 'qty': order['filled_qty'] * (1 if order['side'] == 'buy' else -1)}
+            for order in self.orders.values() if order['filled_qty']])
+
+    def get_account_info(self):
+        return self.state_cache.get('account', lambda: {'portfolio_value': 100_000.0})
+
+
+class TestStrategyManagerGating:
+
+    def test_fill_between_syncs_stays_in_the_book_while_positions_are_cached(self):
+        broker = CachedBroker()
+        router = OrderRouter(broker, fill_poll_interval=60.0)
+        router.start()
+        try:
+            manager = StrategyManager(broker_service=broker, order_router=router,
+                                      risk_engine=make_engine(['AAPL'], max_gross_exposure=0.15))
+            request = OrderRequest('AAPL', 100, 'buy')
+            router.submit(request).result(timeout=5)
+
+            manager._sync_risk_book()
+            assert not manager.risk_engine.evaluate([{'AAPL': 60}])[0].accepted
+
+            # Fills and retires the order while the cached positions are still empty
+            broker.fill(request.client_order_id)
+            assert router.apply_update(broker.get_order_by_client_id(request.client_order_id))
+            assert router.in_flight() == []
+
+            manager._sync_risk_book()
+            decision = manager.risk_engine.evaluate([{'AAPL': 60}])[0]
+            assert (decision.accepted, decision.reason) == (False, 'gross_exposure')
+        finally:
+            router.stop()
+
+    def test_batch_rejects_signals_past_the_sector_limit(self):
+        start = pd.Timestamp('2024-01-02 14:00')
+        frames = {symbol: pd.DataFrame({'timestamp': [start], 'open': [100.0], 'high': [100.0], 'low': [100.0],
+                                        'close': [100.0], 'volume': [1.0]}) for symbol in ('AAPL', 'MSFT', 'XOM')}
+        hub = MarketDataHub(ReplayBarSource(frames))
+        engine = PortfolioRiskEngine(RiskLimits(max_sector_exposure=0.15), equity=100_000.0, sector_source=lambda
+                                     symbols: {'AAPL': 'Tech', 'MSFT': 'Tech', 'XOM': 'Energy'})
+        manager = StrategyManager(market_data_hub=hub, risk_engine=engine)
+        manager.add_strategy('multi', StrategyConfig(MultiSignalStrategy, ['AAPL', 'MSFT', 'XOM'],
+                                                     {'symbols': ['AAPL', 'MSFT', 'XOM']}, {}))
+        manager.start_strategy('multi')
+        executed = []
+        manager.add_signal_callback(lambda signal, name, instructions: executed.append(signal.symbol))
+
+        manager.run_strategies(hub.poll())
+        manager._shutdown_executors()
+
+        assert executed == ['AAPL', 'XOM']
+        risk = manager.get_status()['risk']
+        assert risk['rejected'] == {'sector_exposure': 1}
+        assert risk['sectors'] == {'Energy': pytest.approx(0.1), 'Tech': pytest.approx(0.1)}
@@ -0,0 +1,156 @@
+"""
+Unit tests for DatabaseManager read replica routing
+Tests read/write split, staleness fallback and per-pool metrics
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.data.storage import database
+from src.data.storage.connection_pool import BlockingConnectionPool
+
+
+class FakeCursor:
+    """Cursor answering the replica lag probe"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def execute(self, query, params=None):
+        if self.conn.server['down']:
+            raise RuntimeError("could not connect to server")
+
+    def fetchone(self):
+        return (self.conn.server['lag'],)
+
+    def fetchall(self):
+        return []
+
+
+class FakeConnection:
+    """Stand-in for a psycopg2 connection to one of the servers"""
+
+    def __init__(self, server):
+        self.server = server
+        self.closed = 0
+
+    def cursor(self, *args, **kwargs):
+        return FakeCursor(self)
+
+    def get_transaction_status(self):
+        return 0
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = 1
+
+
+@pytest.fixture
+def servers():
+    return {
+        'primary': {'name': 'primary', 'lag': 0.0, 'down': False},
+        'replica': {'name': 'replica', 'lag': 0.0, 'down': False},
+    }
+
+
+@pytest.fixture
+def db_manager(servers):
+    """DatabaseManager with a primary and a replica pool of fake connections"""
+
+    def pool_factory(minconn, maxconn, **kwargs):
+        server = servers['replica'] if kwargs['host'] == 'replica-host' else servers['primary']
+        return BlockingConnectionPool(minconn, maxconn, connection_factory=lambda: FakeConnection(server),
+                                      **kwargs)
+
+    with patch.object(database, 'BlockingConnectionPool', pool_factory), \
+            patch.object(database.ConnectionConfig, 'REPLICA_LAG_CHECK_INTERVAL', 0):
+        manager = database.DatabaseManager(host='localhost', port=5432, database='test', user='test',
+                                           password='test', min_conn=1, max_conn=2,
+                                           replica_host='replica-host', max_replica_lag=10)
+        yield manager
+    manager.close()
+
+
+class TestReadReplicaRouting:
+    """Test routing of read-only work between replica and primary"""
+
+    def test_reads_use_replica_and_writes_use_primary(self, db_manager):
+        read_conn = db_manager.get_read_connection()
+        write_conn = db_manager.get_connection()
+
+        assert read_conn.server['name'] == 'replica'
+        assert write_conn.server['name'] == 'primary'
+        db_manager.return_connection(read_conn)
+        db_manager.return_connection(write_conn)
+
+    def test_connections_return_to_owning_pool(self, db_manager):
+        with db_manager.get_read_connection_context():
+            assert db_manager.read_pool.get_stats()['used_connections'] == 1
+            assert db_manager.get_pool_stats()['used_connections'] == 0
+
+        assert db_manager.read_pool.get_stats()['used_connections'] == 0
+        assert db_manager.read_pool.get_stats()['available_connections'] == 1
+
+    def test_stale_replica_falls_back_to_primary(self, db_manager, servers):
+        servers['replica']['lag'] = 60.0
+
+        with db_manager.get_read_connection_context() as conn:
+            assert conn.server['name'] == 'primary'
+        routing = db_manager.get_all_pool_stats()['routing']
+        assert routing['stale_fallbacks'] == 1
+        assert routing['replica_lag_seconds'] == 60.0
+
+    def test_unreachable_replica_falls_back_to_primary(self, db_manager, servers):
+        servers['replica']['down'] = True
+
+        with db_manager.get_read_connection_context() as conn:
+            assert conn.server['name'] == 'primary'
+        assert db_manager.get_all_pool_stats()['routing']['error_fallbacks'] == 1
+
+    def test_read_only_methods_are_routed(self, db_manager):
+        with patch.object(db_manager, 'get_read_connection', wraps=db_manager.get_read_connection) as read:
+            db_manager.get_all_sectors()
+        assert read.call_count == 1
+
+    def test_per_pool_metrics(self, db_manager):
+        for _ in range(3):
+            with db_manager.get_read_connection_context():
+                pass
+
+        stats = db_manager.get_all_pool_stats()
+        assert stats['routing']['replica_reads'] == 3
+        assert stats['routing']['primary_reads'] == 0
+        assert stats['replica']['acquired'] >= 3
+        assert stats['primary']['max_connections'] == 2
+
+    def test_without_replica_reads_use_primary(self):
+        pool_factory = lambda minconn, maxconn, **kwargs: BlockingConnectionPool(
+            minconn, maxconn, connection_factory=lambda: FakeConnection({'name': 'primary', 'lag': 0.0, 'down': False}), **kwargs)
+        with patch.object(database, 'BlockingConnectionPool', pool_factory):
+            manager = database.DatabaseManager(host='localhost', port=5432, database='test', user='test',
+                                               password='test', min_conn=1, max_conn=2)
+        try:
+            conn = manager.get_read_connection()
+            assert conn.server['name'] == 'primary'
+            manager.return_connection(conn)
+            assert manager.get_all_pool_stats()['replica'] is None
+        finally:
+            manager.close()
@@ -0,0 +1,103 @@
+"""
+Unit tests for the rolling moment kernels
+Golden test against stored pandas rolling mean/std/skew/kurt and vol-of-vol outputs
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.data.processors.rolling_kernels import _finalize, _moments_loop, rolling_moments, rolling_std
+
+GOLDEN_FILE = project_root / 'tests' / 'fixtures' / 'rolling_moments_golden.csv'
+WINDOWS = [6, 12, 24]
+STATS = ['mean', 'std', 'skew', 'kurt']
+
+
+def write_golden_fixture(path=GOLDEN_FILE, rows=480, seed=11):
+    """Regenerate the golden file from pandas (python tests/unit/test_rolling_kernels.py)"""
+    rng = np.random.default_rng(seed)
+    close = 150 * np.exp(np.cumsum(rng.standard_t(4, size=rows) * 0.004))
+    close[200:220] = close[199]  # halted stretch: constant windows
+    returns = pd.Series(close).pct_change()
+    golden = pd.DataFrame({'returns': returns})
+    for window in WINDOWS:
+        rolling = returns.rolling(window)
+        for stat in STATS:
+            golden[f'{stat}_{window}'] = getattr(rolling, stat)()
+    golden['realized_vol_med'] = returns.rolling(24).std() * np.sqrt(24)
+    golden['vol_of_vol'] = golden['realized_vol_med'].rolling(24).std()
+    golden.to_csv(path, index=False, float_format='%.17g')
+
+
+@pytest.fixture(scope='module')
+def golden():
+    return pd.read_csv(GOLDEN_FILE)
+
+
+def assert_close(actual, expected):
+    expected = np.asarray(expected, dtype=np.float64)
+    np.testing.assert_array_equal(np.isnan(actual), np.isnan(expected))
+    np.testing.assert_allclose(actual, expected, rtol=1e-6, atol=1e-9, equal_nan=True)
+
+
+class TestGoldenMoments:
+
+    @pytest.mark.parametrize('window', WINDOWS)
+    def test_numpy_kernel_matches_pandas(self, golden, window):
+        moments = rolling_moments(golden['returns'], window, engine='numpy')
+        for stat in STATS:
+            assert_close(getattr(moments, stat), golden[f'{stat}_{window}'])
+
+    @pytest.mark.parametrize('window', WINDOWS)
+    def test_single_pass_kernel_matches_pandas(self, golden, window):
+        # Uncompiled form of the Numba kernel
+        values = golden['returns'].to_numpy()
+        moments = _finalize(*_moments_loop(values, window), window)
+        for stat in STATS:
+            assert_close(getattr(moments, stat), golden[f'{stat}_{window}'])
+
+    def test_vol_of_vol_matches_pandas(self, golden):
+        realized_vol_med = rolling_std(golden['returns'], 24) * np.sqrt(24)
+        assert_close(realized_vol_med, golden['realized_vol_med'])
+        assert_close(rolling_std(realized_vol_med, 24), golden['vol_of_vol'])
+
+
+class TestEdgeCases:
+
+    def test_constant_window_has_zero_skew_and_negative_three_kurt(self):
+        moments = rolling_moments(np.full(10, 0.25), 5)
+        assert moments.std[-1] == 0.0
+        assert moments.skew[-1] == 0.0
+        assert moments.kurt[-1] == -3.0
+
+    def test_min_periods_and_nan_windows(self):
+        values = np.array([0.1, np.nan, 0.3, -0.2, 0.5, 0.05, -0.1])
+        series = pd.Series(values)
+        for min_periods in (None, 2):
+            moments = rolling_moments(values, 4, min_periods=min_periods)
+            rolling = series.rolling(4, min_periods=min_periods)
+            for stat in STATS:
+                assert_close(getattr(moments, stat), getattr(rolling, stat)())
+
+    def test_short_series_is_all_nan(self):
+        moments = rolling_moments(np.array([0.1, 0.2]), 6)
+        assert np.isnan(moments.kurt).all() and len(moments.mean) == 2
+
+    def test_numba_engine_requires_numba(self):
+        from src.data.processors import rolling_kernels
+        if rolling_kernels.NUMBA_AVAILABLE:
+            pytest.skip("numba installed")
+        with pytest.raises(ImportError):
+            rolling_moments(np.zeros(10), 3, engine='numba')
+
+
+if __name__ == '__main__':
+    write_golden_fixture()
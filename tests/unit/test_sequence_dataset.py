@@ -0,0 +1,122 @@
+"""
+Unit tests for the rolling-window sequence dataset
+Tests zero-copy windows, label alignment, leakage-free splits, batching and memmap backing
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.data.processors.sequence_dataset import SequenceDataset, build_memmap_dataset, forward_returns
+
+
+def make_frame(symbols=('AAPL', 'MSFT'), periods=20):
+    frames = []
+    for k, symbol in enumerate(symbols):
+        close = 100.0 + k * 50 + np.arange(periods, dtype=float)
+        frames.append(pd.DataFrame({
+            'symbol': symbol,
+            'timestamp': pd.date_range('2024-01-01 10:00', periods=periods, freq='h'),
+            'close': close,
+            'rsi_1d': np.arange(periods, dtype=float) + k * 1000,
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+class TestSequenceWindows:
+
+    def test_windows_are_views_over_feature_array(self):
+        dataset = SequenceDataset.from_frame(make_frame(), ['close', 'rsi_1d'], window=5, horizon=2)
+        series = dataset.series[0]
+        x, _ = dataset[0]
+
+        assert x.shape == (5, 2)
+        assert np.shares_memory(series.windows, series.values)
+        assert np.shares_memory(x, series.values)
+
+    def test_label_is_forward_return_from_last_window_bar(self):
+        dataset = SequenceDataset.from_frame(make_frame(), ['close', 'rsi_1d'], window=5, horizon=2)
+
+        # 20 bars, 16 windows, the last 2 have no future label
+        assert len(dataset) == 2 * 14
+        x, y = dataset[3]
+        last_close = x[-1, 0]
+        assert last_close == 107.0
+        np.testing.assert_allclose(y, 109.0 / 107.0 - 1, rtol=1e-6)
+
+    def test_forward_log_returns(self):
+        labels = forward_returns(np.array([1.0, np.e, np.e ** 3]), 1, log=True)
+        np.testing.assert_allclose(labels[:2], [1.0, 2.0], rtol=1e-6)
+        assert np.isnan(labels[2])
+
+
+class TestSequenceSplits:
+
+    def test_split_has_no_input_or_label_overlap(self):
+        dataset = SequenceDataset.from_frame(make_frame(periods=60), ['close'], window=6, horizon=3)
+        train_end, val_end = pd.Timestamp('2024-01-02 06:00'), pd.Timestamp('2024-01-02 23:00')
+
+        split = dataset.split_by_time(train_end, val_end)
+
+        assert len(split.train) and len(split.val) and len(split.test)
+        assert split.train._times_at(dataset.window - 1 + dataset.horizon).max() <= np.datetime64(train_end)
+        assert split.val._times_at(0).min() > np.datetime64(train_end)
+        assert split.val._times_at(dataset.window - 1 + dataset.horizon).max() <= np.datetime64(val_end)
+        assert split.test._times_at(0).min() > np.datetime64(val_end)
+        # Subsets reuse the same arrays
+        assert split.train.series[0] is dataset.series[0]
+
+
+class TestSequenceBatches:
+
+    def test_batches_cover_every_sample_once(self):
+        dataset = SequenceDataset.from_frame(make_frame(), ['close', 'rsi_1d'], window=4)
+        seen = []
+        for x, y in dataset.batches(7, shuffle=True, seed=3):
+            assert x.shape[1:] == (4, 2) and x.dtype == np.float32
+            seen.extend(x[:, 0, 1].tolist())
+
+        expected = [dataset[i][0][0, 1] for i in range(len(dataset))]
+        assert sorted(seen) == sorted(expected)
+
+    def test_gather_matches_item_access(self):
+        dataset = SequenceDataset.from_frame(make_frame(), ['close', 'rsi_1d'], window=4)
+        rows = np.array([20, 1, 5])
+        x, y = dataset.gather(rows)
+        for k, i in enumerate(rows):
+            np.testing.assert_array_equal(x[k], dataset[i][0])
+            assert y[k] == dataset[i][1]
+
+
+class TestMemmapBacking:
+
+    def test_memmap_round_trip(self, tmp_path):
+        dataset = SequenceDataset.from_frame(make_frame(), ['close', 'rsi_1d'], window=5, horizon=2)
+        dataset.to_memmap(tmp_path / 'ds')
+
+        reopened = SequenceDataset.open_memmap(tmp_path / 'ds')
+
+        assert isinstance(reopened.series[0].values, np.memmap)
+        assert reopened.symbols == ['AAPL', 'MSFT']
+        np.testing.assert_array_equal(reopened.index, dataset.index)
+        x1, y1 = next(dataset.batches(32))
+        x2, y2 = next(reopened.batches(32))
+        np.testing.assert_array_equal(x1, x2)
+        np.testing.assert_array_equal(y1, y2)
+
+    def test_build_streams_one_symbol_at_a_time(self, tmp_path):
+        frame = make_frame()
+        frames = ((symbol, group) for symbol, group in frame.groupby('symbol'))
+
+        dataset = build_memmap_dataset(tmp_path / 'ds', frames, ['close', 'rsi_1d'], window=5, horizon=2)
+        in_memory = SequenceDataset.from_frame(frame, ['close', 'rsi_1d'], window=5, horizon=2)
+
+        assert len(dataset) == len(in_memory)
+        np.testing.assert_array_equal(dataset[10][0], in_memory[10][0])
+        np.testing.assert_array_equal(dataset.sample_times(), in_memory.sample_times())
@@ -0,0 +1,185 @@
+"""
+Unit tests for the prepared statement registry
+Tests per-connection PREPARE, fallbacks and per-statement stats
+"""
+
+import sys
+from pathlib import Path
+
+import psycopg2
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.data.storage.statement_cache import PreparedStatementRegistry, to_server_placeholders
+
+
+class MissingStatementError(psycopg2.Error):
+    """psycopg2 error carrying the 'prepared statement does not exist' SQLSTATE"""
+
+    @property
+    def pgcode(self):
+        return '26000'
+
+
+class RecordingConnection:
+    """Fake connection that records every statement sent to the server"""
+
+    def __init__(self):
+        self.executed = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.in_transaction = False
+        self.forget_next_execute = False
+        self.reject_prepare = False
+
+    def cursor(self):
+        return RecordingCursor(self)
+
+    def get_transaction_status(self):
+        return 2 if self.in_transaction else 0
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class RecordingCursor:
+
+    def __init__(self, conn):
+        self.connection = conn
+
+    def execute(self, sql, params=None):
+        if sql.startswith('EXECUTE') and self.connection.forget_next_execute:
+            self.connection.forget_next_execute = False
+            raise MissingStatementError("prepared statement does not exist")
+        self.connection.executed.append((sql, params))
+        if sql.startswith('PREPARE') and self.connection.reject_prepare:
+            raise psycopg2.ProgrammingError("could not determine data type of parameter $1")
+
+
+def statements(conn, prefix):
+    return [sql for sql, _ in conn.executed if sql.startswith(prefix)]
+
+
+class TestPlaceholderConversion:
+
+    def test_positional_placeholders_numbered(self):
+        sql, count = to_server_placeholders("SELECT * FROM t WHERE a = %s AND b > %s")
+        assert sql == "SELECT * FROM t WHERE a = $1 AND b > $2"
+        assert count == 2
+
+    def test_escaped_percent_unescaped(self):
+        sql, count = to_server_placeholders("SELECT * FROM t WHERE name LIKE 'A%%' AND id = %s")
+        assert sql == "SELECT * FROM t WHERE name LIKE 'A%' AND id = $1"
+        assert count == 1
+
+    def test_placeholder_inside_literal_rejected(self):
+        with pytest.raises(ValueError):
+            to_server_placeholders("SELECT * FROM t WHERE ts >= NOW() - INTERVAL '%s days'")
+
+
+class TestPreparedStatementRegistry:
+
+    def setup_method(self):
+        self.registry = PreparedStatementRegistry()
+        self.registry.register('stock_info', "SELECT * FROM stock_info WHERE symbol = %s")
+
+    def test_prepares_once_per_connection(self):
+        conn = RecordingConnection()
+        for symbol in ['AAPL', 'MSFT', 'AAPL']:
+            self.registry.execute(conn.cursor(), 'stock_info', (symbol,))
+
+        assert statements(conn, 'PREPARE') == ["PREPARE stock_info AS SELECT * FROM stock_info WHERE symbol = $1"]
+        assert len(statements(conn, 'EXECUTE stock_info')) == 3
+        assert conn.executed[-1] == ("EXECUTE stock_info (%s)", ('AAPL',))
+
+    def test_each_connection_prepares_separately(self):
+        first, second = RecordingConnection(), RecordingConnection()
+        self.registry.execute(first.cursor(), 'stock_info', ('AAPL',))
+        self.registry.execute(second.cursor(), 'stock_info', ('AAPL',))
+
+        assert len(statements(first, 'PREPARE')) == 1
+        assert len(statements(second, 'PREPARE')) == 1
+
+    def test_open_transaction_runs_plain_sql(self):
+        conn = RecordingConnection()
+        conn.in_transaction = True
+        self.registry.execute(conn.cursor(), 'stock_info', ('AAPL',))
+
+        assert statements(conn, 'PREPARE') == []
+        assert conn.commits == 0
+        assert self.registry.get_stats()['stock_info']['unprepared_calls'] == 1
+
+    def test_lost_statement_is_prepared_again(self):
+        conn = RecordingConnection()
+        self.registry.execute(conn.cursor(), 'stock_info', ('AAPL',))
+        conn.forget_next_execute = True
+        self.registry.execute(conn.cursor(), 'stock_info', ('AAPL',))
+
+        assert len(statements(conn, 'PREPARE')) == 2
+        assert len(statements(conn, 'EXECUTE')) == 2
+
+    def test_lost_statement_inside_transaction_is_raised_without_rollback(self):
+        conn = RecordingConnection()
+        self.registry.execute(conn.cursor(), 'stock_info', ('AAPL',))
+        conn.in_transaction = True
+        conn.forget_next_execute = True
+        with pytest.raises(MissingStatementError):
+            self.registry.execute(conn.cursor(), 'stock_info', ('AAPL',))
+
+        # The caller's transaction is theirs to roll back; the statement is re-prepared once idle again
+        assert conn.rollbacks == 0
+        assert self.registry.get_stats()['stock_info']['errors'] == 1
+        conn.in_transaction = False
+        self.registry.execute(conn.cursor(), 'stock_info', ('AAPL',))
+        assert len(statements(conn, 'PREPARE')) == 2
+
+    def test_rejected_prepare_runs_plain_sql_on_that_connection(self):
+        rejecting, healthy = RecordingConnection(), RecordingConnection()
+        rejecting.reject_prepare = True
+        for _ in range(2):
+            self.registry.execute(rejecting.cursor(), 'stock_info', ('AAPL',))
+        self.registry.execute(healthy.cursor(), 'stock_info', ('AAPL',))
+
+        # One attempt, undone with the savepoint; later calls skip straight to the plain SQL
+        assert len(statements(rejecting, 'PREPARE')) == 1
+        assert statements(rejecting, 'ROLLBACK TO SAVEPOINT') == ['ROLLBACK TO SAVEPOINT prepare_statement']
+        assert statements(rejecting, 'SELECT') == ["SELECT * FROM stock_info WHERE symbol = %s"] * 2
+        assert statements(rejecting, 'EXECUTE') == []
+        assert len(statements(healthy, 'EXECUTE stock_info')) == 1
+        assert self.registry.get_stats()['stock_info']['unprepared_calls'] == 2
+
+    def test_stats_track_calls_and_latency(self):
+        conn = RecordingConnection()
+        for _ in range(4):
+            self.registry.execute(conn.cursor(), 'stock_info', ('AAPL',))
+
+        stats = self.registry.get_stats()['stock_info']
+        assert stats['calls'] == 4
+        assert stats['prepares'] == 1
+        assert stats['avg_ms'] >= 0
+
+    def test_execute_sql_auto_registers_selects(self):
+        conn = RecordingConnection()
+        query = "SELECT symbol FROM stock_info WHERE sector = %s"
+        self.registry.execute_sql(conn.cursor(), query, ('Tech',))
+        self.registry.execute_sql(conn.cursor(), query, ('Energy',))
+
+        assert len(statements(conn, 'PREPARE')) == 1
+        assert len(statements(conn, 'EXECUTE auto_')) == 2
+
+    def test_execute_sql_leaves_unpreparable_text_alone(self):
+        conn = RecordingConnection()
+        interval_query = "SELECT * FROM market_data WHERE timestamp >= NOW() - INTERVAL '%s days'"
+        in_query = "SELECT * FROM stock_info WHERE symbol IN %s"
+        self.registry.execute_sql(conn.cursor(), interval_query, (30,))
+        self.registry.execute_sql(conn.cursor(), in_query, (('AAPL', 'MSFT'),))
+        self.registry.execute_sql(conn.cursor(), "DELETE FROM t WHERE id = %s", (1,))
+
+        assert statements(conn, 'PREPARE') == []
+        assert [sql for sql, _ in conn.executed] == [interval_query, in_query, "DELETE FROM t WHERE id = %s"]
@@ -0,0 +1,147 @@
+"""
+Unit tests for concurrent strategy evaluation in the strategy manager
+Tests deadlines, late-result dropping, signal ordering and process-pool strategies
+"""
+
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.trading.strategies.base_strategy import (BaseStrategy, SignalType, StrategyPosition, StrategySignal,
+                                                  StrategyState)
+from src.trading.strategies.simple_moving_average import MomentumStrategy
+from src.trading.strategies.strategy_manager import StrategyConfig, StrategyManager
+
+
+def signal(symbol, strength):
+    return StrategySignal(symbol, SignalType.BUY, strength, datetime.now(timezone.utc))
+
+
+class ScriptedStrategy(BaseStrategy):
+    """Sleeps, then returns three signals (or raises)"""
+
+    def __init__(self, symbols, delay=0.0, fail=False, release=None, **kwargs):
+        super().__init__(name="Scripted", symbols=symbols, **kwargs)
+        self.delay = delay
+        self.fail = fail
+        self.release = release
+
+    def generate_signals(self, market_data):
+        if self.release is not None:
+            self.release.wait(5)
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("model unavailable")
+        return [signal(self.symbols[0], strength) for strength in (0.1, 0.2, 0.3)]
+
+    def calculate_position_size(self, signal, available_capital):
+        return 0
+
+
+@pytest.fixture
+def manager():
+    manager = StrategyManager(max_workers=4)
+    processed = []
+    manager._process_signals = lambda signals, name: processed.extend((name, s.strength) for s in signals)
+    manager.processed = processed
+    yield manager
+    manager._shutdown_executors()
+
+
+def add(manager, name, deadline=1.0, executor='thread', **params):
+    config = StrategyConfig(ScriptedStrategy, [name.upper()], {'symbols': [name.upper()], **params}, {},
+                            executor=executor, deadline_seconds=deadline)
+    assert manager.add_strategy(name, config)
+    manager.start_strategy(name)
+
+
+class TestDeadlines:
+
+    def test_slow_strategy_does_not_hold_back_fast_ones(self, manager):
+        release = threading.Event()
+        add(manager, 'slow', deadline=0.2, release=release)
+        add(manager, 'fast')
+
+        started = time.perf_counter()
+        manager.run_strategies()
+        assert time.perf_counter() - started < 1.0
+        assert manager.processed == [('fast', 0.1), ('fast', 0.2), ('fast', 0.3)]
+
+        stats = manager.get_evaluation_stats()
+        assert (stats['slow']['late'], stats['slow']['in_flight']) == (1, True)
+        assert stats['fast']['evaluations'] == 1
+
+        # Still running: skipped rather than queued behind itself
+        manager.run_strategies()
+        assert manager.get_evaluation_stats()['slow']['skipped_in_flight'] == 1
+
+        release.set()
+        for _ in range(50):
+            if not manager.get_evaluation_stats()['slow']['in_flight']:
+                break
+            time.sleep(0.02)
+        assert manager.get_evaluation_stats()['slow']['evaluations'] == 1
+        assert ('slow', 0.1) not in manager.processed
+
+    def test_errors_mark_strategy(self, manager):
+        add(manager, 'broken', fail=True)
+        manager.run_strategies()
+        assert manager.strategies['broken'].state == StrategyState.ERROR
+        assert manager.get_evaluation_stats()['broken']['errors'] == 1
+
+    def test_unknown_executor_rejected(self, manager):
+        config = StrategyConfig(ScriptedStrategy, ['X'], {'symbols': ['X']}, {}, executor='gpu')
+        assert not manager.add_strategy('x', config)
+
+
+class TestReporting:
+
+    def test_status_includes_timing_histograms(self, manager):
+        add(manager, 'timed', delay=0.01)
+        manager.run_strategies()
+        evaluation = manager.get_status()['evaluation']['timed']
+        assert evaluation['executor'] == 'thread'
+        assert evaluation['timing']['count'] == 1
+        assert evaluation['timing']['max'] >= 0.01
+
+
+class TestProcessPool:
+
+    def test_process_strategy_returns_signals(self, manager):
+        add(manager, 'cpu', deadline=30.0, executor='process')
+        manager.run_strategies()
+        assert manager.processed == [('cpu', 0.1), ('cpu', 0.2), ('cpu', 0.3)]
+
+    def test_momentum_strategy_runs_in_a_worker_process(self, manager):
+        closes = np.linspace(110.0, 90.0, 40)
+        frame = pd.DataFrame({'open': closes, 'high': closes + 1, 'low': closes - 1, 'close': closes,
+                              'volume': 1000.0}, index=pd.date_range('2024-01-02', periods=40, freq='h', tz='UTC'))
+        manager._get_market_data = lambda symbols, lookback_bars: {'AAPL': frame}
+        config = StrategyConfig(MomentumStrategy, ['AAPL'], {'symbols': ['AAPL']}, {},
+                                executor='process', deadline_seconds=30.0)
+        assert manager.add_strategy('momentum', config)
+        manager.start_strategy('momentum')
+        strategy = manager.strategies['momentum']
+        strategy.positions['AAPL'] = StrategyPosition('AAPL', 10, 110.0, datetime.now(timezone.utc))
+
+        manager.run_strategies()
+        # Falling below its SMA while holding a position: the worker's snapshot exits it
+        assert manager.processed == [('momentum', 0.8)]
+        assert manager.get_evaluation_stats()['momentum']['errors'] == 0
+        assert 'AAPL' not in strategy.indicators
+
+    def test_unpicklable_strategy_rejected_for_process_executor(self, manager):
+        config = StrategyConfig(ScriptedStrategy, ['X'], {'symbols': ['X'], 'release': threading.Event()}, {},
+                                executor='process')
+        assert not manager.add_strategy('x', config)
+        assert 'x' not in manager.strategies
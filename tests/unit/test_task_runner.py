@@ -0,0 +1,230 @@
+"""
+Unit tests for the bounded concurrency task runner
+Tests DB slot limiting, executor reuse, adaptive limits and metrics
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.sequential_task_runner import (
+    BoundedConcurrencyRunner, SequentialTaskRunner, AdaptiveLimiter, get_safe_task_runner, run_bounded
+)
+from src.utils.connection_config import ConnectionConfig
+
+RUN_CONTEXT = contextvars.ContextVar('run_context', default=None)
+
+
+class TestBoundedConcurrencyRunner:
+    """Test concurrency limits and result handling"""
+
+    def test_results_keep_input_order(self):
+        """Results are returned in input order even when tasks finish out of order"""
+        runner = BoundedConcurrencyRunner(db_concurrency=4, adaptive=False)
+
+        def work(n):
+            time.sleep(0.01 * (5 - n))
+            return n * 2
+
+        results = asyncio.run(runner.map(work, [1, 2, 3, 4]))
+        assert results == [2, 4, 6, 8]
+        runner.shutdown()
+
+    def test_db_work_is_capped(self):
+        """No more than db_concurrency database tasks run at once"""
+        runner = BoundedConcurrencyRunner(db_concurrency=2, io_workers=8, adaptive=False)
+        lock = threading.Lock()
+        state = {'current': 0, 'peak': 0}
+
+        def work(n):
+            with lock:
+                state['current'] += 1
+                state['peak'] = max(state['peak'], state['current'])
+            time.sleep(0.02)
+            with lock:
+                state['current'] -= 1
+            return n
+
+        asyncio.run(runner.map(work, list(range(10))))
+        assert state['peak'] == 2
+        runner.shutdown()
+
+    def test_network_work_is_not_capped_by_db_limit(self):
+        """Tasks marked as not using the database run beyond the DB limit"""
+        runner = BoundedConcurrencyRunner(db_concurrency=1, io_workers=8, adaptive=False)
+        lock = threading.Lock()
+        state = {'current': 0, 'peak': 0}
+
+        def fetch(n):
+            with lock:
+                state['current'] += 1
+                state['peak'] = max(state['peak'], state['current'])
+            time.sleep(0.05)
+            with lock:
+                state['current'] -= 1
+            return n
+
+        asyncio.run(runner.map(fetch, list(range(8)), uses_db=False))
+        assert state['peak'] > 1
+        runner.shutdown()
+
+    def test_executor_is_reused(self):
+        """A single executor is shared across items and map calls"""
+        runner = BoundedConcurrencyRunner(db_concurrency=2, adaptive=False)
+        asyncio.run(runner.map(lambda n: n, [1, 2, 3]))
+        executor = runner.executor
+        asyncio.run(runner.map(lambda n: n, [4, 5]))
+        assert runner.executor is executor
+        runner.shutdown()
+
+    def test_runner_is_reusable_across_event_loops(self):
+        """A second asyncio.run() works even after the first one made tasks wait for a slot"""
+        runner = BoundedConcurrencyRunner(db_concurrency=1, io_workers=4, adaptive=False)
+
+        def work(n):
+            time.sleep(0.01)
+            return n
+
+        assert asyncio.run(runner.map(work, [1, 2, 3])) == [1, 2, 3]
+        assert asyncio.run(runner.map(work, [4, 5, 6])) == [4, 5, 6]
+        runner.shutdown()
+
+    def test_failures_return_none(self):
+        """Failed items yield None and are counted"""
+        runner = BoundedConcurrencyRunner(db_concurrency=2, adaptive=False)
+
+        def work(n):
+            if n == 2:
+                raise ValueError("boom")
+            return n
+
+        results = asyncio.run(runner.map(work, [1, 2, 3]))
+        assert results == [1, None, 3]
+        metrics = runner.get_metrics()
+        assert metrics['completed'] == 2
+        assert metrics['failed'] == 1
+        assert metrics['queue_depth'] == 0
+        assert metrics['in_flight'] == 0
+        runner.shutdown()
+
+    def test_pool_exhaustion_lowers_limit(self):
+        """Pool exhaustion errors halve the database limit"""
+        runner = BoundedConcurrencyRunner(db_concurrency=8)
+
+        def work(n):
+            raise RuntimeError("connection pool exhausted")
+
+        asyncio.run(runner.map(work, [1]))
+        metrics = runner.get_metrics()
+        assert metrics['db_limit'] == 4
+        assert metrics['pressure_events'] == 1
+        runner.shutdown()
+
+    def test_pool_wait_probe_signals_pressure(self):
+        """Growth in observed pool wait time counts as pressure"""
+        waits = iter([0.0, 5.0])
+        runner = BoundedConcurrencyRunner(db_concurrency=4, pool_wait_probe=lambda: next(waits))
+
+        asyncio.run(runner.map(lambda n: n, [1]))
+        asyncio.run(runner.map(lambda n: n, [2]))
+        assert runner.get_metrics()['db_limit'] == 2
+        runner.shutdown()
+
+    def test_sequential_runner_runs_one_at_a_time(self):
+        """SequentialTaskRunner keeps a single slot"""
+        runner = SequentialTaskRunner()
+        assert runner.get_metrics()['db_limit'] == 1
+        assert asyncio.run(runner.map(lambda n: n + 1, [1, 2])) == [2, 3]
+        runner.shutdown()
+
+    def test_factory_returns_bounded_runner(self):
+        """Connection-sensitive work gets the bounded runner"""
+        runner = get_safe_task_runner(total_tasks=100, connection_sensitive=True)
+        assert isinstance(runner, BoundedConcurrencyRunner)
+
+    def test_workers_see_the_callers_context(self):
+        """Context variables set by the caller (e.g. a Prefect flow run) reach the worker threads"""
+        runner = BoundedConcurrencyRunner(db_concurrency=2, adaptive=False)
+        RUN_CONTEXT.set('flow-run-1')
+        try:
+            assert asyncio.run(runner.map(lambda n: RUN_CONTEXT.get(), [1, 2])) == ['flow-run-1'] * 2
+        finally:
+            RUN_CONTEXT.set(None)
+            runner.shutdown()
+
+
+class TestRunBounded:
+    """Test the synchronous entry point used by the flows"""
+
+    def test_caps_concurrency_below_pool_size(self, monkeypatch):
+        monkeypatch.setattr(ConnectionConfig, 'get_task_concurrency_limits',
+                            classmethod(lambda cls: {'db_slots': 3, 'io_workers': 8}))
+        lock = threading.Lock()
+        state = {'current': 0, 'peak': 0}
+
+        def work(n):
+            with lock:
+                state['current'] += 1
+                state['peak'] = max(state['peak'], state['current'])
+            time.sleep(0.02)
+            with lock:
+                state['current'] -= 1
+            return n * 2
+
+        assert run_bounded(work, list(range(8)), db_concurrency=10) == [n * 2 for n in range(8)]
+        assert 1 < state['peak'] <= 3
+
+        state['peak'] = 0
+        run_bounded(work, list(range(8)), db_concurrency=2)
+        assert state['peak'] == 2
+
+    def test_network_work_ignores_the_pool_size(self, monkeypatch):
+        monkeypatch.setattr(ConnectionConfig, 'get_task_concurrency_limits',
+                            classmethod(lambda cls: {'db_slots': 1, 'io_workers': 8}))
+        lock = threading.Lock()
+        state = {'current': 0, 'peak': 0}
+
+        def fetch(n):
+            with lock:
+                state['current'] += 1
+                state['peak'] = max(state['peak'], state['current'])
+            time.sleep(0.05)
+            with lock:
+                state['current'] -= 1
+            return n
+
+        assert run_bounded(fetch, list(range(8)), uses_db=False) == list(range(8))
+        assert state['peak'] > 1
+
+    def test_failed_items_return_none(self):
+        def work(n):
+            if n == 2:
+                raise ValueError("boom")
+            return n
+
+        assert run_bounded(work, [1, 2, 3]) == [1, None, 3]
+
+
+class TestAdaptiveLimiter:
+    """Test the AIMD limit adjustments"""
+
+    def test_limit_recovers_after_clean_streak(self):
+        limiter = AdaptiveLimiter(max_limit=4, increase_after=2)
+        limiter.record_pressure()
+        assert limiter.limit == 2
+        limiter.record_success()
+        limiter.record_success()
+        assert limiter.limit == 3
+
+    def test_limit_never_drops_below_minimum(self):
+        limiter = AdaptiveLimiter(max_limit=2)
+        for _ in range(5):
+            limiter.record_pressure()
+        assert limiter.limit == 1
@@ -0,0 +1,113 @@
+"""
+Unit tests for the columnar backtest trade log
+Tests amortized growth, column views, lazy frames, slotted records and backtest results built from arrays
+"""
+
+import pickle
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.trading.backtesting.backtest_engine import BacktestEngine
+from src.trading.backtesting.trade_log import Trade, TradeLog
+from src.trading.strategies.base_strategy import BaseStrategy, SignalType, StrategySignal
+
+ENTRY = datetime(2024, 1, 2, 14, 0, tzinfo=timezone.utc)
+
+
+def trade(i, pnl):
+    return Trade(f'SYM{i % 3}', ENTRY, ENTRY + pd.Timedelta(hours=i + 1), 100.0, 100.0 + pnl / 10, 10, pnl,
+                 pnl / 10, float(i + 1), 'sma')
+
+
+class TestTradeLog:
+
+    def test_grows_by_doubling_and_round_trips_records(self):
+        log = TradeLog(capacity=2)
+        trades = [trade(i, pnl) for i, pnl in enumerate([5.0, -3.0, 8.0, -1.0, 2.0])]
+        for record in trades:
+            log.append_trade(record)
+
+        assert (len(log), log.capacity) == (5, 8)
+        assert list(log) == trades
+        assert log[-1] == trades[-1]
+        assert log[1:3] == trades[1:3]
+        assert log[0].exit_time == ENTRY + pd.Timedelta(hours=1)
+        with pytest.raises(IndexError):
+            log[5]
+
+    def test_columns_are_read_only_views(self):
+        log = TradeLog()
+        for i, pnl in enumerate([5.0, -3.0, 8.0]):
+            log.append_trade(trade(i, pnl))
+
+        assert log.pnl.tolist() == [5.0, -3.0, 8.0]
+        assert np.shares_memory(log.pnl, log._columns['pnl'])
+        with pytest.raises(ValueError):
+            log.pnl[0] = 0.0
+        assert log.column('symbol').tolist() == ['SYM0', 'SYM1', 'SYM2']
+
+    def test_frame_is_built_lazily_and_cached_until_append(self):
+        log = TradeLog()
+        assert log.to_frame().empty
+        log.append_trade(trade(0, 5.0))
+        frame = log.to_frame()
+        assert log.to_frame() is frame
+        assert str(frame['exit_time'].dt.tz) == 'UTC'
+        assert frame['strategy'].tolist() == ['sma']
+
+        log.append_trade(trade(1, -3.0))
+        assert len(log.to_frame()) == 2
+
+    def test_records_are_slotted(self):
+        assert not hasattr(trade(0, 1.0), '__dict__')
+        signal = StrategySignal('AAPL', SignalType.BUY, 0.9, datetime(2024, 1, 2))
+        assert not hasattr(signal, '__dict__')
+        assert pickle.loads(pickle.dumps(signal)) == signal
+
+
+class AlternatingStrategy(BaseStrategy):
+    """Buys on even bars and sells on odd ones"""
+
+    def __init__(self, symbols, **kwargs):
+        super().__init__(name="Alternating", symbols=symbols, **kwargs)
+        self.bar = 0
+
+    def generate_signals(self, market_data):
+        signal_type = SignalType.BUY if self.bar % 2 == 0 else SignalType.SELL
+        self.bar += 1
+        stamp = market_data['AAPL'].index[-1].to_pydatetime()
+        return [StrategySignal('AAPL', signal_type, 0.9, stamp, quantity=10)]
+
+    def calculate_position_size(self, signal, available_capital):
+        return 10
+
+
+class TestBacktestResults:
+
+    def test_metrics_come_from_the_trade_arrays(self):
+        closes = [100.0, 110.0, 100.0, 95.0, 100.0, 104.0]
+        index = pd.date_range('2024-01-02 14:00', periods=len(closes), freq='h')
+        data = {'AAPL': pd.DataFrame({'open': closes, 'high': closes, 'low': closes, 'close': closes,
+                                      'volume': 1000.0}, index=index)}
+        engine = BacktestEngine(initial_capital=10_000.0, commission=0.0, slippage=0.0)
+
+        result = engine.run_backtest(AlternatingStrategy(['AAPL']), index[0], index[-1], data=data)
+
+        assert isinstance(result.trades, TradeLog)
+        assert result.trades.pnl.tolist() == pytest.approx([100.0, -50.0, 40.0])
+        assert (result.total_trades, result.winning_trades, result.losing_trades) == (3, 2, 1)
+        assert result.profit_factor == pytest.approx(140.0 / 50.0)
+        assert result.avg_position_size == pytest.approx((1000.0 + 1000.0 + 1000.0) / 3)
+        assert result.final_capital == pytest.approx(10_090.0)
+        assert result.max_drawdown == pytest.approx(-50.0)
+        assert result.max_drawdown_pct == pytest.approx(-50.0 / 10_100.0 * 100)
+        assert result.drawdown_curve.index.equals(result.equity_curve.index)